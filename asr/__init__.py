@@ -6,6 +6,12 @@ Advanced Automatic Speech Recognition for DAW voice control.
 Components:
 - engine.py: Core ASR engine with Whisper
 - streaming.py: Real-time streaming with VAD
+- term_usage.py: Per-profile vocabulary usage for prompt/keyword budgets
+- event_stream.py: Sequenced ASR events over a UNIX socket
+- shm_status.py: Shared-memory seqlock status block (RMS, VAD, partials)
+- metrics.py: Counters/latency histograms for the API's /metrics endpoint
+- intent_parser.py: Compiled DAW command grammar (structured intents)
+- direct_dispatch.py: Optional OSC fast lane from intents to REAPER actions
 - vocab.json: Custom DAW vocabulary
 - profiles/: User voice profiles
 
@@ -44,6 +50,42 @@ from .streaming import (
     get_session
 )
 
+from .term_usage import (
+    TermUsageTracker,
+    get_usage_tracker
+)
+
+from .event_stream import (
+    ASREventStream,
+    FileSink,
+    get_event_stream,
+    subscribe
+)
+
+from .shm_status import (
+    SharedStatusReader,
+    SharedStatusWriter,
+    StatusSnapshot,
+    get_status_writer
+)
+
+from .metrics import (
+    MetricsRegistry,
+    get_metrics
+)
+
+from .intent_parser import (
+    Intent,
+    IntentParser,
+    get_intent_parser,
+    parse_intent
+)
+
+from .direct_dispatch import (
+    DirectDispatcher,
+    get_direct_dispatcher
+)
+
 from .calibration import (
     VoiceCalibrationEngine,
     QuickCalibration,
@@ -79,6 +121,36 @@ __all__ = [
     'stop_listening',
     'get_session',
     
+    # Vocabulary usage
+    'TermUsageTracker',
+    'get_usage_tracker',
+    
+    # Event stream
+    'ASREventStream',
+    'FileSink',
+    'get_event_stream',
+    'subscribe',
+    
+    # Shared status block
+    'SharedStatusReader',
+    'SharedStatusWriter',
+    'StatusSnapshot',
+    'get_status_writer',
+    
+    # Metrics
+    'MetricsRegistry',
+    'get_metrics',
+    
+    # Intent parsing
+    'Intent',
+    'IntentParser',
+    'get_intent_parser',
+    'parse_intent',
+    
+    # Fast lane
+    'DirectDispatcher',
+    'get_direct_dispatcher',
+    
     # Calibration
     'VoiceCalibrationEngine',
     'QuickCalibration',
@@ -9,6 +9,7 @@ import os
 import sys
 import time
 import json
+import threading
 import unittest
 import numpy as np
 from pathlib import Path
@@ -35,6 +36,12 @@ from asr.streaming import (
     PartialTranscript
 )
 
+from asr.term_usage import TermUsageTracker
+from asr.event_stream import ASREventStream, FileSink, subscribe
+from asr.shm_status import SharedStatusWriter, SharedStatusReader, PARTIAL_SLOT, VAD_SPEECH
+from asr.intent_parser import IntentParser, GrammarError, normalize
+from asr.direct_dispatch import ACTION_IDS, DirectDispatcher, osc_action_message
+
 
 class TestVocabularyManager(unittest.TestCase):
     """Tests for VocabularyManager"""
@@ -116,6 +123,418 @@ class TestProfileManager(unittest.TestCase):
         self.assertFalse(self.manager.set_active("NonExistent"))
 
 
+class TestTermUsageTracker(unittest.TestCase):
+    """Tests for TermUsageTracker"""
+    
+    def setUp(self):
+        self.usage_dir = "/tmp/test_term_usage"
+        self.terms = ["play", "stop", "mute", "solo", "FabFilter", "punch in"]
+        self.tracker = TermUsageTracker("User1", usage_dir=self.usage_dir, half_life_days=1)
+    
+    def tearDown(self):
+        import shutil
+        if os.path.exists(self.usage_dir):
+            shutil.rmtree(self.usage_dir)
+    
+    def test_observe_matches_words_and_phrases(self):
+        """Test single words and multi-word terms are matched"""
+        matched = self.tracker.observe("Punch in and mute track 3", self.terms)
+        self.assertEqual(set(matched), {"punch in", "mute"})
+        self.assertEqual(self.tracker.observe("playback speed", self.terms), [])
+    
+    def test_select_prefers_used_terms(self):
+        """Test budget is filled by usage, then vocabulary order"""
+        self.tracker.observe("solo", self.terms)
+        self.tracker.observe("solo the fabfilter track", self.terms)
+        selected = self.tracker.select(self.terms, 3)
+        self.assertEqual(selected, ["solo", "FabFilter", "play"])
+    
+    def test_recency_decay(self):
+        """Test older usage counts for less than recent usage"""
+        now = time.time()
+        self.tracker.observe("mute", self.terms, now=now - 3 * 86400)
+        self.tracker.observe("mute", self.terms, now=now - 3 * 86400)
+        self.tracker.observe("stop", self.terms, now=now)
+        self.assertAlmostEqual(self.tracker.score("mute", now), 0.25, places=3)
+        self.assertEqual(self.tracker.select(self.terms, 1, now=now), ["stop"])
+    
+    def test_persistence(self):
+        """Test counts survive a reload"""
+        self.tracker.observe("stop stop", self.terms)
+        self.tracker.save()
+        restored = TermUsageTracker("User1", usage_dir=self.usage_dir, half_life_days=1)
+        self.assertGreater(restored.score("stop"), 0.9)
+        self.assertEqual(restored.score("play"), 0.0)
+
+
+class TestASREventStream(unittest.TestCase):
+    """Tests for ASREventStream"""
+    
+    def setUp(self):
+        self.tmp_dir = "/tmp/test_event_stream"
+        os.makedirs(self.tmp_dir, exist_ok=True)
+        self.socket_path = os.path.join(self.tmp_dir, "events.sock")
+        self.stream = ASREventStream(socket_path=self.socket_path, replay_size=4, file_sink=False)
+        self.assertTrue(self.stream.start())
+    
+    def tearDown(self):
+        import shutil
+        self.stream.stop()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+    
+    def _wait_for_subscribers(self, count):
+        deadline = time.time() + 2.0
+        while self.stream.get_stats()['subscribers'] < count and time.time() < deadline:
+            time.sleep(0.01)
+    
+    def test_replay_since(self):
+        """Test reconnecting subscribers get the events they missed, in order"""
+        for i in range(6):
+            self.stream.partial(f"text {i}", 0.5, "command")
+        events = subscribe(self.socket_path, since=3, timeout=2.0)
+        self.assertEqual([next(events)["seq"] for _ in range(3)], [4, 5, 6])
+        events.close()
+    
+    def test_multiple_subscribers_live(self):
+        """Test every subscriber receives each live event once"""
+        first = subscribe(self.socket_path, replay=0, timeout=2.0)
+        second = subscribe(self.socket_path, replay=0, timeout=2.0)
+        received = []
+        
+        def read_two(gen):
+            received.append([next(gen)["type"], next(gen)["type"]])
+        
+        readers = [threading.Thread(target=read_two, args=(g,)) for g in (first, second)]
+        for r in readers:
+            r.start()
+        self._wait_for_subscribers(2)
+        self.stream.final("play", 0.95, "command")
+        self.stream.barge_in(812)
+        for r in readers:
+            r.join(timeout=2.0)
+        self.assertEqual(received, [["final", "barge_in"], ["final", "barge_in"]])
+    
+    def test_file_sink(self):
+        """Test the compatibility sink writes command and status files"""
+        sink = FileSink(
+            command_file=os.path.join(self.tmp_dir, "cmd.txt"),
+            status_file=os.path.join(self.tmp_dir, "status.json"),
+            user_speaking_file=os.path.join(self.tmp_dir, "speaking.json")
+        )
+        self.stream.sinks.append(sink)
+        self.stream.partial("pla", 0.4, "command")
+        self.assertFalse(os.path.exists(sink.command_file))
+        self.stream.final("play", 0.9, "command", provider="deepgram")
+        with open(sink.command_file) as f:
+            self.assertEqual(f.read(), "play")
+        with open(sink.status_file) as f:
+            status = json.load(f)
+        self.assertTrue(status["is_final"])
+        self.assertEqual(status["provider"], "deepgram")
+    
+    def test_file_sink_skips_dispatched_command(self):
+        """Test fast-lane finals update status but not the command file"""
+        sink = FileSink(
+            command_file=os.path.join(self.tmp_dir, "cmd.txt"),
+            status_file=os.path.join(self.tmp_dir, "status.json"),
+            user_speaking_file=os.path.join(self.tmp_dir, "speaking.json")
+        )
+        self.stream.sinks.append(sink)
+        self.stream.final("play", 0.95, "command", dispatched={'action_id': 1007})
+        self.assertFalse(os.path.exists(sink.command_file))
+        with open(sink.status_file) as f:
+            self.assertEqual(json.load(f)["dispatched"], {'action_id': 1007})
+
+
+class TestSharedStatusBlock(unittest.TestCase):
+    """Tests for the shared-memory status block"""
+    
+    def setUp(self):
+        self.path = "/tmp/test_dawrv_status.shm"
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        self.writer = SharedStatusWriter(self.path)
+        self.reader = SharedStatusReader(self.path)
+    
+    def tearDown(self):
+        self.writer.close()
+        self.reader.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+    
+    def test_update_preserves_other_fields(self):
+        """Test partial updates keep previously written fields"""
+        self.writer.update(rms=812.0, user_speaking=True)
+        self.writer.update(vad_state=VAD_SPEECH)
+        self.writer.update(partial="go to bar")
+        snap = self.reader.read()
+        self.assertEqual(snap.last_rms, 812.0)
+        self.assertTrue(snap.user_speaking)
+        self.assertEqual(snap.vad_state, VAD_SPEECH)
+        self.assertEqual(snap.partial, "go to bar")
+        self.assertEqual(snap.partial_seq, 1)
+        self.assertEqual(snap.seq % 2, 0)
+        self.assertLess(snap.age_s(snap.rms_ns), 5.0)
+        self.assertFalse(snap.rhea_speaking)
+    
+    def test_rhea_speaking_gate(self):
+        """Test RHEA's speaking flag has its own counter and survives other updates"""
+        gate = self.reader.gate_seq()
+        self.writer.update(rhea_speaking=True)
+        self.writer.update(rms=120.0)
+        snap = self.reader.read()
+        self.assertTrue(snap.rhea_speaking)
+        self.assertLess(snap.age_s(snap.rhea_speaking_ns), 5.0)
+        self.assertEqual(self.reader.gate_seq(), gate + 2)
+        self.writer.update(rhea_speaking=False)
+        self.assertFalse(self.reader.read().rhea_speaking)
+    
+    def test_reader_does_not_create_block(self):
+        """Test a reader opened before any writer fails instead of creating the file"""
+        missing = self.path + ".missing"
+        with self.assertRaises(OSError):
+            SharedStatusReader(missing)
+        self.assertFalse(os.path.exists(missing))
+    
+    def test_partial_truncated_to_slot(self):
+        """Test long partials are cut to the fixed slot"""
+        self.writer.update(partial="x" * (PARTIAL_SLOT + 50))
+        self.assertEqual(len(self.reader.read().partial), PARTIAL_SLOT)
+    
+    def test_crashed_writer_recovery(self):
+        """Test an odd (mid-write) counter is repaired by the next writer"""
+        import struct
+        seq = self.reader.seq()
+        with open(self.path, "r+b") as f:
+            f.seek(8)
+            f.write(struct.pack("<Q", seq + 1))
+        self.assertIsNone(self.reader.read())
+        SharedStatusWriter(self.path).close()
+        self.assertIsNotNone(self.reader.read())
+
+
+class TestIntentParser(unittest.TestCase):
+    """Tests for the compiled intent grammar"""
+    
+    @classmethod
+    def setUpClass(cls):
+        cls.parser = IntentParser()
+    
+    def test_number_normalization(self):
+        """Test spoken numbers, signs and ranges become digits"""
+        self.assertEqual(normalize("Track Twelve"), "track 12")
+        self.assertEqual(normalize("minus six dB"), "-6 db")
+        self.assertEqual(normalize("one hundred and twenty five"), "125")
+        self.assertEqual(normalize("three point five"), "3.5")
+        self.assertEqual(normalize("bars 3-7"), "bars 3 to 7")
+        self.assertEqual(normalize("pan 30%"), "pan 30 percent")
+    
+    def test_spoken_ranges_and_compounds(self):
+        """Test word ranges are read after number words, and "one twenty" is 120"""
+        self.assertEqual(normalize("Mute tracks three-five"), "mute tracks 3 to 5")
+        self.assertEqual(normalize("twenty-one"), "21")
+        self.assertEqual(normalize("one twenty"), "120")
+        self.assertEqual(normalize("one fifteen"), "115")
+        self.assertEqual(normalize("pan to -0.5"), "pan to -0.5")
+        intent = self.parser.parse("Mute tracks three-five")
+        self.assertEqual((intent.name, intent.slots), ("mutetrack", {"track_start": 3, "track_end": 5}))
+        self.assertEqual(self.parser.parse("set the tempo to one twenty").slots, {"bpm": 120})
+    
+    def test_transport_and_modes(self):
+        """Test slot-less commands, with wake word and politeness"""
+        self.assertEqual(self.parser.parse("Play").name, "play")
+        self.assertEqual(self.parser.parse("hey rhea could you stop please").name, "stop")
+        self.assertEqual(self.parser.parse("go to the beginning").name, "gotostart")
+        self.assertEqual(self.parser.parse("switch to dictation mode").name, "mode_dictation")
+        self.assertEqual(self.parser.parse("command mode").name, "mode_command")
+    
+    def test_tracks_and_bars(self):
+        """Test track N, track ranges and bar ranges"""
+        intent = self.parser.parse("mute track twelve")
+        self.assertEqual((intent.name, intent.slots), ("mutetrack", {"track": 12}))
+        intent = self.parser.parse("solo tracks one through four")
+        self.assertEqual(intent.slots, {"track_start": 1, "track_end": 4})
+        intent = self.parser.parse("loop bars nine to sixteen")
+        self.assertEqual((intent.name, intent.slots), ("loopbars", {"bar_start": 9, "bar_end": 16}))
+        self.assertEqual(self.parser.parse("mute").name, "mute")
+    
+    def test_tempo_volume_pan(self):
+        """Test numeric slots (signed, decimal) and choices"""
+        self.assertEqual(self.parser.parse("set the tempo to 128 bpm").slots, {"bpm": 128})
+        intent = self.parser.parse("set track 2 volume to minus six point five db")
+        self.assertEqual(intent.slots, {"track": 2, "db": -6.5})
+        self.assertEqual(self.parser.parse("turn it down 3dB").slots, {"db_amount": 3})
+        intent = self.parser.parse("pan forty percent left")
+        self.assertEqual((intent.name, intent.slots), ("pan", {"percent": 40, "direction": "left"}))
+        self.assertEqual(self.parser.parse("pan it centre").slots, {"direction": "center"})
+    
+    def test_out_of_range_slots_rejected(self):
+        """Test track or bar 0 and a zero or negative tempo give no intent"""
+        self.assertIsNone(self.parser.parse("tempo minus 20"))
+        self.assertIsNone(self.parser.parse("set the tempo to zero"))
+        self.assertIsNone(self.parser.parse("increase the tempo by minus five"))
+        self.assertIsNone(self.parser.parse("solo track zero"))
+        self.assertIsNone(self.parser.parse("mute tracks zero to three"))
+        self.assertEqual(self.parser.parse("solo track one").slots, {"track": 1})
+        self.assertEqual(self.parser.parse("tempo 0.5").slots, {"bpm": 0.5})
+    
+    def test_no_match(self):
+        """Test free-form speech does not produce an intent"""
+        self.assertIsNone(self.parser.parse("the snare sounds a little boxy"))
+        self.assertIsNone(self.parser.parse(""))
+    
+    def test_custom_grammar(self):
+        """Test grammars are compiled and validated"""
+        parser = IntentParser([("marker", ("(add|drop) [a] marker [at bar {bar:int}]",))])
+        self.assertEqual(parser.parse("drop a marker at bar five").slots, {"bar": 5})
+        self.assertEqual(parser.parse("add marker").slots, {})
+        with self.assertRaises(GrammarError):
+            IntentParser([("broken", ("go to [bar",))])
+
+
+class TestDirectDispatcher(unittest.TestCase):
+    """Tests for the OSC fast lane"""
+    
+    def setUp(self):
+        import socket
+        self.stand_in = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.stand_in.bind(("127.0.0.1", 0))
+        self.stand_in.settimeout(1.0)
+        self.dispatcher = DirectDispatcher(
+            port=self.stand_in.getsockname()[1], actions=["play", "undo"], min_confidence=0.9
+        )
+    
+    def tearDown(self):
+        self.dispatcher.close()
+        self.stand_in.close()
+    
+    def test_osc_action_message(self):
+        """Test /action/{id} encoding is 4-byte aligned"""
+        self.assertEqual(osc_action_message(1007), b"/action/1007\x00\x00\x00\x00,\x00\x00\x00")
+        self.assertEqual(len(osc_action_message(40029)) % 4, 0)
+    
+    def test_jumps_use_project_start_and_end(self):
+        """Test go to start/end map to REAPER's jump actions, not Stop or Play/pause"""
+        self.assertEqual(ACTION_IDS['gotostart'], 40042)
+        self.assertEqual(ACTION_IDS['gotoend'], 40043)
+    
+    def test_dispatch_sends_action(self):
+        """Test an eligible intent reaches the OSC stand-in"""
+        record = self.dispatcher.dispatch({'name': 'play', 'slots': {}}, 0.95)
+        self.assertEqual(record['action_id'], 1007)
+        self.assertEqual(self.stand_in.recv(256), osc_action_message(1007))
+    
+    def test_ineligible_intents_take_normal_path(self):
+        """Test low confidence, slots and unlisted intents are not dispatched"""
+        self.assertIsNone(self.dispatcher.dispatch({'name': 'play', 'slots': {}}, 0.6))
+        self.assertIsNone(self.dispatcher.dispatch({'name': 'mutetrack', 'slots': {'track': 2}}, 1.0))
+        self.assertIsNone(self.dispatcher.dispatch({'name': 'stop', 'slots': {}}, 1.0))
+        self.assertIsNone(self.dispatcher.dispatch(None, 1.0))
+        self.assertEqual(self.dispatcher.stats['skipped'], 4)
+
+
+class TestASRAPIServer(unittest.TestCase):
+    """Tests for the threaded ASR control API"""
+    
+    class FakeIntegration:
+        """Integration stand-in whose start() is slow like a model load"""
+        
+        def __init__(self):
+            self.is_running = False
+        
+        def start(self):
+            time.sleep(0.5)
+            self.is_running = True
+        
+        def stop(self):
+            self.is_running = False
+        
+        def get_stats(self):
+            return {'is_running': self.is_running}
+    
+    @classmethod
+    def setUpClass(cls):
+        import asr.event_stream as event_stream
+        from asr.asr_to_dawrv import create_api_server
+        
+        cls.event_stream = event_stream
+        cls.saved_stream = event_stream._stream_instance
+        event_stream._stream_instance = ASREventStream(
+            socket_path="/tmp/test_api_events.sock", file_sink=False
+        )
+        cls.integration = cls.FakeIntegration()
+        cls.server = create_api_server(cls.integration, port=0, host="127.0.0.1")
+        cls.port = cls.server.server_address[1]
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+    
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        cls.event_stream._stream_instance = cls.saved_stream
+    
+    def _get(self, path, timeout=2.0):
+        import urllib.request
+        with urllib.request.urlopen(f"http://127.0.0.1:{self.port}{path}", timeout=timeout) as resp:
+            body = resp.read().decode('utf-8')
+            return resp.status, body
+    
+    def test_start_returns_job_without_blocking_status(self):
+        """Test /start returns a job handle and /status answers meanwhile"""
+        began = time.time()
+        status, body = self._get('/start')
+        self.assertEqual(status, 202)
+        job = json.loads(body)['job']
+        self.assertIn(job['state'], ('queued', 'running'))
+        
+        status, body = self._get('/status')
+        self.assertEqual(status, 200)
+        self.assertLess(time.time() - began, 0.4)
+        
+        deadline = time.time() + 3.0
+        while time.time() < deadline:
+            job = json.loads(self._get(f"/jobs/{job['id']}")[1])
+            if job['state'] == 'done':
+                break
+            time.sleep(0.05)
+        self.assertEqual(job['state'], 'done')
+        self.assertTrue(self.integration.is_running)
+    
+    def test_metrics_exposition(self):
+        """Test /metrics renders counters and histograms as text"""
+        self._get('/status')
+        status, body = self._get('/metrics')
+        self.assertEqual(status, 200)
+        self.assertIn('# TYPE dawrv_asr_api_requests_total counter', body)
+        self.assertIn('dawrv_asr_api_request_seconds_bucket{path="/status",le="+Inf"}', body)
+    
+    def test_sse_replays_and_streams(self):
+        """Test /events replays since Last-Event-ID and pushes live events"""
+        import http.client
+        stream = self.event_stream._stream_instance
+        first = stream.partial("go to", 0.4, "command")
+        
+        conn = http.client.HTTPConnection("127.0.0.1", self.port, timeout=2.0)
+        conn.request("GET", "/events", headers={"Last-Event-ID": str(first['seq'] - 1)})
+        resp = conn.getresponse()
+        self.assertEqual(resp.getheader('Content-Type'), 'text/event-stream')
+        
+        def read_event():
+            lines = []
+            while True:
+                line = resp.fp.readline().decode('utf-8').rstrip('\n')
+                if not line:
+                    return lines
+                lines.append(line)
+        
+        self.assertIn("event: partial", read_event())
+        stream.final("go to bar 5", 0.95, "command")
+        event = read_event()
+        self.assertIn("event: final", event)
+        self.assertEqual(json.loads(event[2][len("data: "):])['text'], "go to bar 5")
+        conn.close()
+
+
 class TestTranscriptResult(unittest.TestCase):
     """Tests for TranscriptResult"""
     
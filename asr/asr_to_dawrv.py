@@ -6,7 +6,7 @@ Integration layer between ASR engine and DAWRV NLU/Intent Engine.
 
 This module provides:
 - onTranscript callback hook
-- DAWRV NLU routing
+- DAWRV NLU routing (compiled intent grammar, see intent_parser.py)
 - Command file output for Electron app
 - WebSocket/HTTP API for real-time communication
 """
@@ -21,7 +21,8 @@ from pathlib import Path
 from typing import Optional, Callable, Dict, Any, List
 from dataclasses import dataclass
 import http.server
-import socketserver
+from queue import Queue, Empty
+from urllib.parse import urlparse, parse_qs
 
 # Add parent to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -38,46 +39,59 @@ from asr.streaming import (
     RealtimeASRSession,
     PartialTranscript
 )
+from asr import event_stream
+from asr.event_stream import get_event_stream
+from asr.metrics import get_metrics
+from asr.intent_parser import get_intent_parser
+from asr.direct_dispatch import get_direct_dispatcher
+from asr.shm_status import get_status_writer, VAD_SPEECH, VAD_SILENCE
 
 logger = logging.getLogger('DAWRV_Integration')
 
 # ============================================================================
-# COMMAND FILE OUTPUT (for Electron IPC)
+# EVENT OUTPUT (for Electron IPC)
 # ============================================================================
 
-COMMAND_FILE = '/tmp/dawrv_voice_command.txt'
-STATUS_FILE = '/tmp/dawrv_asr_status.json'
+# Events go out over the UNIX-socket event stream; the legacy command/status
+# files are still written (atomically) by its file sink for pollers.
+COMMAND_FILE = event_stream.COMMAND_FILE
+STATUS_FILE = event_stream.STATUS_FILE
 
 
 def _write_status_to_file(text: str, confidence: float, mode: str, *, is_final: bool, provider: str = "local"):
-    """Write status JSON for Electron to poll (supports partial + final)."""
+    """Publish a partial or final status event."""
     try:
-        status = {
-            "text": text,
-            "confidence": float(confidence) if confidence is not None else 0.0,
-            "mode": mode,
-            "timestamp": time.time(),
-            "is_final": bool(is_final),
-            "provider": provider,
-        }
-        with open(STATUS_FILE, 'w') as f:
-            json.dump(status, f)
+        stream = get_event_stream()
+        if is_final:
+            stream.final(text, confidence, mode, provider=provider)
+        else:
+            stream.partial(text, confidence, mode, provider=provider)
     except Exception as e:
         logger.error(f"Error writing status: {e}")
 
 
-def write_command_to_file(text: str, confidence: float, mode: str, *, provider: str = "local"):
+def write_command_to_file(
+    text: str,
+    confidence: float,
+    mode: str,
+    *,
+    provider: str = "local",
+    intent: Optional[Dict[str, Any]] = None,
+    dispatched: Optional[Dict[str, Any]] = None
+):
     """
-    Write command to file for DAWRV Electron app to read.
-    This is the simplest integration method.
+    Publish a final command for the DAWRV Electron app.
+    Subscribers get it from the event socket; the file sink still
+    writes the command file and final status for pollers.
+    A parsed intent, when present, rides along on the final event.
+    Commands already sent by the fast lane are marked 'dispatched' so
+    the app only shows feedback for them.
     """
     try:
-        with open(COMMAND_FILE, 'w') as f:
-            f.write(text)
-
-        # Also write status (final)
-        _write_status_to_file(text, confidence, mode, is_final=True, provider=provider)
-        
+        fields = {'intent': intent} if intent else {}
+        if dispatched:
+            fields['dispatched'] = dispatched
+        get_event_stream().final(text, confidence, mode, provider=provider, **fields)
         logger.info(f"📝 Command written: {text}")
     except Exception as e:
         logger.error(f"Error writing command: {e}")
@@ -106,15 +120,48 @@ class DAWRVNLUInterface:
         
         # Command queue for confirmation
         self.pending_command: Optional[str] = None
+        self.pending_intent: Optional[Dict[str, Any]] = None
+        
+        # Compiled intent grammar (structured intents for the renderer)
+        self.parser = get_intent_parser()
+        
+        # Optional fast lane: high-confidence intents straight to REAPER via OSC
+        self.dispatcher = get_direct_dispatcher()
         
         # Statistics
         self.stats = {
             'total_commands': 0,
             'executed': 0,
             'confirmed': 0,
-            'repeated': 0
+            'repeated': 0,
+            'intents_matched': 0,
+            'dispatched': 0
         }
     
+    def _parse_intent(self, transcript: str) -> Optional[Dict[str, Any]]:
+        """Parse a transcript into an intent dict (None if no rule matches)"""
+        try:
+            intent = self.parser.parse(transcript)
+        except Exception as e:
+            logger.error(f"Intent parse error: {e}")
+            return None
+        if intent is None:
+            return None
+        self.stats['intents_matched'] += 1
+        return intent.to_dict()
+    
+    def _dispatch(self, intent: Optional[Dict[str, Any]], confidence: float) -> Optional[Dict[str, Any]]:
+        """Send an intent through the fast lane (None if not eligible or disabled)"""
+        if self.dispatcher is None or intent is None:
+            return None
+        with get_metrics().histogram(
+            "dawrv_direct_dispatch_seconds", "Fast-lane intent to OSC send time"
+        ).time():
+            dispatched = self.dispatcher.dispatch(intent, confidence)
+        if dispatched:
+            self.stats['dispatched'] += 1
+        return dispatched
+    
     def process(self, result: TranscriptResult) -> Dict[str, Any]:
         """
         Process a transcript result and route to appropriate handler.
@@ -140,8 +187,14 @@ class DAWRVNLUInterface:
         """Handle high-confidence command - execute immediately"""
         self.stats['executed'] += 1
         
+        intent = self._parse_intent(result.transcript)
+        dispatched = self._dispatch(intent, result.confidence)
+        
         # Write to command file for DAWRV
-        write_command_to_file(result.transcript, result.confidence, result.mode, provider=getattr(result, "provider", "local"))
+        write_command_to_file(
+            result.transcript, result.confidence, result.mode,
+            provider=getattr(result, "provider", "local"), intent=intent, dispatched=dispatched
+        )
         
         # Fire callback
         if self.on_execute:
@@ -150,6 +203,8 @@ class DAWRVNLUInterface:
         return {
             'action': 'execute',
             'command': result.transcript,
+            'intent': intent,
+            'dispatched': dispatched,
             'confidence': result.confidence,
             'message': f"Executing: {result.transcript}"
         }
@@ -158,6 +213,7 @@ class DAWRVNLUInterface:
         """Handle medium-confidence command - request confirmation"""
         self.stats['confirmed'] += 1
         self.pending_command = result.transcript
+        self.pending_intent = self._parse_intent(result.transcript)
         
         # Fire callback
         if self.on_confirm:
@@ -166,6 +222,7 @@ class DAWRVNLUInterface:
         return {
             'action': 'confirm',
             'command': result.transcript,
+            'intent': self.pending_intent,
             'confidence': result.confidence,
             'message': f"Did you say: {result.transcript}?"
         }
@@ -188,10 +245,12 @@ class DAWRVNLUInterface:
         """Confirm the pending command"""
         if self.pending_command:
             cmd = self.pending_command
+            intent = self.pending_intent
             self.pending_command = None
+            self.pending_intent = None
             
             # Write confirmed command
-            write_command_to_file(cmd, 1.0, "command")
+            write_command_to_file(cmd, 1.0, "command", intent=intent)
             
             if self.on_execute:
                 self.on_execute(cmd)
@@ -199,6 +258,7 @@ class DAWRVNLUInterface:
             return {
                 'action': 'execute',
                 'command': cmd,
+                'intent': intent,
                 'message': f"Confirmed: {cmd}"
             }
         return None
@@ -206,6 +266,7 @@ class DAWRVNLUInterface:
     def cancel_pending(self):
         """Cancel the pending command"""
         self.pending_command = None
+        self.pending_intent = None
         return {'action': 'cancelled', 'message': 'Command cancelled'}
 
 
@@ -257,6 +318,19 @@ class DAWRVASRIntegration:
         
         logger.info("DAWRV ASR Integration initialized")
     
+    def _set_vad_state(self, state: int):
+        """Mirror VAD transitions into the shared status block"""
+        try:
+            get_status_writer().update(vad_state=state, user_speaking=(state == VAD_SPEECH))
+        except Exception as e:
+            logger.debug(f"Shared status update failed: {e}")
+    
+    def _emit_status(self, state: str):
+        """Publish a status change to the event stream and callback"""
+        get_event_stream().status(state, mode=self.engine.mode.value)
+        if self.on_status:
+            self.on_status(state)
+    
     def _on_final_transcript(self, result: TranscriptResult):
         """Handle final transcript from ASR"""
         if not self.is_listening:
@@ -267,6 +341,14 @@ class DAWRVASRIntegration:
         # Process through NLU
         action_result = self.nlu.process(result)
         
+        get_metrics().counter("dawrv_asr_finals_total", "Final transcripts by NLU action").inc(
+            action=action_result.get('action', 'unknown')
+        )
+        
+        # Executed commands feed vocabulary usage (prompt budget ranking)
+        if action_result.get('action') == 'execute':
+            self.engine.record_accepted_transcript(result.transcript)
+        
         # Combine ASR result with NLU action
         output = {
             **result.to_dict(),
@@ -293,6 +375,8 @@ class DAWRVASRIntegration:
                 provider="local",
             )
 
+        get_metrics().counter("dawrv_asr_partials_total", "Partial transcripts").inc()
+        
         if self.on_partial:
             self.on_partial(partial.text)
     
@@ -313,13 +397,14 @@ class DAWRVASRIntegration:
             on_transcript=self._on_final_transcript,
             on_partial=self._on_partial_transcript
         )
+        self.session.streamer.on_speech_start = lambda: self._set_vad_state(VAD_SPEECH)
+        self.session.streamer.on_speech_end = lambda: self._set_vad_state(VAD_SILENCE)
         
         # Start listening
         self.session.start()
         self.is_running = True
         
-        if self.on_status:
-            self.on_status("listening")
+        self._emit_status("listening")
         
         logger.info("🎤 ASR listening started")
     
@@ -332,25 +417,23 @@ class DAWRVASRIntegration:
             self.session.stop()
             self.session = None
         
+        self.engine.get_usage_tracker().save()
         self.is_running = False
         
-        if self.on_status:
-            self.on_status("stopped")
+        self._emit_status("stopped")
         
         logger.info("🔇 ASR stopped")
     
     def pause(self):
         """Pause listening (keep session alive)"""
         self.is_listening = False
-        if self.on_status:
-            self.on_status("paused")
+        self._emit_status("paused")
         logger.info("⏸️ ASR paused")
     
     def resume(self):
         """Resume listening"""
         self.is_listening = True
-        if self.on_status:
-            self.on_status("listening")
+        self._emit_status("listening")
         logger.info("▶️ ASR resumed")
     
     def set_mode(self, mode: str):
@@ -363,7 +446,11 @@ class DAWRVASRIntegration:
     
     def confirm(self) -> Dict:
         """Confirm pending command"""
-        return self.nlu.confirm_pending() or {'action': 'no_pending'}
+        result = self.nlu.confirm_pending()
+        if not result:
+            return {'action': 'no_pending'}
+        self.engine.record_accepted_transcript(result['command'])
+        return result
     
     def cancel(self) -> Dict:
         """Cancel pending command"""
@@ -416,28 +503,38 @@ def DAWRV_NLU(data: Dict) -> Dict:
     DAWRV Natural Language Understanding entry point.
     
     This function receives processed ASR output and
-    determines the appropriate DAW action.
+    determines the appropriate DAW action. The structured intent comes
+    from the NLU action when the integration already parsed it, otherwise
+    the transcript is parsed here.
     
     Args:
         data: ASR output with NLU action
     
     Returns:
-        Final action result
+        Final action result ('intent' is None for free-form speech)
     """
     transcript = data.get('transcript', '')
     confidence = data.get('confidence', 0)
     nlu_action = data.get('nlu_action', {})
     
+    if 'intent' in nlu_action:
+        intent = nlu_action['intent']
+    else:
+        parsed = get_intent_parser().parse(transcript)
+        intent = parsed.to_dict() if parsed else None
+    
     # Log for debugging
-    logger.info(f"🧠 DAWRV_NLU received: '{transcript}' (conf={confidence:.2f})")
+    logger.info(
+        f"🧠 DAWRV_NLU received: '{transcript}' (conf={confidence:.2f}) "
+        f"-> {intent['name'] if intent else 'no intent'}"
+    )
     
-    # Return the action result
-    # In production, this would route to DAWRV's intent classifier
     return {
         'success': True,
         'transcript': transcript,
         'action': nlu_action.get('action', 'unknown'),
         'command': nlu_action.get('command', transcript),
+        'intent': intent,
         'confidence': confidence,
         'message': nlu_action.get('message', '')
     }
@@ -447,43 +544,168 @@ def DAWRV_NLU(data: Dict) -> Dict:
 # HTTP API SERVER (Optional)
 # ============================================================================
 
+SSE_HEARTBEAT_S = 15.0
+
+
+class ControlJobRunner:
+    """
+    Runs slow control actions (start loads the model, which can take
+    seconds) on one worker thread, so API handlers return a job handle
+    immediately and /status stays responsive.
+    
+    Jobs run in submission order; submitting an action that is already
+    queued or running returns the existing job instead of a duplicate.
+    """
+    
+    def __init__(self, max_history: int = 50):
+        self.max_history = max_history
+        self.jobs: Dict[str, Dict[str, Any]] = {}
+        self._order: List[str] = []
+        self._queue: Queue = Queue()
+        self._lock = threading.Lock()
+        self._next_id = 0
+        self._worker = threading.Thread(target=self._run, daemon=True)
+        self._worker.start()
+    
+    def submit(self, action: str, fn: Callable[[], Any]) -> Dict[str, Any]:
+        """Queue an action and return a snapshot of its job"""
+        with self._lock:
+            for job_id in reversed(self._order):
+                job = self.jobs[job_id]
+                if job['action'] == action and job['state'] in ('queued', 'running'):
+                    return dict(job)
+            
+            self._next_id += 1
+            job = {
+                'id': f"job-{self._next_id}",
+                'action': action,
+                'state': 'queued',
+                'submitted_at': time.time(),
+                'started_at': None,
+                'finished_at': None,
+                'error': None
+            }
+            self.jobs[job['id']] = job
+            self._order.append(job['id'])
+            while len(self._order) > self.max_history:
+                old_id = self._order[0]
+                if self.jobs[old_id]['state'] in ('queued', 'running'):
+                    break
+                self._order.pop(0)
+                del self.jobs[old_id]
+            snapshot = dict(job)
+        
+        self._queue.put((job['id'], fn))
+        return snapshot
+    
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            job = self.jobs.get(job_id)
+            return dict(job) if job else None
+    
+    def list(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [dict(self.jobs[job_id]) for job_id in self._order]
+    
+    def _set(self, job_id: str, **fields):
+        with self._lock:
+            if job_id in self.jobs:
+                self.jobs[job_id].update(fields)
+    
+    def _run(self):
+        histogram = get_metrics().histogram("dawrv_asr_api_job_seconds", "Control job run time")
+        while True:
+            job_id, fn = self._queue.get()
+            job = self.get(job_id)
+            self._set(job_id, state='running', started_at=time.time())
+            try:
+                with histogram.time(action=job['action']):
+                    fn()
+                self._set(job_id, state='done', finished_at=time.time())
+            except Exception as e:
+                logger.error(f"Job {job_id} ({job['action']}) failed: {e}")
+                self._set(job_id, state='failed', finished_at=time.time(), error=str(e))
+
+
 class ASRAPIHandler(http.server.BaseHTTPRequestHandler):
-    """Simple HTTP API handler for ASR control"""
+    """
+    HTTP API handler for ASR control (one thread per request).
+    
+    GET  /status        integration stats
+    GET  /start, /stop  queue the action, return a job handle (202)
+    GET  /jobs[/<id>]   job state: queued, running, done, failed
+    GET  /pause, /resume
+    GET  /events        Server-Sent Events: partial, final, status, barge_in
+                        (resume with Last-Event-ID or ?since=<seq>)
+    GET  /metrics       Prometheus text exposition
+    POST /confirm, /cancel, /mode
+    """
     
     integration: 'DAWRVASRIntegration' = None
+    jobs: ControlJobRunner = None
     
     def do_GET(self):
         """Handle GET requests"""
-        if self.path == '/status':
+        url = urlparse(self.path)
+        path = url.path.rstrip('/') or '/'
+        query = parse_qs(url.query)
+        
+        if path == '/events':
+            self._record_request('/events', 200)
+            self._stream_events(query)
+            return
+        
+        start = time.perf_counter()
+        if path == '/status':
+            status = 200
             self._send_json(self.integration.get_stats() if self.integration else {})
-        elif self.path == '/start':
-            if self.integration:
-                self.integration.start()
-            self._send_json({'status': 'started'})
-        elif self.path == '/stop':
-            if self.integration:
-                self.integration.stop()
-            self._send_json({'status': 'stopped'})
-        elif self.path == '/pause':
+        elif path in ('/start', '/stop'):
+            action = path[1:]
+            if self.integration and self.jobs:
+                fn = self.integration.start if action == 'start' else self.integration.stop
+                job = self.jobs.submit(action, fn)
+                status = 202
+                self._send_json({'status': 'starting' if action == 'start' else 'stopping', 'job': job}, status)
+            else:
+                status = 503
+                self._send_json({'error': 'ASR integration not available'}, status)
+        elif path == '/jobs':
+            status = 200
+            self._send_json({'jobs': self.jobs.list() if self.jobs else []})
+        elif path.startswith('/jobs/'):
+            job = self.jobs.get(path[len('/jobs/'):]) if self.jobs else None
+            status = 200 if job else 404
+            self._send_json(job if job else {'error': 'Unknown job'}, status)
+        elif path == '/pause':
             if self.integration:
                 self.integration.pause()
+            status = 200
             self._send_json({'status': 'paused'})
-        elif self.path == '/resume':
+        elif path == '/resume':
             if self.integration:
                 self.integration.resume()
+            status = 200
             self._send_json({'status': 'resumed'})
+        elif path == '/metrics':
+            status = 200
+            self._send_metrics()
         else:
-            self._send_json({'error': 'Unknown endpoint'}, 404)
+            status = 404
+            self._send_json({'error': 'Unknown endpoint'}, status)
+        self._record_request(path if status != 404 else 'unknown', status, start)
     
     def do_POST(self):
         """Handle POST requests"""
-        if self.path == '/confirm':
+        start = time.perf_counter()
+        path = urlparse(self.path).path.rstrip('/')
+        status = 200
+        if path == '/confirm':
             result = self.integration.confirm() if self.integration else {}
             self._send_json(result)
-        elif self.path == '/cancel':
+        elif path == '/cancel':
             result = self.integration.cancel() if self.integration else {}
             self._send_json(result)
-        elif self.path == '/mode':
+        elif path == '/mode':
             content_length = int(self.headers.get('Content-Length', 0))
             body = self.rfile.read(content_length).decode('utf-8')
             data = json.loads(body) if body else {}
@@ -492,26 +714,108 @@ class ASRAPIHandler(http.server.BaseHTTPRequestHandler):
                 self.integration.set_mode(mode)
             self._send_json({'mode': mode})
         else:
-            self._send_json({'error': 'Unknown endpoint'}, 404)
+            status = 404
+            self._send_json({'error': 'Unknown endpoint'}, status)
+        self._record_request(path if status != 404 else 'unknown', status, start)
+    
+    def _record_request(self, path: str, status: int, start: float = None):
+        metrics = get_metrics()
+        metrics.counter("dawrv_asr_api_requests_total", "API requests").inc(path=path, code=status)
+        if start is not None:
+            metrics.histogram(
+                "dawrv_asr_api_request_seconds", "API request handling time"
+            ).observe(time.perf_counter() - start, path=path)
+    
+    def _send_metrics(self):
+        """Send Prometheus text exposition"""
+        metrics = get_metrics()
+        stream_stats = get_event_stream().get_stats()
+        metrics.gauge("dawrv_asr_running", "ASR session running").set(
+            1 if self.integration and self.integration.is_running else 0
+        )
+        metrics.gauge("dawrv_asr_event_subscribers", "Connected event subscribers").set(stream_stats['subscribers'])
+        metrics.gauge("dawrv_asr_event_seq", "Last published event sequence").set(stream_stats['seq'])
+        
+        body = metrics.render().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def _stream_events(self, query: Dict[str, List[str]]):
+        """Push events as Server-Sent Events until the client disconnects"""
+        since = self.headers.get('Last-Event-ID') or (query.get('since') or [None])[0]
+        replay = (query.get('replay') or [None])[0]
+        try:
+            since = int(since) if since is not None else None
+            replay = int(replay) if replay is not None else None
+        except ValueError:
+            since, replay = None, None
+        
+        stream = get_event_stream()
+        sub, backlog = stream.attach(since=since, replay=replay)
+        try:
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/event-stream')
+            self.send_header('Cache-Control', 'no-cache')
+            self.send_header('Connection', 'keep-alive')
+            self.send_header('Access-Control-Allow-Origin', '*')
+            self.end_headers()
+            
+            for event in backlog:
+                self._send_sse(event)
+            while sub.alive:
+                try:
+                    event = sub.queue.get(timeout=SSE_HEARTBEAT_S)
+                except Empty:
+                    self.wfile.write(b": keep-alive\n\n")
+                    self.wfile.flush()
+                    continue
+                self._send_sse(event)
+        except (BrokenPipeError, ConnectionResetError, OSError):
+            pass
+        finally:
+            stream.detach(sub)
+    
+    def _send_sse(self, event: Dict[str, Any]):
+        data = json.dumps(event, separators=(',', ':'))
+        self.wfile.write(f"id: {event['seq']}\nevent: {event['type']}\ndata: {data}\n\n".encode('utf-8'))
+        self.wfile.flush()
     
     def _send_json(self, data: Dict, status: int = 200):
         """Send JSON response"""
+        body = json.dumps(data).encode('utf-8')
         self.send_response(status)
         self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
         self.send_header('Access-Control-Allow-Origin', '*')
         self.end_headers()
-        self.wfile.write(json.dumps(data).encode('utf-8'))
+        self.wfile.write(body)
     
     def log_message(self, format, *args):
         """Suppress default logging"""
         pass
 
 
+class ASRAPIServer(http.server.ThreadingHTTPServer):
+    """Threaded API server: a slow request never blocks /status or /events"""
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+def create_api_server(integration: DAWRVASRIntegration, port: int = 8765, host: str = "") -> ASRAPIServer:
+    """Create (but do not start) the HTTP API server"""
+    ASRAPIHandler.integration = integration
+    if ASRAPIHandler.jobs is None:
+        ASRAPIHandler.jobs = ControlJobRunner()
+    get_event_stream()  # SSE clients can attach before the first event
+    return ASRAPIServer((host, port), ASRAPIHandler)
+
+
 def start_api_server(integration: DAWRVASRIntegration, port: int = 8765):
     """Start HTTP API server"""
-    ASRAPIHandler.integration = integration
-    
-    with socketserver.TCPServer(("", port), ASRAPIHandler) as httpd:
+    with create_api_server(integration, port) as httpd:
         logger.info(f"🌐 ASR API server running on port {port}")
         httpd.serve_forever()
 
@@ -544,7 +848,9 @@ def main():
         result = onTranscript(data)
         action = result.get('action', 'unknown')
         command = result.get('command', '')
-        print(f"✅ [{action.upper()}] {command}")
+        intent = result.get('intent')
+        suffix = f"  → {intent['name']} {intent['slots']}" if intent else ""
+        print(f"✅ [{action.upper()}] {command}{suffix}")
     
     def on_partial(text):
         print(f"   ... {text}", end='\r')
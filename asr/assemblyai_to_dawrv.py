@@ -10,7 +10,8 @@ AssemblyAI is known for:
 - Reliable API
 - Good for command recognition
 
-Writes:
+Publishes partial/final/barge-in events on the ASR event stream
+(asr/event_stream.py), whose file sink still writes:
 - /tmp/dawrv_asr_status.json  (partial + final)
 - /tmp/dawrv_voice_command.txt (final only, for compatibility)
 """
@@ -24,10 +25,9 @@ import audioop
 import pyaudio
 from typing import Optional
 
-COMMAND_FILE = "/tmp/dawrv_voice_command.txt"
-STATUS_FILE = "/tmp/dawrv_asr_status.json"
+from event_stream import get_event_stream, COMMAND_FILE, STATUS_FILE, USER_SPEAKING_FILE
+
 SPEAKING_SIGNAL_FILE = "/tmp/rhea_speaking"
-USER_SPEAKING_FILE = "/tmp/dawrv_user_speaking.json"
 
 # Audio settings
 SAMPLE_RATE = 16000
@@ -47,36 +47,28 @@ def _is_rhea_speaking():
 
 
 def _write_user_speaking(rms=0):
-    """Write VAD signal for barge-in detection."""
+    """Publish a barge-in (VAD) event."""
     try:
-        data = {"speaking": True, "timestamp": time.time(), "rms": rms}
-        with open(USER_SPEAKING_FILE, "w") as f:
-            json.dump(data, f)
+        get_event_stream().barge_in(rms)
     except Exception:
         pass
 
 
 def _write_status(text: str, confidence: float, mode: str, is_final: bool):
-    """Write ASR status to JSON file."""
+    """Publish a partial or final transcript event."""
     try:
-        data = {
-            "text": text,
-            "confidence": confidence,
-            "mode": mode,
-            "timestamp": time.time(),
-            "isFinal": is_final
-        }
-        with open(STATUS_FILE, "w") as f:
-            json.dump(data, f)
+        if is_final:
+            _write_final(text, confidence, mode)
+        else:
+            get_event_stream().partial(text, confidence, mode, provider="assemblyai")
     except Exception as e:
         print(f"⚠️ Failed to write status: {e}", file=sys.stderr, flush=True)
 
 
-def _write_command(text: str):
-    """Write final command to text file."""
+def _write_final(text: str, confidence: float, mode: str):
+    """Publish a final command event (file sink keeps the command/status files)."""
     try:
-        with open(COMMAND_FILE, "w") as f:
-            f.write(text.strip() + "\n")
+        get_event_stream().final(text.strip(), confidence, mode, provider="assemblyai")
     except Exception as e:
         print(f"⚠️ Failed to write command: {e}", file=sys.stderr, flush=True)
 
@@ -131,6 +123,7 @@ async def main():
         
         async def send_audio():
             """Send audio chunks to AssemblyAI."""
+            global last_vad_ts
             while True:
                 try:
                     if _is_rhea_speaking():
@@ -144,7 +137,6 @@ async def main():
                         rms = audioop.rms(data, 2)
                         now = time.time()
                         if rms >= VAD_RMS_THRESHOLD and (now - last_vad_ts) >= VAD_MIN_INTERVAL_S:
-                            global last_vad_ts
                             last_vad_ts = now
                             _write_user_speaking(rms=rms)
                     except Exception:
@@ -173,8 +165,7 @@ async def main():
                         confidence = getattr(message, "confidence", 0.85) or 0.85
                         if text.strip():
                             print(f"📝 Transcript: {text}", flush=True)
-                            _write_status(text, confidence, mode, is_final=True)
-                            _write_command(text)
+                            _write_final(text, confidence, mode)
                     elif message.type == "SessionTerminated":
                         print("🔌 AssemblyAI session terminated", flush=True)
                         break
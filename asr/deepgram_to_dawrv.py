@@ -4,7 +4,8 @@ DAWRV Deepgram Streaming Integration
 ===================================
 Hybrid / low-latency STT provider using Deepgram websocket streaming.
 
-Writes:
+Publishes partial/final/barge-in events on the ASR event stream
+(asr/event_stream.py), whose file sink still writes:
 - /tmp/dawrv_asr_status.json  (partial + final)
 - /tmp/dawrv_voice_command.txt (final only, for compatibility)
 
@@ -20,17 +21,23 @@ import asyncio
 import audioop
 from typing import Optional
 
-COMMAND_FILE = "/tmp/dawrv_voice_command.txt"
-STATUS_FILE = "/tmp/dawrv_asr_status.json"
 SPEAKING_SIGNAL_FILE = "/tmp/rhea_speaking"
-USER_SPEAKING_FILE = "/tmp/dawrv_user_speaking.json"
 
+# Stdlib-only helpers next to this script
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from event_stream import get_event_stream, COMMAND_FILE, STATUS_FILE, USER_SPEAKING_FILE
 
-def _load_vocab_keywords(max_keywords: int = 60):
+try:
+    from term_usage import get_usage_tracker
+except ImportError:
+    get_usage_tracker = None
+
+PROFILE_NAME = os.environ.get("DAWRV_ASR_PROFILE", "default")
+
+
+def _load_vocab_terms():
     """
-    Load DAW/REAPER vocabulary keywords to improve Deepgram accuracy.
-    Deepgram supports keyword boosting via `keywords` query param.
-    Returns a list of strings, e.g. ["reaper:2", "mute:2"].
+    Load single-word DAW/REAPER vocabulary terms (lowercased, stable order).
     """
     try:
         here = os.path.dirname(os.path.abspath(__file__))
@@ -68,37 +75,51 @@ def _load_vocab_keywords(max_keywords: int = 60):
                 continue
             seen.add(w)
             uniq.append(w)
-
-        # Apply a mild boost
-        boost = int(os.environ.get("DAWRV_DEEPGRAM_KEYWORD_BOOST", "2"))
-        uniq = uniq[:max_keywords]
-        return [f"{w}:{boost}" for w in uniq]
+        return uniq
     except Exception:
         return []
 
 
-def _write_status(text: str, confidence: float, mode: str, *, is_final: bool):
+def _load_vocab_keywords(max_keywords: int = 60):
+    """
+    Load DAW/REAPER vocabulary keywords to improve Deepgram accuracy.
+    Deepgram supports keyword boosting via `keywords` query param.
+    The budget is filled with the terms this profile actually uses
+    (recency-weighted), then with the remaining vocabulary in order.
+    Returns a list of strings, e.g. ["reaper:2", "mute:2"].
+    """
+    uniq = _load_vocab_terms()
+    if get_usage_tracker is not None:
+        try:
+            uniq = get_usage_tracker(PROFILE_NAME).select(uniq, max_keywords)
+        except Exception:
+            pass
+
+    # Apply a mild boost
+    boost = int(os.environ.get("DAWRV_DEEPGRAM_KEYWORD_BOOST", "2"))
+    uniq = uniq[:max_keywords]
+    return [f"{w}:{boost}" for w in uniq]
+
+
+def _record_term_usage(text: str, terms):
+    """Count vocabulary terms in a final transcript (best-effort)."""
+    if get_usage_tracker is None or not terms:
+        return
     try:
-        payload = {
-            "text": text,
-            "confidence": float(confidence) if confidence is not None else 0.0,
-            "mode": mode,
-            "timestamp": time.time(),
-            "is_final": bool(is_final),
-            "provider": "deepgram",
-        }
-        with open(STATUS_FILE, "w") as f:
-            json.dump(payload, f)
+        get_usage_tracker(PROFILE_NAME).observe(text, terms)
     except Exception:
-        # Don't crash the audio loop for file I/O issues
         pass
 
 
-def _write_command(text: str):
+def _write_status(text: str, confidence: float, mode: str, *, is_final: bool):
     try:
-        with open(COMMAND_FILE, "w") as f:
-            f.write(text)
+        stream = get_event_stream()
+        if is_final:
+            stream.final(text, confidence, mode, provider="deepgram")
+        else:
+            stream.partial(text, confidence, mode, provider="deepgram")
     except Exception:
+        # Don't crash the audio loop for IPC issues
         pass
 
 
@@ -109,15 +130,11 @@ def _is_rhea_speaking() -> bool:
 def _write_user_speaking(*, rms: float):
     """
     Best-effort, low-latency signal used for barge-in.
-    Renderer/main process can poll this file and stop TTS immediately when user speaks.
+    Renderer/main process can subscribe (or poll the file sink) and stop TTS
+    immediately when user speaks.
     """
     try:
-        payload = {
-            "timestamp": time.time(),
-            "rms": float(rms),
-        }
-        with open(USER_SPEAKING_FILE, "w") as f:
-            json.dump(payload, f)
+        get_event_stream().barge_in(rms)
     except Exception:
         pass
 
@@ -249,6 +266,7 @@ async def main():
         sys.exit(1)
 
     # Keyword boosting to improve DAW command recognition
+    vocab_terms = _load_vocab_terms()
     keywords = _load_vocab_keywords(max_keywords=int(os.environ.get("DAWRV_DEEPGRAM_MAX_KEYWORDS", "60")))
 
     # Build options defensively (SDK versions vary in accepted fields)
@@ -304,9 +322,9 @@ async def main():
             _write_status(text, confidence, mode, is_final=False)
             return
 
-        # Final transcript
+        # Final transcript (the file sink also writes the command file)
         _write_status(text, confidence, mode, is_final=True)
-        _write_command(text)
+        _record_term_usage(text, vocab_terms)
 
     def on_error(self, error, **kwargs):
         error_str = str(error) if error else "Unknown error"
@@ -376,6 +394,8 @@ async def main():
             dg.finish()
         except Exception:
             pass
+        if get_usage_tracker is not None:
+            get_usage_tracker(PROFILE_NAME).save()
         try:
             stream.stop_stream()
             stream.close()
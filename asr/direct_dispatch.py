@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+DAWRV Direct Dispatch (fast lane)
+=================================
+Sends high-confidence structured intents straight to REAPER from the ASR
+process over a persistent OSC socket, skipping the command file, the
+main-process poller, the renderer round trip and the per-action
+reaper_bridge.py spawn.
+
+Only a configurable set of slot-less intents is dispatched; everything
+else (and anything that fails to send) takes the normal path. Dispatched
+finals are still published on the event stream, marked "dispatched", so
+the UI shows feedback without executing the command a second time.
+
+Configuration (environment):
+    DAWRV_FAST_LANE=1                  enable (off by default)
+    DAWRV_FAST_LANE_ACTIONS=play,stop  intents eligible for dispatch
+    DAWRV_FAST_LANE_MIN_CONFIDENCE     confidence floor (default 0.85)
+    DAWRV_REAPER_OSC_HOST / _PORT      REAPER OSC target (127.0.0.1:8000)
+
+This module is stdlib-only.
+"""
+
+import os
+import time
+import socket
+import logging
+import threading
+from typing import Optional, Dict, Any, Iterable
+
+logger = logging.getLogger('DAWRV_DirectDispatch')
+
+REAPER_OSC_HOST = os.environ.get("DAWRV_REAPER_OSC_HOST", "127.0.0.1")
+REAPER_OSC_PORT = int(os.environ.get("DAWRV_REAPER_OSC_PORT", "8000"))
+
+# Slot-less intents -> REAPER action IDs (rhea.js reaperActions, except:
+# - gotostart: rhea.js sends Stop (1016), which only returns to the start when
+#   REAPER's "stop moves to start" preference is on; the fast lane uses the
+#   dedicated "Go to start of project" action instead
+# - gotoend: rhea.js sends 40073, which is "Transport: Play/pause" and would
+#   toggle playback; the fast lane uses "Go to end of project" (40043))
+ACTION_IDS: Dict[str, int] = {
+    'play': 1007,
+    'stop': 1016,
+    'pause': 1008,
+    'record': 1013,
+    'rewind': 40042,
+    'fastforward': 1015,
+    'gotostart': 40042,
+    'gotoend': 40043,
+    'loop': 1068,
+    'undo': 40029,
+    'redo': 40030,
+    'save': 40026,
+    'mute': 6,
+    'unmute': 7,
+    'solo': 8,
+    'unsolo': 9,
+    'armtrack': 40294,
+    'disarmtrack': 40294,
+    'armall': 40490,
+    'disarmall': 40491,
+    'newtrack': 40001,
+    'nexttrack': 40285,
+    'previoustrack': 40286,
+}
+
+# Non-toggling transport/edit commands: safe to fire without renderer context
+DEFAULT_FAST_ACTIONS = (
+    'play', 'stop', 'pause', 'record', 'rewind', 'gotostart', 'gotoend', 'undo', 'redo', 'save'
+)
+
+DEFAULT_MIN_CONFIDENCE = 0.85
+
+
+def _osc_pad(data: bytes) -> bytes:
+    return data + b'\x00' * (4 - (len(data) % 4))
+
+
+def osc_action_message(action_id: int) -> bytes:
+    """Encode REAPER's argument-less /action/{id} OSC message"""
+    return _osc_pad(f"/action/{action_id}".encode('ascii')) + b',\x00\x00\x00'
+
+
+class DirectDispatcher:
+    """
+    Maps intents to action IDs and sends precomputed OSC packets over one
+    long-lived UDP socket.
+    """
+
+    def __init__(
+        self,
+        host: str = REAPER_OSC_HOST,
+        port: int = REAPER_OSC_PORT,
+        actions: Iterable[str] = DEFAULT_FAST_ACTIONS,
+        min_confidence: float = DEFAULT_MIN_CONFIDENCE
+    ):
+        """
+        Initialize dispatcher.
+
+        Args:
+            host: REAPER OSC host
+            port: REAPER OSC listen port
+            actions: Intent names eligible for the fast lane
+            min_confidence: Minimum ASR confidence to dispatch
+        """
+        self.address = (host, port)
+        self.min_confidence = min_confidence
+        self.actions = {name for name in actions if name in ACTION_IDS}
+        unknown = set(actions) - self.actions
+        if unknown:
+            logger.warning(f"Fast lane ignores intents without an action ID: {sorted(unknown)}")
+
+        # Packets for fixed action IDs never change; encode them once
+        self._packets: Dict[str, bytes] = {
+            name: osc_action_message(ACTION_IDS[name]) for name in self.actions
+        }
+
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._lock = threading.Lock()
+
+        self.stats = {
+            'dispatched': 0,
+            'skipped': 0,
+            'errors': 0
+        }
+
+    def can_dispatch(self, intent: Optional[Dict[str, Any]], confidence: float) -> bool:
+        return bool(
+            intent
+            and intent.get('name') in self._packets
+            and not intent.get('slots')
+            and confidence >= self.min_confidence
+        )
+
+    def dispatch(self, intent: Optional[Dict[str, Any]], confidence: float) -> Optional[Dict[str, Any]]:
+        """
+        Send an intent to REAPER if it qualifies for the fast lane.
+
+        Args:
+            intent: Intent dict from the intent parser
+            confidence: ASR confidence of the final transcript
+
+        Returns:
+            Dispatch record (intent, action_id, send_us), or None when the
+            intent must take the normal path
+        """
+        if not self.can_dispatch(intent, confidence):
+            self.stats['skipped'] += 1
+            return None
+
+        name = intent['name']
+        start = time.perf_counter()
+        try:
+            with self._lock:
+                self._sock.sendto(self._packets[name], self.address)
+        except OSError as e:
+            self.stats['errors'] += 1
+            logger.warning(f"Fast lane send failed ({name}): {e}")
+            return None
+        send_us = (time.perf_counter() - start) * 1e6
+
+        self.stats['dispatched'] += 1
+        logger.debug(f"⚡ Fast lane: {name} -> action {ACTION_IDS[name]} ({send_us:.0f} µs)")
+        return {
+            'intent': name,
+            'action_id': ACTION_IDS[name],
+            'transport': 'osc',
+            'send_us': round(send_us, 1)
+        }
+
+    def close(self):
+        self._sock.close()
+
+
+# ============================================================================
+# MODULE INTERFACE
+# ============================================================================
+
+_dispatcher_instance: Optional[DirectDispatcher] = None
+_dispatcher_lock = threading.Lock()
+
+
+def fast_lane_enabled() -> bool:
+    return os.environ.get("DAWRV_FAST_LANE", "0").lower() in ("1", "true", "yes", "on")
+
+
+def get_direct_dispatcher() -> Optional[DirectDispatcher]:
+    """Get the process-wide dispatcher (None unless DAWRV_FAST_LANE is set)"""
+    global _dispatcher_instance
+    if not fast_lane_enabled():
+        return None
+    with _dispatcher_lock:
+        if _dispatcher_instance is None:
+            actions_env = os.environ.get("DAWRV_FAST_LANE_ACTIONS")
+            actions = (
+                [a.strip() for a in actions_env.split(",") if a.strip()]
+                if actions_env else DEFAULT_FAST_ACTIONS
+            )
+            _dispatcher_instance = DirectDispatcher(
+                actions=actions,
+                min_confidence=float(os.environ.get(
+                    "DAWRV_FAST_LANE_MIN_CONFIDENCE", str(DEFAULT_MIN_CONFIDENCE)
+                ))
+            )
+        return _dispatcher_instance
+
+
+# ============================================================================
+# LATENCY BENCHMARK
+# ============================================================================
+
+def benchmark(iterations: int = 2000) -> Dict[str, float]:
+    """
+    Transcript-to-packet latency against a local OSC stand-in.
+
+    Times intent parsing + dispatch until the datagram is received by a
+    UDP socket playing REAPER. Speech-end-to-action latency is this plus
+    the decode time.
+
+    Returns:
+        Mean/p50/p99/max milliseconds
+    """
+    try:
+        from .intent_parser import get_intent_parser
+    except ImportError:
+        from intent_parser import get_intent_parser
+
+    stand_in = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    stand_in.bind(("127.0.0.1", 0))
+    stand_in.settimeout(1.0)
+    dispatcher = DirectDispatcher(port=stand_in.getsockname()[1])
+    parser = get_intent_parser()
+    phrases = ["play", "stop", "undo", "go to the start", "save the project"]
+
+    samples = []
+    try:
+        for i in range(iterations):
+            start = time.perf_counter()
+            intent = parser.parse(phrases[i % len(phrases)])
+            record = dispatcher.dispatch(intent.to_dict(), 0.95)
+            if record is None:
+                raise RuntimeError(f"Benchmark phrase was not dispatched: {phrases[i % len(phrases)]}")
+            stand_in.recv(256)
+            samples.append(time.perf_counter() - start)
+    finally:
+        dispatcher.close()
+        stand_in.close()
+
+    samples.sort()
+    n = len(samples)
+    return {
+        "iterations": n,
+        "mean_ms": sum(samples) / n * 1e3,
+        "p50_ms": samples[n // 2] * 1e3,
+        "p99_ms": samples[min(n - 1, int(n * 0.99))] * 1e3,
+        "max_ms": samples[-1] * 1e3,
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+
+    arg_parser = argparse.ArgumentParser(description="DAWRV direct dispatch fast lane")
+    arg_parser.add_argument("--benchmark", action="store_true", help="Measure latency against a local OSC stand-in")
+    arg_parser.add_argument("--iterations", type=int, default=2000, help="Benchmark iterations")
+    arg_parser.add_argument("--send", metavar="INTENT", help="Send one intent to REAPER (e.g. play)")
+    args = arg_parser.parse_args()
+
+    if args.benchmark:
+        res = benchmark(args.iterations)
+        print(f"transcript -> OSC packet received ({res['iterations']} runs)")
+        print(f"mean: {res['mean_ms']:.3f} ms  p50: {res['p50_ms']:.3f} ms  "
+              f"p99: {res['p99_ms']:.3f} ms  max: {res['max_ms']:.3f} ms")
+    elif args.send:
+        sent = DirectDispatcher(actions=[args.send]).dispatch({'name': args.send, 'slots': {}}, 1.0)
+        print(sent or f"'{args.send}' is not a fast-lane intent")
+    else:
+        arg_parser.print_help()
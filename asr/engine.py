@@ -23,6 +23,12 @@ from enum import Enum
 import threading
 from queue import Queue
 
+# Works both as asr.engine and as a script (python asr/engine.py --benchmark-prompt)
+try:
+    from .term_usage import TermUsageTracker, get_usage_tracker
+except ImportError:
+    from term_usage import TermUsageTracker, get_usage_tracker
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -211,7 +217,8 @@ class VocabularyManager:
             terms.extend(category)
         terms.extend(self.aliases.keys())
         terms.extend(self.boost_words)
-        return list(set(terms))
+        # De-dupe but keep a stable order (prompt budgets are filled in order)
+        return list(dict.fromkeys(terms))
     
     def resolve_alias(self, text: str) -> str:
         """Check if text matches an alias and return the action"""
@@ -338,6 +345,9 @@ class DAWRVASREngine:
         self.transcript_log: List[Dict] = []
         self.log_transcripts = True
         
+        # Prompt budget (vocabulary terms in the initial prompt), filled by usage
+        self.prompt_term_budget = int(os.environ.get("DAWRV_PROMPT_TERM_BUDGET", "50"))
+        
         logger.info(f"DAWRV ASR Engine initialized (model={model_size}, device={self.device})")
     
     def _detect_device(self, device: str) -> str:
@@ -389,6 +399,22 @@ class DAWRVASREngine:
             logger.error(f"Failed to load model: {e}")
             raise
     
+    def get_usage_tracker(self) -> TermUsageTracker:
+        """Usage tracker for the active voice profile"""
+        return get_usage_tracker(self.profile_manager.get_active_name())
+    
+    def get_prompt_terms(self, budget: int = None) -> List[str]:
+        """Vocabulary terms for the initial prompt, most-used first"""
+        budget = self.prompt_term_budget if budget is None else budget
+        return self.get_usage_tracker().select(self.vocab_manager.get_all_terms(), budget)
+    
+    def record_accepted_transcript(self, transcript: str) -> List[str]:
+        """
+        Count vocabulary terms in an accepted (executed/confirmed) transcript
+        so future prompts prefer them.
+        """
+        return self.get_usage_tracker().observe(transcript, self.vocab_manager.get_all_terms())
+    
     def set_mode(self, mode: ASRMode):
         """Set the operating mode"""
         self.mode = mode
@@ -503,7 +529,7 @@ class DAWRVASREngine:
         """Transcribe using faster-whisper backend"""
         
         # Get vocabulary for prompting
-        vocab_prompt = " ".join(self.vocab_manager.get_all_terms()[:50])
+        vocab_prompt = " ".join(self.get_prompt_terms())
         
         segments_gen, info = self._model.transcribe(
             audio,
@@ -576,7 +602,7 @@ class DAWRVASREngine:
         """Transcribe using standard whisper backend"""
         
         # Get vocabulary for prompting
-        vocab_prompt = " ".join(self.vocab_manager.get_all_terms()[:50])
+        vocab_prompt = " ".join(self.get_prompt_terms())
         
         result = self._model.transcribe(
             audio,
@@ -712,6 +738,58 @@ def transcribe(audio: np.ndarray, **kwargs) -> TranscriptResult:
     return engine.transcribe(audio, **kwargs)
 
 
+def benchmark_prompt_budget(
+    engine: DAWRVASREngine,
+    audio: np.ndarray,
+    budgets: List[int] = None,
+    runs: int = 5
+) -> List[Dict[str, Any]]:
+    """
+    Measure decode latency against prompt length.
+    
+    Args:
+        engine: ASR engine (model is loaded if needed)
+        audio: Audio to decode repeatedly (float32, 16kHz)
+        budgets: Prompt term budgets to try
+        runs: Decodes per budget (after one warm-up)
+    
+    Returns:
+        One row per budget with prompt size and latency stats (ms)
+    """
+    budgets = budgets or [0, 10, 20, 30, 50, 80]
+    engine.load_model()
+    
+    original_budget = engine.prompt_term_budget
+    original_logging = engine.log_transcripts
+    engine.log_transcripts = False
+    rows = []
+    try:
+        engine.transcribe(audio)  # warm-up
+        for budget in budgets:
+            engine.prompt_term_budget = budget
+            prompt = " ".join(engine.get_prompt_terms())
+            latencies = []
+            transcript = ""
+            for _ in range(max(1, runs)):
+                start = time.perf_counter()
+                result = engine.transcribe(audio)
+                latencies.append((time.perf_counter() - start) * 1000)
+                transcript = result.transcript
+            rows.append({
+                "budget": budget,
+                "prompt_chars": len(prompt),
+                "prompt_words": len(prompt.split()),
+                "mean_ms": float(np.mean(latencies)),
+                "p50_ms": float(np.percentile(latencies, 50)),
+                "max_ms": float(np.max(latencies)),
+                "transcript": transcript
+            })
+    finally:
+        engine.prompt_term_budget = original_budget
+        engine.log_transcripts = original_logging
+    return rows
+
+
 # ============================================================================
 # CLI INTERFACE
 # ============================================================================
@@ -723,12 +801,30 @@ if __name__ == "__main__":
     parser.add_argument("--model", default="base", help="Whisper model size")
     parser.add_argument("--device", default="auto", help="Device (cpu, cuda, mps, auto)")
     parser.add_argument("--test", action="store_true", help="Run test transcription")
+    parser.add_argument("--benchmark-prompt", action="store_true", help="Benchmark decode latency vs prompt budget")
+    parser.add_argument("--audio", default=None, help="WAV file for --benchmark-prompt (default: 2s noise)")
+    parser.add_argument("--runs", type=int, default=5, help="Decodes per budget for --benchmark-prompt")
     
     args = parser.parse_args()
     
     engine = DAWRVASREngine(model_size=args.model, device=args.device)
     
-    if args.test:
+    if args.benchmark_prompt:
+        if args.audio:
+            import soundfile as sf
+            bench_audio, _ = sf.read(args.audio, dtype="float32")
+            if bench_audio.ndim > 1:
+                bench_audio = bench_audio.mean(axis=1)
+        else:
+            bench_audio = (np.random.randn(32000) * 0.01).astype(np.float32)
+        
+        print(f"{'budget':>6} {'words':>6} {'chars':>6} {'mean ms':>9} {'p50 ms':>8} {'max ms':>8}")
+        for row in benchmark_prompt_budget(engine, bench_audio, runs=args.runs):
+            print(
+                f"{row['budget']:>6} {row['prompt_words']:>6} {row['prompt_chars']:>6} "
+                f"{row['mean_ms']:>9.1f} {row['p50_ms']:>8.1f} {row['max_ms']:>8.1f}  {row['transcript']!r}"
+            )
+    elif args.test:
         # Generate test audio (silence)
         test_audio = np.zeros(16000, dtype=np.float32)
         result = engine.transcribe(test_audio)
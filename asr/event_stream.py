@@ -0,0 +1,495 @@
+#!/usr/bin/env python3
+"""
+DAWRV ASR Event Stream
+======================
+Sequenced ASR events over a UNIX domain socket, replacing the
+"overwrite a file in /tmp and let Electron poll it" IPC.
+
+Protocol (JSON lines, one event per line):
+    {"seq": 42, "type": "final", "session": "...", "ts": 1700000000.12,
+     "text": "play", "confidence": 0.93, "mode": "command", "provider": "local"}
+
+Event types:
+- partial   live text, never executed
+- final     executed command text
+- status    ASR state changes (listening, paused, stopped, ...)
+- barge_in  user started speaking (RMS) while RHEA may be talking
+
+Subscribers connect to DAWRV_EVENT_SOCKET (default /tmp/dawrv_asr_events.sock)
+and may send one optional hello line within HELLO_TIMEOUT_S:
+    {"since": 41}    replay buffered events with seq > 41, then go live
+    {"replay": 10}   replay the last 10 buffered events, then go live
+Without a hello the subscriber only receives live events.
+
+The legacy files (/tmp/dawrv_voice_command.txt, /tmp/dawrv_asr_status.json,
+/tmp/dawrv_user_speaking.json) are still written by the optional FileSink,
+now atomically (temp file + rename), so existing pollers keep working.
+
+This module is stdlib-only so provider scripts can import it directly.
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import logging
+import threading
+from collections import deque
+from queue import Queue, Full, Empty
+from typing import Optional, Dict, List, Any, Callable, Iterator, Tuple
+
+logger = logging.getLogger('DAWRV_EventStream')
+
+EVENT_SOCKET_PATH = os.environ.get("DAWRV_EVENT_SOCKET", "/tmp/dawrv_asr_events.sock")
+COMMAND_FILE = '/tmp/dawrv_voice_command.txt'
+STATUS_FILE = '/tmp/dawrv_asr_status.json'
+USER_SPEAKING_FILE = '/tmp/dawrv_user_speaking.json'
+
+HELLO_TIMEOUT_S = 0.25
+SUBSCRIBER_QUEUE_SIZE = 1024
+
+
+def _atomic_write(path: str, data: str):
+    """Write a whole file so readers never see a partial write"""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+# ============================================================================
+# FILE SINK (compatibility)
+# ============================================================================
+
+class FileSink:
+    """
+    Mirrors events into the legacy /tmp files for pollers that have not
+    moved to the socket yet.
+    """
+
+    def __init__(
+        self,
+        command_file: str = COMMAND_FILE,
+        status_file: str = STATUS_FILE,
+        user_speaking_file: str = USER_SPEAKING_FILE
+    ):
+        self.command_file = command_file
+        self.status_file = status_file
+        self.user_speaking_file = user_speaking_file
+
+    def __call__(self, event: Dict[str, Any]):
+        try:
+            event_type = event.get("type")
+            if event_type in ("partial", "final"):
+                status = {
+                    "text": event.get("text", ""),
+                    "confidence": event.get("confidence", 0.0),
+                    "mode": event.get("mode", "command"),
+                    "timestamp": event.get("ts", time.time()),
+                    "is_final": event_type == "final",
+                    "provider": event.get("provider", "local"),
+                    "seq": event.get("seq"),
+                }
+                if event.get("intent") is not None:
+                    status["intent"] = event["intent"]
+                if event.get("dispatched"):
+                    status["dispatched"] = event["dispatched"]
+                # Already executed by the fast lane: status (feedback) only
+                if event_type == "final" and not event.get("dispatched"):
+                    _atomic_write(self.command_file, event.get("text", ""))
+                _atomic_write(self.status_file, json.dumps(status))
+            elif event_type == "barge_in":
+                payload = {
+                    "speaking": True,
+                    "timestamp": event.get("ts", time.time()),
+                    "rms": event.get("rms", 0.0),
+                }
+                _atomic_write(self.user_speaking_file, json.dumps(payload))
+        except Exception as e:
+            logger.error(f"File sink error: {e}")
+
+
+# ============================================================================
+# EVENT STREAM SERVER
+# ============================================================================
+
+class _Subscriber:
+    """One subscriber (socket client or in-process) with its own bounded queue"""
+
+    def __init__(self, conn: Optional[socket.socket] = None):
+        self.conn = conn
+        self.queue: Queue = Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self.alive = True
+
+
+class ASREventStream:
+    """
+    Publishes sequenced ASR events to any number of UNIX-socket subscribers.
+
+    publish() never blocks on a subscriber: each one has its own queue and
+    writer thread, and a subscriber that falls SUBSCRIBER_QUEUE_SIZE events
+    behind is disconnected (it can reconnect with {"since": last_seq}).
+    """
+
+    def __init__(
+        self,
+        socket_path: str = EVENT_SOCKET_PATH,
+        replay_size: int = 64,
+        file_sink: bool = True
+    ):
+        """
+        Initialize event stream.
+
+        Args:
+            socket_path: UNIX socket path to listen on
+            replay_size: Number of recent events kept for replay
+            file_sink: Also mirror events into the legacy /tmp files
+        """
+        self.socket_path = socket_path
+        self.session = f"{os.getpid()}-{int(time.time() * 1000)}"
+        self.seq = 0
+        self.replay: deque = deque(maxlen=replay_size)
+        self.sinks: List[Callable[[Dict[str, Any]], None]] = []
+        if file_sink:
+            self.sinks.append(FileSink())
+
+        self._subscribers: List[_Subscriber] = []
+        self._lock = threading.Lock()
+        self._server: Optional[socket.socket] = None
+        self._accept_thread: Optional[threading.Thread] = None
+        self.is_running = False
+
+        self.stats = {
+            'published': 0,
+            'subscribers_total': 0,
+            'subscribers_dropped': 0
+        }
+
+    # ------------------------------------------------------------------
+    # Server lifecycle
+    # ------------------------------------------------------------------
+
+    def start(self) -> bool:
+        """Start listening on the UNIX socket (False if unavailable)"""
+        if self.is_running:
+            return True
+
+        # Another live publisher already owns the socket: stay file-only
+        if os.path.exists(self.socket_path):
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                probe.connect(self.socket_path)
+                logger.warning(f"Event socket already in use: {self.socket_path}")
+                return False
+            except OSError:
+                os.unlink(self.socket_path)  # stale socket from a crashed process
+            finally:
+                probe.close()
+
+        try:
+            server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            server.bind(self.socket_path)
+            server.listen(8)
+        except OSError as e:
+            logger.error(f"Could not open event socket {self.socket_path}: {e}")
+            return False
+
+        self._server = server
+        self.is_running = True
+        self._accept_thread = threading.Thread(target=self._accept_loop, daemon=True)
+        self._accept_thread.start()
+        logger.info(f"📡 ASR event stream on {self.socket_path}")
+        return True
+
+    def stop(self):
+        """Stop the server and disconnect all subscribers"""
+        if not self.is_running:
+            return
+        self.is_running = False
+
+        try:
+            self._server.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        try:
+            self._server.close()
+        except OSError:
+            pass
+        if self._accept_thread:
+            self._accept_thread.join(timeout=1.0)
+            self._accept_thread = None
+        try:
+            os.unlink(self.socket_path)
+        except OSError:
+            pass
+
+        with self._lock:
+            subscribers = list(self._subscribers)
+            self._subscribers = []
+        for sub in subscribers:
+            self._drop(sub)
+
+    def _accept_loop(self):
+        while self.is_running:
+            try:
+                conn, _ = self._server.accept()
+            except OSError:
+                break
+
+            sub = _Subscriber(conn)
+            with self._lock:
+                # Snapshot + register under one lock: no gaps, no duplicates
+                backlog = list(self.replay)
+                self._subscribers.append(sub)
+                self.stats['subscribers_total'] += 1
+
+            threading.Thread(target=self._serve, args=(sub, backlog), daemon=True).start()
+
+    def _read_hello(self, conn: socket.socket) -> Dict[str, Any]:
+        conn.settimeout(HELLO_TIMEOUT_S)
+        try:
+            data = b""
+            while b"\n" not in data and len(data) < 4096:
+                chunk = conn.recv(4096)
+                if not chunk:
+                    break
+                data += chunk
+            line = data.split(b"\n", 1)[0].strip()
+            return json.loads(line) if line else {}
+        except (socket.timeout, ValueError, OSError):
+            return {}
+        finally:
+            conn.settimeout(None)
+
+    @staticmethod
+    def _select_replay(backlog: List[Dict[str, Any]], since: int = None, replay: int = None) -> List[Dict[str, Any]]:
+        if since is not None:
+            return [e for e in backlog if e["seq"] > since]
+        if replay:
+            return backlog[-max(0, replay):]
+        return []
+
+    def _serve(self, sub: _Subscriber, backlog: List[Dict[str, Any]]):
+        hello = self._read_hello(sub.conn)
+        try:
+            since = int(hello["since"]) if "since" in hello else None
+            count = int(hello["replay"]) if "replay" in hello else None
+        except (TypeError, ValueError):
+            since, count = None, None
+        replay = self._select_replay(backlog, since, count)
+
+        try:
+            for event in replay:
+                sub.conn.sendall(self._encode(event))
+            while sub.alive and self.is_running:
+                try:
+                    event = sub.queue.get(timeout=0.5)
+                except Empty:
+                    continue
+                sub.conn.sendall(self._encode(event))
+        except OSError:
+            pass
+        finally:
+            self._drop(sub)
+
+    def _drop(self, sub: _Subscriber):
+        sub.alive = False
+        with self._lock:
+            if sub in self._subscribers:
+                self._subscribers.remove(sub)
+        if sub.conn is None:
+            return
+        try:
+            sub.conn.close()
+        except OSError:
+            pass
+
+    def attach(self, since: int = None, replay: int = None) -> Tuple[_Subscriber, List[Dict[str, Any]]]:
+        """
+        Subscribe in-process (e.g. the HTTP API's SSE endpoint).
+
+        Returns:
+            (subscriber, replayed events); read live events from
+            subscriber.queue while subscriber.alive, then call detach()
+        """
+        sub = _Subscriber()
+        with self._lock:
+            backlog = list(self.replay)
+            self._subscribers.append(sub)
+            self.stats['subscribers_total'] += 1
+        return sub, self._select_replay(backlog, since, replay)
+
+    def detach(self, sub: _Subscriber):
+        """Remove an in-process subscriber"""
+        self._drop(sub)
+
+    @staticmethod
+    def _encode(event: Dict[str, Any]) -> bytes:
+        return (json.dumps(event, separators=(',', ':')) + "\n").encode('utf-8')
+
+    # ------------------------------------------------------------------
+    # Publishing
+    # ------------------------------------------------------------------
+
+    def publish(self, event_type: str, **fields) -> Dict[str, Any]:
+        """
+        Publish an event to all subscribers and sinks.
+
+        Returns:
+            The event as sent (with seq, session and ts filled in)
+        """
+        with self._lock:
+            self.seq += 1
+            event = {
+                "seq": self.seq,
+                "type": event_type,
+                "session": self.session,
+                "ts": time.time(),
+                **fields
+            }
+            self.replay.append(event)
+            self.stats['published'] += 1
+
+            slow = []
+            for sub in self._subscribers:
+                try:
+                    sub.queue.put_nowait(event)
+                except Full:
+                    slow.append(sub)
+
+        for sub in slow:
+            logger.warning("Dropping slow event subscriber")
+            self.stats['subscribers_dropped'] += 1
+            self._drop(sub)
+
+        for sink in self.sinks:
+            sink(event)
+
+        return event
+
+    def partial(self, text: str, confidence: float, mode: str, provider: str = "local") -> Dict[str, Any]:
+        return self.publish(
+            "partial", text=text, confidence=float(confidence or 0.0), mode=mode, provider=provider
+        )
+
+    def final(self, text: str, confidence: float, mode: str, provider: str = "local", **fields) -> Dict[str, Any]:
+        return self.publish(
+            "final", text=text, confidence=float(confidence or 0.0), mode=mode, provider=provider, **fields
+        )
+
+    def status(self, state: str, **fields) -> Dict[str, Any]:
+        return self.publish("status", state=state, **fields)
+
+    def barge_in(self, rms: float) -> Dict[str, Any]:
+        return self.publish("barge_in", rms=float(rms))
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            subscribers = len(self._subscribers)
+        return {
+            **self.stats,
+            'is_running': self.is_running,
+            'socket_path': self.socket_path,
+            'seq': self.seq,
+            'subscribers': subscribers
+        }
+
+
+# ============================================================================
+# SUBSCRIBER CLIENT
+# ============================================================================
+
+def subscribe(
+    socket_path: str = EVENT_SOCKET_PATH,
+    since: int = None,
+    replay: int = None,
+    timeout: float = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Iterate over events from a running ASR event stream.
+
+    Args:
+        socket_path: UNIX socket path
+        since: Replay buffered events after this seq
+        replay: Replay the last N buffered events
+        timeout: Socket read timeout (None = block forever)
+    """
+    conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    conn.connect(socket_path)
+    conn.settimeout(timeout)
+    try:
+        if since is not None:
+            conn.sendall(json.dumps({"since": since}).encode('utf-8') + b"\n")
+        elif replay is not None:
+            conn.sendall(json.dumps({"replay": replay}).encode('utf-8') + b"\n")
+
+        buffer = b""
+        while True:
+            chunk = conn.recv(65536)
+            if not chunk:
+                return
+            buffer += chunk
+            while b"\n" in buffer:
+                line, buffer = buffer.split(b"\n", 1)
+                if line.strip():
+                    yield json.loads(line)
+    finally:
+        conn.close()
+
+
+# ============================================================================
+# MODULE INTERFACE
+# ============================================================================
+
+def _shared_status_sink():
+    # Imported lazily; works both as asr.event_stream and as a script-local module
+    try:
+        from .shm_status import SharedStatusSink
+    except ImportError:
+        from shm_status import SharedStatusSink
+    return SharedStatusSink()
+
+
+_stream_instance: Optional[ASREventStream] = None
+_stream_lock = threading.Lock()
+
+
+def get_event_stream() -> ASREventStream:
+    """
+    Get (and start) the process-wide event stream.
+
+    DAWRV_EVENT_FILE_SINK=0 disables the legacy /tmp file mirror.
+    DAWRV_SHM_STATUS=0 disables the shared-memory status block mirror.
+    """
+    global _stream_instance
+    with _stream_lock:
+        if _stream_instance is None:
+            file_sink = os.environ.get("DAWRV_EVENT_FILE_SINK", "1") != "0"
+            replay_size = int(os.environ.get("DAWRV_EVENT_REPLAY", "64"))
+            _stream_instance = ASREventStream(replay_size=replay_size, file_sink=file_sink)
+            if os.environ.get("DAWRV_SHM_STATUS", "1") != "0":
+                try:
+                    _stream_instance.sinks.append(_shared_status_sink())
+                except Exception as e:
+                    logger.error(f"Shared status block unavailable: {e}")
+            _stream_instance.start()
+        return _stream_instance
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="DAWRV ASR event stream subscriber")
+    parser.add_argument("--socket", default=EVENT_SOCKET_PATH, help="Event socket path")
+    parser.add_argument("--replay", type=int, default=10, help="Replay last N events on connect")
+    args = parser.parse_args()
+
+    try:
+        for ev in subscribe(args.socket, replay=args.replay):
+            print(json.dumps(ev), flush=True)
+    except (ConnectionRefusedError, FileNotFoundError):
+        print(f"❌ No ASR event stream at {args.socket}", file=sys.stderr)
+        sys.exit(1)
+    except KeyboardInterrupt:
+        pass
@@ -4,7 +4,8 @@ DAWRV Gemini 2.5 Audio Integration
 ===================================
 STT provider using Google Gemini 2.5 Audio API.
 
-Writes:
+Publishes partial/final/barge-in events on the ASR event stream
+(asr/event_stream.py), whose file sink still writes:
 - /tmp/dawrv_asr_status.json  (partial + final)
 - /tmp/dawrv_voice_command.txt (final only, for compatibility)
 
@@ -23,10 +24,9 @@ import wave
 import tempfile
 from typing import Optional
 
-COMMAND_FILE = "/tmp/dawrv_voice_command.txt"
-STATUS_FILE = "/tmp/dawrv_asr_status.json"
+from event_stream import get_event_stream, COMMAND_FILE, STATUS_FILE, USER_SPEAKING_FILE
+
 SPEAKING_SIGNAL_FILE = "/tmp/rhea_speaking"
-USER_SPEAKING_FILE = "/tmp/dawrv_user_speaking.json"
 
 # Audio settings
 SAMPLE_RATE = 16000
@@ -52,36 +52,28 @@ def _is_rhea_speaking():
 
 
 def _write_user_speaking(rms=0):
-    """Write VAD signal for barge-in detection."""
+    """Publish a barge-in (VAD) event."""
     try:
-        data = {"speaking": True, "timestamp": time.time(), "rms": rms}
-        with open(USER_SPEAKING_FILE, "w") as f:
-            json.dump(data, f)
+        get_event_stream().barge_in(rms)
     except Exception:
         pass
 
 
 def _write_status(text: str, confidence: float, mode: str, is_final: bool):
-    """Write ASR status to JSON file."""
+    """Publish a partial or final transcript event."""
     try:
-        data = {
-            "text": text,
-            "confidence": confidence,
-            "mode": mode,
-            "timestamp": time.time(),
-            "isFinal": is_final
-        }
-        with open(STATUS_FILE, "w") as f:
-            json.dump(data, f)
+        if is_final:
+            _write_final(text, confidence, mode)
+        else:
+            get_event_stream().partial(text, confidence, mode, provider="gemini")
     except Exception as e:
         print(f"⚠️ Failed to write status: {e}", file=sys.stderr, flush=True)
 
 
-def _write_command(text: str):
-    """Write final command to text file."""
+def _write_final(text: str, confidence: float, mode: str):
+    """Publish a final command event (file sink keeps the command/status files)."""
     try:
-        with open(COMMAND_FILE, "w") as f:
-            f.write(text.strip() + "\n")
+        get_event_stream().final(text.strip(), confidence, mode, provider="gemini")
     except Exception as e:
         print(f"⚠️ Failed to write command: {e}", file=sys.stderr, flush=True)
 
@@ -237,8 +229,7 @@ def main():
                                         
                                         if transcript:
                                             # Write final transcript
-                                            _write_status(transcript, confidence, mode, is_final=True)
-                                            _write_command(transcript)
+                                            _write_final(transcript, confidence, mode)
                                             print(f"📝 Transcript: {transcript}", flush=True)
                                         else:
                                             print("⚠️ No transcript returned", flush=True)
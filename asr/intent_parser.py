@@ -0,0 +1,646 @@
+#!/usr/bin/env python3
+"""
+DAWRV/Rhea Intent Parser
+========================
+Compiled intent grammar for DAW voice commands, run in the ASR process so
+finals reach the renderer as structured intents instead of raw text.
+
+The grammar is a declarative list of (intent, patterns). Patterns use a
+small syntax:
+    word            literal word
+    (a|b c)         alternatives
+    [the]           optional part (may nest)
+    {bar:int}       slot; types: int, num (signed/decimal) or a|b|c choices
+
+All patterns are compiled into ONE anchored regex with a named group per
+rule, so a parse is: normalize -> one regex match -> slot conversion.
+Number words are normalized first ("track twelve" -> "track 12",
+"minus six db" -> "-6 db", "one hundred and twenty" -> "120").
+
+Intent names follow the renderer's reaperActions keys (rhea.js).
+
+This module is stdlib-only.
+"""
+
+import re
+import sys
+import json
+import time
+import random
+import logging
+import threading
+from dataclasses import dataclass, field, asdict
+from typing import Optional, Dict, List, Tuple, Any, Iterable
+
+logger = logging.getLogger('DAWRV_IntentParser')
+
+
+# ============================================================================
+# GRAMMAR
+# ============================================================================
+
+_RANGE = "(to|through|thru|until)"
+_DB = "(db|decibels|decibel)"
+
+# Order matters only for ambiguous matches: earlier rules win.
+GRAMMAR: List[Tuple[str, Tuple[str, ...]]] = [
+    # Bars
+    ("loopbars", (
+        "loop bars {bar_start:int} " + _RANGE + " {bar_end:int}",
+        "loop [from] bar {bar_start:int} " + _RANGE + " [bar] {bar_end:int}",
+        "set [the] loop [from] [bar] {bar_start:int} " + _RANGE + " [bar] {bar_end:int}",
+    )),
+    ("playfrombar", (
+        "play (from|at) bar {bar:int}",
+        "start (playing|playback) (from|at) bar {bar:int}",
+    )),
+    ("gotobar", (
+        "(go|jump|skip|move) to bar {bar:int}",
+        "bar {bar:int}",
+    )),
+    ("setpunchin", ("[set] punch in [at] bar {bar:int}",)),
+    ("setpunchout", ("[set] punch out [at] bar {bar:int}",)),
+
+    # Specific tracks (single track or range)
+    ("mutetrack", (
+        "mute tracks {track_start:int} " + _RANGE + " {track_end:int}",
+        "mute track {track:int}",
+    )),
+    ("unmutetrack", (
+        "unmute tracks {track_start:int} " + _RANGE + " {track_end:int}",
+        "unmute track {track:int}",
+    )),
+    ("solotrack", (
+        "solo tracks {track_start:int} " + _RANGE + " {track_end:int}",
+        "solo track {track:int}",
+    )),
+    ("unsolotrack", (
+        "unsolo tracks {track_start:int} " + _RANGE + " {track_end:int}",
+        "unsolo track {track:int}",
+    )),
+    ("armtracknum", (
+        "[record] arm tracks {track_start:int} " + _RANGE + " {track_end:int}",
+        "[record] arm track {track:int}",
+    )),
+    ("selecttrack", (
+        "select tracks {track_start:int} " + _RANGE + " {track_end:int}",
+        "(select|go to) track {track:int}",
+    )),
+    ("settrackvolume", (
+        "set track {track:int} volume to {db:num} [" + _DB + "]",
+        "set [the] volume (of|on) track {track:int} to {db:num} [" + _DB + "]",
+        "track {track:int} volume {db:num} [" + _DB + "]",
+    )),
+    ("settrackpan", (
+        "pan track {track:int} [to] [the] {direction:center|centre}",
+        "pan track {track:int} {percent:num} percent [to] [the] {direction:left|right}",
+        "pan track {track:int} [to] [the] {direction:left|right} [{percent:num} percent]",
+    )),
+
+    # Tempo
+    ("settempo", (
+        "(set|change) [the] tempo to {bpm:num} [bpm|beats per minute]",
+        "tempo {bpm:num} [bpm]",
+        "{bpm:num} bpm",
+    )),
+    ("increasetempo", (
+        "(increase|raise) [the] tempo [by {amount:num} [bpm]]",
+        "speed (up|it up) [by {amount:num} [bpm]]",
+        "faster",
+    )),
+    ("decreasetempo", (
+        "(decrease|lower|reduce) [the] tempo [by {amount:num} [bpm]]",
+        "slow (down|it down) [by {amount:num} [bpm]]",
+        "slower",
+    )),
+    ("gettempo", (
+        "(whats|what is) the tempo",
+        "(get|show) [the] tempo",
+    )),
+
+    # Volume (selected track / master)
+    ("setvolume", (
+        "set [the] volume to {db:num} [" + _DB + "]",
+        "volume {db:num} " + _DB,
+    )),
+    ("volume_up", (
+        "(turn|bring) [it|the volume] up [by] [{db_amount:num} " + _DB + "]",
+        "(raise|increase) [the] volume [by {db_amount:num} " + _DB + "]",
+        "volume up [by] [{db_amount:num} " + _DB + "]",
+        "louder",
+    )),
+    ("volume_down", (
+        "(turn|bring) [it|the volume] down [by] [{db_amount:num} " + _DB + "]",
+        "(lower|decrease|reduce) [the] volume [by {db_amount:num} " + _DB + "]",
+        "volume down [by] [{db_amount:num} " + _DB + "]",
+        "quieter",
+    )),
+
+    # Pan (selected track)
+    ("pan", (
+        "pan [it] [to] [the] {direction:center|centre}",
+        "pan [it] {percent:num} percent [to] [the] {direction:left|right}",
+        "pan [it] [to] [the] {direction:left|right} [{percent:num} percent]",
+    )),
+
+    # Mode switches
+    ("mode_dictation", (
+        "(dictation|dictate) mode",
+        "(switch|go) to dictation [mode]",
+        "start dictation",
+    )),
+    ("mode_command", (
+        "command mode",
+        "(switch|go) to command [mode]",
+        "stop dictation",
+    )),
+
+    # Track control (selected track)
+    ("armall", ("arm all [tracks]",)),
+    ("disarmall", ("(disarm|unarm) all [tracks]",)),
+    ("mute", ("mute [the] [selected] [track]",)),
+    ("unmute", ("unmute [the] [selected] [track]",)),
+    ("solo", ("solo [the] [selected] [track]",)),
+    ("unsolo", ("unsolo [the] [selected] [track]",)),
+    ("armtrack", ("[record] arm [the] [selected] track",)),
+    ("disarmtrack", ("(disarm|unarm) [the] [selected] track",)),
+    ("newtrack", ("(new|add [a]|create [a]) track", "insert [a] [new] track")),
+    ("nexttrack", ("next track",)),
+    ("previoustrack", ("(previous|last) track",)),
+
+    # Transport
+    ("play", ("play", "start playback", "start playing", "resume [playback]")),
+    ("stop", ("stop", "stop playback", "stop playing", "stop recording")),
+    ("pause", ("pause", "pause playback")),
+    ("record", ("record", "start recording")),
+    ("rewind", ("rewind",)),
+    ("fastforward", ("fast forward",)),
+    ("gotostart", ("(go|jump|return|back) to [the] (start|beginning)",)),
+    ("gotoend", ("(go|jump|skip) to [the] end",)),
+    ("loop", ("loop", "toggle loop", "loop (on|off)", "(enable|disable) loop")),
+    ("undo", ("undo [that]",)),
+    ("redo", ("redo [that]",)),
+    ("save", ("save [the] [project]",)),
+]
+
+# Wake word / politeness around any command
+_PREFIX = r"(?:(?:hey |ok |okay )?(?:rhea |reaper )?)(?:please )?(?:(?:can|could|would) you )?"
+_SUFFIX = r"(?:please |now |for me )*"
+
+
+# ============================================================================
+# NUMBER NORMALIZATION
+# ============================================================================
+
+_UNITS = {
+    "zero": 0, "one": 1, "two": 2, "three": 3, "four": 4, "five": 5,
+    "six": 6, "seven": 7, "eight": 8, "nine": 9, "ten": 10, "eleven": 11,
+    "twelve": 12, "thirteen": 13, "fourteen": 14, "fifteen": 15,
+    "sixteen": 16, "seventeen": 17, "eighteen": 18, "nineteen": 19,
+}
+_TENS = {
+    "twenty": 20, "thirty": 30, "forty": 40, "fifty": 50,
+    "sixty": 60, "seventy": 70, "eighty": 80, "ninety": 90,
+}
+_SCALES = {"hundred": 100, "thousand": 1000}
+_SIGNS = {"minus": "-", "negative": "-", "plus": "", "positive": ""}
+
+_TOKEN_RE = re.compile(r"[-+]?\d+(?:\.\d+)?|[a-z]+|-")
+# "3-7", "3 - 7", "three-five", "twenty-one": the dash becomes its own token
+_DASH_RE = re.compile(r"(?<=\d)\s*-\s*(?=\d)|(?<=[a-z0-9])-(?=[a-z0-9])")
+_UNIT_SUFFIX_RE = re.compile(r"(\d)(db|bpm|%)\b")
+
+
+def _is_number_word(token: str) -> bool:
+    return token in _UNITS or token in _TENS
+
+
+def _is_number_start(token: str) -> bool:
+    return _is_number_word(token) or token[0].isdigit() or (len(token) > 1 and token[0] in "+-")
+
+
+def _read_number(tokens: List[str], i: int) -> Tuple[Optional[str], int]:
+    """
+    Read one spoken number starting at tokens[i].
+
+    Returns:
+        (digits string, index after the number), or (None, i) if no number
+    """
+    token = tokens[i]
+    if token[0].isdigit() or token[0] in "+-":
+        if token[0] == "+":
+            token = token[1:]
+        return token, i + 1
+    if not _is_number_word(token):
+        return None, i
+
+    total = 0
+    current = 0
+    last = None  # "unit", "teen", "tens", "scale"
+    n = len(tokens)
+    while i < n:
+        token = tokens[i]
+        if token in _TENS and last in (None, "scale"):
+            current += _TENS[token]
+            last = "tens"
+        elif token == "-" and last == "tens" and i + 1 < n and tokens[i + 1] in _UNITS and 0 < _UNITS[tokens[i + 1]] < 10:
+            pass  # "twenty-one"
+        elif last == "unit" and current < 10 and (token in _TENS or (token in _UNITS and _UNITS[token] >= 10)):
+            # "one twenty" -> 120, "one fifteen" -> 115 (tempos are spoken this way)
+            current *= 100
+            last = "scale"
+            continue
+        elif token in _UNITS and (last in (None, "scale") or (last == "tens" and _UNITS[token] < 10)):
+            current += _UNITS[token]
+            last = "teen" if _UNITS[token] >= 10 else "unit"
+        elif token in _SCALES and last in ("unit", "teen", "tens"):
+            scale = _SCALES[token]
+            if scale == 100:
+                current *= 100
+            else:
+                total += current * scale
+                current = 0
+            last = "scale"
+        elif token == "and" and last == "scale" and i + 1 < n and _is_number_word(tokens[i + 1]):
+            pass
+        else:
+            break
+        i += 1
+
+    value = str(total + current)
+
+    # "three point five" -> 3.5 (one digit word per decimal place)
+    if i + 1 < n and tokens[i] == "point" and tokens[i + 1] in _UNITS and _UNITS[tokens[i + 1]] < 10:
+        decimals = []
+        i += 1
+        while i < n and tokens[i] in _UNITS and _UNITS[tokens[i]] < 10:
+            decimals.append(str(_UNITS[tokens[i]]))
+            i += 1
+        value = f"{value}.{''.join(decimals)}"
+
+    return value, i
+
+
+def normalize(text: str) -> str:
+    """
+    Lowercase, strip punctuation and turn spoken numbers into digits.
+
+    "Mute tracks three-five" -> "mute tracks 3 to 5"
+    "Set track twelve volume to minus six dB" -> "set track 12 volume to -6 db"
+    "Tempo one twenty" -> "tempo 120"
+    """
+    text = (text or "").lower().replace("'", "").replace("%", " percent")
+    text = _DASH_RE.sub(" - ", text)
+    text = _UNIT_SUFFIX_RE.sub(r"\1 \2", text)
+    tokens = _TOKEN_RE.findall(text)
+
+    out: List[str] = []
+    i = 0
+    n = len(tokens)
+    while i < n:
+        token = tokens[i]
+        sign = _SIGNS.get(token)
+        if sign is not None and i + 1 < n and _is_number_start(tokens[i + 1]):
+            value, j = _read_number(tokens, i + 1)
+            if value is not None:
+                if sign and value[0] != "-":
+                    value = sign + value
+                out.append(value)
+                i = j
+                continue
+        if _is_number_start(token):
+            value, j = _read_number(tokens, i)
+            if value is not None:
+                out.append(value)
+                i = j
+                continue
+        if token == "-":
+            # A dash left between two numbers is a range; elsewhere it is dropped
+            if out and _is_number_start(out[-1]) and i + 1 < n and _is_number_start(tokens[i + 1]):
+                out.append("to")
+            i += 1
+            continue
+        out.append(token)
+        i += 1
+    return " ".join(out)
+
+
+# ============================================================================
+# GRAMMAR COMPILER
+# ============================================================================
+
+_SLOT_PATTERNS = {
+    "int": r"\d+",
+    "num": r"-?\d+(?:\.\d+)?",
+}
+
+# Tracks and bars count from 1; tempos and tempo steps must be positive
+_SLOT_MINIMUM = {name: 1 for name in ("track", "track_start", "track_end", "bar", "bar_start", "bar_end")}
+_POSITIVE_SLOTS = {"bpm", "amount"}
+
+_PATTERN_TOKEN_RE = re.compile(r"\{[^}]+\}|[()\[\]|]|[^\s()\[\]|{}]+")
+
+
+class GrammarError(ValueError):
+    """Raised when a grammar pattern cannot be compiled"""
+
+
+def _compile_pattern(pattern: str, rule_group: str, slots: Dict[str, str]) -> str:
+    """
+    Compile one pattern to a regex fragment.
+
+    Every word/slot is emitted followed by a single space; the input is
+    matched as the normalized text plus a trailing space, so optional
+    parts need no special whitespace handling.
+    """
+    out = []
+    depth = []
+    for token in _PATTERN_TOKEN_RE.findall(pattern):
+        if token == "(":
+            out.append("(?:")
+            depth.append(")")
+        elif token == "[":
+            out.append("(?:")
+            depth.append(")?")
+        elif token in (")", "]"):
+            if not depth:
+                raise GrammarError(f"Unbalanced '{token}' in pattern: {pattern}")
+            out.append(depth.pop())
+        elif token == "|":
+            out.append("|")
+        elif token.startswith("{"):
+            name, _, kind = token[1:-1].partition(":")
+            kind = kind or "int"
+            if kind in _SLOT_PATTERNS:
+                body = _SLOT_PATTERNS[kind]
+            else:
+                body = "|".join(re.escape(choice) for choice in kind.split("|"))
+            slots[name] = kind
+            out.append(f"(?P<{rule_group}_{name}>{body}) ")
+        else:
+            out.append(re.escape(token) + " ")
+    if depth:
+        raise GrammarError(f"Unclosed group in pattern: {pattern}")
+    return "".join(out)
+
+
+@dataclass
+class Intent:
+    """Structured intent parsed from a transcript"""
+    name: str
+    slots: Dict[str, Any] = field(default_factory=dict)
+    text: str = ""
+    normalized: str = ""
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass
+class _Rule:
+    group: str
+    intent: str
+    pattern: str
+    slots: Dict[str, str]
+
+
+class IntentParser:
+    """
+    Compiles a grammar into a single regex and parses transcripts into
+    Intent objects.
+    """
+
+    def __init__(self, grammar: Iterable[Tuple[str, Iterable[str]]] = None):
+        self.grammar = list(GRAMMAR if grammar is None else grammar)
+        self.rules: Dict[str, _Rule] = {}
+
+        branches = []
+        for intent_name, patterns in self.grammar:
+            for pattern in patterns:
+                group = f"r{len(self.rules)}"
+                slots: Dict[str, str] = {}
+                fragment = _compile_pattern(pattern, group, slots)
+                self.rules[group] = _Rule(group, intent_name, pattern, slots)
+                branches.append(f"(?P<{group}>{fragment})")
+
+        self.regex = re.compile(f"{_PREFIX}(?:{'|'.join(branches)}){_SUFFIX}")
+        logger.info(f"Compiled {len(self.rules)} intent patterns")
+
+    @property
+    def intents(self) -> List[str]:
+        return list(dict.fromkeys(intent for intent, _ in self.grammar))
+
+    @staticmethod
+    def _convert(name: str, kind: str, value: str) -> Any:
+        """Typed slot value; ValueError if out of range (e.g. track 0, tempo -20)"""
+        if kind == "int":
+            converted = int(value)
+        elif kind == "num":
+            number = float(value)
+            converted = int(number) if number.is_integer() else number
+        else:
+            return value
+        if converted < _SLOT_MINIMUM.get(name, converted) or (name in _POSITIVE_SLOTS and converted <= 0):
+            raise ValueError(f"{name} out of range: {value}")
+        return converted
+
+    def parse(self, text: str) -> Optional[Intent]:
+        """
+        Parse a transcript.
+
+        Args:
+            text: Raw transcript
+
+        Returns:
+            Intent, or None if no rule matches the whole utterance or a
+            slot is out of range
+        """
+        normalized = normalize(text)
+        if not normalized:
+            return None
+
+        match = self.regex.fullmatch(normalized + " ")
+        if match is None:
+            return None
+
+        rule = self.rules[match.lastgroup]
+        slots = {}
+        for name, kind in rule.slots.items():
+            value = match.group(f"{rule.group}_{name}")
+            if value is not None:
+                try:
+                    slots[name] = self._convert(name, kind, value)
+                except ValueError as e:
+                    logger.debug(f"Rejected \"{normalized}\": {e}")
+                    return None
+        if rule.intent in ("settrackpan", "pan") and slots.get("direction") == "centre":
+            slots["direction"] = "center"
+
+        return Intent(name=rule.intent, slots=slots, text=text, normalized=normalized)
+
+
+# ============================================================================
+# MODULE INTERFACE
+# ============================================================================
+
+_parser_instance: Optional[IntentParser] = None
+_parser_lock = threading.Lock()
+
+
+def get_intent_parser() -> IntentParser:
+    """Get the process-wide parser for the default grammar"""
+    global _parser_instance
+    with _parser_lock:
+        if _parser_instance is None:
+            _parser_instance = IntentParser()
+        return _parser_instance
+
+
+def parse_intent(text: str) -> Optional[Intent]:
+    """Parse a transcript with the default grammar"""
+    return get_intent_parser().parse(text)
+
+
+# ============================================================================
+# BENCHMARK
+# ============================================================================
+
+_SAMPLE_COMMANDS = [
+    "play", "stop", "pause", "record", "undo", "redo", "save the project",
+    "go to bar {n}", "jump to bar {w}", "play from bar {n}", "loop bars {n} to {m}",
+    "loop from bar {w} to bar {m}", "mute track {w}", "solo tracks {n} through {m}",
+    "unmute track {n}", "arm track {w}", "select track {n}",
+    "set track {w} volume to minus {w} db", "set the tempo to {bpm} bpm",
+    "increase the tempo by {n}", "slow down", "set volume to -{n} dB",
+    "turn it up {n} db", "volume down", "pan {n} percent left", "pan track {n} right",
+    "pan it center", "dictation mode", "switch to command mode", "go to the end",
+    "hey rhea could you mute track {w} please",
+]
+_SAMPLE_DICTATION = [
+    "this verse needs more energy in the second half",
+    "remind me to comp the vocals tomorrow",
+    "the snare sounds a little boxy",
+    "lets try a different chord progression",
+]
+_NUMBER_WORDS = ["one", "two", "three", "four", "twelve", "sixteen", "twenty one", "thirty two"]
+
+
+def load_transcripts(paths: Iterable[str]) -> List[str]:
+    """
+    Load logged transcripts.
+
+    Accepts save_transcript_log() JSON arrays, JSON-lines files with a
+    "transcript" or "text" field, or plain text (one transcript per line).
+    """
+    transcripts: List[str] = []
+    for path in paths:
+        with open(path, "r") as f:
+            content = f.read()
+        stripped = content.lstrip()
+        if stripped.startswith("["):
+            for entry in json.loads(content):
+                text = entry.get("transcript") or entry.get("text") if isinstance(entry, dict) else entry
+                if text:
+                    transcripts.append(str(text))
+            continue
+        for line in content.splitlines():
+            line = line.strip()
+            if not line:
+                continue
+            if line.startswith("{"):
+                try:
+                    entry = json.loads(line)
+                    line = entry.get("transcript") or entry.get("text") or ""
+                except ValueError:
+                    pass
+            if line:
+                transcripts.append(line)
+    return transcripts
+
+
+def synthetic_transcripts(count: int = 5000, seed: int = 7) -> List[str]:
+    """Command-like transcripts (with ~20% dictation) for benchmarking"""
+    rng = random.Random(seed)
+    out = []
+    for _ in range(count):
+        if rng.random() < 0.2:
+            out.append(rng.choice(_SAMPLE_DICTATION))
+            continue
+        template = rng.choice(_SAMPLE_COMMANDS)
+        n = rng.randint(1, 64)
+        out.append(template.format(
+            n=n, m=n + rng.randint(1, 16), w=rng.choice(_NUMBER_WORDS), bpm=rng.randint(60, 180)
+        ))
+    return out
+
+
+def benchmark(transcripts: List[str], parser: IntentParser = None, rounds: int = 3) -> Dict[str, Any]:
+    """
+    Parse throughput over a transcript corpus.
+
+    Returns:
+        Counts, match rate, mean/p50/p99 microseconds per parse and
+        parses per second (best round)
+    """
+    parser = parser or get_intent_parser()
+    per_call: List[float] = []
+    best_total = float('inf')
+    matched = 0
+    by_intent: Dict[str, int] = {}
+
+    for round_index in range(max(1, rounds)):
+        round_start = time.perf_counter()
+        for text in transcripts:
+            start = time.perf_counter()
+            intent = parser.parse(text)
+            elapsed = time.perf_counter() - start
+            if round_index == 0:
+                per_call.append(elapsed)
+                if intent:
+                    matched += 1
+                    by_intent[intent.name] = by_intent.get(intent.name, 0) + 1
+        best_total = min(best_total, time.perf_counter() - round_start)
+
+    per_call.sort()
+    count = len(transcripts)
+
+    def pct(q: float) -> float:
+        return per_call[min(count - 1, int(q * count))] * 1e6 if count else 0.0
+
+    return {
+        "transcripts": count,
+        "matched": matched,
+        "match_rate": matched / count if count else 0.0,
+        "mean_us": (sum(per_call) / count * 1e6) if count else 0.0,
+        "p50_us": pct(0.50),
+        "p99_us": pct(0.99),
+        "parses_per_s": count / best_total if best_total > 0 else 0.0,
+        "by_intent": dict(sorted(by_intent.items(), key=lambda item: -item[1])),
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+
+    arg_parser = argparse.ArgumentParser(description="DAWRV intent parser")
+    arg_parser.add_argument("text", nargs="*", help="Transcript to parse")
+    arg_parser.add_argument("--benchmark", action="store_true", help="Measure parse throughput")
+    arg_parser.add_argument("--log", action="append", default=[], help="Transcript log(s) for --benchmark")
+    arg_parser.add_argument("--count", type=int, default=5000, help="Synthetic transcripts if no --log")
+    arg_parser.add_argument("--rounds", type=int, default=3, help="Benchmark rounds")
+    args = arg_parser.parse_args()
+
+    if args.benchmark:
+        corpus = load_transcripts(args.log) if args.log else synthetic_transcripts(args.count)
+        res = benchmark(corpus, rounds=args.rounds)
+        print(f"transcripts: {res['transcripts']}  matched: {res['matched']} ({res['match_rate']:.0%})")
+        print(f"mean: {res['mean_us']:.1f} µs  p50: {res['p50_us']:.1f} µs  p99: {res['p99_us']:.1f} µs")
+        print(f"throughput: {res['parses_per_s']:,.0f} parses/s")
+        for name, n in list(res['by_intent'].items())[:10]:
+            print(f"   {name:<16} {n}")
+    elif args.text:
+        result = parse_intent(" ".join(args.text))
+        print(json.dumps(result.to_dict() if result else None, indent=2))
+        sys.exit(0 if result else 1)
+    else:
+        arg_parser.print_help()
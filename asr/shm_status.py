@@ -0,0 +1,417 @@
+#!/usr/bin/env python3
+"""
+DAWRV Shared-Memory Status Block
+================================
+Fixed-layout status record for high-frequency signals (barge-in RMS,
+user and RHEA speaking flags, VAD state, latest partial) shared through a
+memory-mapped file instead of small JSON files rewritten in /tmp.
+
+Writers update the record under a seqlock: the sequence counter is odd
+while a write is in progress and even when the record is consistent.
+Readers copy the record and retry if the counter changed (or was odd),
+so polling is lock-free and, once mapped, costs no syscalls.
+Writers from several processes serialize with flock (writer side only).
+Readers open the block read-only and never create it.
+
+Layout (little-endian, 512 bytes):
+    0   4s   magic b"DWRV"
+    4   u32  layout version
+    8   u64  seqlock counter
+    16  u8   reserved
+    17  u8   user_speaking
+    18  u8   vad_state (0=silence, 1=speech)
+    20  u16  partial length (bytes)
+    24  f64  last RMS
+    32  u64  RMS timestamp        (time.monotonic_ns)
+    40  u64  speaking timestamp   (time.monotonic_ns)
+    48  u64  VAD timestamp        (time.monotonic_ns)
+    56  u64  partial timestamp    (time.monotonic_ns)
+    64  u64  partial sequence
+    72  ...  partial text (UTF-8, PARTIAL_SLOT bytes)
+    496 u32  speaking-gate seqlock counter
+    500 u8   rhea_speaking
+    504 u64  RHEA speaking timestamp (time.monotonic_ns)
+
+Timestamps use CLOCK_MONOTONIC, which is shared by all processes on the host.
+
+RHEA's speaking gate has its own seqlock because its writer is the
+Electron main process (src/main/shm-status.js, next to /tmp/rhea_speaking),
+which cannot take the writers' flock. Python writers never rewrite it
+except through update(rhea_speaking=...).
+
+This module is stdlib-only so provider scripts can import it directly.
+"""
+
+import os
+import sys
+import json
+import mmap
+import time
+import fcntl
+import struct
+import logging
+import tempfile
+from contextlib import contextmanager
+from dataclasses import dataclass, asdict
+from typing import Optional, Dict, Any
+
+logger = logging.getLogger('DAWRV_ShmStatus')
+
+MAGIC = b"DWRV"
+LAYOUT_VERSION = 3
+BLOCK_SIZE = 512
+
+_HEADER = struct.Struct("<4sIQ")            # magic, version, seq
+_FIELDS = struct.Struct("<xBBxHxxdQQQQQ")   # flags, partial_len, rms, timestamps, partial_seq
+_GATE = struct.Struct("<IBxxxQ")          # gate seq, rhea_speaking, timestamp
+_SEQ = struct.Struct("<Q")
+SEQ_OFFSET = 8
+FIELDS_OFFSET = _HEADER.size
+PARTIAL_OFFSET = FIELDS_OFFSET + _FIELDS.size
+GATE_OFFSET = BLOCK_SIZE - _GATE.size
+PARTIAL_SLOT = GATE_OFFSET - PARTIAL_OFFSET
+
+VAD_SILENCE = 0
+VAD_SPEECH = 1
+
+MAX_READ_RETRIES = 1000
+
+
+def default_status_path() -> str:
+    """/dev/shm when available (Linux), otherwise the temp dir (macOS)"""
+    env_path = os.environ.get("DAWRV_SHM_STATUS_PATH")
+    if env_path:
+        return env_path
+    if os.path.isdir("/dev/shm"):
+        return "/dev/shm/dawrv_status"
+    return os.path.join(tempfile.gettempdir(), "dawrv_status.shm")
+
+
+@dataclass
+class StatusSnapshot:
+    """Consistent copy of the shared status record"""
+    seq: int
+    user_speaking: bool
+    rhea_speaking: bool
+    vad_state: int
+    last_rms: float
+    rms_ns: int
+    speaking_ns: int
+    rhea_speaking_ns: int
+    vad_ns: int
+    partial_ns: int
+    partial_seq: int
+    partial: str
+
+    def age_s(self, timestamp_ns: int) -> float:
+        """Seconds since a monotonic timestamp field (inf if never set)"""
+        if not timestamp_ns:
+            return float('inf')
+        return (time.monotonic_ns() - timestamp_ns) / 1e9
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def _open_block(path: str, writable: bool = True) -> mmap.mmap:
+    """Map the block; only writers create or extend the file"""
+    if not writable:
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            if os.fstat(fd).st_size < BLOCK_SIZE:
+                raise OSError(f"{path} is not a status block (yet)")
+            return mmap.mmap(fd, BLOCK_SIZE, access=mmap.ACCESS_READ)
+        finally:
+            os.close(fd)
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o666)
+    try:
+        if os.fstat(fd).st_size < BLOCK_SIZE:
+            os.ftruncate(fd, BLOCK_SIZE)
+        return mmap.mmap(fd, BLOCK_SIZE)
+    finally:
+        os.close(fd)
+
+
+def _read_gate(mm) -> Optional[tuple]:
+    """(rhea_speaking, timestamp) under the gate seqlock, or None"""
+    for _ in range(MAX_READ_RETRIES):
+        seq1, speaking, speaking_ns = _GATE.unpack_from(mm, GATE_OFFSET)
+        if seq1 & 1:
+            continue
+        if _GATE.unpack_from(mm, GATE_OFFSET)[0] == seq1:
+            return bool(speaking), speaking_ns
+    return None
+
+
+class SharedStatusReader:
+    """Lock-free reader for the shared status block"""
+
+    def __init__(self, path: str = None):
+        """
+        Raises:
+            OSError: No writer has created the block yet
+        """
+        self.path = path or default_status_path()
+        self._mm = _open_block(self.path, writable=False)
+
+    def read(self) -> Optional[StatusSnapshot]:
+        """
+        Read a consistent snapshot.
+
+        Returns:
+            StatusSnapshot, or None if the block is uninitialized or a
+            writer stayed mid-update for MAX_READ_RETRIES attempts
+        """
+        mm = self._mm
+        for _ in range(MAX_READ_RETRIES):
+            seq1 = _SEQ.unpack_from(mm, SEQ_OFFSET)[0]
+            if seq1 & 1:
+                continue
+            magic = mm[0:4]
+            fields = _FIELDS.unpack_from(mm, FIELDS_OFFSET)
+            partial_raw = mm[PARTIAL_OFFSET:PARTIAL_OFFSET + min(fields[2], PARTIAL_SLOT)]
+            if _SEQ.unpack_from(mm, SEQ_OFFSET)[0] != seq1:
+                continue
+            if magic != MAGIC:
+                return None
+            gate = _read_gate(mm)
+            if gate is None:
+                return None
+            return StatusSnapshot(
+                seq=seq1,
+                user_speaking=bool(fields[0]),
+                rhea_speaking=gate[0],
+                vad_state=fields[1],
+                last_rms=fields[3],
+                rms_ns=fields[4],
+                speaking_ns=fields[5],
+                rhea_speaking_ns=gate[1],
+                vad_ns=fields[6],
+                partial_ns=fields[7],
+                partial_seq=fields[8],
+                partial=partial_raw.decode('utf-8', errors='ignore')
+            )
+        return None
+
+    def seq(self) -> int:
+        """Current seqlock counter (cheap change detection)"""
+        return _SEQ.unpack_from(self._mm, SEQ_OFFSET)[0]
+
+    def gate_seq(self) -> int:
+        """Speaking-gate counter (changes when rhea_speaking is written)"""
+        return _GATE.unpack_from(self._mm, GATE_OFFSET)[0]
+
+    def close(self):
+        self._mm.close()
+
+
+class SharedStatusWriter:
+    """
+    Seqlock writer for the shared status block.
+    Only the fields passed to update() change; the rest are preserved.
+    """
+
+    def __init__(self, path: str = None):
+        self.path = path or default_status_path()
+        self._mm = _open_block(self.path)
+        self._lock_fd = os.open(self.path, os.O_RDWR)
+
+        with self._locked():
+            magic, version, seq = _HEADER.unpack_from(self._mm, 0)
+            if magic != MAGIC or version != LAYOUT_VERSION:
+                self._mm[:] = bytes(BLOCK_SIZE)
+                _HEADER.pack_into(self._mm, 0, MAGIC, LAYOUT_VERSION, 0)
+            elif seq & 1:
+                # A writer died mid-update; republish the record as consistent
+                _SEQ.pack_into(self._mm, SEQ_OFFSET, seq + 1)
+
+    @contextmanager
+    def _locked(self):
+        fcntl.flock(self._lock_fd, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
+
+    def update(
+        self,
+        *,
+        rms: float = None,
+        user_speaking: bool = None,
+        rhea_speaking: bool = None,
+        vad_state: int = None,
+        partial: str = None
+    ) -> int:
+        """
+        Update one or more fields atomically (for readers).
+
+        Returns:
+            New (even) seqlock counter
+        """
+        now_ns = time.monotonic_ns()
+        mm = self._mm
+        with self._locked():
+            seq = _SEQ.unpack_from(mm, SEQ_OFFSET)[0]
+            (user, vad, partial_len, last_rms,
+             rms_ns, speaking_ns, vad_ns, partial_ns, partial_seq) = _FIELDS.unpack_from(mm, FIELDS_OFFSET)
+
+            if rms is not None:
+                last_rms = float(rms)
+                rms_ns = now_ns
+            if user_speaking is not None:
+                user = 1 if user_speaking else 0
+                speaking_ns = now_ns
+            if vad_state is not None:
+                vad = int(vad_state)
+                vad_ns = now_ns
+
+            encoded = None
+            if partial is not None:
+                encoded = partial.encode('utf-8')[:PARTIAL_SLOT]
+                partial_len = len(encoded)
+                partial_ns = now_ns
+                partial_seq += 1
+
+            _SEQ.pack_into(mm, SEQ_OFFSET, seq + 1)  # odd: write in progress
+            _FIELDS.pack_into(
+                mm, FIELDS_OFFSET, user, vad, partial_len, last_rms,
+                rms_ns, speaking_ns, vad_ns, partial_ns, partial_seq
+            )
+            if encoded is not None:
+                mm[PARTIAL_OFFSET:PARTIAL_OFFSET + partial_len] = encoded
+            _SEQ.pack_into(mm, SEQ_OFFSET, seq + 2)  # even: consistent
+
+            if rhea_speaking is not None:
+                gate_seq = _GATE.unpack_from(mm, GATE_OFFSET)[0]
+                gate_seq += gate_seq & 1                # repair a crashed writer's odd counter
+                struct.pack_into("<I", mm, GATE_OFFSET, gate_seq + 1)
+                _GATE.pack_into(mm, GATE_OFFSET, gate_seq + 1, 1 if rhea_speaking else 0, now_ns)
+                struct.pack_into("<I", mm, GATE_OFFSET, gate_seq + 2)
+            return seq + 2
+
+    def close(self):
+        self._mm.close()
+        os.close(self._lock_fd)
+
+
+_writer_instance: Optional[SharedStatusWriter] = None
+
+
+def get_status_writer() -> SharedStatusWriter:
+    """Get the process-wide writer for the default status block"""
+    global _writer_instance
+    if _writer_instance is None:
+        _writer_instance = SharedStatusWriter()
+    return _writer_instance
+
+
+class SharedStatusSink:
+    """Event-stream sink that mirrors barge-in and partials into the block"""
+
+    def __init__(self, writer: SharedStatusWriter = None):
+        self.writer = writer or get_status_writer()
+
+    def __call__(self, event: Dict[str, Any]):
+        try:
+            event_type = event.get("type")
+            if event_type == "barge_in":
+                self.writer.update(rms=event.get("rms", 0.0), user_speaking=True)
+            elif event_type == "partial":
+                self.writer.update(partial=event.get("text", ""))
+            elif event_type == "final":
+                self.writer.update(partial=event.get("text", ""), user_speaking=False)
+        except Exception as e:
+            logger.error(f"Shared status sink error: {e}")
+
+
+# ============================================================================
+# MICROBENCHMARK
+# ============================================================================
+
+def benchmark(iterations: int = 20000, path: str = None) -> Dict[str, float]:
+    """
+    Compare shared-block update/read cost with the JSON-file approach
+    used by _write_user_speaking / the status files.
+
+    Returns:
+        Mean microseconds per operation for each method
+    """
+    tmp_dir = tempfile.mkdtemp(prefix="dawrv_shm_bench_")
+    block_path = path or os.path.join(tmp_dir, "status.shm")
+    json_path = os.path.join(tmp_dir, "user_speaking.json")
+
+    writer = SharedStatusWriter(block_path)
+    reader = SharedStatusReader(block_path)
+
+    def timed(fn) -> float:
+        start = time.perf_counter()
+        for i in range(iterations):
+            fn(i)
+        return (time.perf_counter() - start) / iterations * 1e6
+
+    def json_write(i):
+        with open(json_path, "w") as f:
+            json.dump({"timestamp": time.time(), "rms": float(i)}, f)
+
+    def json_read(_):
+        with open(json_path, "r") as f:
+            json.load(f)
+
+    results = {
+        "shm_update_us": timed(lambda i: writer.update(rms=float(i), user_speaking=True)),
+        "shm_read_us": timed(lambda _: reader.read()),
+        "shm_seq_poll_us": timed(lambda _: reader.seq()),
+        "json_write_us": timed(json_write),
+        "json_read_us": timed(json_read),
+    }
+
+    writer.close()
+    reader.close()
+    for name in os.listdir(tmp_dir):
+        os.remove(os.path.join(tmp_dir, name))
+    os.rmdir(tmp_dir)
+    return results
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="DAWRV shared-memory status block")
+    parser.add_argument("--path", default=None, help="Status block path")
+    parser.add_argument("--benchmark", action="store_true", help="Compare with JSON-file IPC")
+    parser.add_argument("--iterations", type=int, default=20000, help="Benchmark iterations")
+    parser.add_argument("--watch", action="store_true", help="Print the block whenever it changes")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        res = benchmark(args.iterations)
+        print(f"{'method':<16} {'update/write µs':>16} {'read µs':>10}")
+        print(f"{'shared block':<16} {res['shm_update_us']:>16.2f} {res['shm_read_us']:>10.2f}")
+        print(f"{'json file':<16} {res['json_write_us']:>16.2f} {res['json_read_us']:>10.2f}")
+        print(f"seq-only poll: {res['shm_seq_poll_us']:.3f} µs")
+    elif args.watch:
+        status_reader = None
+        last_seq = None
+        try:
+            while status_reader is None:
+                try:
+                    status_reader = SharedStatusReader(args.path)
+                except OSError:
+                    time.sleep(0.5)         # no writer yet
+            while True:
+                seqs = (status_reader.seq(), status_reader.gate_seq())
+                if seqs != last_seq:
+                    snap = status_reader.read()
+                    if snap:
+                        last_seq = seqs
+                        print(json.dumps(snap.to_dict()), flush=True)
+                time.sleep(0.01)
+        except KeyboardInterrupt:
+            pass
+    else:
+        try:
+            snap = SharedStatusReader(args.path).read()
+        except OSError:
+            snap = None
+        print(json.dumps(snap.to_dict() if snap else None, indent=2))
+        sys.exit(0 if snap else 1)
@@ -31,6 +31,7 @@ from .engine import (
     ASRMode,
     get_engine
 )
+from .metrics import get_metrics
 
 logger = logging.getLogger('DAWRV_ASR_Streaming')
 
@@ -470,9 +471,11 @@ class StreamingASR:
     ):
         """Process a complete speech segment"""
         process_start = time.time()
+        metrics = get_metrics()
         
         # Transcribe
-        result = self.engine.transcribe(audio, sample_rate=self.sample_rate)
+        with metrics.histogram("dawrv_asr_decode_seconds", "ASR decode time").time(kind="final"):
+            result = self.engine.transcribe(audio, sample_rate=self.sample_rate)
 
         # Optional second pass (local-only) for tricky command-like utterances
         if (
@@ -506,6 +509,9 @@ class StreamingASR:
         
         # Track latency
         latency_ms = (time.time() - start_time) * 1000
+        metrics.histogram(
+            "dawrv_asr_speech_to_final_seconds", "Speech start to final transcript"
+        ).observe(latency_ms / 1000.0)
         self.latency_samples.append(latency_ms)
         self.avg_latency_ms = np.mean(list(self.latency_samples))
         
@@ -525,7 +531,8 @@ class StreamingASR:
             audio = np.concatenate(audio_frames)
             
             # Quick transcription for partial
-            result = self.engine.transcribe(audio, sample_rate=self.sample_rate)
+            with get_metrics().histogram("dawrv_asr_decode_seconds", "ASR decode time").time(kind="partial"):
+                result = self.engine.transcribe(audio, sample_rate=self.sample_rate)
             
             if result.transcript:
                 partial = PartialTranscript(
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+DAWRV/Rhea Vocabulary Usage Tracking
+====================================
+Tracks which vocabulary terms actually show up in accepted transcripts,
+per voice profile, so prompt/keyword budgets can be filled with the terms
+a user really says instead of whatever happens to come first.
+
+Features:
+- Recency-weighted term frequency with exponential decay (half-life)
+- Per-profile persistence (asr/profiles/usage/<profile>.json)
+- Budget selection that falls back to vocabulary order for unseen terms
+
+This module is stdlib-only so lightweight provider scripts
+(e.g. deepgram_to_dawrv.py) can use it without loading the Whisper engine.
+"""
+
+import os
+import re
+import json
+import math
+import time
+import logging
+import threading
+from pathlib import Path
+from typing import Optional, Dict, List, Tuple, Iterable
+
+logger = logging.getLogger('DAWRV_TermUsage')
+
+# Default half-life: a term used two weeks ago counts half as much as one used today
+DEFAULT_HALF_LIFE_DAYS = float(os.environ.get("DAWRV_TERM_USAGE_HALF_LIFE_DAYS", "14"))
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+(?:[-'][a-z0-9]+)*")
+
+
+def _tokenize(text: str) -> Tuple[str, ...]:
+    """Lowercase word tokens (keeps hyphenated names like 'pro-q' together)"""
+    return tuple(_TOKEN_RE.findall((text or "").lower()))
+
+
+def default_usage_dir() -> str:
+    return str(Path(__file__).parent / "profiles" / "usage")
+
+
+class _TermMatcher:
+    """Finds vocabulary terms (single or multi-word) inside a transcript"""
+
+    def __init__(self, terms: Iterable[str]):
+        self.by_tokens: Dict[Tuple[str, ...], str] = {}
+        self.max_len = 1
+        for term in terms:
+            tokens = _tokenize(term)
+            if not tokens:
+                continue
+            self.by_tokens.setdefault(tokens, term.lower())
+            self.max_len = max(self.max_len, len(tokens))
+
+    def match(self, text: str) -> List[str]:
+        tokens = _tokenize(text)
+        found = []
+        seen = set()
+        for i in range(len(tokens)):
+            for n in range(1, min(self.max_len, len(tokens) - i) + 1):
+                key = self.by_tokens.get(tokens[i:i + n])
+                if key is not None and key not in seen:
+                    seen.add(key)
+                    found.append(key)
+        return found
+
+
+class TermUsageTracker:
+    """
+    Recency-weighted vocabulary usage counts for one voice profile.
+
+    Each term keeps a (score, updated_at) pair. Reading a score decays it
+    to "now"; observing the term decays it and adds 1. This is equivalent
+    to summing 0.5 ** (age / half_life) over every past occurrence.
+    """
+
+    def __init__(
+        self,
+        profile: str = "default",
+        usage_dir: str = None,
+        half_life_days: float = DEFAULT_HALF_LIFE_DAYS,
+        autosave_every: int = 5
+    ):
+        """
+        Initialize usage tracker.
+
+        Args:
+            profile: Voice profile name (one usage file per profile)
+            usage_dir: Directory for usage files
+            half_life_days: Decay half-life in days
+            autosave_every: Persist after this many accepted transcripts (0 = manual save only)
+        """
+        self.profile = profile or "default"
+        self.usage_dir = usage_dir or default_usage_dir()
+        self.half_life_s = max(1.0, float(half_life_days) * 86400.0)
+        self.autosave_every = autosave_every
+
+        self.counts: Dict[str, Tuple[float, float]] = {}
+        self._matcher: Optional[_TermMatcher] = None
+        self._matcher_key: Optional[Tuple[str, ...]] = None
+        self._unsaved = 0
+        self.lock = threading.Lock()
+
+        self.load()
+
+    @property
+    def usage_path(self) -> str:
+        safe_name = re.sub(r"[^A-Za-z0-9_.-]", "_", self.profile)
+        return os.path.join(self.usage_dir, f"{safe_name}.json")
+
+    def _decay(self, score: float, age_s: float) -> float:
+        if age_s <= 0:
+            return score
+        return score * math.pow(0.5, age_s / self.half_life_s)
+
+    def score(self, term: str, now: float = None) -> float:
+        """Current decayed score for a term (0.0 if never seen)"""
+        entry = self.counts.get((term or "").lower())
+        if entry is None:
+            return 0.0
+        now = time.time() if now is None else now
+        return self._decay(entry[0], now - entry[1])
+
+    def _get_matcher(self, terms: List[str]) -> _TermMatcher:
+        key = tuple(terms)
+        if self._matcher is None or key != self._matcher_key:
+            self._matcher = _TermMatcher(terms)
+            self._matcher_key = key
+        return self._matcher
+
+    def observe(self, transcript: str, terms: List[str], now: float = None) -> List[str]:
+        """
+        Record an accepted transcript.
+
+        Args:
+            transcript: Accepted (final, executed/confirmed) transcript
+            terms: Candidate vocabulary terms to look for
+            now: Timestamp override (for tests)
+
+        Returns:
+            Lowercased vocabulary terms found in the transcript
+        """
+        if not transcript or not terms:
+            return []
+
+        now = time.time() if now is None else now
+        with self.lock:
+            matched = self._get_matcher(terms).match(transcript)
+            for term in matched:
+                score, updated_at = self.counts.get(term, (0.0, now))
+                self.counts[term] = (self._decay(score, now - updated_at) + 1.0, now)
+
+            if matched:
+                self._unsaved += 1
+
+        if matched and self.autosave_every and self._unsaved >= self.autosave_every:
+            self.save()
+
+        return matched
+
+    def select(self, terms: List[str], budget: int, now: float = None) -> List[str]:
+        """
+        Fill a term budget by decayed usage score.
+
+        Terms that have been used are ranked highest-score first; the rest
+        of the budget is filled with unused terms in their original order.
+        """
+        if budget <= 0:
+            return []
+
+        now = time.time() if now is None else now
+        ranked = []
+        unused = []
+        seen = set()
+        for index, term in enumerate(terms):
+            key = (term or "").lower()
+            if not key or key in seen:
+                continue
+            seen.add(key)
+            s = self.score(key, now)
+            if s > 0.0:
+                ranked.append((-s, index, term))
+            else:
+                unused.append(term)
+
+        ranked.sort()
+        selected = [term for _, _, term in ranked[:budget]]
+        if len(selected) < budget:
+            selected.extend(unused[:budget - len(selected)])
+        return selected
+
+    def top_terms(self, limit: int = 20, now: float = None) -> List[Tuple[str, float]]:
+        """Most-used terms with their current scores"""
+        now = time.time() if now is None else now
+        scored = [(term, self.score(term, now)) for term in self.counts]
+        scored.sort(key=lambda item: item[1], reverse=True)
+        return scored[:limit]
+
+    def load(self):
+        """Load usage counts from disk"""
+        try:
+            if os.path.exists(self.usage_path):
+                with open(self.usage_path, 'r') as f:
+                    data = json.load(f)
+                self.counts = {
+                    str(term): (float(entry[0]), float(entry[1]))
+                    for term, entry in (data.get('terms') or {}).items()
+                }
+                logger.info(f"Loaded usage for {len(self.counts)} terms (profile={self.profile})")
+        except Exception as e:
+            logger.error(f"Error loading term usage: {e}")
+            self.counts = {}
+
+    def save(self, prune_below: float = 0.01):
+        """
+        Save usage counts to disk (atomic write).
+
+        Args:
+            prune_below: Drop terms whose decayed score fell below this
+        """
+        try:
+            now = time.time()
+            with self.lock:
+                terms = {}
+                for term, (score, updated_at) in self.counts.items():
+                    current = self._decay(score, now - updated_at)
+                    if current >= prune_below:
+                        terms[term] = [round(current, 6), now]
+                self.counts = {term: (entry[0], entry[1]) for term, entry in terms.items()}
+                self._unsaved = 0
+
+            os.makedirs(self.usage_dir, exist_ok=True)
+            data = {
+                'profile': self.profile,
+                'half_life_s': self.half_life_s,
+                'updated_at': now,
+                'terms': terms
+            }
+            tmp_path = f"{self.usage_path}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(data, f, indent=2)
+            os.replace(tmp_path, self.usage_path)
+        except Exception as e:
+            logger.error(f"Error saving term usage: {e}")
+
+
+# ============================================================================
+# MODULE INTERFACE
+# ============================================================================
+
+_trackers: Dict[str, TermUsageTracker] = {}
+_trackers_lock = threading.Lock()
+
+
+def get_usage_tracker(profile: str = "default", **kwargs) -> TermUsageTracker:
+    """Get or create the cached usage tracker for a profile"""
+    key = profile or "default"
+    with _trackers_lock:
+        if key not in _trackers:
+            _trackers[key] = TermUsageTracker(profile=key, **kwargs)
+        return _trackers[key]
@@ -0,0 +1,355 @@
+-- DAWRV Command Server for REAPER
+-- ==============================
+-- Resident script that executes DAWRV commands inside REAPER, so Lua-level
+-- operations (bar navigation, tempo, actions) cost one defer cycle instead
+-- of launching the REAPER binary with -run for every command.
+--
+-- Protocol (spool directories, see reaper_command_server.py):
+-- - Clients write batch files atomically to:  REAPER_RESOURCE/DAWRV/server/inbox/<name>.cmd
+--     undo<TAB>Undo label                (optional: run the whole batch in ONE undo block)
+--     <id><TAB><command><TAB>arg...      (one command per line)
+-- - Every defer tick this script runs all pending batches in name order and
+--   writes one ack file per batch to:  REAPER_RESOURCE/DAWRV/server/outbox/<name>.ack
+--     <id><TAB>1|0<TAB>result or error
+-- - A heartbeat file (server/alive) is touched about once a second so
+--   clients know the server is running.
+--
+-- Commands:
+--   ping                               -> pong
+--   action <id | _named_id>            Main_OnCommand
+--   bar <command> [measureA] [measureB]   goto, play, loop, marker, next_marker,
+--                                      previous_marker, loop_from_selection, clear_loop,
+--                                      toggle_click, toggle_preroll, toggle_countin,
+--                                      nudge_beats, nudge_bars, barpos (-> "start,end")
+--   tempo <set|increase|decrease|get> [value]   (-> current BPM)
+--   track <number> <param> <value>     SetMediaTrackInfo_Value (1-based track, e.g. B_MUTE 1)
+--   extstate <section> <key> <value>   SetExtState (not persisted)
+--   tempomap                           rewrite server/tempo_map.txt now (-> marker count)
+--
+-- Tempo map: every TEMPO_MAP_INTERVAL the server checks the project's tempo /
+-- time signature markers and rewrites server/tempo_map.txt only when they
+-- changed (see reaper_tempo_map.py, which converts bars to seconds locally):
+--     base<TAB>bpm<TAB>num<TAB>denom
+--     marker<TAB>time<TAB>qn<TAB>measure<TAB>bpm<TAB>num<TAB>denom<TAB>linear
+--
+-- Install:
+-- 1) Copy this file to: ~/Library/Application Support/REAPER/Scripts/DAWRV/dawrv_command_server.lua
+-- 2) In REAPER: Actions -> Show action list... -> ReaScript -> Load..., then Run it.
+--    (Add it to SWS startup actions / __startup.lua to start it with REAPER.)
+
+local SERVER_VERSION = "dawrv_command_server.lua v1"
+local MAX_BATCHES_PER_TICK = 64
+local HEARTBEAT_INTERVAL = 1.0
+local TEMPO_MAP_INTERVAL = 0.5
+
+local resource = reaper.GetResourcePath()
+local server_dir = resource .. "/DAWRV/server"
+local inbox = server_dir .. "/inbox"
+local outbox = server_dir .. "/outbox"
+local alive_path = server_dir .. "/alive"
+local tempo_map_path = server_dir .. "/tempo_map.txt"
+
+reaper.RecursiveCreateDirectory(inbox, 0)
+reaper.RecursiveCreateDirectory(outbox, 0)
+
+local function read_file(path)
+  local f = io.open(path, "r")
+  if not f then return nil end
+  local c = f:read("*a")
+  f:close()
+  return c
+end
+
+local function write_file_atomic(path, content)
+  local tmp = path .. ".tmp"
+  local f = io.open(tmp, "w")
+  if not f then return false end
+  f:write(content)
+  f:close()
+  if os.rename(tmp, path) then return true end
+  os.remove(path) -- rename does not replace existing files on Windows
+  return os.rename(tmp, path)
+end
+
+local function split_tabs(line)
+  local fields = {}
+  for field in (line .. "\t"):gmatch("(.-)\t") do
+    table.insert(fields, field)
+  end
+  return fields
+end
+
+local function clean(text)
+  return (tostring(text or ""):gsub("[\t\r\n]", " "))
+end
+
+-- ---------------------------------------------------------------------------
+-- Bar / measure commands (same semantics as reaper_bar_bridge.create_lua_script)
+-- ---------------------------------------------------------------------------
+
+local function clamp_measure(value)
+  value = tonumber(value) or 1
+  if value < 1 then value = 1 end
+  return math.floor(value)
+end
+
+local function get_measure_times(measure_number)
+  local ok, qn_start, qn_end = reaper.TimeMap_GetMeasureInfo(0, measure_number - 1)
+  if ok and qn_start then
+    local start_pos = reaper.TimeMap2_QNToTime(0, qn_start)
+    local end_pos = qn_end and reaper.TimeMap2_QNToTime(0, qn_end) or nil
+    return start_pos, end_pos or start_pos
+  end
+  return nil, nil
+end
+
+local function set_cursor_position(position, seekplay)
+  if not position then return end
+  reaper.SetEditCurPos(position, true, seekplay ~= false)
+  if reaper.CSurf_OnPlayPositionChange then
+    reaper.CSurf_OnPlayPositionChange(position, seekplay ~= false)
+  end
+  reaper.UpdateTimeline()
+  reaper.TrackList_AdjustWindows(false)
+  reaper.UpdateArrange()
+end
+
+local function run_bar(command, a, b)
+  local measureA = clamp_measure(a)
+  local measureB = clamp_measure(b or a)
+
+  if command == "goto" or command == "play" then
+    local start_pos = get_measure_times(measureA)
+    if not start_pos then error("No such measure: " .. measureA) end
+    set_cursor_position(start_pos, false)
+    if command == "play" then reaper.Main_OnCommand(1007, 0) end
+  elseif command == "loop" then
+    if measureB < measureA then measureA, measureB = measureB, measureA end
+    local start_pos = get_measure_times(measureA)
+    local _, end_pos = get_measure_times(measureB + 1)
+    if not end_pos then
+      local _, loop_end = get_measure_times(measureB)
+      end_pos = loop_end
+    end
+    if not (start_pos and end_pos) then error("No such measure range") end
+    reaper.GetSet_LoopTimeRange2(0, true, true, start_pos, end_pos, false)
+    reaper.Main_OnCommand(1068, 0)
+    set_cursor_position(start_pos, false)
+    reaper.Main_OnCommand(1007, 0)
+  elseif command == "marker" then
+    reaper.GoToMarker(0, measureA, true)
+  elseif command == "next_marker" then
+    reaper.Main_OnCommand(40161, 0)
+  elseif command == "previous_marker" then
+    reaper.Main_OnCommand(40162, 0)
+  elseif command == "loop_from_selection" then
+    local start_time, end_time = reaper.GetSet_LoopTimeRange2(0, false, false, 0, 0, false)
+    if start_time and end_time and end_time > start_time then
+      reaper.GetSet_LoopTimeRange2(0, true, true, start_time, end_time, false)
+      if reaper.GetToggleCommandState(1068) == 0 then reaper.Main_OnCommand(1068, 0) end
+      set_cursor_position(start_time, false)
+    end
+  elseif command == "clear_loop" then
+    reaper.GetSet_LoopTimeRange2(0, true, true, 0, 0, false)
+    if reaper.GetToggleCommandState(1068) == 1 then reaper.Main_OnCommand(1068, 0) end
+  elseif command == "toggle_click" then
+    reaper.Main_OnCommand(40364, 0)
+  elseif command == "toggle_preroll" then
+    reaper.Main_OnCommand(40375, 0)
+  elseif command == "toggle_countin" then
+    reaper.Main_OnCommand(40379, 0)
+  elseif command == "nudge_beats" or command == "nudge_bars" then
+    local cur_pos = reaper.GetCursorPosition()
+    local qn = reaper.TimeMap2_timeToQN(0, cur_pos)
+    local amount = tonumber(a) or 1
+    if command == "nudge_bars" then
+      local timesig_num = reaper.TimeMap_GetTimeSigAtTime(0, cur_pos)
+      if not timesig_num or timesig_num < 1 then timesig_num = 4 end
+      amount = amount * timesig_num
+    end
+    set_cursor_position(reaper.TimeMap2_QNToTime(0, qn + amount), false)
+  elseif command == "barpos" then
+    local start_pos, end_pos = get_measure_times(measureA)
+    if not start_pos then error("No such measure: " .. measureA) end
+    return string.format("%.6f,%.6f", start_pos, end_pos)
+  else
+    error("Unknown bar command: " .. tostring(command))
+  end
+  return "ok"
+end
+
+-- ---------------------------------------------------------------------------
+-- Command dispatch
+-- ---------------------------------------------------------------------------
+
+local handlers = {}
+
+handlers.ping = function()
+  return "pong"
+end
+
+handlers.action = function(id)
+  local command_id = tonumber(id) or reaper.NamedCommandLookup(tostring(id))
+  if not command_id or command_id == 0 then error("Unknown action: " .. tostring(id)) end
+  reaper.Main_OnCommand(command_id, 0)
+  return tostring(command_id)
+end
+
+handlers.bar = run_bar
+
+handlers.tempo = function(command, value)
+  local bpm = reaper.Master_GetTempo()
+  local amount = tonumber(value)
+  if command == "set" and amount then
+    bpm = amount
+  elseif command == "increase" and amount then
+    bpm = bpm + amount
+  elseif command == "decrease" and amount then
+    bpm = math.max(1, bpm - amount)
+  elseif command ~= "get" then
+    error("Bad tempo command: " .. tostring(command))
+  end
+  if command ~= "get" then reaper.SetCurrentBPM(0, bpm, true) end
+  return string.format("%.2f", reaper.Master_GetTempo())
+end
+
+handlers.track = function(number, param, value)
+  local track = reaper.GetTrack(0, (tonumber(number) or 0) - 1)
+  if not track then error("Track not found: " .. tostring(number)) end
+  reaper.SetMediaTrackInfo_Value(track, param, tonumber(value) or 0)
+  return "ok"
+end
+
+handlers.extstate = function(section, key, value)
+  reaper.SetExtState(section, key, value or "", false)
+  return "ok"
+end
+
+-- ---------------------------------------------------------------------------
+-- Tempo map export
+-- ---------------------------------------------------------------------------
+
+local last_tempo_map = nil
+
+local function build_tempo_map()
+  local num, denom, bpm = reaper.TimeMap_GetTimeSigAtTime(0, 0)
+  local lines = { string.format("base\t%.6f\t%d\t%d", bpm, num, denom) }
+  for i = 0, reaper.CountTempoTimeSigMarkers(0) - 1 do
+    local ok, timepos, measurepos, _, marker_bpm, ts_num, ts_denom, linear =
+      reaper.GetTempoTimeSigMarker(0, i)
+    if ok then
+      table.insert(lines, string.format("marker\t%.9f\t%.9f\t%d\t%.6f\t%d\t%d\t%d",
+        timepos, reaper.TimeMap2_timeToQN(0, timepos), measurepos, marker_bpm,
+        ts_num, ts_denom, linear and 1 or 0))
+    end
+  end
+  return table.concat(lines, "\n") .. "\n"
+end
+
+local function export_tempo_map(force)
+  local map = build_tempo_map()
+  if force or map ~= last_tempo_map then
+    write_file_atomic(tempo_map_path, map)
+    last_tempo_map = map
+  end
+  return map
+end
+
+handlers.tempomap = function()
+  local map = export_tempo_map(true)
+  local _, count = map:gsub("\nmarker", "")
+  return tostring(count)
+end
+
+local function run_batch(content)
+  local acks = {}
+  local undo_label = nil
+  local commands = {}
+
+  for line in (content .. "\n"):gmatch("(.-)\r?\n") do
+    if line ~= "" then
+      local fields = split_tabs(line)
+      if fields[1] == "undo" then
+        undo_label = fields[2] or "DAWRV"
+      else
+        table.insert(commands, fields)
+      end
+    end
+  end
+
+  if undo_label then
+    reaper.Undo_BeginBlock()
+    reaper.PreventUIRefresh(1)
+  end
+
+  for _, fields in ipairs(commands) do
+    local id, name = fields[1], fields[2]
+    local handler = handlers[name or ""]
+    local ok, result
+    if handler then
+      ok, result = pcall(handler, table.unpack(fields, 3))
+    else
+      ok, result = false, "Unknown command: " .. tostring(name)
+    end
+    table.insert(acks, clean(id) .. "\t" .. (ok and "1" or "0") .. "\t" .. clean(result))
+  end
+
+  if undo_label then
+    reaper.PreventUIRefresh(-1)
+    reaper.Undo_EndBlock(undo_label, -1)
+  end
+
+  return table.concat(acks, "\n") .. "\n"
+end
+
+-- ---------------------------------------------------------------------------
+-- Defer loop
+-- ---------------------------------------------------------------------------
+
+local last_heartbeat = 0
+local last_tempo_check = 0
+
+local function pending_batches()
+  local names = {}
+  reaper.EnumerateFiles(inbox, -1) -- invalidate REAPER's directory cache
+  local i = 0
+  while true do
+    local name = reaper.EnumerateFiles(inbox, i)
+    if not name then break end
+    if name:sub(-4) == ".cmd" then table.insert(names, name) end
+    i = i + 1
+  end
+  table.sort(names)
+  return names
+end
+
+local function loop()
+  local now = reaper.time_precise()
+  if now - last_heartbeat >= HEARTBEAT_INTERVAL then
+    write_file_atomic(alive_path, SERVER_VERSION .. "\n")
+    last_heartbeat = now
+  end
+
+  if now - last_tempo_check >= TEMPO_MAP_INTERVAL then
+    export_tempo_map(false)
+    last_tempo_check = now
+  end
+
+  local names = pending_batches()
+  for index = 1, math.min(#names, MAX_BATCHES_PER_TICK) do
+    local name = names[index]
+    local path = inbox .. "/" .. name
+    local content = read_file(path)
+    os.remove(path)
+    if content then
+      local ok, acks = pcall(run_batch, content)
+      if not ok then acks = "\t0\t" .. clean("Server error: " .. tostring(acks)) .. "\n" end
+      write_file_atomic(outbox .. "/" .. name:sub(1, -5) .. ".ack", acks)
+    end
+  end
+
+  reaper.defer(loop)
+end
+
+reaper.atexit(function() os.remove(alive_path) end)
+loop()
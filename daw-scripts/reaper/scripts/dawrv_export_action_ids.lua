@@ -1,27 +1,76 @@
 -- DAWRV Automatic Action ID Exporter
 -- This script exports all action IDs to a JSON file for automatic processing
 -- Run this in REAPER, then use parse_action_ids.py to update rhea.js
+-- It also writes the full action list to dawrv_action_catalog.tsv, which
+-- reaper_action_catalog.py indexes for searching actions by name
 
 local json = require("json")
 
 local output_file = reaper.GetResourcePath() .. "/dawrv_actions.json"
+local catalog_file = reaper.GetResourcePath() .. "/dawrv_action_catalog.tsv"
 local actions = {}
 
+-- Action list sections: main, main (alt), MIDI editor, MIDI event list,
+-- MIDI inline editor, media explorer
+local SECTIONS = {0, 100, 32060, 32061, 32062, 32063}
+
+-- Enumerate every action in a section: {id, named_id, name}
+function enumerate_actions(section_id)
+    local list = {}
+    local section = reaper.SectionFromUniqueID(section_id)
+    if not section then return list end
+    local i = 0
+    while true do
+        local cmd, name = reaper.kbd_enumerateActions(section, i)
+        if not cmd or cmd == 0 then break end
+        local named = reaper.ReverseNamedCommandLookup(cmd)
+        table.insert(list, {
+            id = cmd,
+            named_id = named and ("_" .. named) or "",
+            name = name
+        })
+        i = i + 1
+    end
+    return list
+end
+
+local main_actions = enumerate_actions(0)
+
 -- Function to search for actions by name pattern
 function find_actions_by_pattern(pattern)
     local found = {}
-    for i = 0, reaper.CountActions() - 1 do
-        local retval, action_name = reaper.GetActionName(i)
-        if action_name and string.find(string.lower(action_name), string.lower(pattern)) then
+    for _, action in ipairs(main_actions) do
+        if action.name and string.find(string.lower(action.name), string.lower(pattern)) then
             table.insert(found, {
-                id = i,
-                name = action_name
+                id = action.id,
+                name = action.name
             })
         end
     end
     return found
 end
 
+-- Full catalog: section<TAB>id<TAB>named_id<TAB>name, written to a temp
+-- file and renamed so readers never see a partial export
+function write_catalog()
+    local tmp = catalog_file .. ".tmp"
+    local file = io.open(tmp, "w")
+    if not file then return 0 end
+    local count = 0
+    for _, section_id in ipairs(SECTIONS) do
+        local list = section_id == 0 and main_actions or enumerate_actions(section_id)
+        for _, action in ipairs(list) do
+            local name = action.name:gsub("[\t\r\n]", " ")
+            file:write(section_id, "\t", action.id, "\t", action.named_id, "\t", name, "\n")
+            count = count + 1
+        end
+    end
+    file:close()
+    os.remove(catalog_file)
+    os.rename(tmp, catalog_file)
+    return count
+end
+
 -- Find DAWRV-related actions
 actions.dawrv_scripts = {}
 actions.dawrv_scripts.transport = find_actions_by_pattern("dawrv.*transport")
@@ -42,13 +91,16 @@ actions.common = {
     marker = find_actions_by_pattern("marker")
 }
 
+local catalog_count = write_catalog()
+
 -- Write to JSON file
 local file = io.open(output_file, "w")
 if file then
     file:write(json.encode(actions, {indent = true}))
     file:close()
     reaper.ShowMessageBox(
-        "Action IDs exported to:\n" .. output_file .. "\n\n" ..
+        "Action IDs exported to:\n" .. output_file .. "\n" ..
+        catalog_count .. " actions indexed in:\n" .. catalog_file .. "\n\n" ..
         "Run: python3 parse_action_ids.py",
         "DAWRV Export Complete",
         0
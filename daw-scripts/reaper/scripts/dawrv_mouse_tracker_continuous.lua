@@ -16,6 +16,39 @@ local last_clicked_control = nil
 -- Initialize gfx for mouse state detection
 gfx.init("RHEA Mouse Tracker", 0, 0, 0, 0, 0)
 
+-- Click position relative to the top-level window under it, so a learned
+-- click stays valid when the window moves. Needs js_ReaScriptAPI or SWS.
+-- Returns rel_x, rel_y, width, height, title (nil without either extension)
+function window_relative_position(x, y)
+    local hwnd
+    if reaper.JS_Window_FromPoint then
+        hwnd = reaper.JS_Window_FromPoint(x, y)
+        if hwnd and reaper.JS_Window_GetAncestor then
+            hwnd = reaper.JS_Window_GetAncestor(hwnd, "GA_ROOT") or hwnd
+        end
+    elseif reaper.BR_Win32_WindowFromPoint then
+        hwnd = reaper.BR_Win32_WindowFromPoint(x, y)
+        while hwnd and reaper.BR_Win32_GetParent(hwnd) do
+            hwnd = reaper.BR_Win32_GetParent(hwnd)
+        end
+    end
+    if not hwnd then return nil end
+    
+    local ok, left, top, right, bottom, title
+    if reaper.JS_Window_GetRect then
+        ok, left, top, right, bottom = reaper.JS_Window_GetRect(hwnd)
+        title = reaper.JS_Window_GetTitle and reaper.JS_Window_GetTitle(hwnd) or ""
+    else
+        ok, left, top, right, bottom = reaper.BR_Win32_GetWindowRect(hwnd)
+        title = ""
+    end
+    if not ok then return nil end
+    
+    -- macOS reports rects with y growing upwards (top > bottom)
+    local rel_y = top > bottom and (top - y) or (y - top)
+    return math.floor(x - left), math.floor(rel_y), math.floor(right - left), math.floor(math.abs(bottom - top)), title
+end
+
 function detect_control_under_mouse()
     -- Get mouse position
     local x, y = reaper.GetMousePosition()
@@ -473,6 +506,13 @@ function main()
                 reaper.SetExtState("RHEA", "clicked_type", result.control_type or "", true)
                 reaper.SetExtState("RHEA", "clicked_track", tostring(result.track_number or ""), true)
                 reaper.SetExtState("RHEA", "clicked_guid", result.track_guid or "", true)
+                -- Where the click was, so clicks can be learned into hit grids
+                reaper.SetExtState("RHEA", "clicked_x", tostring(result.position.x), true)
+                reaper.SetExtState("RHEA", "clicked_y", tostring(result.position.y), true)
+                local rel_x, rel_y, win_w, win_h, win_title = window_relative_position(result.position.x, result.position.y)
+                reaper.SetExtState("RHEA", "clicked_window", rel_x and string.format("%d,%d,%d,%d", rel_x, rel_y, win_w, win_h) or "", true)
+                reaper.SetExtState("RHEA", "clicked_window_title", win_title or "", true)
+                reaper.SetExtState("RHEA", "clicked_context", result.context or "", true)
                 reaper.SetExtState("RHEA", "click_timestamp", tostring(current_time), true)
                 
                 reaper.ShowConsoleMsg(string.format(
@@ -7,20 +7,25 @@ import os
 import re
 import sys
 
+from reaper_action_catalog import Action, ActionCatalog
+
 REAPER_RESOURCE_PATH = os.path.expanduser("~/Library/Application Support/REAPER")
 ACTION_FILE = os.path.join(REAPER_RESOURCE_PATH, "dawrv_actions.json")
 RHEA_JS = "src/renderer/scripts/rhea.js"
 
 def find_action_id(actions_list, keywords):
-    """Find action ID by matching keywords"""
+    """Find action ID by matching keywords (best fuzzy match, first keyword wins)"""
     if not actions_list:
         return None
     
-    for action in actions_list:
-        name_lower = action.get('name', '').lower()
-        for keyword in keywords:
-            if keyword.lower() in name_lower:
-                return action.get('id')
+    catalog = ActionCatalog(
+        Action(0, int(action['id']), action.get('named_id', ''), action.get('name', ''))
+        for action in actions_list if 'id' in action
+    )
+    for keyword in keywords:
+        action = catalog.best(keyword)
+        if action:
+            return action.id
     return None
 
 def update_rhea_js(action_mappings):
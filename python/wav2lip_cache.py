@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+RHEA Wav2Lip Video Cache - Size-bounded LRU of rendered phrases
+
+The service kept every rendered mp4 forever, globbed the cache directory
+on each /status call, and tracked work in one global 'processing' flag,
+so two /generate requests for the same text rendered it twice.
+
+VideoCache keeps:
+- an index (index.json) of cached videos in least-recently-used order,
+  trimmed to max_bytes by evicting from the old end
+- videos written to a temp name and renamed into place, so a crash never
+  leaves a half-written <key>.mp4 behind
+- a job per key being rendered (queued, running, done, failed,
+  cancelled); a request for a key already queued or running attaches to
+  that job
+- a runner that schedules the renders (RenderQueue: a fixed pool behind
+  a priority queue)
+
+/check and /status answer from this in-memory state.
+
+Usage:
+    cache = VideoCache(CONFIG['cache_dir'], max_bytes=500 * 1024 * 1024)
+    job = cache.request(key, text, render, priority=INTERACTIVE)   # render(text, output_path) -> path
+    job.wait(60)
+    cache.status(key)       # {'ready': True, 'state': 'done', ...}
+"""
+
+import os
+import json
+import time
+import itertools
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+from wav2lip_queue import INTERACTIVE, RenderQueue
+
+DEFAULT_MAX_BYTES = int(os.environ.get('DAWRV_WAV2LIP_CACHE_MB', '500')) * 1024 * 1024
+INDEX_VERSION = 1
+MAX_FINISHED = 64
+
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+
+
+class VideoJob:
+    """Rendering one phrase; every request for the same key shares it"""
+
+    def __init__(self, key, text, state=QUEUED, path=None, priority=INTERACTIVE):
+        self.key = key
+        self.text = text
+        self.priority = priority
+        self.state = state
+        self.path = path
+        self.error = None
+        self.requests = 1
+        self.created = time.time()
+        self.queued_at = None
+        self.started = None
+        self.finished = None
+        self._done = threading.Event()
+        if state in (DONE, FAILED, CANCELLED):
+            self._done.set()
+
+    def wait(self, timeout=None):
+        """True once the job is done, failed or cancelled"""
+        return self._done.wait(timeout)
+
+    def cancel(self, reason):
+        """Called by the runner for a job that will not run"""
+        self.state, self.error = CANCELLED, reason
+        self.finished = time.time()
+        self._done.set()
+
+    def to_dict(self):
+        return {
+            'key': self.key,
+            'state': self.state,
+            'priority': self.priority,
+            'error': self.error,
+            'requests': self.requests,
+            'created': self.created,
+            'started': self.started,
+            'finished': self.finished,
+        }
+
+
+class VideoCache:
+    """LRU index of rendered videos plus single-flight rendering jobs"""
+
+    def __init__(self, cache_dir, max_bytes=DEFAULT_MAX_BYTES, runner=None):
+        """
+        Args:
+            cache_dir: Directory holding <key>.mp4 and index.json
+            max_bytes: Byte budget for cached videos
+            runner: Schedules renders: submit(job, fn, supersede) and
+                cancel(job) (default: a RenderQueue)
+        """
+        self.dir = Path(cache_dir)
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self.index_path = self.dir / 'index.json'
+        self.max_bytes = max_bytes
+        self.runner = runner or RenderQueue()
+        self.bytes = 0
+        self.jobs = {}
+        self.stats = {'hits': 0, 'misses': 0, 'deduplicated': 0, 'evictions': 0, 'rendered': 0, 'failed': 0}
+        self._entries = OrderedDict()     # key -> {'size', 'used', 'text'}, least recently used first
+        self._lock = threading.RLock()
+        self._temp_ids = itertools.count(1)
+        self._load()
+
+    # -------------------------------------------------------------------------
+    # Index
+    # -------------------------------------------------------------------------
+
+    def _load(self):
+        try:
+            with open(self.index_path) as f:
+                data = json.load(f)
+            indexed = data['entries'] if data.get('version') == INDEX_VERSION else []
+        except (OSError, ValueError, KeyError):
+            indexed = []
+
+        for path in self.dir.glob('*.tmp*'):
+            path.unlink(missing_ok=True)         # left over from an interrupted render
+        on_disk = {}
+        for path in self.dir.glob('*.mp4'):
+            st = path.stat()
+            on_disk[path.stem] = (st.st_size, st.st_mtime)
+
+        # Videos missing from the index count as least recently used
+        known = {key for key, _ in indexed}
+        for key, (size, mtime) in sorted(on_disk.items(), key=lambda item: item[1][1]):
+            if key not in known:
+                self._entries[key] = {'size': size, 'used': mtime, 'text': None}
+        for key, meta in indexed:
+            if key in on_disk:
+                self._entries[key] = dict(meta, size=on_disk[key][0])
+        self.bytes = sum(meta['size'] for meta in self._entries.values())
+        self._evict()
+        self._save()
+
+    def _save(self):
+        tmp = self.index_path.with_name(self.index_path.name + '.tmp')
+        with open(tmp, 'w') as f:
+            json.dump({'version': INDEX_VERSION, 'entries': list(self._entries.items())}, f)
+        os.replace(tmp, self.index_path)
+
+    def _evict(self, keep=None):
+        while self.bytes > self.max_bytes and self._entries:
+            key = next(iter(self._entries))
+            if key == keep:
+                break
+            meta = self._entries.pop(key)
+            self.bytes -= meta['size']
+            self.path(key).unlink(missing_ok=True)
+            self.stats['evictions'] += 1
+
+    def path(self, key):
+        return self.dir / f"{key}.mp4"
+
+    def temp_path(self, key):
+        """Where a render writes before put() renames it into place"""
+        return self.dir / f"{key}.tmp-{os.getpid()}-{next(self._temp_ids)}.mp4"
+
+    def get(self, key):
+        """Path of a cached video (marked most recently used), or None"""
+        with self._lock:
+            meta = self._entries.get(key)
+            if meta is None:
+                return None
+            meta['used'] = time.time()
+            self._entries.move_to_end(key)
+            return self.path(key)
+
+    def discard(self, key):
+        """Forget a video whose file disappeared"""
+        with self._lock:
+            meta = self._entries.pop(key, None)
+            if meta:
+                self.bytes -= meta['size']
+                self._save()
+
+    def put(self, key, temp_path, text=None):
+        """Rename a finished render into the cache and evict down to max_bytes"""
+        with self._lock:
+            size = Path(temp_path).stat().st_size
+            os.replace(temp_path, self.path(key))
+            old = self._entries.pop(key, None)
+            if old:
+                self.bytes -= old['size']
+            self._entries[key] = {'size': size, 'used': time.time(), 'text': text}
+            self.bytes += size
+            self._evict(keep=key)
+            self._save()
+            return self.path(key)
+
+    def clear(self):
+        """Delete every cached video (renders in flight keep their temp files)"""
+        with self._lock:
+            count = 0
+            for path in self.dir.glob('*'):
+                if path.is_file() and '.tmp' not in path.name:
+                    path.unlink(missing_ok=True)
+                    count += 1
+            self._entries.clear()
+            self.bytes = 0
+            self._save()
+            return count
+
+    # -------------------------------------------------------------------------
+    # Jobs
+    # -------------------------------------------------------------------------
+
+    def request(self, key, text, render, priority=INTERACTIVE, supersede=False):
+        """
+        The job for key: already done if cached, the in-flight job if one is
+        queued or running (moved up to priority), else a new job handed to
+        the runner.
+
+        Args:
+            render: render(text, output_path) -> output_path, or None on failure
+            priority: Runner priority (lower runs first)
+            supersede: Cancel other queued jobs of this priority
+        """
+        with self._lock:
+            path = self.get(key)
+            if path is not None:
+                self.stats['hits'] += 1
+                return VideoJob(key, text, DONE, path, priority)
+            job = self.jobs.get(key)
+            if job is not None and job.state in (QUEUED, RUNNING):
+                job.requests += 1
+                job.priority = min(job.priority, priority)
+                self.stats['deduplicated'] += 1
+                render_job = None
+            else:
+                self.stats['misses'] += 1
+                self._prune_finished()
+                job = self.jobs[key] = VideoJob(key, text, priority=priority)
+                render_job = lambda: self._render(job, render)
+        self.runner.submit(job, render_job, supersede)
+        return job
+
+    def cancel(self, key):
+        """Cancel key's job if it has not started"""
+        with self._lock:
+            job = self.jobs.get(key)
+        return job is not None and self.runner.cancel(job)
+
+    def _render(self, job, render):
+        with self._lock:
+            job.state = RUNNING
+            job.started = time.time()
+        temp = self.temp_path(job.key)
+        try:
+            if not render(job.text, temp) or not temp.exists():
+                raise RuntimeError("Video generation failed")
+            path = self.put(job.key, temp, job.text)
+        except Exception as e:
+            temp.unlink(missing_ok=True)
+            with self._lock:
+                job.state, job.error = FAILED, str(e)
+                self.stats['failed'] += 1
+        else:
+            with self._lock:
+                job.state, job.path = DONE, path
+                self.stats['rendered'] += 1
+                if self.jobs.get(job.key) is job:
+                    del self.jobs[job.key]
+        job.finished = time.time()
+        job._done.set()
+
+    def _prune_finished(self):
+        """Keep the most recent failed/cancelled jobs for status()"""
+        finished = [key for key, job in self.jobs.items() if job.state in (FAILED, CANCELLED)]
+        for key in finished[:max(0, len(finished) - MAX_FINISHED)]:
+            del self.jobs[key]
+
+    # -------------------------------------------------------------------------
+    # Status
+    # -------------------------------------------------------------------------
+
+    def status(self, key):
+        """Readiness of one key, from memory"""
+        with self._lock:
+            if key in self._entries:
+                return {'ready': True, 'state': DONE}
+            job = self.jobs.get(key)
+            if job is None:
+                return {'ready': False, 'state': None}
+            return {'ready': False, 'state': job.state, 'error': job.error}
+
+    def summary(self):
+        with self._lock:
+            states = [job.state for job in self.jobs.values()]
+            return {
+                'count': len(self._entries),
+                'bytes': self.bytes,
+                'max_bytes': self.max_bytes,
+                'queued': states.count(QUEUED),
+                'running': states.count(RUNNING),
+                'failed': states.count(FAILED),
+                'cancelled': states.count(CANCELLED),
+                'stats': dict(self.stats),
+            }
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+RHEA Wav2Lip Render Queue - Fixed worker pool fed by a priority queue
+
+/generate and /precache started a thread per request, so a burst of
+requests rendered everything at once, and background pre-caching (run
+phrase by phrase with a one-second sleep) competed with the replies RHEA
+was about to speak.
+
+RenderQueue runs jobs on a fixed pool sized from the CPU count. Wav2Lip
+inference itself is serialized on the worker model's thread (and torch
+uses every core), so the pool only needs enough workers to overlap TTS and
+ffmpeg with it. Jobs wait in a bounded priority queue:
+- interactive replies run before pre-cache jobs (lower value first)
+- a newer reply can supersede the replies still queued, which are
+  cancelled rather than rendered late
+- a job asked for again at a higher priority moves up
+- when full, the lowest-priority newest job is dropped (or the new job,
+  if nothing queued ranks below it)
+
+Queue depth and wait times are reported by summary().
+
+Usage:
+    queue = RenderQueue(workers=2)
+    queue.submit(job, render_fn, supersede=True)   # job.priority, job.cancel()
+    queue.cancel(job)
+    queue.summary()     # {'queued': 3, 'running': 2, 'avg_wait_s': 0.4, ...}
+"""
+
+import os
+import sys
+import time
+import heapq
+import itertools
+import threading
+
+INTERACTIVE = 0
+PRECACHE = 10
+PRIORITIES = {'interactive': INTERACTIVE, 'precache': PRECACHE}
+
+DEFAULT_WORKERS = int(os.environ.get('DAWRV_WAV2LIP_WORKERS', '0')) or max(1, min(4, (os.cpu_count() or 2) // 4))
+DEFAULT_MAX_QUEUED = 32
+
+
+class RenderQueue:
+    """Bounded priority queue in front of a fixed pool of render threads"""
+
+    def __init__(self, workers=DEFAULT_WORKERS, max_queued=DEFAULT_MAX_QUEUED):
+        """
+        Args:
+            workers: Render threads (started on the first job)
+            max_queued: Most jobs waiting at once
+        """
+        self.workers = workers
+        self.max_queued = max_queued
+        self.running = 0
+        self.stats = {
+            'submitted': 0, 'started': 0, 'completed': 0, 'promoted': 0,
+            'superseded': 0, 'cancelled': 0, 'rejected': 0,
+            'wait_total_s': 0.0, 'wait_max_s': 0.0
+        }
+        self._heap = []                 # (priority, seq, job); stale entries skipped
+        self._queued = {}               # job -> (fn, priority, seq)
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._threads = []
+
+    def submit(self, job, fn, supersede=False):
+        """
+        Queue fn, which renders job, by job.priority.
+
+        A job already queued is moved up if job.priority improved (fn is
+        ignored). With supersede, other queued jobs of the same priority
+        are cancelled.
+
+        Returns:
+            False if the job was not queued (queue full)
+        """
+        with self._cond:
+            if supersede:
+                for other, (_, priority, _) in list(self._queued.items()):
+                    if other is not job and priority == job.priority:
+                        self._drop(other, "Superseded by a newer reply")
+                        self.stats['superseded'] += 1
+
+            entry = self._queued.get(job)
+            if entry is not None:
+                if job.priority < entry[1]:
+                    self._push(job, entry[0])
+                    self.stats['promoted'] += 1
+                return True
+            if fn is None:
+                return False
+
+            if len(self._queued) >= self.max_queued:
+                victim = max(self._queued, key=lambda j: self._queued[j][1:])
+                if self._queued[victim][1] <= job.priority:
+                    job.cancel("Render queue full")
+                    self.stats['rejected'] += 1
+                    return False
+                self._drop(victim, "Dropped for a higher-priority job")
+                self.stats['rejected'] += 1
+
+            job.queued_at = time.monotonic()
+            self._push(job, fn)
+            self.stats['submitted'] += 1
+            if len(self._threads) < self.workers:
+                thread = threading.Thread(target=self._work, name=f"wav2lip-render-{len(self._threads)}", daemon=True)
+                self._threads.append(thread)
+                thread.start()
+            self._cond.notify()
+            return True
+
+    def cancel(self, job, reason="Cancelled"):
+        """Cancel a job that has not started; False if it is running or unknown"""
+        with self._cond:
+            if job not in self._queued:
+                return False
+            self._drop(job, reason)
+            self.stats['cancelled'] += 1
+            return True
+
+    def _push(self, job, fn):
+        seq = next(self._seq)
+        self._queued[job] = (fn, job.priority, seq)
+        heapq.heappush(self._heap, (job.priority, seq, job))
+
+    def _drop(self, job, reason):
+        del self._queued[job]           # its heap entry is skipped when popped
+        job.cancel(reason)
+
+    def _work(self):
+        while True:
+            with self._cond:
+                while True:
+                    while not self._heap:
+                        self._cond.wait()
+                    _, seq, job = heapq.heappop(self._heap)
+                    entry = self._queued.get(job)
+                    if entry is not None and entry[2] == seq:
+                        break
+                fn = self._queued.pop(job)[0]
+                wait = time.monotonic() - job.queued_at
+                self.stats['started'] += 1
+                self.stats['wait_total_s'] += wait
+                self.stats['wait_max_s'] = max(self.stats['wait_max_s'], wait)
+                self.running += 1
+            try:
+                fn()
+            except Exception as e:
+                print(f"Render job failed: {e}", file=sys.stderr)
+            finally:
+                with self._cond:
+                    self.running -= 1
+                    self.stats['completed'] += 1
+
+    def summary(self):
+        """Pool size, queue depth per priority and wait times"""
+        with self._cond:
+            now = time.monotonic()
+            depth = {name: 0 for name in PRIORITIES}
+            names = {value: name for name, value in PRIORITIES.items()}
+            for _, priority, _ in self._queued.values():
+                name = names.get(priority, str(priority))
+                depth[name] = depth.get(name, 0) + 1
+            return {
+                'workers': self.workers,
+                'running': self.running,
+                'queued': len(self._queued),
+                'depth': depth,
+                'oldest_wait_s': round(max((now - job.queued_at for job in self._queued), default=0.0), 3),
+                'avg_wait_s': round(self.stats['wait_total_s'] / max(1, self.stats['started']), 3),
+                'stats': dict(self.stats),
+            }
@@ -13,7 +13,6 @@ This service:
 import os
 import sys
 import json
-import time
 import hashlib
 import subprocess
 import threading
@@ -24,6 +23,10 @@ from flask_cors import CORS
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from wav2lip_cache import DEFAULT_MAX_BYTES, VideoCache
+from wav2lip_queue import DEFAULT_WORKERS, INTERACTIVE, PRECACHE, RenderQueue
+from wav2lip_worker import Wav2LipWorker
+
 app = Flask(__name__)
 CORS(app)
 
@@ -34,20 +37,29 @@ CONFIG = {
     'rhea_image': Path(__file__).parent.parent / 'src' / 'renderer' / 'assets' / 'images' / 'rhea_avatar.png',
     'wav2lip_path': Path(__file__).parent / 'Wav2Lip',
     'model_path': Path(__file__).parent / 'models' / 'wav2lip.pth',
+    'face_cache_dir': Path(__file__).parent / 'cache' / 'faces',
+    'cache_max_bytes': DEFAULT_MAX_BYTES,  # DAWRV_WAV2LIP_CACHE_MB
+    'render_workers': DEFAULT_WORKERS,  # DAWRV_WAV2LIP_WORKERS (default: from CPU count)
+    'render_timeout': 60,  # seconds per render, from when the worker starts it
+    'render_queue_timeout': 300,  # seconds a render may wait for the worker
     'tts_voice': 'com.apple.speech.synthesis.voice.samantha',  # macOS
 }
 
-# Ensure cache directory exists
-CONFIG['cache_dir'].mkdir(parents=True, exist_ok=True)
+# Rendered videos (LRU within the byte budget) and the jobs rendering them,
+# run by a fixed pool with replies ahead of pre-caching
+render_queue = RenderQueue(workers=CONFIG['render_workers'])
+video_cache = VideoCache(CONFIG['cache_dir'], max_bytes=CONFIG['cache_max_bytes'], runner=render_queue)
 
 # Track service status
 service_status = {
     'wav2lip_available': False,
-    'model_loaded': False,
-    'cache_count': 0,
-    'processing': False
+    'model_loaded': False
 }
 
+# Resident Wav2Lip model, started on first use (see get_wav2lip_worker)
+wav2lip_worker = None
+wav2lip_worker_lock = threading.Lock()
+
 
 def get_cache_key(text):
     """Generate a cache key for the given text."""
@@ -56,11 +68,7 @@ def get_cache_key(text):
 
 def get_cached_video(text):
     """Check if we have a cached video for this text."""
-    cache_key = get_cache_key(text)
-    cache_path = CONFIG['cache_dir'] / f"{cache_key}.mp4"
-    if cache_path.exists():
-        return cache_path
-    return None
+    return video_cache.get(get_cache_key(text))
 
 
 def generate_tts_audio(text, output_path):
@@ -96,15 +104,50 @@ def generate_tts_audio(text, output_path):
         return None
 
 
+def get_wav2lip_worker():
+    """The resident Wav2Lip worker (model loaded once), or None if not installed."""
+    global wav2lip_worker
+    with wav2lip_worker_lock:
+        if wav2lip_worker is None:
+            if not (CONFIG['wav2lip_path'] / 'inference.py').exists() or not CONFIG['model_path'].exists():
+                return None
+            wav2lip_worker = Wav2LipWorker(
+                CONFIG['wav2lip_path'],
+                CONFIG['model_path'],
+                CONFIG['rhea_image'],
+                CONFIG['face_cache_dir']
+            ).start()
+        return wav2lip_worker
+
+
 def generate_wav2lip_video(audio_path, output_path):
     """Generate lip-synced video using Wav2Lip."""
-    try:
-        wav2lip_script = CONFIG['wav2lip_path'] / 'inference.py'
-        
-        if not wav2lip_script.exists():
-            print("Wav2Lip not installed. Using fallback mode.")
+    wav2lip_script = CONFIG['wav2lip_path'] / 'inference.py'
+    
+    if not wav2lip_script.exists():
+        print("Wav2Lip not installed. Using fallback mode.")
+        return None
+    
+    worker = get_wav2lip_worker()
+    if worker is not None:
+        job = worker.submit(audio_path, output_path)
+        # Time the render, not the wait behind other phrases (or the model load)
+        started = job.wait_started(timeout=CONFIG['render_queue_timeout'])
+        if not started or not job.wait(timeout=CONFIG['render_timeout']):
+            job.cancel()
+            print("Wav2Lip timed out")
             return None
-        
+        if job.result or not worker.error:
+            return job.result
+        # The model could not be loaded in this interpreter (e.g. no torch):
+        # fall back to one inference.py process per phrase
+    
+    return run_wav2lip_inference(wav2lip_script, audio_path, output_path)
+
+
+def run_wav2lip_inference(wav2lip_script, audio_path, output_path):
+    """Generate lip-synced video with a separate inference.py process."""
+    try:
         # Run Wav2Lip inference
         result = subprocess.run([
             'python', str(wav2lip_script),
@@ -130,40 +173,34 @@ def generate_wav2lip_video(audio_path, output_path):
         return None
 
 
-def generate_video_for_text(text):
-    """Full pipeline: text -> TTS -> Wav2Lip -> video."""
-    cache_key = get_cache_key(text)
-    cache_path = CONFIG['cache_dir'] / f"{cache_key}.mp4"
+def render_video(text, output_path):
+    """Full pipeline: text -> TTS -> Wav2Lip, written to output_path."""
+    # Generate TTS audio
+    audio_path = output_path.with_name(f"{output_path.stem}_audio.aiff")
+    wav_path = generate_tts_audio(text, audio_path)
     
-    # Check cache first
-    if cache_path.exists():
-        return cache_path
-    
-    service_status['processing'] = True
+    if not wav_path:
+        return None
     
     try:
-        # Generate TTS audio
-        audio_path = CONFIG['cache_dir'] / f"{cache_key}_audio.aiff"
-        wav_path = generate_tts_audio(text, audio_path)
-        
-        if not wav_path:
-            return None
-        
         # Generate lip-synced video
-        video_path = generate_wav2lip_video(wav_path, cache_path)
-        
+        return generate_wav2lip_video(wav_path, output_path)
+    finally:
         # Clean up temp audio
         audio_path.unlink(missing_ok=True)
         wav_path.unlink(missing_ok=True)
-        
-        if video_path:
-            service_status['cache_count'] += 1
-            return video_path
-        
-        return None
-        
-    finally:
-        service_status['processing'] = False
+
+
+def request_video(text, priority=INTERACTIVE, supersede=False):
+    """The job rendering text (shared by concurrent requests; done if cached)."""
+    return video_cache.request(get_cache_key(text), text, render_video, priority, supersede)
+
+
+def generate_video_for_text(text, priority=INTERACTIVE):
+    """Rendered video for text (cached, or waits for its job); None on failure."""
+    job = request_video(text, priority)
+    job.wait()
+    return job.path
 
 
 # =============================================================================
@@ -177,16 +214,19 @@ def status():
     wav2lip_exists = (CONFIG['wav2lip_path'] / 'inference.py').exists()
     model_exists = CONFIG['model_path'].exists()
     
-    # Count cached videos
-    cache_count = len(list(CONFIG['cache_dir'].glob('*.mp4')))
+    cache = video_cache.summary()
     
     return jsonify({
         'running': True,
         'wav2lip_available': wav2lip_exists,
         'model_loaded': model_exists,
-        'cache_count': cache_count,
-        'processing': service_status['processing'],
-        'rhea_image_exists': CONFIG['rhea_image'].exists()
+        'cache_count': cache['count'],
+        'cache': cache,
+        'processing': cache['queued'] + cache['running'] > 0,
+        'queue': render_queue.summary(),
+        'rhea_image_exists': CONFIG['rhea_image'].exists(),
+        'worker_ready': bool(wav2lip_worker and wav2lip_worker.available),
+        'worker': wav2lip_worker.stats if wav2lip_worker else None
     })
 
 
@@ -199,26 +239,29 @@ def generate():
     if not text:
         return jsonify({'error': 'No text provided'}), 400
     
-    # Check cache first
-    cached = get_cached_video(text)
-    if cached:
+    # Cached, already being rendered, or a new job (async); a new reply
+    # cancels older replies still waiting unless "supersede": false
+    job = request_video(text, INTERACTIVE, supersede=data.get('supersede', True))
+    if job.state == 'done':
         return jsonify({
             'success': True,
             'cached': True,
-            'video_url': f'/video/{get_cache_key(text)}'
+            'video_url': f'/video/{job.key}'
         })
     
-    # Generate new video (async)
-    def generate_async():
-        generate_video_for_text(text)
-    
-    thread = threading.Thread(target=generate_async)
-    thread.start()
+    if job.state == 'cancelled':
+        return jsonify({
+            'success': False,
+            'cache_key': job.key,
+            'error': job.error
+        }), 503
     
     return jsonify({
         'success': True,
         'cached': False,
         'processing': True,
+        'cache_key': job.key,
+        'state': job.state,
         'message': 'Video generation started. Use /check endpoint to poll.'
     })
 
@@ -249,9 +292,9 @@ def generate_sync():
 @app.route('/check/<cache_key>', methods=['GET'])
 def check_status(cache_key):
     """Check if a video is ready."""
-    cache_path = CONFIG['cache_dir'] / f"{cache_key}.mp4"
+    status = video_cache.status(cache_key)
     
-    if cache_path.exists():
+    if status['ready']:
         return jsonify({
             'ready': True,
             'video_url': f'/video/{cache_key}'
@@ -259,18 +302,31 @@ def check_status(cache_key):
     else:
         return jsonify({
             'ready': False,
-            'processing': service_status['processing']
+            'state': status['state'],
+            'error': status.get('error'),
+            'processing': status['state'] in ('queued', 'running')
         })
 
 
+@app.route('/cancel/<cache_key>', methods=['POST'])
+def cancel(cache_key):
+    """Cancel a video that has not started rendering."""
+    return jsonify({
+        'success': True,
+        'cancelled': video_cache.cancel(cache_key)
+    })
+
+
 @app.route('/video/<cache_key>', methods=['GET'])
 def get_video(cache_key):
     """Serve a cached video."""
-    cache_path = CONFIG['cache_dir'] / f"{cache_key}.mp4"
+    cache_path = video_cache.get(cache_key)
     
-    if cache_path.exists():
+    if cache_path and cache_path.exists():
         return send_file(cache_path, mimetype='video/mp4')
     else:
+        if cache_path:
+            video_cache.discard(cache_key)
         return jsonify({'error': 'Video not found'}), 404
 
 
@@ -297,29 +353,23 @@ def precache():
         "Listening"
     ]
     
-    def cache_all():
-        for phrase in common_phrases:
-            if not get_cached_video(phrase):
-                print(f"Pre-caching: {phrase}")
-                generate_video_for_text(phrase)
-                time.sleep(1)  # Avoid overloading
-    
-    thread = threading.Thread(target=cache_all)
-    thread.start()
+    # Queued behind interactive replies; the pool bounds the load
+    queued = 0
+    for phrase in common_phrases:
+        if request_video(phrase, PRECACHE).state == 'queued':
+            queued += 1
     
     return jsonify({
         'success': True,
-        'message': f'Pre-caching {len(common_phrases)} phrases in background'
+        'queued': queued,
+        'message': f'Pre-caching {queued} of {len(common_phrases)} phrases in background'
     })
 
 
 @app.route('/clear-cache', methods=['POST'])
 def clear_cache():
     """Clear the video cache."""
-    count = 0
-    for file in CONFIG['cache_dir'].glob('*'):
-        file.unlink()
-        count += 1
+    count = video_cache.clear()
     
     return jsonify({
         'success': True,
@@ -413,6 +463,11 @@ if __name__ == '__main__':
     
     check_dependencies()
     
+    # Load the model now rather than on the first phrase
+    if service_status['wav2lip_available'] and service_status['model_loaded']:
+        print("⏳ Loading Wav2Lip model in the background...")
+        get_wav2lip_worker()
+    
     print()
     print(f"🚀 Starting server on http://localhost:{CONFIG['port']}")
     print()
@@ -421,6 +476,7 @@ if __name__ == '__main__':
     print("  POST /generate      - Generate video (async)")
     print("  POST /generate-sync - Generate video (blocking)")
     print("  GET  /check/<key>   - Check if video is ready")
+    print("  POST /cancel/<key>  - Cancel a video not yet rendering")
     print("  GET  /video/<key>   - Get cached video")
     print("  POST /precache      - Pre-cache common phrases")
     print("  POST /clear-cache   - Clear video cache")
@@ -0,0 +1,373 @@
+#!/usr/bin/env python3
+"""
+RHEA Wav2Lip Test Suite
+=======================
+Unit tests for the video cache, render queue and resident worker. Renders
+are stand-ins that write a few bytes, so Wav2Lip, torch and flask are not
+needed (mel windows use numpy).
+"""
+
+import os
+import sys
+import json
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from wav2lip_cache import CANCELLED, DONE, FAILED, QUEUED, VideoCache, VideoJob
+from wav2lip_queue import INTERACTIVE, PRECACHE, RenderQueue
+from wav2lip_worker import FPS, MEL_STEP, Wav2LipWorker, mel_chunks
+
+
+class ManualRunner:
+    """Holds submitted renders until run() (a RenderQueue without threads)"""
+
+    def __init__(self):
+        self.pending = []
+
+    def submit(self, job, fn, supersede=False):
+        if fn is not None:
+            self.pending.append((job, fn))
+        return True
+
+    def cancel(self, job, reason="Cancelled"):
+        for i, (queued, _) in enumerate(self.pending):
+            if queued is job:
+                del self.pending[i]
+                job.cancel(reason)
+                return True
+        return False
+
+    def run(self):
+        while self.pending:
+            _, fn = self.pending.pop(0)
+            fn()
+
+
+def write_render(size=100):
+    calls = []
+
+    def render(text, output_path):
+        calls.append(text)
+        Path(output_path).write_bytes(b"x" * size)
+        return output_path
+
+    render.calls = calls
+    return render
+
+
+class TestVideoCache(unittest.TestCase):
+    """Test single-flight jobs, LRU eviction and the on-disk index"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+        self.runner = ManualRunner()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _cache(self, max_bytes=1000):
+        return VideoCache(self.dir, max_bytes=max_bytes, runner=self.runner)
+
+    def _fill(self, cache, *keys, size=100):
+        for key in keys:
+            temp = cache.temp_path(key)
+            temp.write_bytes(b"x" * size)
+            cache.put(key, temp, text=key)
+
+    def test_requests_for_one_key_share_a_render(self):
+        """Test a second request while rendering attaches to the job, and later ones hit the cache"""
+        cache = self._cache()
+        render = write_render()
+        first = cache.request("hello", "Hello", render, priority=PRECACHE)
+        second = cache.request("hello", "Hello", render, priority=INTERACTIVE)
+        self.assertIs(first, second)
+        self.assertEqual((first.state, first.requests, first.priority), (QUEUED, 2, INTERACTIVE))
+        self.assertEqual(len(self.runner.pending), 1)
+
+        self.runner.run()
+        self.assertTrue(first.wait(0))
+        self.assertEqual(first.state, DONE)
+        self.assertEqual(first.path, cache.path("hello"))
+        hit = cache.request("hello", "Hello", render)
+        self.assertEqual((hit.state, hit.path), (DONE, cache.path("hello")))
+        self.assertEqual(render.calls, ["Hello"])
+        self.assertEqual(cache.stats['misses'], 1)
+        self.assertEqual(cache.stats['deduplicated'], 1)
+        self.assertEqual(cache.stats['hits'], 1)
+
+    def test_failed_render_leaves_no_temp_file(self):
+        """Test a render that writes nothing fails the job and cleans its temp file"""
+        cache = self._cache()
+
+        def broken(text, output_path):
+            Path(output_path).write_bytes(b"partial")
+            return None
+
+        job = cache.request("oops", "Oops", broken)
+        self.runner.run()
+        self.assertEqual(job.state, FAILED)
+        self.assertEqual(cache.status("oops"), {'ready': False, 'state': FAILED, 'error': job.error})
+        self.assertEqual(list(self.dir.glob("*.mp4")), [])
+        retry = cache.request("oops", "Oops", write_render())
+        self.assertIsNot(retry, job)
+
+    def test_cancel_only_before_start(self):
+        """Test a queued job can be cancelled and a new request renders again"""
+        cache = self._cache()
+        job = cache.request("late", "Late", write_render())
+        self.assertTrue(cache.cancel("late"))
+        self.assertEqual(job.state, CANCELLED)
+        self.assertFalse(cache.cancel("late"))
+        self.assertIsNot(cache.request("late", "Late", write_render()), job)
+
+    def test_least_recently_used_evicted(self):
+        """Test putting past max_bytes evicts from the least recently used end"""
+        cache = self._cache(max_bytes=250)
+        self._fill(cache, "a", "b")
+        cache.get("a")
+        self._fill(cache, "c")
+        self.assertEqual(sorted(p.stem for p in self.dir.glob("*.mp4")), ["a", "c"])
+        self.assertEqual((len(cache), cache.bytes, cache.stats['evictions']), (2, 200, 1))
+
+    def test_new_video_kept_even_if_over_budget(self):
+        """Test the video just rendered is never its own eviction victim"""
+        cache = self._cache(max_bytes=150)
+        self._fill(cache, "a")
+        self._fill(cache, "big", size=400)
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.get("big"), cache.path("big"))
+
+    def test_index_rebuilt_from_disk(self):
+        """Test a restart keeps LRU order, adopts unindexed videos and drops missing ones"""
+        cache = self._cache()
+        self._fill(cache, "a", "b")
+        cache.get("a")
+        self._fill(cache, "c")
+        cache.path("b").unlink()
+        stray = self.dir / "stray.mp4"
+        stray.write_bytes(b"x" * 50)
+        os.utime(stray, (1, 1))
+
+        reloaded = self._cache()
+        self.assertEqual(list(reloaded._entries), ["stray", "a", "c"])
+        self.assertEqual(reloaded.bytes, 250)
+        with open(self.dir / "index.json") as f:
+            self.assertEqual([key for key, _ in json.load(f)['entries']], ["stray", "a", "c"])
+
+        self._cache(max_bytes=150)
+        self.assertEqual(sorted(p.stem for p in self.dir.glob("*.mp4")), ["c"])
+
+    def test_unreadable_index_rebuilt(self):
+        """Test a corrupt or outdated index.json is rebuilt from the videos"""
+        self._fill(self._cache(), "a")
+        (self.dir / "index.json").write_text("{not json")
+        self.assertEqual(self._cache().get("a"), self.dir / "a.mp4")
+
+    def test_interrupted_renders_removed(self):
+        """Test temp files left by a crash are deleted on load and kept by clear()"""
+        cache = self._cache()
+        self._fill(cache, "a")
+        leftover = cache.temp_path("b")
+        leftover.write_bytes(b"half")
+        (self.dir / "index.json.tmp").write_text("{")
+
+        cache = self._cache()
+        self.assertEqual(sorted(p.name for p in self.dir.iterdir()), ["a.mp4", "index.json"])
+        self.assertEqual(len(cache), 1)
+
+        rendering = cache.temp_path("c")
+        rendering.write_bytes(b"in flight")
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(sorted(p.name for p in self.dir.iterdir()), sorted(["index.json", rendering.name]))
+
+
+class TestRenderQueue(unittest.TestCase):
+    """Test run order, superseding, promotion and the queue bound"""
+
+    def setUp(self):
+        self.queue = RenderQueue(workers=1, max_queued=8)
+        self.ran = []
+        self.finished = threading.Semaphore(0)
+        # Hold the only worker so everything submitted next waits in the queue
+        self.gate = threading.Event()
+        started = threading.Event()
+
+        def hold():
+            started.set()
+            self.gate.wait(5)
+
+        self.queue.submit(VideoJob("gate", "gate"), hold)
+        self.assertTrue(started.wait(5))
+
+    def tearDown(self):
+        self.gate.set()
+
+    def _submit(self, key, priority, supersede=False):
+        job = VideoJob(key, key, priority=priority)
+
+        def render():
+            self.ran.append(key)
+            self.finished.release()
+
+        self.assertTrue(self.queue.submit(job, render, supersede))
+        return job
+
+    def _run(self, count):
+        self.gate.set()
+        for _ in range(count):
+            self.assertTrue(self.finished.acquire(timeout=5))
+        return self.ran
+
+    def test_interactive_runs_before_precache(self):
+        """Test lower priority values run first, in submission order within a priority"""
+        for key, priority in [("p1", PRECACHE), ("i1", INTERACTIVE), ("p2", PRECACHE), ("i2", INTERACTIVE)]:
+            self._submit(key, priority)
+        self.assertEqual(self._run(4), ["i1", "i2", "p1", "p2"])
+
+    def test_newer_reply_supersedes_queued_replies(self):
+        """Test supersede cancels queued jobs of the same priority only"""
+        old = [self._submit(f"i{n}", INTERACTIVE) for n in range(2)]
+        self._submit("p1", PRECACHE)
+        self._submit("latest", INTERACTIVE, supersede=True)
+        self.assertEqual([job.state for job in old], [CANCELLED, CANCELLED])
+        self.assertEqual(old[0].error, "Superseded by a newer reply")
+        self.assertEqual(self.queue.stats['superseded'], 2)
+        self.assertEqual(self._run(2), ["latest", "p1"])
+
+    def test_requeued_job_promoted(self):
+        """Test a queued job asked for at a higher priority moves up and runs once"""
+        self._submit("p1", PRECACHE)
+        wanted = self._submit("p2", PRECACHE)
+        wanted.priority = INTERACTIVE
+        self.assertTrue(self.queue.submit(wanted, None))
+        self.assertEqual(self.queue.stats['promoted'], 1)
+        self.assertEqual(self._run(2), ["p2", "p1"])
+        time.sleep(0.05)
+        self.assertEqual(self.ran, ["p2", "p1"])
+
+    def test_full_queue_drops_newest_lowest_priority(self):
+        """Test a full queue drops its newest pre-cache job for a reply, and rejects what ranks lowest"""
+        self.queue.max_queued = 3
+        self._submit("i1", INTERACTIVE)
+        older = self._submit("p1", PRECACHE)
+        newer = self._submit("p2", PRECACHE)
+        self._submit("i2", INTERACTIVE)
+        self.assertEqual((older.state, newer.state), (QUEUED, CANCELLED))
+        self.assertEqual(newer.error, "Dropped for a higher-priority job")
+
+        extra = VideoJob("p3", "p3", priority=PRECACHE)
+        self.assertFalse(self.queue.submit(extra, lambda: self.ran.append("p3")))
+        self.assertEqual((extra.state, extra.error), (CANCELLED, "Render queue full"))
+        self.assertEqual(self.queue.stats['rejected'], 2)
+        self.assertEqual(self._run(3), ["i1", "i2", "p1"])
+
+    def test_wait_times_reported(self):
+        """Test summary() reports queue depth per priority and how long jobs waited"""
+        self._submit("i1", INTERACTIVE)
+        self._submit("p1", PRECACHE)
+        self._submit("p2", PRECACHE)
+        time.sleep(0.05)
+        summary = self.queue.summary()
+        self.assertEqual((summary['running'], summary['queued']), (1, 3))
+        self.assertEqual(summary['depth'], {'interactive': 1, 'precache': 2})
+        self.assertGreaterEqual(summary['oldest_wait_s'], 0.05)
+
+        self._run(3)
+        summary = self.queue.summary()
+        self.assertEqual((summary['queued'], summary['oldest_wait_s']), (0, 0.0))
+        self.assertEqual(summary['stats']['started'], 4)
+        self.assertGreaterEqual(summary['stats']['wait_max_s'], 0.05)
+        self.assertGreater(summary['avg_wait_s'], 0.0)
+
+
+class GatedWorker(Wav2LipWorker):
+    """A worker without the model: renders write a few bytes once the gate opens"""
+
+    def __init__(self, directory):
+        super().__init__(directory, "wav2lip.pth", "face.png", directory)
+        self.gate = threading.Event()
+        self.rendering = threading.Event()
+
+    def _load(self):
+        pass
+
+    def _render(self, job):
+        self.rendering.set()
+        self.gate.wait(5)
+        job.output_path.write_bytes(b"x" * 100)
+        return job.output_path
+
+
+class TestWav2LipWorker(unittest.TestCase):
+    """Test mel windows, cancellation and stopping without torch"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+        self.worker = GatedWorker(self.dir).start()
+
+    def tearDown(self):
+        self.worker.gate.set()
+        self.worker.stop()
+        self.tmp.cleanup()
+
+    def test_mel_chunks_one_per_frame(self):
+        """Test a window per 80/FPS mel steps, and a last window flush with the end"""
+        mel = np.arange(80 * 100, dtype=float).reshape(80, 100)
+        chunks = mel_chunks(mel)
+        step = 80. / FPS
+        self.assertEqual(len(chunks), int((100 - MEL_STEP) / step) + 2)
+        self.assertTrue(all(chunk.shape == (80, MEL_STEP) for chunk in chunks))
+        np.testing.assert_array_equal(chunks[1], mel[:, int(step):int(step) + MEL_STEP])
+        np.testing.assert_array_equal(chunks[-1], mel[:, -MEL_STEP:])
+
+    def test_cancelled_before_start(self):
+        """Test a job cancelled while queued is never rendered"""
+        first = self.worker.submit(self.dir / "a.wav", self.dir / "a.mp4")
+        self.assertTrue(self.worker.rendering.wait(5))
+        queued = self.worker.submit(self.dir / "b.wav", self.dir / "b.mp4")
+        queued.cancel()
+        self.worker.gate.set()
+        self.assertTrue(queued.wait(5))
+        self.assertEqual((queued.result, queued.error, queued.started), (None, "Cancelled", None))
+        self.assertEqual(first.result, self.dir / "a.mp4")
+        self.assertFalse((self.dir / "b.mp4").exists())
+        self.assertEqual(self.worker.stats['cancelled'], 1)
+
+    def test_cancelled_during_render(self):
+        """Test a job cancelled mid-render finishes as cancelled and leaves no output"""
+        job = self.worker.submit(self.dir / "a.wav", self.dir / "a.mp4")
+        self.assertTrue(job.wait_started(5))
+        job.cancel()
+        self.worker.gate.set()
+        self.assertTrue(job.wait(5))
+        self.assertEqual((job.result, job.error), (None, "Cancelled"))
+        self.assertFalse((self.dir / "a.mp4").exists())
+
+    def test_generate_after_stop_returns(self):
+        """Test jobs queued at stop() and submitted after it fail instead of waiting forever"""
+        self.worker.submit(self.dir / "a.wav", self.dir / "a.mp4")
+        self.assertTrue(self.worker.rendering.wait(5))
+        queued = self.worker.submit(self.dir / "b.wav", self.dir / "b.mp4")
+        stopper = threading.Thread(target=self.worker.stop)
+        stopper.start()
+        while not self.worker._stopped:
+            time.sleep(0.01)
+        self.worker.gate.set()
+        stopper.join(5)
+        self.assertTrue(queued.wait(5))
+        self.assertEqual(queued.error, "Worker stopped")
+        self.assertIsNone(self.worker.generate(self.dir / "c.wav", self.dir / "c.mp4"))
+
+
+if __name__ == "__main__":
+    unittest.main()
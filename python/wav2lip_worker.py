@@ -0,0 +1,379 @@
+#!/usr/bin/env python3
+"""
+RHEA Wav2Lip Worker - Resident Wav2Lip inference for the animation service
+
+generate_wav2lip_video used to run `python Wav2Lip/inference.py` for every
+phrase: a new interpreter, the torch import, the checkpoint load and S3FD
+face detection on the same static rhea_avatar.png, all before the actual
+mel-to-frame inference.
+
+Wav2LipWorker does the fixed work once:
+1. Loads the checkpoint when its thread starts
+2. Detects and crops the face once per image, cached on disk under the
+   image's SHA-256 (so a restart skips detection too)
+3. Keeps the masked 96x96 face input on the device, paired with each
+   phrase's mel chunks as inference.py's datagen() would
+
+Jobs reach the worker thread, which owns the model, through an in-process
+queue; callers wait on the returned Job. A cancelled job is skipped if it
+has not started, and its output discarded if it has. Once stop() is
+called, jobs still queued and new submissions fail with "Worker stopped".
+"""
+
+import os
+import sys
+import time
+import queue
+import hashlib
+import subprocess
+import threading
+from pathlib import Path
+
+# inference.py defaults for a static image
+IMG_SIZE = 96
+MEL_STEP = 16
+FPS = 25
+PADS = (0, 10, 0, 0)        # top, bottom, left, right
+BATCH_SIZE = 128
+FACE_CACHE_VERSION = 1
+
+
+def mel_chunks(mel, fps=FPS):
+    """16-step mel windows, one per video frame (as in inference.py)"""
+    chunks = []
+    step = 80. / fps
+    i = 0
+    while True:
+        start = int(i * step)
+        if start + MEL_STEP > len(mel[0]):
+            chunks.append(mel[:, len(mel[0]) - MEL_STEP:])
+            return chunks
+        chunks.append(mel[:, start:start + MEL_STEP])
+        i += 1
+
+
+class Job:
+    """One phrase for the worker: audio in, mp4 out"""
+
+    def __init__(self, audio_path, output_path):
+        self.audio_path = Path(audio_path)
+        self.output_path = Path(output_path)
+        self.result = None
+        self.error = None
+        self.cancelled = False
+        self.submitted = time.time()
+        self.started = None
+        self._started = threading.Event()
+        self._done = threading.Event()
+
+    def start(self):
+        self.started = time.time()
+        self._started.set()
+
+    def finish(self, result, error=None):
+        self.result = result
+        self.error = error
+        self._started.set()
+        self._done.set()
+
+    def cancel(self):
+        """Give up on the job (its caller stopped waiting)"""
+        self.cancelled = True
+
+    def wait_started(self, timeout=None):
+        """True once the worker picked the job up (or finished it)"""
+        return self._started.wait(timeout)
+
+    def wait(self, timeout=None):
+        """True once the job finished (result is the mp4 path, or None on error)"""
+        return self._done.wait(timeout)
+
+
+class Wav2LipWorker:
+    """Loads Wav2Lip once and renders queued jobs on one thread"""
+
+    def __init__(self, wav2lip_path, checkpoint, face_image, cache_dir, device=None, batch_size=BATCH_SIZE):
+        """
+        Args:
+            wav2lip_path: Cloned Wav2Lip repository (models/, audio.py, face_detection/)
+            checkpoint: wav2lip.pth
+            face_image: Static avatar image
+            cache_dir: Where detected face crops are cached
+            device: torch device (default: cuda if available, else cpu)
+            batch_size: Frames per forward pass
+        """
+        self.wav2lip_path = Path(wav2lip_path)
+        self.checkpoint = Path(checkpoint)
+        self.face_image = Path(face_image)
+        self.cache_dir = Path(cache_dir)
+        self.device = device
+        self.batch_size = batch_size
+        self.jobs = queue.Queue()
+        self.ready = threading.Event()
+        self.error = None
+        self.stats = {
+            'jobs': 0, 'failed': 0, 'cancelled': 0, 'frames': 0,
+            'load_s': None, 'face_cache': None, 'last_ms': None
+        }
+        self._thread = None
+        self._stopped = False
+        self._lock = threading.Lock()
+
+    @property
+    def available(self):
+        """Model loaded and face prepared"""
+        return self.ready.is_set() and self.error is None
+
+    def start(self):
+        if self._thread is None:
+            self._stopped = False
+            self._thread = threading.Thread(target=self._run, name="wav2lip-worker", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        if self._thread is not None:
+            with self._lock:
+                self._stopped = True
+                self.jobs.put(None)
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def submit(self, audio_path, output_path):
+        """Queue a job; returns the Job to wait on (already failed if the worker is stopped)"""
+        job = Job(audio_path, output_path)
+        with self._lock:
+            if self._stopped:
+                job.finish(None, "Worker stopped")
+            else:
+                self.jobs.put(job)
+        return job
+
+    def generate(self, audio_path, output_path, timeout=None, queue_timeout=None):
+        """
+        Render and wait: the mp4 path, or None on error or timeout.
+
+        Args:
+            timeout: Seconds for the render, from when the worker starts it
+            queue_timeout: Seconds the job may wait for the worker to start it
+        """
+        job = self.submit(audio_path, output_path)
+        if not job.wait_started(queue_timeout) or not job.wait(timeout):
+            job.cancel()
+        return job.result
+
+    # -------------------------------------------------------------------------
+    # Worker thread
+    # -------------------------------------------------------------------------
+
+    def _run(self):
+        try:
+            self._load()
+        except Exception as e:
+            self.error = str(e) or type(e).__name__
+            print(f"⚠️  Wav2Lip worker unavailable: {self.error}")
+        finally:
+            self.ready.set()
+
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                break
+            if self.error:
+                job.finish(None, self.error)
+                continue
+            if self._stopped:
+                job.finish(None, "Worker stopped")
+                continue
+            if job.cancelled:
+                self.stats['cancelled'] += 1
+                job.finish(None, "Cancelled")
+                continue
+            job.start()
+            start = time.perf_counter()
+            try:
+                result = self._render(job)
+                if job.cancelled:
+                    # The caller gave up mid-render and cleaned up after it
+                    job.output_path.unlink(missing_ok=True)
+                    self.stats['cancelled'] += 1
+                    job.finish(None, "Cancelled")
+                else:
+                    job.finish(result)
+                self.stats['jobs'] += 1
+            except Exception as e:
+                self.stats['failed'] += 1
+                print(f"Wav2Lip error: {e}")
+                job.finish(None, str(e))
+            self.stats['last_ms'] = (time.perf_counter() - start) * 1000
+
+    def _load(self):
+        start = time.perf_counter()
+        if not (self.wav2lip_path / 'inference.py').exists():
+            raise FileNotFoundError(f"Wav2Lip not found at {self.wav2lip_path}")
+        if str(self.wav2lip_path) not in sys.path:
+            sys.path.insert(0, str(self.wav2lip_path))
+
+        import numpy as np
+        import torch
+        import audio
+        from models import Wav2Lip
+
+        device = self.device or ('cuda' if torch.cuda.is_available() else 'cpu')
+        checkpoint = torch.load(str(self.checkpoint), map_location=device)
+        state = {k.replace('module.', ''): v for k, v in checkpoint['state_dict'].items()}
+        model = Wav2Lip()
+        model.load_state_dict(state)
+        self.model = model.to(device).eval()
+
+        self.frame, self.coords, face = self._prepare_face(device)
+        masked = face.copy()
+        masked[IMG_SIZE // 2:] = 0
+        image = np.concatenate((masked, face), axis=2)[None] / 255.
+        self.face_input = torch.FloatTensor(np.transpose(image, (0, 3, 1, 2))).to(device)
+
+        self._np, self._torch, self._audio = np, torch, audio
+        self.device = device
+        self.stats['load_s'] = round(time.perf_counter() - start, 2)
+        print(f"✅ Wav2Lip worker ready on {device} ({self.stats['load_s']} s, "
+              f"face cache {self.stats['face_cache']})")
+
+    def _prepare_face(self, device):
+        """Avatar frame, face box and 96x96 face crop (detected once per image)"""
+        import cv2
+        import numpy as np
+
+        data = self.face_image.read_bytes()
+        frame = cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_COLOR)
+        if frame is None:
+            raise ValueError(f"Could not read {self.face_image}")
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.cache_dir / f"{digest}_v{FACE_CACHE_VERSION}.npz"
+
+        try:
+            with np.load(path) as cached:
+                self.stats['face_cache'] = 'hit'
+                return frame, tuple(int(v) for v in cached['coords']), cached['face']
+        except (OSError, ValueError, KeyError):
+            pass
+
+        coords = self._detect_face(frame, device)
+        y1, y2, x1, x2 = coords
+        face = cv2.resize(frame[y1:y2, x1:x2], (IMG_SIZE, IMG_SIZE))
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + '.tmp')
+        with open(tmp, 'wb') as f:
+            np.savez(f, coords=np.array(coords), face=face)
+        os.replace(tmp, path)
+        self.stats['face_cache'] = 'miss'
+        return frame, coords, face
+
+    def _detect_face(self, frame, device):
+        import numpy as np
+        import face_detection
+
+        detector = face_detection.FaceAlignment(
+            face_detection.LandmarksType._2D, flip_input=False, device=device
+        )
+        rect = detector.get_detections_for_batch(np.array([frame]))[0]
+        del detector
+        if rect is None:
+            raise ValueError(f"Face not detected in {self.face_image}")
+        top, bottom, left, right = PADS
+        h, w = frame.shape[:2]
+        return (max(0, rect[1] - top), min(h, rect[3] + bottom),
+                max(0, rect[0] - left), min(w, rect[2] + right))
+
+    def _render(self, job):
+        import cv2
+        np, torch = self._np, self._torch
+
+        mel = self._audio.melspectrogram(self._audio.load_wav(str(job.audio_path), 16000))
+        if np.isnan(mel.reshape(-1)).sum() > 0:
+            raise ValueError("Mel contains nan (silent or corrupt audio?)")
+        chunks = mel_chunks(mel)
+
+        h, w = self.frame.shape[:2]
+        y1, y2, x1, x2 = self.coords
+        video = job.output_path.with_name(job.output_path.stem + '.tmp.avi')
+        out = cv2.VideoWriter(str(video), cv2.VideoWriter_fourcc(*'DIVX'), FPS, (w, h))
+        try:
+            with torch.no_grad():
+                for i in range(0, len(chunks), self.batch_size):
+                    mels = np.asarray(chunks[i:i + self.batch_size])[:, None]
+                    mels = torch.FloatTensor(mels).to(self.device)
+                    faces = self.face_input.expand(len(mels), -1, -1, -1)
+                    pred = self.model(mels, faces).cpu().numpy().transpose(0, 2, 3, 1) * 255.
+                    for p in pred:
+                        f = self.frame.copy()
+                        f[y1:y2, x1:x2] = cv2.resize(p.astype(np.uint8), (x2 - x1, y2 - y1))
+                        out.write(f)
+        finally:
+            out.release()
+        self.stats['frames'] += len(chunks)
+
+        try:
+            subprocess.run([
+                'ffmpeg', '-y', '-loglevel', 'error',
+                '-i', str(job.audio_path), '-i', str(video),
+                '-strict', '-2', '-q:v', '1', str(job.output_path)
+            ], check=True, capture_output=True, timeout=60)
+        finally:
+            video.unlink(missing_ok=True)
+        return job.output_path if job.output_path.exists() else None
+
+
+# =============================================================================
+# BENCHMARK
+# =============================================================================
+
+def benchmark(audio_path, wav2lip_path, checkpoint, face_image, cache_dir, runs=3):
+    """Seconds per phrase: inference.py per phrase vs. the resident worker"""
+    import tempfile
+
+    audio_path, checkpoint, face_image = (os.path.abspath(p) for p in (audio_path, checkpoint, face_image))
+    results = {'process_s': [], 'worker_s': []}
+    with tempfile.TemporaryDirectory() as tmp:
+        for i in range(runs):
+            start = time.perf_counter()
+            subprocess.run([
+                sys.executable, str(Path(wav2lip_path) / 'inference.py'),
+                '--checkpoint_path', str(checkpoint), '--face', str(face_image),
+                '--audio', str(audio_path), '--outfile', os.path.join(tmp, f'p{i}.mp4'),
+                '--resize_factor', '1', '--nosmooth'
+            ], cwd=str(wav2lip_path), check=True, capture_output=True)
+            results['process_s'].append(time.perf_counter() - start)
+
+        worker = Wav2LipWorker(wav2lip_path, checkpoint, face_image, cache_dir).start()
+        worker.ready.wait()
+        if worker.error:
+            raise RuntimeError(worker.error)
+        for i in range(runs):
+            start = time.perf_counter()
+            worker.generate(audio_path, Path(tmp) / f'w{i}.mp4')
+            results['worker_s'].append(time.perf_counter() - start)
+        worker.stop()
+    results['load_s'] = worker.stats['load_s']
+    return results
+
+
+if __name__ == '__main__':
+    import argparse
+
+    here = Path(__file__).parent
+    parser = argparse.ArgumentParser(description="RHEA resident Wav2Lip worker")
+    parser.add_argument('--benchmark', metavar='WAV', help="Time inference.py vs. the worker on a 16 kHz wav")
+    parser.add_argument('--runs', type=int, default=3)
+    parser.add_argument('--wav2lip', default=str(here / 'Wav2Lip'))
+    parser.add_argument('--checkpoint', default=str(here / 'models' / 'wav2lip.pth'))
+    parser.add_argument('--face', default=str(here.parent / 'src' / 'renderer' / 'assets' / 'images' / 'rhea_avatar.png'))
+    parser.add_argument('--cache-dir', default=str(here / 'cache' / 'faces'))
+    args = parser.parse_args()
+
+    if args.benchmark:
+        res = benchmark(args.benchmark, args.wav2lip, args.checkpoint, args.face, args.cache_dir, args.runs)
+        print(f"inference.py: {', '.join(f'{s:.2f}' for s in res['process_s'])} s per phrase")
+        print(f"worker:       {', '.join(f'{s:.2f}' for s in res['worker_s'])} s per phrase "
+              f"(after a one-time {res['load_s']} s load)")
+    else:
+        parser.print_help()
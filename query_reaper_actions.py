@@ -2,26 +2,39 @@
 """
 Query REAPER via HTTP API to find action IDs automatically
 """
-import urllib.request
 import json
 import re
 import sys
 
+from reaper_action_catalog import get_action_catalog
+from reaper_http import get_http_client, ReaperHTTPError
+
+# Action names to resolve from the local catalog
+CATALOG_QUERIES = {
+    'play': 'transport play',
+    'stop': 'transport stop',
+    'record': 'transport record',
+    'pause': 'transport pause',
+    'metronome': 'toggle metronome',
+    'newtrack': 'insert new track',
+    'marker': 'insert marker at current position',
+}
+
 def query_reaper_action_list():
     """Try to get action list from REAPER HTTP API"""
     try:
         # REAPER HTTP API might support listing actions
-        url = "http://localhost:8080/_/GET/ACTIONS"
-        req = urllib.request.Request(url)
-        response = urllib.request.urlopen(req, timeout=2)
-        data = response.read().decode()
-        return data
+        status, body = get_http_client().request("/_/GET/ACTIONS")
+        return body.decode() if status == 200 else None
     except Exception as e:
         # HTTP API might not support this endpoint
         return None
 
-def find_action_by_name(action_name, action_list_text):
-    """Find action ID by searching action list text"""
+def find_action_by_name(action_name, action_list_text=None):
+    """Find action ID by name: local action catalog first, then action list text"""
+    action = get_action_catalog().best(action_name)
+    if action:
+        return action.id
     if not action_list_text:
         return None
     
@@ -34,12 +47,11 @@ def find_action_by_name(action_name, action_list_text):
 
 def get_action_id_via_test(action_id):
     """Test if an action ID works by trying it"""
+    # Keep-alive connection from the shared pool instead of one connection per probe
     try:
-        url = f"http://localhost:8080/_/ACTION/{action_id}"
-        req = urllib.request.Request(url)
-        response = urllib.request.urlopen(req, timeout=1)
-        return response.status == 200
-    except:
+        status, _ = get_http_client().request(f"/_/ACTION/{action_id}")
+        return status == 200
+    except ReaperHTTPError:
         return False
 
 def auto_find_action_ids():
@@ -106,6 +118,20 @@ def main():
     print("=" * 60)
     print()
     
+    # Method 0: Local catalog from dawrv_export_action_ids.lua (no probing)
+    print("Method 0: Searching the local action catalog...")
+    catalog = get_action_catalog()
+    if catalog.actions:
+        print(f"✅ {len(catalog.actions)} actions indexed")
+        for name, query in CATALOG_QUERIES.items():
+            results = catalog.search(query, limit=1)
+            if results:
+                score, action = results[0]
+                print(f"   {name}: {action.id}  ({action.name}, score {score:.2f})")
+        return
+    print("⚠️  No action catalog yet (run dawrv_export_action_ids.lua in REAPER)")
+    print()
+    
     # Method 1: Try HTTP API query (might not work)
     print("Method 1: Trying REAPER HTTP API...")
     action_list = query_reaper_action_list()
@@ -0,0 +1,459 @@
+#!/usr/bin/env python3
+"""
+REAPER Action Catalog - Searchable index of REAPER's actions
+
+parse_action_ids.find_action_id scanned action lists linearly with
+substring matching, and query_reaper_actions.py brute-forced ID ranges
+by firing each action over HTTP. This module indexes the exports written
+by the DAWRV Lua scripts instead:
+
+- dawrv_action_catalog.tsv   full catalog (dawrv_export_action_ids.lua):
+                             section<TAB>command_id<TAB>named_id<TAB>name
+- dawrv_actions.json         grouped export (dawrv_export_action_ids.lua)
+- dawrv_action_ids.txt       "ID: n | Name: ..." list (dawrv_list_actions.lua)
+
+The index is an inverted token index (token -> action postings) plus a
+one-deletion neighbourhood for typo tolerance and a sorted vocabulary for
+prefix matches. It is saved as one pickle next to the exports and rebuilt
+only when an export's mtime/size changes. Lookups by command ID or named
+ID are dict hits; name searches score postings, typically well under a
+millisecond.
+
+Usage:
+    from reaper_action_catalog import get_action_catalog
+
+    catalog = get_action_catalog()
+    catalog.search("toggle metronome")     # [(score, Action), ...]
+    catalog.by_id(40364)
+    catalog.search("quantize", section="midi_editor")
+"""
+import os
+import re
+import sys
+import json
+import time
+import heapq
+import math
+import bisect
+import pickle
+import threading
+from array import array
+from collections import namedtuple
+
+REAPER_RESOURCE_PATH = os.environ.get(
+    "DAWRV_REAPER_RESOURCE_PATH",
+    os.path.expanduser("~/Library/Application Support/REAPER")
+)
+CATALOG_SOURCES = [
+    os.path.join(REAPER_RESOURCE_PATH, "dawrv_action_catalog.tsv"),
+    os.path.join(REAPER_RESOURCE_PATH, "dawrv_actions.json"),
+    os.path.join(REAPER_RESOURCE_PATH, "dawrv_action_ids.txt"),
+]
+CATALOG_CACHE = os.environ.get(
+    "DAWRV_ACTION_CATALOG_CACHE",
+    os.path.join(REAPER_RESOURCE_PATH, "DAWRV", "action_catalog.idx")
+)
+INDEX_VERSION = 3
+
+# REAPER action list sections (KbdSectionInfo unique IDs)
+SECTIONS = {
+    "main": 0,
+    "main_alt": 100,
+    "midi_editor": 32060,
+    "midi_event_list": 32061,
+    "midi_inline": 32062,
+    "media_explorer": 32063,
+}
+
+# Direction words (in/out, on/off, up/down) tell action pairs apart, so they are kept
+STOPWORDS = {"a", "an", "the", "to", "of", "and", "for", "at", "with"}
+
+# Score weights per match kind
+EXACT, PREFIX, TYPO = 1.0, 0.7, 0.5
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+Action = namedtuple("Action", "section id named_id name")
+
+
+def tokenize(text):
+    """Lowercase alphanumeric tokens without stopwords"""
+    return [t for t in _TOKEN.findall(text.lower()) if t not in STOPWORDS]
+
+
+def _deletions(token):
+    return {token[:i] + token[i + 1:] for i in range(len(token))} if len(token) > 3 else set()
+
+
+# ============================================================================
+# EXPORT PARSING
+# ============================================================================
+
+_TXT_LINE = re.compile(r"ID:\s*(-?\d+)\s*\|\s*Name:\s*(.+)")
+
+
+def load_actions(paths):
+    """
+    Read actions from DAWRV exports (TSV, grouped JSON or TXT).
+
+    Returns:
+        De-duplicated list of Action, in first-seen order
+    """
+    actions = {}
+
+    def add(section, command_id, named_id, name):
+        name = (name or "").strip()
+        if not name:
+            return
+        key = (section, named_id or command_id)
+        if key not in actions:
+            actions[key] = Action(section, command_id, named_id or "", name)
+
+    def walk(node):
+        if isinstance(node, dict):
+            if "name" in node and "id" in node:
+                add(int(node.get("section", 0)), int(node["id"]), node.get("named_id"), node["name"])
+            else:
+                for value in node.values():
+                    walk(value)
+        elif isinstance(node, list):
+            for value in node:
+                walk(value)
+
+    for path in paths:
+        if not os.path.exists(path):
+            continue
+        with open(path, encoding="utf-8", errors="replace") as f:
+            if path.endswith(".json"):
+                try:
+                    walk(json.load(f))
+                except ValueError as e:
+                    print(f"⚠️  Skipping {path}: {e}", file=sys.stderr)
+                continue
+            for line in f:
+                if path.endswith(".tsv"):
+                    fields = line.rstrip("\n").split("\t")
+                    if len(fields) >= 4 and fields[1].lstrip("-").isdigit():
+                        add(int(fields[0]), int(fields[1]), fields[2], fields[3])
+                else:
+                    match = _TXT_LINE.search(line)
+                    if match:
+                        add(0, int(match.group(1)), None, match.group(2))
+    return list(actions.values())
+
+
+# ============================================================================
+# INDEX
+# ============================================================================
+
+class ActionCatalog:
+    """Inverted token index over REAPER actions with fuzzy scoring"""
+
+    def __init__(self, actions, sources=()):
+        self.actions = list(actions)
+        self.sources = list(sources)
+        self._by_id = {}
+        self._by_named = {}
+        postings = {}
+        self._lengths = array("H")
+        for index, action in enumerate(self.actions):
+            self._by_id.setdefault((action.section, action.id), index)
+            if action.named_id:
+                self._by_named[action.named_id.lstrip("_")] = index
+            tokens = tokenize(action.name)
+            self._lengths.append(min(len(tokens), 65535))
+            for token in tokens:
+                postings.setdefault(token, set()).add(index)
+        self._postings = {t: frozenset(p) for t, p in postings.items()}
+        self._vocab = sorted(postings)
+        self._deletes = {}
+        for token in self._vocab:
+            for variant in _deletions(token) | {token}:
+                self._deletes.setdefault(variant, []).append(token)
+        total = max(1, len(self.actions))
+        self._idf = {t: math.log(1 + total / len(p)) for t, p in postings.items()}
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+
+    def by_id(self, command_id, section=0):
+        """Action for a numeric command ID (None if unknown)"""
+        index = self._by_id.get((section, int(command_id)))
+        return self.actions[index] if index is not None else None
+
+    def by_named_id(self, named_id):
+        """Action for a named command ID such as _SWS_ABOUT"""
+        index = self._by_named.get(str(named_id).lstrip("_"))
+        return self.actions[index] if index is not None else None
+
+    def _candidates(self, token):
+        """Index tokens matching a query token: [(token, weight)]"""
+        matches = {}
+        if token in self._postings:
+            matches[token] = EXACT
+        if len(token) >= 3:
+            start = bisect.bisect_left(self._vocab, token)
+            for vocab_token in self._vocab[start:start + 50]:
+                if not vocab_token.startswith(token):
+                    break
+                matches.setdefault(vocab_token, PREFIX)
+        if token not in self._postings and len(token) > 3:
+            # Edit distance <= 1 via shared deletions (typos, ASR slips)
+            for variant in _deletions(token) | {token}:
+                for vocab_token in self._deletes.get(variant, ()):
+                    if abs(len(vocab_token) - len(token)) <= 1:
+                        matches.setdefault(vocab_token, TYPO)
+        return matches
+
+    def search(self, query, section=None, limit=5):
+        """
+        Rank actions by name for a free-text query.
+
+        Args:
+            query: e.g. "toggle metronome", "insert new track"
+            section: Section name (see SECTIONS) or ID to restrict results
+            limit: Maximum results
+
+        Returns:
+            [(score, Action)] best first: most query tokens matched, then
+            score (1.0 = every query token matched exactly and nothing else
+            is in the name)
+        """
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+        if isinstance(section, str):
+            section = SECTIONS.get(section, section)
+
+        # Rare tokens pick the candidates; common ones ("track", "toggle")
+        # only add to their scores via set membership, so a query never walks
+        # the postings of a token that appears in thousands of names
+        per_token = []
+        possible = 0.0
+        for token in tokens:
+            idf = self._idf.get(token, math.log(1 + len(self.actions)))
+            possible += idf
+            matches = self._candidates(token)
+            size = sum(len(self._postings[t]) for t in matches)
+            per_token.append((size, idf, matches))
+        per_token.sort(key=lambda item: item[0])
+        cap = max(64, len(self.actions) // 50)
+
+        scores = {}
+        matched = {}
+        for position, (size, idf, matches) in enumerate(per_token):
+            # Best-weighted match per action, built with set operations
+            walk = position == 0 or size <= cap or not scores
+            best = {}
+            for vocab_token, weight in sorted(matches.items(), key=lambda m: -m[1]):
+                postings = self._postings[vocab_token]
+                hits = (postings if walk else scores.keys() & postings) - best.keys()
+                best.update(dict.fromkeys(hits, weight * idf))
+            if not scores:
+                scores = best
+                matched = dict.fromkeys(best, 1)
+                continue
+            for index, score in best.items():
+                scores[index] = scores.get(index, 0.0) + score
+                matched[index] = matched.get(index, 0) + 1
+
+        if section is not None:
+            matched = {i: m for i, m in matched.items() if self.actions[i].section == section}
+        if not matched:
+            return []
+        # Names matching more query tokens always rank first, so only the
+        # top tier needs scoring (unless it has fewer than limit entries)
+        top = max(matched.values())
+        pool = [i for i, m in matched.items() if m == top]
+        if len(pool) < limit:
+            pool = list(matched)
+        full = len(tokens)
+        lengths = self._lengths
+
+        def rank(index):
+            # Coverage, discounted for partial matches and extra words in the name
+            m = matched[index]
+            extra = max(0, lengths[index] - m)
+            return (m, scores[index] / possible * (1.0 if m == full else 0.8) / (1.0 + 0.1 * extra), -index)
+
+        best = heapq.nlargest(limit, pool, key=rank)
+        return [(round(rank(i)[1], 4), self.actions[i]) for i in best]
+
+    def best(self, query, section=None, min_score=0.5):
+        """Best action for a query, or None below min_score"""
+        results = self.search(query, section, limit=1)
+        if results and results[0][0] >= min_score:
+            return results[0][1]
+        return None
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            # Actions as plain tuples: a pickled Action names its defining
+            # module, which is __main__ when the CLI rebuilt the index
+            state = dict(self.__dict__, actions=[tuple(a) for a in self.actions])
+            pickle.dump((INDEX_VERSION, self.sources, state), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            version, sources, state = pickle.load(f)
+        if version != INDEX_VERSION:
+            raise ValueError(f"Index version {version} != {INDEX_VERSION}")
+        catalog = cls.__new__(cls)
+        catalog.__dict__.update(state)
+        catalog.actions = [Action(*a) for a in state["actions"]]
+        return catalog
+
+
+def _source_stamps(paths):
+    stamps = []
+    for path in paths:
+        try:
+            st = os.stat(path)
+            stamps.append((path, st.st_mtime_ns, st.st_size))
+        except OSError:
+            pass
+    return stamps
+
+
+def build_catalog(sources=None, cache_path=None):
+    """
+    Load the cached index, rebuilding it if any export changed.
+
+    Returns:
+        ActionCatalog (empty if there are no exports)
+    """
+    sources = sources or CATALOG_SOURCES
+    cache_path = cache_path or CATALOG_CACHE
+    stamps = _source_stamps(sources)
+    try:
+        catalog = ActionCatalog.load(cache_path)
+        if catalog.sources == stamps:
+            return catalog
+    except Exception:
+        pass                # missing, stale or unreadable: rebuild
+    catalog = ActionCatalog(load_actions([s[0] for s in stamps]), stamps)
+    if stamps:
+        try:
+            catalog.save(cache_path)
+        except OSError as e:
+            print(f"⚠️  Could not save action index: {e}", file=sys.stderr)
+    return catalog
+
+
+_catalog = None
+_checked_at = 0.0
+_catalog_lock = threading.Lock()
+
+
+def get_action_catalog(max_age=1.0):
+    """Process-wide catalog; export mtimes are re-checked at most every max_age s"""
+    global _catalog, _checked_at
+    with _catalog_lock:
+        now = time.monotonic()
+        if _catalog is None or now - _checked_at > max_age:
+            if _catalog is None or _catalog.sources != _source_stamps(CATALOG_SOURCES):
+                _catalog = build_catalog()
+            _checked_at = now
+        return _catalog
+
+
+# ============================================================================
+# BENCHMARK
+# ============================================================================
+
+def synthetic_actions(count=12000, seed=7):
+    """Action list shaped like REAPER's (prefix: verb object modifiers)"""
+    import random
+    rng = random.Random(seed)
+    prefixes = ["Track", "Item", "Transport", "View", "Markers", "Edit", "Envelope", "Take", "SWS", "Xenakios"]
+    verbs = ["toggle", "set", "select", "insert", "remove", "move", "nudge", "zoom", "go", "render"]
+    objects = ["mute", "solo", "record arm", "volume", "pan", "metronome", "loop points", "time selection",
+               "marker", "region", "envelope", "fx chain", "grid", "cursor", "selected items", "tempo",
+               "phase", "width", "send", "receive", "folder", "color", "height", "lane", "fade in", "fade out",
+               "crossfade", "pitch", "playrate", "snap", "ripple", "locking", "peaks", "spectral", "take",
+               "stretch marker", "automation", "input monitoring", "freeze", "render", "glue", "split"]
+    # REAPER numbers many actions ("... for track 07", "... slot 3")
+    numbered = [f"{noun} {n:02d}" for noun in ("track", "slot", "marker", "fx", "screenset") for n in range(1, 100)]
+    mods = ["", "for selected tracks", "to next", "to previous", "by one pixel", "all", "(no undo)", "left", "right"]
+    actions = [Action(0, 40364, "", "Options: Toggle metronome"), Action(0, 1007, "", "Transport: Play")]
+    for i in range(count - len(actions)):
+        target = rng.choice(objects) if i % 3 else rng.choice(numbered)
+        name = f"{rng.choice(prefixes)}: {rng.choice(verbs).title()} {target} {rng.choice(mods)}".strip()
+        section = 0 if i % 5 else SECTIONS["midi_editor"]
+        actions.append(Action(section, 41000 + i, "", name))
+    return actions
+
+
+def benchmark(count=12000, queries=2000):
+    start = time.perf_counter()
+    catalog = ActionCatalog(synthetic_actions(count))
+    build_ms = (time.perf_counter() - start) * 1000
+
+    phrases = ["toggle metronome", "select all items", "nudge cursor left", "insert marker",
+               "metronom", "zoom grid", "set volume selected tracks", "togle solo"]
+    linear = [a.name.lower() for a in catalog.actions]
+    start = time.perf_counter()
+    for i in range(queries):
+        phrase = phrases[i % len(phrases)]
+        next((n for n in linear if phrase in n), None)
+    linear_us = (time.perf_counter() - start) / queries * 1e6
+
+    start = time.perf_counter()
+    for i in range(queries):
+        catalog.search(phrases[i % len(phrases)])
+    search_us = (time.perf_counter() - start) / queries * 1e6
+
+    start = time.perf_counter()
+    for i in range(queries):
+        catalog.by_id(41000 + i)
+    id_us = (time.perf_counter() - start) / queries * 1e6
+    return {"actions": count, "build_ms": build_ms, "linear_substring_us": linear_us,
+            "search_us": search_us, "by_id_us": id_us}
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="DAWRV REAPER action catalog")
+    parser.add_argument("query", nargs="*", help="Action name to search for (or a command ID)")
+    parser.add_argument("--section", help=f"Restrict to a section: {', '.join(SECTIONS)}")
+    parser.add_argument("--limit", type=int, default=5, help="Maximum results")
+    parser.add_argument("--rebuild", action="store_true", help="Rebuild the index from the exports")
+    parser.add_argument("--benchmark", action="store_true", help="Index and query a synthetic catalog")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        res = benchmark()
+        print(f"{res['actions']} actions, index built in {res['build_ms']:.0f} ms")
+        print(f"linear substring scan: {res['linear_substring_us']:8.1f} µs/query")
+        print(f"indexed fuzzy search:  {res['search_us']:8.1f} µs/query")
+        print(f"lookup by command ID:  {res['by_id_us']:8.2f} µs/query")
+        sys.exit(0)
+
+    if args.rebuild:
+        try:
+            os.remove(CATALOG_CACHE)
+        except OSError:
+            pass
+    catalog = get_action_catalog()
+    if not catalog.actions:
+        print("❌ No action exports found. Run dawrv_export_action_ids.lua in REAPER first.", file=sys.stderr)
+        sys.exit(1)
+    query = " ".join(args.query)
+    if query.lstrip("-").isdigit():
+        action = catalog.by_id(int(query), SECTIONS.get(args.section, 0))
+        print(action if action else "not found")
+    elif query:
+        for score, action in catalog.search(query, args.section, args.limit):
+            print(f"{score:6.3f}  {action.id:>8}  {action.named_id or '-':<24} {action.name}")
+    else:
+        print(f"{len(catalog.actions)} actions indexed from {len(catalog.sources)} export(s)")
@@ -7,7 +7,10 @@ import sys
 import tempfile
 import subprocess
 import socket
-import struct
+
+from reaper_osc import encode_message, REAPER_OSC_HOST, REAPER_OSC_PORT
+from reaper_command_server import try_call
+from reaper_tempo_map import get_tempo_map, seek_packet
 
 
 def create_lua_script(command, measure1=None, measure2=None):
@@ -135,30 +138,7 @@ end
 
 
 def _build_osc_message(path, args):
-    # OSC address, null padded to 4
-    data = path.encode('utf-8')
-    data += b'\x00' * (4 - (len(data) % 4))
-    # Type tag
-    types = ','
-    for a in (args or []):
-        if isinstance(a, int):
-            types += 'i'
-        elif isinstance(a, float):
-            types += 'f'
-        else:
-            types += 's'
-    tt = types.encode('utf-8')
-    data += tt + b'\x00' * (4 - (len(tt) % 4))
-    # Arguments
-    for a in (args or []):
-        if isinstance(a, int):
-            data += struct.pack('>i', a)
-        elif isinstance(a, float):
-            data += struct.pack('>f', a)
-        else:
-            s = str(a).encode('utf-8')
-            data += s + b'\x00' * (4 - (len(s) % 4))
-    return data
+    return encode_message(path, tuple(args or ()))
 
 
 def send_osc(address, args=None, host='127.0.0.1', port=8000):
@@ -177,7 +157,33 @@ def run_reaper_script(command, measure1=None, measure2=None):
     SWS-first/OSC seek approach:
       - Compute bar start/end via Lua when needed OR compute via Lua-only earlier
       - For reliability on macOS, use OSC to set /time/pos and /play, avoiding CLI -run
+
+    Returns (start, end) seconds for 'barpos' (None if unknown); nothing is
+    printed, so the bridge daemon can run this behind its framed stdout.
     """
+    # Cached tempo map: bar -> seconds locally, seek with one OSC bundle
+    tempo_map = get_tempo_map() if command in ('goto', 'play', 'loop', 'barpos') else None
+    if tempo_map is not None:
+        if command == 'barpos':
+            return tempo_map.measure_bounds(measure1 or 1)
+        packet = seek_packet(command, tempo_map, measure1, measure2)
+        try:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            sock.sendto(packet, (REAPER_OSC_HOST, REAPER_OSC_PORT))
+            sock.close()
+            return
+        except OSError as e:
+            print(f"⚠️  OSC seek failed: {e}", file=sys.stderr)
+
+    # Resident Lua command server runs the same bar logic without a REAPER launch
+    args = [a for a in (measure1, measure2) if a is not None]
+    result = try_call("bar", command, *args)
+    if result is not None:
+        if command == 'barpos':
+            start, end = result.split(",")
+            return float(start), float(end)
+        return
+
     # Fast path: compute bar times via Lua, but drive cursor via OSC
     # We still create a temp Lua to get accurate bar start/end, then send OSC /time/pos
     if command in ('goto', 'play', 'loop'):
@@ -240,6 +246,24 @@ def run_reaper_script(command, measure1=None, measure2=None):
         return
 
 
+def _run(command, measure1=None, measure2=None):
+    """Forward to the resident bridge daemon if running, else run here"""
+    from reaper_bridge_client import forward
+    response = forward("bar", command=command, measure=measure1, measure_end=measure2)
+    if response is None:
+        bounds = run_reaper_script(command, measure1, measure2)
+    elif response.get("ok"):
+        result = response["result"]
+        bounds = (result["start"], result["end"]) if result.get("start") is not None else None
+    else:
+        # Not retried here: the daemon may already have run the script
+        print(f"❌ Bridge daemon {command} failed: {response.get('error')}", file=sys.stderr)
+        sys.exit(1)
+    if command == 'barpos' and bounds is not None:
+        print(f"BARPOS_START={bounds[0]:.6f}")
+        print(f"BARPOS_END={bounds[1]:.6f}")
+
+
 def main():
     if len(sys.argv) < 2:
         print("Usage: reaper_bar_bridge.py <command> [measure] [measure_end]")
@@ -258,7 +282,7 @@ def main():
 
     # Some commands require no measures
     if command in zero_arg_cmds:
-        run_reaper_script(command)
+        _run(command)
         return
 
     # Commands that require one numeric parameter if provided
@@ -288,7 +312,7 @@ def main():
         print(f"Unknown command: {command}")
         sys.exit(1)
 
-    run_reaper_script(command, measure1, measure2)
+    _run(command, measure1, measure2)
 
 
 if __name__ == '__main__':
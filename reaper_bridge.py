@@ -5,32 +5,14 @@ REAPER Bridge - Execute REAPER actions via HTTP API, OSC, or script execution
 import subprocess
 import sys
 import os
-import struct
+
+from reaper_osc import encode_message, REAPER_OSC_HOST, REAPER_OSC_PORT
+from reaper_http import REAPER_HTTP_HOST, REAPER_HTTP_PORT, ReaperHTTPError, run_action
+from reaper_command_server import try_call
 
 def build_osc_message(path, args):
-    """Build a properly formatted OSC message"""
-    # OSC path: null-padded to 4-byte boundary
-    message = path.encode('utf-8') + b'\x00' * (4 - (len(path) % 4))
-    
-    if args:
-        # Type tag: comma + types + null-padded to 4-byte boundary
-        type_tag = ',' + ''.join('i' if isinstance(a, int) else 'f' if isinstance(a, float) else 's' for a in args)
-        message += type_tag.encode('utf-8') + b'\x00' * (4 - (len(type_tag) % 4))
-        
-        # Arguments
-        for arg in args:
-            if isinstance(arg, int):
-                message += struct.pack('>i', arg)  # Big-endian 32-bit integer
-            elif isinstance(arg, float):
-                message += struct.pack('>f', arg)  # Big-endian 32-bit float
-            elif isinstance(arg, str):
-                arg_bytes = arg.encode('utf-8')
-                message += arg_bytes + b'\x00' * (4 - (len(arg_bytes) % 4))
-    else:
-        # No arguments - just null-padded type tag
-        message += b',\x00\x00\x00'
-    
-    return message
+    """Build a properly formatted OSC message (cached/struct-packed, see reaper_osc.py)"""
+    return encode_message(path, tuple(args or ()))
 
 def execute_reaper_action(action_id):
     """Execute a REAPER action by ID using multiple methods"""
@@ -43,7 +25,7 @@ def execute_reaper_action(action_id):
         try:
             sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
             message = build_osc_message(f"/action/{action_id}", [])
-            sock.sendto(message, ('127.0.0.1', 8000))
+            sock.sendto(message, (REAPER_OSC_HOST, REAPER_OSC_PORT))
             sock.close()
             print(f"✅ REAPER action {action_id} sent via OSC (instant execution)", file=sys.stderr)
             return True  # Success!
@@ -55,7 +37,7 @@ def execute_reaper_action(action_id):
         try:
             sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
             message = build_osc_message(f"/action/{action_id}", [int(action_id)])
-            sock.sendto(message, ('127.0.0.1', 8000))
+            sock.sendto(message, (REAPER_OSC_HOST, REAPER_OSC_PORT))
             sock.close()
             print(f"✅ REAPER action {action_id} sent via OSC (format: /action/{action_id} with arg)", file=sys.stderr)
             return True
@@ -66,7 +48,7 @@ def execute_reaper_action(action_id):
         try:
             sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
             message = build_osc_message("/action", [int(action_id)])
-            sock.sendto(message, ('127.0.0.1', 8000))
+            sock.sendto(message, (REAPER_OSC_HOST, REAPER_OSC_PORT))
             sock.close()
             print(f"✅ REAPER action {action_id} sent via OSC (format: /action with arg)", file=sys.stderr)
             return True
@@ -77,23 +59,21 @@ def execute_reaper_action(action_id):
         print(f"⚠️  OSC failed: {e}", file=sys.stderr)
         pass
     
-    # Method 2: Try HTTP API as fallback (no delays)
+    # Method 2: Try HTTP API as fallback (pooled keep-alive client, see reaper_http.py)
     try:
-        import urllib.request
-        
-        url = f"http://localhost:8080/_/ACTION/{action_id}"
-        req = urllib.request.Request(url)
-        response = urllib.request.urlopen(req, timeout=2)  # Fast timeout
-        
-        if response.status == 200:
-            response.read()  # Read response to complete request
-            print(f"✅ REAPER action {action_id} sent via HTTP API", file=sys.stderr)
-            return True
-    except Exception as e:
+        run_action(action_id)
+        print(f"✅ REAPER action {action_id} sent via HTTP API", file=sys.stderr)
+        return True
+    except ReaperHTTPError as e:
         print(f"⚠️  HTTP API failed: {e}", file=sys.stderr)
         pass
     
-    # Method 3: Last resort - Use temporary Lua script file (slowest, but most compatible)
+    # Method 3: Resident Lua command server (dawrv_command_server.lua), if running
+    if try_call("action", action_id) is not None:
+        print(f"✅ REAPER action {action_id} run via command server", file=sys.stderr)
+        return True
+    
+    # Method 4: Last resort - Use temporary Lua script file (slowest, but most compatible)
     import tempfile
     temp_dir = tempfile.gettempdir()
     temp_script = os.path.join(temp_dir, f"rhea_action_{action_id}_{os.getpid()}.lua")
@@ -180,5 +160,17 @@ def execute_reaper_action(action_id):
 if __name__ == "__main__":
     if len(sys.argv) > 1:
         action_id = sys.argv[1]
+        
+        # Resident daemon (reaper_bridge_daemon.py) already holds the sockets
+        from reaper_bridge_client import forward
+        response = forward("action", action_id=action_id)
+        if response is not None:
+            if not response.get("ok"):
+                # Not retried here: the daemon may already have sent it
+                print(f"❌ Bridge daemon could not send action {action_id}: {response.get('error')}", file=sys.stderr)
+                sys.exit(1)
+            print(f"✅ REAPER action {action_id} sent via bridge daemon ({response['result']['via']})", file=sys.stderr)
+            sys.exit(0)
+        
         success = execute_reaper_action(action_id)
         sys.exit(0 if success else 1)
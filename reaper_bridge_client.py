@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+REAPER Bridge Client - Talk to the resident bridge daemon
+
+Frames are a 4-byte big-endian length followed by UTF-8 JSON:
+    request:  {"id": 7, "op": "action", "action_id": 1007}
+    response: {"id": 7, "ok": true, "result": {...}, "ms": 0.08}
+
+Requests are pipelined: submit() returns immediately with a correlation
+ID and responses may arrive out of order (slow script ops run on a worker
+pool while OSC/HTTP actions are answered inline).
+
+The CLI bridges (reaper_bridge.py, reaper_bar_bridge.py,
+reaper_tempo_bridge.py) call forward() first and only do the work
+themselves when no daemon is running. Once a request has been sent it
+is never retried locally: a timeout may still run it, and running a
+toggle twice undoes it.
+"""
+import os
+import sys
+import json
+import socket
+import struct
+import itertools
+import threading
+
+BRIDGE_SOCKET_PATH = os.environ.get("DAWRV_BRIDGE_SOCKET", "/tmp/dawrv_reaper_bridge.sock")
+MAX_FRAME = 1 << 20
+
+_LENGTH = struct.Struct(">I")
+
+
+class BridgeError(Exception):
+    """Daemon unreachable, protocol error or request timeout"""
+
+
+def encode_frame(message):
+    """Length-prefixed JSON frame"""
+    body = json.dumps(message, separators=(',', ':')).encode('utf-8')
+    if len(body) > MAX_FRAME:
+        raise BridgeError(f"Frame too large: {len(body)} bytes")
+    return _LENGTH.pack(len(body)) + body
+
+
+def _read_exact(read, size):
+    data = b''
+    while len(data) < size:
+        chunk = read(size - len(data))
+        if not chunk:
+            return None
+        data += chunk
+    return data
+
+
+def read_frame(read):
+    """
+    Read one frame using a recv/read-style callable.
+
+    Returns:
+        Decoded message, or None at EOF
+    """
+    header = _read_exact(read, _LENGTH.size)
+    if header is None:
+        return None
+    (size,) = _LENGTH.unpack(header)
+    if size > MAX_FRAME:
+        raise BridgeError(f"Frame too large: {size} bytes")
+    body = _read_exact(read, size)
+    if body is None:
+        return None
+    return json.loads(body.decode('utf-8'))
+
+
+class BridgeClient:
+    """Pipelined client for the bridge daemon's UNIX socket"""
+
+    def __init__(self, socket_path=BRIDGE_SOCKET_PATH, connect_timeout=0.5):
+        self.socket_path = socket_path
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._sock.settimeout(connect_timeout)
+        try:
+            self._sock.connect(socket_path)
+        except OSError as e:
+            self._sock.close()
+            raise BridgeError(f"Bridge daemon not reachable at {socket_path}: {e}")
+        self._sock.settimeout(None)
+
+        self._ids = itertools.count(1)
+        self._send_lock = threading.Lock()
+        self._responses = {}
+        self._cond = threading.Condition()
+        self._closed = False
+        self._reader = threading.Thread(target=self._read_loop, daemon=True)
+        self._reader.start()
+
+    def _read_loop(self):
+        try:
+            while True:
+                message = read_frame(self._sock.recv)
+                if message is None:
+                    break
+                with self._cond:
+                    self._responses[message.get("id")] = message
+                    self._cond.notify_all()
+        except (OSError, ValueError, BridgeError):
+            pass
+        finally:
+            with self._cond:
+                self._closed = True
+                self._cond.notify_all()
+
+    def submit(self, op, **fields):
+        """Send a request without waiting; returns its correlation ID"""
+        request_id = next(self._ids)
+        frame = encode_frame({"id": request_id, "op": op, **fields})
+        try:
+            with self._send_lock:
+                self._sock.sendall(frame)
+        except OSError as e:
+            raise BridgeError(f"Send failed: {e}")
+        return request_id
+
+    def wait(self, request_id, timeout=5.0):
+        """Wait for the response to a submitted request"""
+        with self._cond:
+            ready = self._cond.wait_for(
+                lambda: request_id in self._responses or self._closed, timeout=timeout
+            )
+            if request_id in self._responses:
+                return self._responses.pop(request_id)
+        if not ready:
+            raise BridgeError(f"Request {request_id} timed out")
+        raise BridgeError("Bridge daemon closed the connection")
+
+    def call(self, op, timeout=5.0, **fields):
+        """Submit a request and wait for its response"""
+        return self.wait(self.submit(op, **fields), timeout)
+
+    def close(self):
+        try:
+            self._sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self._sock.close()
+
+
+def forward(op, timeout=5.0, socket_path=None, **fields):
+    """
+    Forward one request to the daemon if it is running.
+
+    Returns:
+        Response dict ({"ok": False, "error": ...} if the request failed
+        after it was sent), or None if no daemon is reachable (the caller
+        should then do the work itself)
+    """
+    path = socket_path or BRIDGE_SOCKET_PATH
+    if not os.path.exists(path):
+        return None
+    try:
+        client = BridgeClient(path)
+    except BridgeError:
+        return None
+    try:
+        return client.call(op, timeout=timeout, **fields)
+    except BridgeError as e:
+        print(f"⚠️  Bridge daemon request failed: {e}", file=sys.stderr)
+        return {"ok": False, "error": str(e)}
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: reaper_bridge_client.py <op> [json-fields]")
+        print("Example: reaper_bridge_client.py action '{\"action_id\": 1007}'")
+        sys.exit(1)
+
+    extra = json.loads(sys.argv[2]) if len(sys.argv) > 2 else {}
+    response = forward(sys.argv[1], **extra)
+    if response is None:
+        print("❌ Bridge daemon is not running", file=sys.stderr)
+        sys.exit(2)
+    print(json.dumps(response, indent=2))
+    sys.exit(0 if response.get("ok") else 1)
@@ -0,0 +1,512 @@
+#!/usr/bin/env python3
+"""
+REAPER Bridge Daemon - Resident process for REAPER actions
+
+Replaces one Python process per action (reaper_bridge.py,
+reaper_bar_bridge.py, reaper_tempo_bridge.py via execFile) with a
+long-lived daemon that keeps its OSC socket and HTTP keep-alive
+connection pool open.
+
+Protocol: length-prefixed JSON frames (see reaper_bridge_client.py) over
+a UNIX socket (default) or stdin/stdout (--stdio, for a parent process
+such as Electron main). Requests carry an "id" that is echoed back, so
+clients can pipeline.
+
+Ops:
+    ping                                   liveness
+    action   {action_id, via?}             /action/{id} via OSC, HTTP fallback
+    actions  {action_ids, at?}             several actions as one OSC bundle
+    osc      {address, args?}              raw OSC message
+    http     {commands}                    batched web interface commands, parsed
+    bar      {command, measure?, measure_end?}   reaper_bar_bridge commands
+                                           (barpos answers {start, end})
+    tempo    {command, value?}             reaper_tempo_bridge commands
+                                           ("get" answered from the state mirror)
+    state    {track?, name?, marker?}      REAPER state mirror (OSC feedback)
+    dispatch {action_id} | {param, delta|value, track?}
+                                           coalescing queue (reaper_dispatch):
+                                           merged nudges, deduplicated toggles;
+                                           answered when queued, with the
+                                           queue's send error count (actions
+                                           that fail over OSC retry via HTTP)
+    resolve  {query, kinds?, limit?}       tracks/markers/regions/FX by name
+                                           (indexed from the state mirror)
+    find_plugin {query, instrument?, formats?, limit?}
+                                           installed plugins by spoken name
+    find_action {query, section?, limit?, run?}   search the action catalog;
+                                           run=true also fires the best match
+    stats                                  counters
+
+OSC/HTTP ops are answered inline in arrival order (so actions reach REAPER
+in the order they were sent); bar/tempo ops may launch REAPER scripts and
+run on a small worker pool, answered out of order.
+
+Usage:
+    python3 reaper_bridge_daemon.py                 # UNIX socket
+    python3 reaper_bridge_daemon.py --stdio         # framed stdin/stdout
+    python3 reaper_bridge_daemon.py --feedback-port 0   # no state mirror
+    python3 reaper_bridge_daemon.py --benchmark     # vs. per-spawn path
+"""
+import os
+import sys
+import time
+import socket
+import threading
+import subprocess
+import dataclasses
+from concurrent.futures import ThreadPoolExecutor
+
+from reaper_dispatch import DispatchQueue
+from reaper_http import REAPER_HTTP_HOST, REAPER_HTTP_PORT, ReaperHTTPClient
+from reaper_name_resolver import NameResolver
+from reaper_osc import REAPER_OSC_HOST, REAPER_OSC_PORT, encode_message, action_bundle
+from reaper_state import REAPER_FEEDBACK_HOST, REAPER_FEEDBACK_PORT, ReaperStateMirror
+from reaper_bridge_client import (
+    BRIDGE_SOCKET_PATH,
+    BridgeClient,
+    BridgeError,
+    encode_frame,
+    read_frame,
+)
+
+SCRIPT_OPS = {"bar", "tempo"}
+
+
+class ReaperBridgeDaemon:
+    """Executes bridge requests with persistent REAPER connections"""
+
+    def __init__(
+        self,
+        socket_path=BRIDGE_SOCKET_PATH,
+        osc_host=REAPER_OSC_HOST,
+        osc_port=REAPER_OSC_PORT,
+        http_host=REAPER_HTTP_HOST,
+        http_port=REAPER_HTTP_PORT,
+        script_workers=2,
+        feedback_port=None
+    ):
+        self.socket_path = socket_path
+        self.osc_address = (osc_host, osc_port)
+        self._osc = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._osc_lock = threading.Lock()
+        self.http = ReaperHTTPClient(http_host, http_port)
+        self._scripts = ThreadPoolExecutor(max_workers=script_workers, thread_name_prefix="bridge-script")
+
+        # Live state from REAPER's OSC feedback (None = disabled)
+        self.state = None
+        if feedback_port is not None:
+            mirror = ReaperStateMirror(REAPER_FEEDBACK_HOST, feedback_port)
+            if mirror.start():
+                self.state = mirror
+        self.dispatch = DispatchQueue(self.send_packet, state=self.state, on_failed=self._http_actions)
+        self.names = NameResolver()
+        if self.state is not None:
+            self.names.attach(self.state)
+
+        self._server = None
+        self._accept_thread = None
+        self.is_running = False
+        self.started_at = time.time()
+        self.stats = {'requests': 0, 'errors': 0, 'connections': 0}
+        self._stats_lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Ops
+    # ------------------------------------------------------------------
+
+    def send_packet(self, packet):
+        with self._osc_lock:
+            self._osc.sendto(packet, self.osc_address)
+
+    def _http_actions(self, action_ids):
+        # Dispatch packets OSC could not send go over HTTP, as in _op_action
+        self.http.command(*(f"ACTION/{action_id}" for action_id in action_ids))
+
+    def send_osc(self, address, args=None):
+        # Argument-less messages (/action/{id}) come from the encoder cache
+        self.send_packet(encode_message(address, tuple(args or ())))
+
+    def _op_action(self, request):
+        action_id = str(request["action_id"])
+        via = request.get("via", "osc")
+        if via == "osc":
+            try:
+                self.send_osc(f"/action/{action_id}")
+                return {"action_id": action_id, "via": "osc"}
+            except OSError as e:
+                print(f"⚠️  OSC failed for {action_id}: {e}", file=sys.stderr)
+        self.http.command(f"ACTION/{action_id}")
+        return {"action_id": action_id, "via": "http"}
+
+    def _op_actions(self, request):
+        action_ids = [str(a) for a in request["action_ids"]]
+        if not action_ids:
+            raise ValueError("No action IDs")
+        self.send_packet(action_bundle(action_ids, request.get("at")))
+        return {"action_ids": action_ids, "via": "osc-bundle"}
+
+    def _op_dispatch(self, request):
+        if request.get("action_id") is not None:
+            kind = self.dispatch.action(request["action_id"])
+        elif request.get("value") is not None:
+            kind = self.dispatch.set(request["param"], request["value"], request.get("track"))
+        else:
+            kind = self.dispatch.nudge(request["param"], request["delta"], request.get("track"))
+        # Queued, not yet sent: errors counts earlier packets that failed
+        return {"kind": kind, "errors": self.dispatch.stats["errors"]}
+
+    def _op_osc(self, request):
+        self.send_osc(request["address"], request.get("args") or [])
+        return {"address": request["address"]}
+
+    def _op_http(self, request):
+        commands = request["commands"]
+        if isinstance(commands, str):
+            commands = [commands]
+        return {
+            "results": [
+                dataclasses.asdict(item) if dataclasses.is_dataclass(item) else list(item)
+                for item in self.http.command(*commands)
+            ]
+        }
+
+    def _op_bar(self, request):
+        import reaper_bar_bridge
+        bounds = reaper_bar_bridge.run_reaper_script(
+            request["command"], request.get("measure"), request.get("measure_end")
+        )
+        if request["command"] == "barpos":
+            if bounds is None:
+                raise RuntimeError("Bar position unavailable")
+            return {"command": "barpos", "start": bounds[0], "end": bounds[1]}
+        return {"command": request["command"]}
+
+    def _op_tempo(self, request):
+        if request["command"] == "get" and self.state is not None and self.state.tempo is not None:
+            return {"command": "get", "value": self.state.tempo, "via": "feedback"}
+        import reaper_tempo_bridge
+        result = reaper_tempo_bridge.execute_tempo_command(request["command"], request.get("value"))
+        if result is False:
+            raise RuntimeError(f"Tempo command failed: {request['command']}")
+        return {"command": request["command"], "value": result if not isinstance(result, bool) else None}
+
+    def _op_state(self, request):
+        if self.state is None:
+            raise RuntimeError("State mirror disabled (no OSC feedback port)")
+        if request.get("track") is not None:
+            return self.state.track(request["track"])
+        if request.get("name"):
+            return self.state.track_by_name(request["name"])
+        if request.get("marker") is not None:
+            return self.state.marker(request["marker"])
+        return self.state.snapshot()
+
+    def _op_resolve(self, request):
+        if self.state is None:
+            raise RuntimeError("State mirror disabled (no OSC feedback port)")
+        matches = self.names.resolve(request["query"], request.get("kinds"), int(request.get("limit", 5)))
+        return {"matches": [
+            {"score": m.score, "kind": m.kind, "key": list(m.key) if isinstance(m.key, tuple) else m.key, "name": m.name}
+            for m in matches
+        ]}
+
+    def _op_find_plugin(self, request):
+        from reaper_plugin_catalog import get_plugin_catalog
+        results = get_plugin_catalog().search(
+            request["query"], request.get("instrument"), request.get("formats"), int(request.get("limit", 5))
+        )
+        return {"matches": [
+            dict(plugin._asdict(), score=score, add_name=plugin.add_name) for score, plugin in results
+        ]}
+
+    def _op_find_action(self, request):
+        from reaper_action_catalog import get_action_catalog
+        matches = get_action_catalog().search(
+            request["query"], request.get("section"), int(request.get("limit", 5))
+        )
+        result = {"matches": [dict(action._asdict(), score=score) for score, action in matches]}
+        if request.get("run") and matches:
+            action = matches[0][1]
+            if action.section != 0:
+                raise ValueError(f"Not a main-section action: {action.name}")
+            # Named IDs (scripts, extensions) are stable across REAPER
+            # sessions; numeric IDs for them are not
+            if action.named_id:
+                self.http.command(action.named_id)
+                result["via"] = "http"
+            else:
+                self.send_osc(f"/action/{action.id}")
+                result["via"] = "osc"
+        return result
+
+    def _op_ping(self, request):
+        return {"pong": True, "pid": os.getpid()}
+
+    def _op_stats(self, request):
+        with self._stats_lock:
+            stats = dict(self.stats)
+        stats["uptime_s"] = round(time.time() - self.started_at, 1)
+        stats["dispatch"] = dict(self.dispatch.stats)
+        return stats
+
+    def handle(self, request):
+        """Execute one request and build its response frame payload"""
+        start = time.perf_counter()
+        request_id = request.get("id") if isinstance(request, dict) else None
+        with self._stats_lock:
+            self.stats['requests'] += 1
+        try:
+            handler = getattr(self, f"_op_{request.get('op')}", None)
+            if handler is None:
+                raise ValueError(f"Unknown op: {request.get('op')}")
+            result = handler(request)
+            response = {"id": request_id, "ok": True, "result": result}
+        except Exception as e:
+            with self._stats_lock:
+                self.stats['errors'] += 1
+            response = {"id": request_id, "ok": False, "error": str(e)}
+        response["ms"] = round((time.perf_counter() - start) * 1000, 3)
+        return response
+
+    # ------------------------------------------------------------------
+    # Transports
+    # ------------------------------------------------------------------
+
+    def _serve_stream(self, read, write):
+        """Serve framed requests from one stream until EOF"""
+        write_lock = threading.Lock()
+
+        def reply(response):
+            frame = encode_frame(response)
+            with write_lock:
+                write(frame)
+
+        def run_script(request):
+            try:
+                reply(self.handle(request))
+            except OSError:
+                pass
+
+        while True:
+            try:
+                request = read_frame(read)
+            except (ValueError, BridgeError) as e:
+                reply({"id": None, "ok": False, "error": f"Bad frame: {e}"})
+                break
+            if request is None:
+                break
+            if isinstance(request, dict) and request.get("op") in SCRIPT_OPS:
+                self._scripts.submit(run_script, request)
+            else:
+                reply(self.handle(request))
+
+    def serve_stdio(self):
+        """Serve framed requests on stdin/stdout (for a parent process)"""
+        stdin = sys.stdin.buffer
+        stdout = sys.stdout.buffer
+
+        def write(frame):
+            stdout.write(frame)
+            stdout.flush()
+
+        # Keep stray prints from scripts off the framed stdout
+        sys.stdout = sys.stderr
+        print("🌉 REAPER bridge daemon on stdio", file=sys.stderr)
+        self._serve_stream(stdin.read, write)
+
+    def start(self):
+        """Listen on the UNIX socket (False if another daemon owns it)"""
+        if os.path.exists(self.socket_path):
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                probe.connect(self.socket_path)
+                print(f"⚠️  Bridge daemon already running at {self.socket_path}", file=sys.stderr)
+                return False
+            except OSError:
+                os.unlink(self.socket_path)  # stale socket from a crashed daemon
+            finally:
+                probe.close()
+
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(self.socket_path)
+        server.listen(16)
+        self._server = server
+        self.is_running = True
+        self._accept_thread = threading.Thread(target=self._accept_loop, daemon=True)
+        self._accept_thread.start()
+        print(f"🌉 REAPER bridge daemon on {self.socket_path}", file=sys.stderr)
+        return True
+
+    def _accept_loop(self):
+        while self.is_running:
+            try:
+                conn, _ = self._server.accept()
+            except OSError:
+                break
+            with self._stats_lock:
+                self.stats['connections'] += 1
+            threading.Thread(target=self._serve_connection, args=(conn,), daemon=True).start()
+
+    def _serve_connection(self, conn):
+        try:
+            self._serve_stream(conn.recv, conn.sendall)
+        except OSError:
+            pass
+        finally:
+            conn.close()
+
+    def stop(self):
+        if self.is_running:
+            self.is_running = False
+            try:
+                self._server.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            self._server.close()
+            if self._accept_thread:
+                self._accept_thread.join(timeout=1.0)
+            try:
+                os.unlink(self.socket_path)
+            except OSError:
+                pass
+        self._scripts.shutdown(wait=False)
+        self.dispatch.close()
+        if self.state is not None:
+            self.state.stop()
+        self.http.close()
+        self._osc.close()
+
+
+# ============================================================================
+# BENCHMARK
+# ============================================================================
+
+def _summary(latencies, elapsed):
+    latencies = sorted(latencies)
+    n = len(latencies)
+    return {
+        "actions": n,
+        "actions_per_s": n / elapsed if elapsed > 0 else 0.0,
+        "p50_ms": latencies[n // 2] * 1000,
+        "p99_ms": latencies[min(n - 1, int(n * 0.99))] * 1000,
+    }
+
+
+def benchmark(daemon_count=2000, spawn_count=20, pipeline_depth=16):
+    """
+    Actions/s and p99 latency: per-action reaper_bridge.py spawn vs. the
+    daemon (one at a time, and pipelined with pipeline_depth requests in
+    flight), all sending to a local OSC stand-in.
+    """
+    import tempfile
+
+    stand_in = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    stand_in.bind(("127.0.0.1", 0))
+    stand_in.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 20)
+    osc_port = stand_in.getsockname()[1]
+    received = [0]
+
+    def drain():
+        while True:
+            try:
+                stand_in.recv(512)
+                received[0] += 1
+            except OSError:
+                break
+
+    threading.Thread(target=drain, daemon=True).start()
+
+    socket_path = os.path.join(tempfile.mkdtemp(prefix="dawrv_bridge_bench_"), "bridge.sock")
+    results = {}
+
+    # Per-spawn path (what main.js does today)
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "reaper_bridge.py")
+    env = dict(os.environ, DAWRV_REAPER_OSC_PORT=str(osc_port), DAWRV_BRIDGE_SOCKET=socket_path)
+    latencies = []
+    start_all = time.perf_counter()
+    for _ in range(spawn_count):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, script, "1007"], env=env, capture_output=True)
+        latencies.append(time.perf_counter() - start)
+    results["spawn"] = _summary(latencies, time.perf_counter() - start_all)
+
+    # Daemon path, pipelined over one connection
+    daemon = ReaperBridgeDaemon(socket_path=socket_path, osc_port=osc_port)
+    daemon.start()
+    client = BridgeClient(socket_path)
+    try:
+        in_flight = []
+        latencies = []
+
+        def complete_oldest():
+            request_id, t0 = in_flight.pop(0)
+            response = client.wait(request_id)
+            if not response.get("ok"):
+                raise BridgeError(response.get("error"))
+            latencies.append(time.perf_counter() - t0)
+
+        start_all = time.perf_counter()
+        for _ in range(daemon_count):
+            if len(in_flight) >= pipeline_depth:
+                complete_oldest()
+            in_flight.append((client.submit("action", action_id=1007), time.perf_counter()))
+        while in_flight:
+            complete_oldest()
+        results["daemon_pipelined"] = _summary(latencies, time.perf_counter() - start_all)
+
+        # Daemon path, one request at a time (interactive latency)
+        latencies = []
+        start_all = time.perf_counter()
+        for _ in range(min(daemon_count, 500)):
+            t0 = time.perf_counter()
+            client.call("action", action_id=1007)
+            latencies.append(time.perf_counter() - t0)
+        results["daemon_sequential"] = _summary(latencies, time.perf_counter() - start_all)
+    finally:
+        client.close()
+        daemon.stop()
+        stand_in.close()
+        os.rmdir(os.path.dirname(socket_path))
+
+    results["osc_packets_received"] = received[0]
+    return results
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="DAWRV REAPER bridge daemon")
+    parser.add_argument("--socket", default=BRIDGE_SOCKET_PATH, help="UNIX socket path")
+    parser.add_argument("--stdio", action="store_true", help="Serve framed requests on stdin/stdout")
+    parser.add_argument("--feedback-port", type=int, default=REAPER_FEEDBACK_PORT,
+                        help="REAPER OSC feedback port for the state mirror (0 = off)")
+    parser.add_argument("--benchmark", action="store_true", help="Compare with one process per action")
+    parser.add_argument("--count", type=int, default=2000, help="Daemon benchmark actions")
+    parser.add_argument("--spawn-count", type=int, default=20, help="Per-spawn benchmark actions")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        res = benchmark(args.count, args.spawn_count)
+        print(f"{'path':<20} {'actions':>8} {'actions/s':>12} {'p50 ms':>9} {'p99 ms':>9}")
+        for name in ("spawn", "daemon_sequential", "daemon_pipelined"):
+            r = res[name]
+            print(f"{name:<20} {r['actions']:>8} {r['actions_per_s']:>12,.0f} {r['p50_ms']:>9.3f} {r['p99_ms']:>9.3f}")
+        sys.exit(0)
+
+    bridge = ReaperBridgeDaemon(socket_path=args.socket, feedback_port=args.feedback_port or None)
+    if args.stdio:
+        try:
+            bridge.serve_stdio()
+        finally:
+            bridge.stop()
+        sys.exit(0)
+
+    if not bridge.start():
+        sys.exit(1)
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        bridge.stop()
@@ -0,0 +1,418 @@
+#!/usr/bin/env python3
+"""
+REAPER Command Server Client - Pipelined requests to dawrv_command_server.lua
+
+The bar, tempo and last-resort action paths used to write a temp Lua
+file and launch `reaper -nonewinst -run` (plus an osascript activation)
+for every command, which takes seconds. dawrv_command_server.lua runs
+resident inside REAPER and executes spooled command batches on each
+defer tick, so a command costs one defer cycle (~30 ms) instead.
+
+Protocol (files under REAPER_RESOURCE/DAWRV/server):
+    inbox/<name>.cmd    batch written atomically (tmp + rename):
+                          undo<TAB>label            optional, one undo block
+                          <id><TAB><command><TAB>arg...
+    outbox/<name>.ack   one line per command: <id><TAB>1|0<TAB>result
+    alive               heartbeat, touched about once a second
+
+Batch names start with a nanosecond timestamp, so batches run in
+submission order. Requests are pipelined: submit() returns an ID
+immediately and wait() blocks until the matching ack arrives.
+
+Usage:
+    from reaper_command_server import get_command_client
+
+    client = get_command_client()
+    if client.is_alive():
+        client.call("bar", "goto", 17)
+        client.call_batch([("track", 1, "B_MUTE", 1), ("track", 2, "B_MUTE", 1)],
+                          undo="DAWRV: mute tracks")
+"""
+import os
+import sys
+import time
+import uuid
+import itertools
+import threading
+
+REAPER_RESOURCE_PATH = os.environ.get(
+    "DAWRV_REAPER_RESOURCE_PATH",
+    os.path.expanduser("~/Library/Application Support/REAPER")
+)
+COMMAND_SERVER_DIR = os.environ.get(
+    "DAWRV_COMMAND_SERVER_DIR",
+    os.path.join(REAPER_RESOURCE_PATH, "DAWRV", "server")
+)
+HEARTBEAT_TIMEOUT = 3.0     # server counts as running if alive is newer than this
+POLL_INTERVAL = 0.002       # outbox poll while requests are outstanding
+
+
+class CommandServerError(Exception):
+    """Command failed in REAPER, timed out, or the server is not running"""
+
+
+def _field(value):
+    return str(value).replace("\t", " ").replace("\n", " ").replace("\r", " ")
+
+
+def _write_atomic(path, content):
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        f.write(content)
+    os.replace(tmp, path)
+
+
+class LuaCommandClient:
+    """Pipelined client for the resident Lua command server"""
+
+    def __init__(self, server_dir=COMMAND_SERVER_DIR, poll_interval=POLL_INTERVAL):
+        self.server_dir = server_dir
+        self.inbox = os.path.join(server_dir, "inbox")
+        self.outbox = os.path.join(server_dir, "outbox")
+        self.poll_interval = poll_interval
+        self._token = uuid.uuid4().hex[:8]
+        self._ids = itertools.count(1)
+        self._batches = itertools.count(1)
+
+        self._cond = threading.Condition()
+        self._results = {}           # id -> (ok, result)
+        self._outstanding = {}       # batch name -> [ids]
+        self._abandoned = set()      # ids nobody waits for: their acks are dropped
+        self._closed = False
+        self._reader = None
+        self.stats = {'commands': 0, 'batches': 0, 'acks': 0, 'timeouts': 0}
+
+    def is_alive(self, max_age=HEARTBEAT_TIMEOUT):
+        """True if the Lua server has written its heartbeat recently"""
+        try:
+            return time.time() - os.path.getmtime(os.path.join(self.server_dir, "alive")) < max_age
+        except OSError:
+            return False
+
+    # ------------------------------------------------------------------
+    # Submitting
+    # ------------------------------------------------------------------
+
+    def submit_batch(self, commands, undo=None):
+        """
+        Queue commands as one batch (one defer tick, optionally one undo block).
+
+        Args:
+            commands: (command, *args) tuples
+            undo: Undo label to group the batch into a single undo point
+
+        Returns:
+            Request IDs, in command order
+        """
+        commands = list(commands)
+        if not commands:
+            return []
+        os.makedirs(self.inbox, exist_ok=True)
+        ids = [f"{self._token}.{next(self._ids)}" for _ in commands]
+        lines = [f"undo\t{_field(undo)}"] if undo else []
+        for request_id, (command, *args) in zip(ids, commands):
+            lines.append("\t".join([request_id, _field(command), *(_field(a) for a in args)]))
+
+        name = f"{time.time_ns():020d}-{self._token}-{next(self._batches):06d}"
+        with self._cond:
+            if self._closed:
+                raise CommandServerError("Client is closed")
+            self._outstanding[name] = ids
+            self._start_reader()
+            self._cond.notify_all()
+        _write_atomic(os.path.join(self.inbox, name + ".cmd"), "\n".join(lines) + "\n")
+        self.stats['commands'] += len(commands)
+        self.stats['batches'] += 1
+        return ids
+
+    def submit(self, command, *args):
+        """Queue one command; returns its request ID"""
+        return self.submit_batch([(command, *args)])[0]
+
+    # ------------------------------------------------------------------
+    # Acks
+    # ------------------------------------------------------------------
+
+    def _start_reader(self):
+        if self._reader is None:
+            self._reader = threading.Thread(target=self._read_loop, daemon=True)
+            self._reader.start()
+
+    def _read_loop(self):
+        suffix_marker = f"-{self._token}-"
+        while True:
+            with self._cond:
+                while not self._outstanding and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+            try:
+                names = [
+                    n for n in os.listdir(self.outbox)
+                    if n.endswith(".ack") and suffix_marker in n
+                ]
+            except OSError:
+                names = []
+            for name in sorted(names):
+                self._collect(name)
+            time.sleep(self.poll_interval)
+
+    def _collect(self, name):
+        path = os.path.join(self.outbox, name)
+        try:
+            with open(path) as f:
+                content = f.read()
+            os.remove(path)
+        except OSError:
+            return
+        batch = name[:-4]
+        with self._cond:
+            ids = self._outstanding.pop(batch, [])
+            for line in content.splitlines():
+                request_id, ok, result = (line.split("\t", 2) + ["", ""])[:3]
+                if request_id:
+                    self._results[request_id] = (ok == "1", result)
+                else:
+                    # Batch-level failure: fail every command in it
+                    for missing in ids:
+                        self._results.setdefault(missing, (False, result))
+            for missing in ids:
+                self._results.setdefault(missing, (False, "No ack for command"))
+            # Late acks for commands that timed out or were given up on
+            for request_id in self._abandoned.intersection(ids):
+                self._abandoned.discard(request_id)
+                self._results.pop(request_id, None)
+            self.stats['acks'] += 1
+            self._cond.notify_all()
+
+    def wait(self, request_id, timeout=2.0):
+        """
+        Wait for a command's ack.
+
+        Returns:
+            Result string from the server
+
+        Raises:
+            CommandServerError: The command failed or timed out
+        """
+        with self._cond:
+            done = self._cond.wait_for(lambda: request_id in self._results, timeout=timeout)
+            if not done:
+                self.stats['timeouts'] += 1
+                if not self._withdraw(request_id):
+                    self._abandon([request_id])
+                raise CommandServerError(f"Command {request_id} timed out")
+            ok, result = self._results.pop(request_id)
+        if not ok:
+            raise CommandServerError(result or "Command failed")
+        return result
+
+    def _withdraw(self, request_id):
+        # Called with the lock held: drop a batch REAPER never picked up so
+        # it does not run late when the server comes back. False if it was
+        # picked up (its ack may still come)
+        for name, ids in list(self._outstanding.items()):
+            if request_id in ids:
+                try:
+                    os.remove(os.path.join(self.inbox, name + ".cmd"))
+                    del self._outstanding[name]
+                    return True
+                except OSError:
+                    return False
+        return False
+
+    def _abandon(self, request_ids):
+        # Called with the lock held: forget results nobody will wait for,
+        # now or when their batch's ack arrives
+        pending = {i for ids in self._outstanding.values() for i in ids}
+        for request_id in request_ids:
+            if self._results.pop(request_id, None) is None and request_id in pending:
+                self._abandoned.add(request_id)
+
+    def call(self, command, *args, timeout=2.0):
+        """Submit one command and wait for its result"""
+        return self.wait(self.submit(command, *args), timeout)
+
+    def call_batch(self, commands, undo=None, timeout=2.0):
+        """Submit a batch and wait for all results"""
+        deadline = time.time() + timeout
+        ids = self.submit_batch(commands, undo)
+        results = []
+        for i, request_id in enumerate(ids):
+            try:
+                results.append(self.wait(request_id, max(0.0, deadline - time.time())))
+            except CommandServerError:
+                with self._cond:
+                    self._abandon(ids[i + 1:])
+                raise
+        return results
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if self._reader:
+            self._reader.join(timeout=1.0)
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_command_client():
+    """Process-wide client for the configured server directory"""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = LuaCommandClient()
+        return _client
+
+
+def try_call(command, *args, timeout=2.0):
+    """
+    Run a command on the Lua server if it is running.
+
+    Returns:
+        Result string, or None if the server is not running or the command
+        failed (callers then fall back to launching a script)
+    """
+    client = get_command_client()
+    if not client.is_alive():
+        return None
+    try:
+        return client.call(command, *args, timeout=timeout)
+    except CommandServerError as e:
+        print(f"⚠️  Command server: {e}", file=sys.stderr)
+        return None
+
+
+# ============================================================================
+# STAND-IN SERVER / BENCHMARK
+# ============================================================================
+
+class StandInServer:
+    """
+    Python stand-in for dawrv_command_server.lua (same spool protocol and a
+    defer-style tick), for tests and benchmarks without REAPER.
+    """
+
+    def __init__(self, server_dir, tick=1 / 30, handlers=None):
+        self.server_dir = server_dir
+        self.inbox = os.path.join(server_dir, "inbox")
+        self.outbox = os.path.join(server_dir, "outbox")
+        self.tick = tick
+        self.handlers = handlers or {"ping": lambda: "pong"}
+        self.executed = []
+        self.undo_blocks = []
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        os.makedirs(self.inbox, exist_ok=True)
+        os.makedirs(self.outbox, exist_ok=True)
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+        self._thread.start()
+
+    def _run_batch(self, content):
+        acks = []
+        undo = None
+        for line in content.splitlines():
+            fields = line.split("\t")
+            if fields[0] == "undo":
+                undo = fields[1]
+                continue
+            request_id, command, args = fields[0], fields[1], fields[2:]
+            handler = self.handlers.get(command)
+            try:
+                if handler is None:
+                    raise ValueError(f"Unknown command: {command}")
+                result, ok = handler(*args), "1"
+            except Exception as e:
+                result, ok = str(e), "0"
+            self.executed.append((command, *args))
+            acks.append(f"{request_id}\t{ok}\t{result}")
+        if undo:
+            self.undo_blocks.append(undo)
+        return "\n".join(acks) + "\n"
+
+    def _loop(self):
+        while not self._stop.is_set():
+            _write_atomic(os.path.join(self.server_dir, "alive"), "stand-in\n")
+            for name in sorted(n for n in os.listdir(self.inbox) if n.endswith(".cmd")):
+                path = os.path.join(self.inbox, name)
+                with open(path) as f:
+                    content = f.read()
+                os.remove(path)
+                _write_atomic(os.path.join(self.outbox, name[:-4] + ".ack"), self._run_batch(content))
+            self._stop.wait(self.tick)
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=1.0)
+
+
+def benchmark(count=30, tick=1 / 30):
+    """
+    Commands/s against a stand-in with a REAPER-like defer tick: one
+    command per round trip vs. all commands pipelined.
+    """
+    import shutil
+    import tempfile
+
+    server_dir = tempfile.mkdtemp(prefix="dawrv_cmdserver_bench_")
+    server = StandInServer(server_dir, tick)
+    server.start()
+    client = LuaCommandClient(server_dir)
+    results = {}
+    try:
+        start = time.perf_counter()
+        for _ in range(count):
+            client.call("ping")
+        elapsed = time.perf_counter() - start
+        results["sequential"] = {"commands": count, "commands_per_s": count / elapsed,
+                                 "ms_per_command": elapsed / count * 1000}
+
+        start = time.perf_counter()
+        ids = [client.submit("ping") for _ in range(count)]
+        for request_id in ids:
+            client.wait(request_id)
+        elapsed = time.perf_counter() - start
+        results["pipelined"] = {"commands": count, "commands_per_s": count / elapsed,
+                                "ms_per_command": elapsed / count * 1000}
+    finally:
+        client.close()
+        server.stop()
+        shutil.rmtree(server_dir, ignore_errors=True)
+    return results
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="DAWRV REAPER command server client")
+    parser.add_argument("command", nargs="*", help="Command and arguments, e.g. bar goto 17")
+    parser.add_argument("--benchmark", action="store_true", help="Sequential vs. pipelined on a stand-in")
+    parser.add_argument("--count", type=int, default=30, help="Benchmark commands")
+    parser.add_argument("--timeout", type=float, default=2.0, help="Ack timeout in seconds")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        res = benchmark(args.count)
+        print(f"{'path':<12} {'commands':>9} {'cmds/s':>9} {'ms/cmd':>8}")
+        for name, r in res.items():
+            print(f"{name:<12} {r['commands']:>9} {r['commands_per_s']:>9.1f} {r['ms_per_command']:>8.2f}")
+        sys.exit(0)
+
+    if not args.command:
+        parser.print_help()
+        sys.exit(1)
+    client = get_command_client()
+    if not client.is_alive():
+        print(f"❌ Command server not running (no heartbeat in {client.server_dir})", file=sys.stderr)
+        sys.exit(2)
+    try:
+        print(client.call(*args.command, timeout=args.timeout))
+    except CommandServerError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        sys.exit(1)
@@ -0,0 +1,386 @@
+#!/usr/bin/env python3
+"""
+REAPER Dispatch Queue - Coalescing front end for REAPER commands
+
+Each listener had its own ad-hoc duplicate suppression (COOLDOWN in the
+Whisper listener, write_cooldown in the Deepgram listener,
+fileWatcherCooldown in main.js), and "volume up" said five times still
+became five separate REAPER actions. Commands now go through one queue
+with per-kind rules:
+
+- nudge      relative changes ("volume up", "tempo +5") for the same
+             target are summed and sent as ONE absolute set, based on the
+             state mirror (or the last value this queue sent)
+- set        absolute values replace pending nudges/sets for the target
+- toggle     a repeat of the same toggle inside toggle_window is dropped
+             (a double recognition would otherwise undo itself)
+- transport  play/stop/record/... are never merged or reordered: pending
+             commands are flushed ahead of them, immediately
+- plain      every other action is sent as is, in arrival order
+
+Pending commands go out as one OSC bundle after window seconds without a
+new command (at most max_delay after the first one).
+
+Usage:
+    from reaper_dispatch import get_dispatch_queue
+
+    queue = get_dispatch_queue()
+    queue.nudge("volume_db", 1.0, track=3)
+    queue.action(1007)              # flushes the volume set, then plays
+    queue.stats                     # {'submitted': 2, 'sent': 2, 'saved': 0, ...}
+"""
+import sys
+import time
+import threading
+
+from reaper_osc import OSCSender, encode_message, get_encoder
+
+DEFAULT_WINDOW = 0.04
+DEFAULT_MAX_DELAY = 0.15
+DEFAULT_TOGGLE_WINDOW = 0.5
+# Prefer what this queue last sent over the mirror for this long, until
+# REAPER's feedback for it has arrived
+FEEDBACK_GRACE = 1.0
+
+TRANSPORT, TOGGLE, PLAIN, NUDGE, SET = "transport", "toggle", "plain", "nudge", "set"
+
+# Transport and cursor actions that must keep their order
+TRANSPORT_ACTIONS = {
+    1007,   # Transport: Play
+    1008,   # Transport: Pause
+    1013,   # Transport: Record
+    1016,   # Transport: Stop
+    40044,  # Transport: Play/stop
+    40073,  # Transport: Play/pause
+    40042,  # Transport: Go to start of project
+    40043,  # Transport: Go to end of project
+}
+
+# Toggles known without the action catalog
+TOGGLE_ACTIONS = {
+    6,      # Track: Toggle mute for selected tracks
+    7,      # Track: Toggle solo for selected tracks
+    9,      # Track: Toggle record arm for selected tracks
+    1068,   # Transport: Toggle repeat
+    40364,  # Options: Toggle metronome
+}
+
+# param -> (min, max)
+PARAMS = {
+    "volume_db": (-150.0, 12.0),
+    "tempo": (1.0, 960.0),
+}
+
+
+def param_address(param, track=None):
+    """OSC address that sets a parameter absolutely"""
+    if param == "tempo":
+        return "/tempo/raw"
+    if param == "volume_db":
+        return "/master/volume/db" if not track else f"/track/{int(track)}/volume/db"
+    raise ValueError(f"Unknown parameter: {param}")
+
+
+def classify_action(action_id):
+    """TRANSPORT, TOGGLE or PLAIN for a REAPER action ID"""
+    try:
+        number = int(action_id)
+    except (TypeError, ValueError):
+        number = None
+    if number in TRANSPORT_ACTIONS:
+        return TRANSPORT
+    if number in TOGGLE_ACTIONS:
+        return TOGGLE
+    try:
+        from reaper_action_catalog import get_action_catalog
+        catalog = get_action_catalog()
+        action = catalog.by_id(number) if number is not None else catalog.by_named_id(action_id)
+    except Exception:
+        action = None
+    if action and "toggle" in action.name.lower():
+        return TOGGLE
+    return PLAIN
+
+
+class DispatchQueue:
+    """Coalesces REAPER commands and sends them as OSC bundles"""
+
+    def __init__(
+        self,
+        send_packet=None,
+        state=None,
+        window=DEFAULT_WINDOW,
+        max_delay=DEFAULT_MAX_DELAY,
+        toggle_window=DEFAULT_TOGGLE_WINDOW,
+        on_failed=None
+    ):
+        """
+        Args:
+            send_packet: Callable taking one OSC packet (default: OSCSender)
+            state: ReaperStateMirror for current values of nudged parameters
+            window: Debounce window in seconds
+            max_delay: Longest a command waits for the window to close
+            toggle_window: Repeats of a toggle inside this window are dropped
+            on_failed: Called with the action IDs of a packet that could not
+                       be sent (e.g. to retry them over HTTP)
+        """
+        if send_packet is None:
+            self._sender = OSCSender()
+            send_packet = self._sender.send_packet
+        else:
+            self._sender = None
+        self.send_packet = send_packet
+        self.state = state
+        self.window = window
+        self.max_delay = max_delay
+        self.toggle_window = toggle_window
+        self.on_failed = on_failed
+
+        self._pending = []          # ordered slots: ["action", id] / ["param", key, base, delta]
+        self._params = {}           # (param, track) -> pending slot
+        self._toggles = {}          # action id -> last accepted time
+        self._last_sent = {}        # (param, track) -> (value, time)
+        self._first_at = None
+        self._deadline = None
+        self._lock = threading.Lock()
+        self._wake = threading.Condition(self._lock)
+        self._closed = False
+        self.stats = {'submitted': 0, 'sent': 0, 'saved': 0, 'packets': 0, 'errors': 0, 'fallback': 0}
+        self._thread = threading.Thread(target=self._run, daemon=True, name="reaper-dispatch")
+        self._thread.start()
+
+    # ------------------------------------------------------------------
+    # Submitting
+    # ------------------------------------------------------------------
+
+    def action(self, action_id, kind=None):
+        """
+        Queue a REAPER action.
+
+        Returns:
+            The kind it was handled as, or "dropped" for a repeated toggle
+        """
+        kind = kind or classify_action(action_id)
+        now = time.monotonic()
+        with self._lock:
+            self.stats['submitted'] += 1
+            if kind == TOGGLE:
+                last = self._toggles.get(str(action_id))
+                if last is not None and now - last < self.toggle_window:
+                    self.stats['saved'] += 1
+                    return "dropped"
+                self._toggles[str(action_id)] = now
+            self._pending.append(["action", str(action_id)])
+            if kind == TRANSPORT:
+                taken = self._take()
+            else:
+                self._schedule(now)
+                return kind
+        self._send(*taken)
+        return kind
+
+    def nudge(self, param, delta, track=None):
+        """
+        Queue a relative change; nudges to one target are merged.
+
+        Raises:
+            ValueError: The current value is unknown (no feedback yet and
+                        nothing pending or sent for the target)
+        """
+        self._param(param, track, None, float(delta))
+        return NUDGE
+
+    def set(self, param, value, track=None):
+        """Queue an absolute value; replaces pending changes to the target"""
+        self._param(param, track, float(value), 0.0)
+        return SET
+
+    def _param(self, param, track, base, delta):
+        if param not in PARAMS:
+            raise ValueError(f"Unknown parameter: {param}")
+        key = (param, int(track) if track else None)
+        now = time.monotonic()
+        with self._lock:
+            self.stats['submitted'] += 1
+            slot = self._params.get(key)
+            if slot is None and base is None and self._current(key, now) is None:
+                self.stats['submitted'] -= 1
+                raise ValueError(f"Current {param} unknown; cannot apply a relative change")
+            if slot is None:
+                slot = ["param", key, base, delta]
+                self._params[key] = slot
+                self._pending.append(slot)
+            else:
+                self.stats['saved'] += 1
+                if base is not None:
+                    slot[2], slot[3] = base, 0.0
+                else:
+                    slot[3] += delta
+            self._schedule(now)
+
+    # ------------------------------------------------------------------
+    # Flushing
+    # ------------------------------------------------------------------
+
+    def _schedule(self, now):
+        if self._first_at is None:
+            self._first_at = now
+        self._deadline = min(now + self.window, self._first_at + self.max_delay)
+        self._wake.notify()
+
+    def _current(self, key, now):
+        """Current value of a parameter for applying nudges (None if unknown)"""
+        param, track = key
+        sent = self._last_sent.get(key)
+        if sent and now - sent[1] < FEEDBACK_GRACE:
+            return sent[0]
+        value = None
+        if self.state is not None:
+            if param == "tempo":
+                value = self.state.tempo
+            elif track:
+                value = (self.state.track(track) or {}).get("volume_db")
+        if value is None and sent:
+            value = sent[0]
+        return value
+
+    def _take(self):
+        """Build the packet for everything pending, and its action IDs (lock held)"""
+        if not self._pending:
+            return None, ()
+        now = time.monotonic()
+        elements = []
+        actions = []
+        for slot in self._pending:
+            if slot[0] == "action":
+                elements.append((f"/action/{slot[1]}", ()))
+                actions.append(slot[1])
+                continue
+            _, key, base, delta = slot
+            value = base if base is not None else self._current(key, now)
+            if value is None:
+                print(f"⚠️  Dropping {key[0]} nudge: current value unknown", file=sys.stderr)
+                self.stats['errors'] += 1
+                continue
+            low, high = PARAMS[key[0]]
+            value = min(high, max(low, value + delta))
+            self._last_sent[key] = (value, now)
+            elements.append((param_address(*key), (float(value),)))
+        self._pending = []
+        self._params = {}
+        self._first_at = self._deadline = None
+        if not elements:
+            return None, ()
+        self.stats['sent'] += len(elements)
+        self.stats['packets'] += 1
+        if len(elements) == 1:
+            return encode_message(*elements[0]), actions
+        return get_encoder().bundle(elements), actions
+
+    def _send(self, packet, actions=()):
+        if packet is None:
+            return
+        try:
+            self.send_packet(packet)
+            return
+        except OSError as e:
+            with self._lock:
+                self.stats['errors'] += 1
+            print(f"❌ Dispatch send failed: {e}", file=sys.stderr)
+        if self.on_failed is not None and actions:
+            try:
+                self.on_failed(list(actions))
+                with self._lock:
+                    self.stats['fallback'] += len(actions)
+            except Exception as e:
+                print(f"❌ Dispatch fallback failed: {e}", file=sys.stderr)
+
+    def flush(self):
+        """Send everything pending now"""
+        with self._lock:
+            taken = self._take()
+        self._send(*taken)
+
+    def _run(self):
+        while True:
+            with self._lock:
+                while not self._closed and (
+                    self._deadline is None or time.monotonic() < self._deadline
+                ):
+                    timeout = None if self._deadline is None else self._deadline - time.monotonic()
+                    self._wake.wait(timeout)
+                if self._closed:
+                    return
+                taken = self._take()
+            self._send(*taken)
+
+    def close(self):
+        self.flush()
+        with self._lock:
+            self._closed = True
+            self._wake.notify()
+        self._thread.join(timeout=1.0)
+        if self._sender is not None:
+            self._sender.close()
+
+
+_queue = None
+_queue_lock = threading.Lock()
+
+
+def get_dispatch_queue(state=None):
+    """Process-wide dispatch queue (state is only used on first call)"""
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            _queue = DispatchQueue(state=state)
+        return _queue
+
+
+# ============================================================================
+# BENCHMARK
+# ============================================================================
+
+def benchmark(bursts=200, burst_size=5):
+    """OSC packets for bursts of repeated voice commands, direct vs. queued"""
+    import socket
+
+    sink = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sink.bind(("127.0.0.1", 0))
+    sender = OSCSender("127.0.0.1", sink.getsockname()[1])
+    queue = DispatchQueue(sender.send_packet, window=0.002, max_delay=0.01, toggle_window=0.05)
+    queue.set("tempo", 120.0)
+    queue.set("volume_db", 0.0)
+    queue.flush()
+    direct = 0
+    for _ in range(bursts):
+        for _ in range(burst_size):
+            queue.nudge("tempo", 1.0)       # "tempo up" x5
+            queue.nudge("volume_db", -0.5)  # "master volume down" x5
+            queue.action(40364)             # "metronome" recognised x5
+            direct += 3
+        queue.action(1016)                  # "stop": flushes in order
+        direct += 1
+        time.sleep(0.06)
+    queue.close()
+    sender.close()
+    sink.close()
+    stats = dict(queue.stats)
+    stats["direct_actions"] = direct + 2
+    return stats
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="DAWRV REAPER dispatch queue")
+    parser.add_argument("--benchmark", action="store_true", help="Coalesce bursts of repeated commands")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        res = benchmark()
+        print(f"direct:  {res['direct_actions']} actions")
+        print(f"queued:  {res['sent']} messages in {res['packets']} packets, "
+              f"{res['saved']} actions saved, {res['errors']} dropped")
+    else:
+        parser.print_help()
@@ -0,0 +1,654 @@
+#!/usr/bin/env python3
+"""
+REAPER ExtState Watcher - Typed change events from reaper-extstate.ini
+
+dawrv_mouse_tracker_continuous.lua publishes the control under the mouse
+with ten SetExtState(..., true) calls, and REAPER rewrites
+reaper-extstate.ini for each of them. DAWRV read it back by re-reading
+and re-parsing the whole file for every key it wanted, on every poll.
+
+This module waits for the file to be written (inotify on Linux, kqueue
+on macOS, stat polling elsewhere), lets REAPER's burst of writes settle
+for `debounce` seconds (at most `max_delay`), then reads only the [RHEA]
+section, starting at its byte offset from the previous read (the file is
+scanned again only when the section has moved). Values are converted to
+their types (FIELDS) and compared with the previous read, and one event
+is published per kind of change:
+
+- control   what the mouse is over (control_type, track_number, value, ...)
+- click     a click on a control, for learning (clicked_x, clicked_y, ...)
+- other     keys written by other scripts into the same section
+
+Usage:
+    python3 reaper_extstate.py                  # print changes as JSON lines
+    python3 reaper_extstate.py --benchmark
+
+    from reaper_extstate import ExtStateWatcher
+
+    watcher = ExtStateWatcher()
+    watcher.subscribe(lambda change: print(change.kind, change.changed), kind='control')
+    watcher.start()
+"""
+import os
+import sys
+import json
+import time
+import select
+import struct
+import itertools
+import threading
+from collections import namedtuple
+
+
+def _default_path():
+    if sys.platform == "darwin":
+        base = "~/Library/Application Support/REAPER"
+    elif sys.platform.startswith("win"):
+        base = os.path.join(os.environ.get("APPDATA", "~"), "REAPER")
+    else:
+        base = "~/.config/REAPER"
+    return os.path.join(os.path.expanduser(base), "reaper-extstate.ini")
+
+
+EXTSTATE_PATH = os.environ.get("DAWRV_REAPER_EXTSTATE") or _default_path()
+SECTION = "RHEA"
+DEFAULT_DEBOUNCE = 0.05
+DEFAULT_MAX_DELAY = 0.25
+POLL_INTERVAL = 0.1
+
+KINDS = ("control", "click", "other")
+
+
+def _flag(text):
+    return text.strip().lower() in ("true", "1", "yes")
+
+
+def _int(text):
+    try:
+        return int(float(text))
+    except ValueError:
+        return None
+
+
+def _float(text):
+    try:
+        return float(text)
+    except ValueError:
+        return None
+
+
+# key -> (kind, converter), as written by dawrv_mouse_tracker_continuous.lua
+FIELDS = {
+    "control_detected": ("control", _flag),
+    "control_type": ("control", str),
+    "control_context": ("control", str),
+    "track_number": ("control", _int),
+    "track_name": ("control", str),
+    "track_guid": ("control", str),
+    "parameter": ("control", str),
+    "value": ("control", _float),
+    "value_formatted": ("control", str),
+    "timestamp": ("control", _float),
+    "control_clicked": ("click", _flag),
+    "clicked_type": ("click", str),
+    "clicked_track": ("click", _int),
+    "clicked_guid": ("click", str),
+    "clicked_x": ("click", _float),
+    "clicked_y": ("click", _float),
+    "clicked_context": ("click", str),
+    "clicked_window": ("click", str),
+    "clicked_window_title": ("click", str),
+    "click_timestamp": ("click", _float),
+}
+
+
+class ExtStateChange(namedtuple("ExtStateChange", "kind changed removed values")):
+    """
+    kind: one of KINDS; changed: {key: typed value} that differ from the
+    previous read; removed: keys no longer present; values: every typed
+    value of that kind after the change.
+    """
+    __slots__ = ()
+
+    def to_dict(self):
+        return {"kind": self.kind, "changed": self.changed, "removed": self.removed, "values": self.values}
+
+
+def convert(raw):
+    """Typed values for raw section strings (unknown keys stay strings)"""
+    typed = {}
+    for key, text in raw.items():
+        field = FIELDS.get(key)
+        typed[key] = field[1](text) if field else text
+    return typed
+
+
+def diff_values(old, new):
+    """One ExtStateChange per kind whose typed values differ"""
+    changes = []
+    for kind in KINDS:
+        changed = {key: value for key, value in new.items()
+                   if _kind(key) == kind and (key not in old or old[key] != value)}
+        removed = [key for key in old if _kind(key) == kind and key not in new]
+        if changed or removed:
+            values = {key: value for key, value in new.items() if _kind(key) == kind}
+            changes.append(ExtStateChange(kind, changed, removed, values))
+    return changes
+
+
+def _kind(key):
+    field = FIELDS.get(key)
+    return field[0] if field else "other"
+
+
+def _stamp(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_ino, st.st_size, st.st_mtime_ns)
+
+
+# ============================================================================
+# SECTION READER
+# ============================================================================
+
+class SectionReader:
+    """
+    Reads one [section] of an ini file, starting at the byte offset where
+    it was found last time; the whole file is scanned only when the header
+    is no longer there.
+    """
+
+    def __init__(self, path=EXTSTATE_PATH, section=SECTION):
+        self.path = path
+        self.header = f"[{section}]".encode("utf-8")
+        self.offset = None
+        self.values = {}
+        self._stamp = None
+        self.stats = {'reads': 0, 'unchanged': 0, 'scans': 0, 'bytes': 0}
+
+    def read(self, force=False):
+        """
+        The section's raw values (the cached ones if the file looks unchanged).
+
+        Args:
+            force: Read even if inode, size and mtime are the same (a same-size
+                rewrite within the filesystem's mtime resolution looks unchanged)
+        """
+        stamp = _stamp(self.path)
+        if not force and stamp is not None and stamp == self._stamp:
+            self.stats['unchanged'] += 1
+            return self.values
+        try:
+            with open(self.path, "rb") as f:
+                lines = self._at_offset(f) if self.offset is not None else None
+                if lines is None:
+                    lines = self._scan(f)
+        except OSError:
+            self._stamp, self.offset, self.values = None, None, {}
+            return self.values
+        self.stats['reads'] += 1
+        self._stamp = stamp
+        self.values = self._parse(lines)
+        return self.values
+
+    def _at_offset(self, f):
+        f.seek(self.offset)
+        line = f.readline()
+        self.stats['bytes'] += len(line)
+        if line.rstrip(b"\r\n") != self.header:
+            return None
+        return self._body(f)
+
+    def _scan(self, f):
+        self.stats['scans'] += 1
+        f.seek(0)
+        while True:
+            offset = f.tell()
+            line = f.readline()
+            if not line:
+                self.offset = None
+                return []
+            self.stats['bytes'] += len(line)
+            if line.rstrip(b"\r\n") == self.header:
+                self.offset = offset
+                return self._body(f)
+
+    def _body(self, f):
+        lines = []
+        for line in iter(f.readline, b""):
+            if line.startswith(b"["):
+                break
+            self.stats['bytes'] += len(line)
+            lines.append(line)
+        return lines
+
+    @staticmethod
+    def _parse(lines):
+        values = {}
+        for line in lines:
+            key, sep, value = line.decode("utf-8", "replace").rstrip("\r\n").partition("=")
+            if sep and key:
+                values[key] = value
+        return values
+
+
+# ============================================================================
+# FILE WATCHES
+# ============================================================================
+
+class StatWatch:
+    """Polls the file's inode, size and mtime"""
+
+    name = "stat"
+
+    def __init__(self, path, interval=POLL_INTERVAL):
+        self.path = path
+        self.interval = interval
+        self._stamp = _stamp(path)
+
+    def wait(self, timeout):
+        """True once the file changed, False after timeout seconds without a change"""
+        deadline = time.monotonic() + timeout
+        while True:
+            stamp = _stamp(self.path)
+            if stamp != self._stamp:
+                self._stamp = stamp
+                return True
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            time.sleep(min(self.interval, remaining))
+
+    def close(self):
+        pass
+
+
+class InotifyWatch:
+    """Linux inotify on the file's directory (REAPER may replace the file)"""
+
+    name = "inotify"
+    IN_MODIFY = 0x002
+    IN_CLOSE_WRITE = 0x008
+    IN_MOVED_TO = 0x080
+    IN_CREATE = 0x100
+    _EVENT = struct.Struct("iIII")
+
+    def __init__(self, path):
+        import ctypes
+        import ctypes.util
+
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or None, use_errno=True)
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        directory, self.filename = os.path.split(os.path.abspath(path))
+        mask = self.IN_MODIFY | self.IN_CLOSE_WRITE | self.IN_MOVED_TO | self.IN_CREATE
+        if libc.inotify_add_watch(fd, os.fsencode(directory), mask) < 0:
+            err = ctypes.get_errno()
+            os.close(fd)
+            raise OSError(err, f"inotify_add_watch failed for {directory}")
+        self.filename = os.fsencode(self.filename)
+        self.fd = fd
+
+    def wait(self, timeout):
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining < 0 or not select.select([self.fd], [], [], remaining)[0]:
+                return False
+            try:
+                data = os.read(self.fd, 65536)
+            except BlockingIOError:
+                continue
+            if self._names(data):
+                return True
+
+    def _names(self, data):
+        """Whether the events in data concern our file (others share the directory)"""
+        i = 0
+        while i < len(data):
+            _, _, _, length = self._EVENT.unpack_from(data, i)
+            i += self._EVENT.size
+            if data[i:i + length].rstrip(b"\0") == self.filename:
+                return True
+            i += length
+        return False
+
+    def close(self):
+        os.close(self.fd)
+
+
+class KqueueWatch:
+    """macOS/BSD kqueue vnode events on the file, re-armed when it is replaced"""
+
+    name = "kqueue"
+    O_EVTONLY = getattr(os, "O_EVTONLY", 0x8000 if sys.platform == "darwin" else os.O_RDONLY)
+
+    def __init__(self, path):
+        self.path = path
+        self.kq = select.kqueue()
+        self.fd = None
+        self._arm()
+
+    def _arm(self):
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+        try:
+            self.fd = os.open(self.path, self.O_EVTONLY)
+        except OSError:
+            return False
+        event = select.kevent(
+            self.fd, filter=select.KQ_FILTER_VNODE,
+            flags=select.KQ_EV_ADD | select.KQ_EV_CLEAR,
+            fflags=select.KQ_NOTE_WRITE | select.KQ_NOTE_EXTEND | select.KQ_NOTE_ATTRIB
+            | select.KQ_NOTE_DELETE | select.KQ_NOTE_RENAME
+        )
+        self.kq.control([event], 0, 0)
+        return True
+
+    def wait(self, timeout):
+        if self.fd is None:
+            # Not there yet: look again after timeout
+            time.sleep(timeout)
+            return self._arm()
+        events = self.kq.control(None, 4, timeout)
+        if not events:
+            return False
+        if any(e.fflags & (select.KQ_NOTE_DELETE | select.KQ_NOTE_RENAME) for e in events):
+            self._arm()
+        return True
+
+    def close(self):
+        if self.fd is not None:
+            os.close(self.fd)
+        self.kq.close()
+
+
+BACKENDS = {"inotify": InotifyWatch, "kqueue": KqueueWatch, "stat": StatWatch}
+
+
+def open_watch(path, backend=None):
+    """The best watch available here (or the named backend), else stat polling"""
+    if backend is None:
+        if sys.platform.startswith("linux"):
+            backend = "inotify"
+        elif hasattr(select, "kqueue"):
+            backend = "kqueue"
+        else:
+            backend = "stat"
+    try:
+        return BACKENDS[backend](path)
+    except (OSError, AttributeError) as e:
+        print(f"⚠️  {backend} watch unavailable ({e}), polling {path}", file=sys.stderr)
+        return StatWatch(path)
+
+
+# ============================================================================
+# WATCHER
+# ============================================================================
+
+class ExtStateWatcher:
+    """
+    Publishes typed ExtStateChange events for one ExtState section.
+
+    Subscribers are called on the watcher thread, once per kind of change
+    per settled burst of writes.
+    """
+
+    def __init__(
+        self,
+        path=EXTSTATE_PATH,
+        section=SECTION,
+        debounce=DEFAULT_DEBOUNCE,
+        max_delay=DEFAULT_MAX_DELAY,
+        backend=None
+    ):
+        """
+        Args:
+            path: reaper-extstate.ini
+            section: ExtState section to follow
+            debounce: Seconds without a write before the section is read
+            max_delay: Most seconds a steady stream of writes delays a read
+            backend: 'inotify', 'kqueue' or 'stat' (default: best available)
+        """
+        self.reader = SectionReader(path, section)
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self.backend = backend
+        self.values = {}
+        self.stats = {'notifications': 0, 'polls': 0, 'events': 0}
+
+        self._lock = threading.RLock()
+        self._subscribers = {}
+        self._tokens = itertools.count(1)
+        self._watch = None
+        self._thread = None
+        self.is_running = False
+
+    def subscribe(self, callback, kind=None):
+        """
+        Call callback(change) for every ExtStateChange.
+
+        Args:
+            kind: One of KINDS, or None for all changes
+
+        Returns:
+            Token for unsubscribe()
+        """
+        if kind is not None and kind not in KINDS:
+            raise ValueError(f"Unknown kind: {kind}")
+        token = next(self._tokens)
+        with self._lock:
+            self._subscribers[token] = (kind, callback)
+        return token
+
+    def unsubscribe(self, token):
+        with self._lock:
+            self._subscribers.pop(token, None)
+
+    def get(self, key, default=None):
+        with self._lock:
+            return self.values.get(key, default)
+
+    def poll(self, publish=True):
+        """Read the section once and publish what changed"""
+        values = convert(self.reader.read(force=True))
+        with self._lock:
+            self.stats['polls'] += 1
+            changes = diff_values(self.values, values)
+            self.values = values
+            subscribers = list(self._subscribers.values()) if publish else []
+        for change in changes if publish else ():
+            self.stats['events'] += 1
+            for kind, callback in subscribers:
+                if kind is None or kind == change.kind:
+                    try:
+                        callback(change)
+                    except Exception as e:
+                        print(f"⚠️  ExtState subscriber failed: {e}", file=sys.stderr)
+        return changes
+
+    def settle(self, watch):
+        """After a notification: wait out the rest of the burst"""
+        start = time.monotonic()
+        while True:
+            remaining = self.max_delay - (time.monotonic() - start)
+            if remaining <= 0 or not watch.wait(min(self.debounce, remaining)):
+                return
+            self.stats['notifications'] += 1
+
+    def start(self):
+        """Read the current values and follow changes on a background thread"""
+        if self.is_running:
+            return
+        self._watch = open_watch(self.reader.path, self.backend)
+        self.poll(publish=False)
+        self.is_running = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while self.is_running:
+            if not self._watch.wait(0.5):
+                continue
+            self.stats['notifications'] += 1
+            self.settle(self._watch)
+            if self.is_running:
+                self.poll()
+
+    def stop(self):
+        if not self.is_running:
+            return
+        self.is_running = False
+        if self._thread:
+            self._thread.join(timeout=1.0)
+        self._watch.close()
+
+
+# ============================================================================
+# BENCHMARK
+# ============================================================================
+
+def synthetic_extstate(path, sections=150, keys=12, rhea=None, seed=3):
+    """An extstate file crowded with other scripts' sections, [RHEA] in the middle"""
+    import random
+
+    rng = random.Random(seed)
+    blocks = []
+    for i in range(sections):
+        lines = [f"[script_{i:03d}]"] + [
+            f"key_{k}={rng.randrange(10 ** 8)}" * rng.randint(1, 4) for k in range(keys)
+        ]
+        blocks.append("\n".join(lines))
+    body = "\n".join(f"{key}={value}" for key, value in (rhea or {}).items())
+    blocks.insert(sections // 2, f"[{SECTION}]\n{body}" if body else f"[{SECTION}]")
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write("\n".join(blocks) + "\n")
+    os.replace(tmp, path)
+
+
+def _control(i):
+    return {
+        "control_detected": "true", "control_type": ["volume-fader", "pan-control", "mute-button"][i % 3],
+        "control_context": "mixer", "track_number": str(i % 16 + 1), "track_name": f"Track {i % 16 + 1}",
+        "track_guid": "{%08d-0000-0000-0000-000000000000}" % i, "parameter": "volume",
+        "value": f"{(i % 100) / 100:.2f}", "value_formatted": f"{-(i % 60)}.0 dB", "timestamp": f"{1000 + i:.3f}",
+    }
+
+
+def _read_key(path, section, key):
+    """What reascript-service.js getExtState() does for every key"""
+    with open(path, "r", encoding="utf-8") as f:
+        lines = f.read().split("\n")
+    inside = False
+    for line in lines:
+        line = line.strip()
+        if line == f"[{section}]":
+            inside = True
+        elif line.startswith("[") and line.endswith("]"):
+            inside = False
+        elif inside and line.startswith(key + "="):
+            return line[len(key) + 1:]
+    return ""
+
+
+def benchmark(changes=200, directory=None):
+    """
+    Bytes read and parse time per control change: the whole file per key
+    vs. the offset-cached section read, plus events per burst of ten
+    writes through the live watcher.
+    """
+    import tempfile
+
+    with tempfile.TemporaryDirectory(dir=directory) as tmp:
+        path = os.path.join(tmp, "reaper-extstate.ini")
+        synthetic_extstate(path, rhea=_control(0))
+        size = os.path.getsize(path)
+
+        # Whole file for every key
+        legacy = 0.0
+        for i in range(changes):
+            synthetic_extstate(path, rhea=_control(i))
+            start = time.perf_counter()
+            for key in FIELDS:
+                _read_key(path, SECTION, key)
+            legacy += time.perf_counter() - start
+
+        # One section read per change
+        reader = SectionReader(path)
+        values = {}
+        cached, events = 0.0, 0
+        for i in range(changes):
+            synthetic_extstate(path, rhea=_control(i))
+            start = time.perf_counter()
+            new = convert(reader.read())
+            events += len(diff_values(values, new))
+            values = new
+            cached += time.perf_counter() - start
+
+        # Live: REAPER rewrites the file once per SetExtState
+        watcher = ExtStateWatcher(path)
+        received = []
+        watcher.subscribe(received.append)
+        watcher.start()
+        bursts = 5
+        for i in range(bursts):
+            control = _control(i + 1)
+            for n in range(1, len(control) + 1):
+                synthetic_extstate(path, rhea=dict(itertools.islice(control.items(), n)))
+                time.sleep(0.002)
+            time.sleep(watcher.max_delay + 0.2)
+        watcher.stop()
+
+    return {
+        'changes': changes,
+        'file_bytes': size,
+        'legacy_bytes': size * len(FIELDS),
+        'legacy_us': legacy / changes * 1e6,
+        'section_bytes': reader.stats['bytes'] / changes,
+        'section_us': cached / changes * 1e6,
+        'scans': reader.stats['scans'],
+        'events': events,
+        'backend': watcher._watch.name,
+        'bursts': bursts,
+        'burst_events': len(received),
+        'notifications': watcher.stats['notifications'],
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="DAWRV REAPER ExtState watcher")
+    parser.add_argument("--path", default=EXTSTATE_PATH, help="reaper-extstate.ini")
+    parser.add_argument("--section", default=SECTION, help="ExtState section")
+    parser.add_argument("--backend", choices=sorted(BACKENDS), help="File watch (default: best available)")
+    parser.add_argument("--debounce", type=float, default=DEFAULT_DEBOUNCE, help="Seconds of quiet before a read")
+    parser.add_argument("--benchmark", action="store_true", help="Compare against whole-file reads")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        res = benchmark()
+        print(f"file:     {res['file_bytes']} bytes, {len(FIELDS)} keys")
+        print(f"per key:  {res['legacy_bytes']} bytes read, {res['legacy_us']:.0f} µs per change")
+        print(f"section:  {res['section_bytes']:.0f} bytes read, {res['section_us']:.0f} µs per change, "
+              f"{res['scans']} scan(s), {res['events']} events for {res['changes']} changes")
+        print(f"watcher:  {res['burst_events']} events for {res['bursts']} bursts of writes "
+              f"({res['notifications']} notifications, {res['backend']})")
+        sys.exit(0)
+
+    watcher = ExtStateWatcher(args.path, args.section, debounce=args.debounce, backend=args.backend)
+    watcher.subscribe(lambda change: print(json.dumps(change.to_dict()), flush=True))
+    watcher.start()
+    print(f"👂 Watching [{args.section}] in {args.path} ({watcher._watch.name})", file=sys.stderr)
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.stop()
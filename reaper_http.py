@@ -0,0 +1,505 @@
+#!/usr/bin/env python3
+"""
+REAPER HTTP Client - Pooled keep-alive connections with command batching
+
+REAPER's web interface (Preferences > Control/OSC/web > Web browser
+interface) takes commands as /_/cmd and several at once as /_/a;b;c.
+This client:
+
+- keeps a small pool of persistent HTTP/1.1 connections instead of one
+  urllib connection (and TCP handshake) per action
+- coalesces commands submitted within a short window into one batched
+  request; identical queries in the same window are sent once
+- parses response lines (TRANSPORT, TRACK, BEATPOS, CMDSTATE, NTRACK)
+  into structured objects and hands each command the lines it asked for
+
+Usage:
+    from reaper_http import get_http_client
+
+    client = get_http_client()
+    client.command("ACTION/1007")                # run an action
+    transport, = client.command("TRANSPORT")     # Transport(play_state=1, ...)
+    tracks = client.command("TRACK")             # [Track(...), ...]
+"""
+import os
+import sys
+import time
+import queue
+import threading
+import http.client
+import urllib.parse
+from dataclasses import dataclass
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+
+REAPER_HTTP_HOST = os.environ.get("DAWRV_REAPER_HTTP_HOST", "localhost")
+REAPER_HTTP_PORT = int(os.environ.get("DAWRV_REAPER_HTTP_PORT", "8080"))
+
+DEFAULT_WINDOW = 0.002   # coalescing window (s)
+DEFAULT_MAX_BATCH = 32   # commands per request (keeps URLs short)
+
+# Queries: read-only, answered by tagged lines, safe to de-duplicate
+QUERY_TAGS = {"TRANSPORT", "BEATPOS", "NTRACK", "TRACK", "MARKER", "REGION"}
+
+
+class ReaperHTTPError(OSError):
+    """REAPER's web interface is unreachable or returned an error status"""
+
+
+# ============================================================================
+# RESPONSE PARSING
+# ============================================================================
+
+@dataclass
+class Transport:
+    play_state: int          # 0 stopped, 1 playing, 2 paused, 5 recording, 6 record paused
+    position: float          # seconds
+    repeat: bool
+    position_str: str
+    beats_str: str
+
+    @property
+    def playing(self):
+        return self.play_state in (1, 5)
+
+    @property
+    def recording(self):
+        return self.play_state in (5, 6)
+
+    @property
+    def paused(self):
+        return self.play_state in (2, 6)
+
+
+@dataclass
+class Track:
+    number: int              # 0 = master
+    name: str
+    flags: int
+    volume: float            # linear gain (1.0 = 0 dB)
+    pan: float               # -1.0 .. 1.0
+    peak: float
+    peak_pos: float
+    width: float
+    pan_mode: int
+    sends: int
+    receives: int
+    hw_outs: int
+    color: int
+
+    @property
+    def selected(self):
+        return bool(self.flags & 2)
+
+    @property
+    def muted(self):
+        return bool(self.flags & 8)
+
+    @property
+    def soloed(self):
+        return bool(self.flags & 16)
+
+    @property
+    def armed(self):
+        return bool(self.flags & 64)
+
+
+@dataclass
+class BeatPos:
+    play_state: int
+    position: float
+    beat_position: float
+    measure: int
+    beats_in_measure: float
+    ts_numerator: int
+    ts_denominator: int
+
+
+@dataclass
+class CommandState:
+    command: str
+    state: int               # 1 on, 0 off, -1 not a toggle
+
+
+def _parse_line(fields):
+    tag = fields[0]
+    try:
+        if tag == "TRANSPORT" and len(fields) >= 6:
+            return Transport(int(fields[1]), float(fields[2]), fields[3] == "1", fields[4], fields[5])
+        if tag == "TRACK" and len(fields) >= 14:
+            return Track(
+                int(fields[1]), fields[2], int(fields[3]), float(fields[4]), float(fields[5]),
+                float(fields[6]), float(fields[7]), float(fields[8]), int(fields[9]),
+                int(fields[10]), int(fields[11]), int(fields[12]), int(fields[13])
+            )
+        if tag == "BEATPOS" and len(fields) >= 8:
+            return BeatPos(
+                int(fields[1]), float(fields[2]), float(fields[3]), int(fields[4]),
+                float(fields[5]), int(fields[6]), int(fields[7])
+            )
+        if tag == "CMDSTATE" and len(fields) >= 3:
+            return CommandState(fields[1], int(fields[2]))
+    except ValueError:
+        pass
+    return tuple(fields)
+
+
+def parse_response(text):
+    """
+    Parse a web interface response into objects (one per line).
+
+    Lines the parser doesn't know (NTRACK, MARKER, ...) come back as
+    tuples of their tab-separated fields.
+    """
+    return [
+        _parse_line(line.split("\t"))
+        for line in text.splitlines()
+        if line.strip()
+    ]
+
+
+def _tag(item):
+    if isinstance(item, tuple):
+        return item[0]
+    return {Transport: "TRANSPORT", Track: "TRACK", BeatPos: "BEATPOS", CommandState: "CMDSTATE"}[type(item)]
+
+
+def _is_query(command):
+    head = command.split("/", 1)[0].upper()
+    return head in QUERY_TAGS or (head == "GET" and command.count("/") == 1)
+
+
+def select_results(command, items):
+    """Lines of a batched response that answer one command ([] for actions)"""
+    parts = command.split("/")
+    head = parts[0].upper()
+    if head == "GET" and len(parts) == 2:
+        return [i for i in items if isinstance(i, CommandState) and i.command == parts[1]]
+    if head not in QUERY_TAGS:
+        return []
+    if head == "TRACK" and len(parts) > 1 and parts[1].isdigit():
+        number = int(parts[1])
+        return [i for i in items if isinstance(i, Track) and i.number == number]
+    return [i for i in items if _tag(i) == head]
+
+
+# ============================================================================
+# CONNECTION POOL
+# ============================================================================
+
+class HTTPConnectionPool:
+    """Fixed-size pool of keep-alive connections to one host"""
+
+    def __init__(self, host=REAPER_HTTP_HOST, port=REAPER_HTTP_PORT, size=2, timeout=2.0):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self._idle = queue.LifoQueue()
+        for _ in range(size):
+            self._idle.put(None)   # connected lazily
+        self.stats = {'requests': 0, 'connects': 0, 'reconnects': 0}
+
+    def get(self, path):
+        """
+        GET a path on a pooled connection (reconnects once if it went stale).
+
+        Returns:
+            (status, body bytes)
+        """
+        conn = self._idle.get()
+        try:
+            for attempt in range(2):
+                if conn is None:
+                    conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+                    self.stats['connects'] += 1
+                try:
+                    conn.request("GET", path)
+                    response = conn.getresponse()
+                    body = response.read()
+                    self.stats['requests'] += 1
+                    if response.will_close:
+                        conn.close()
+                        conn = None
+                    return response.status, body
+                except (OSError, http.client.HTTPException) as e:
+                    conn.close()
+                    conn = None
+                    if attempt:
+                        raise ReaperHTTPError(f"REAPER web interface unreachable: {e}")
+                    self.stats['reconnects'] += 1
+        finally:
+            self._idle.put(conn)
+
+    def close(self):
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            if conn is not None:
+                conn.close()
+
+
+# ============================================================================
+# BATCHING CLIENT
+# ============================================================================
+
+class ReaperHTTPClient:
+    """
+    Coalescing client for REAPER's /_/ command interface.
+
+    Commands submitted within `window` seconds of the first pending one go
+    out as a single /_/a;b;c request on a pooled connection. Batches are
+    sent one at a time, so actions reach REAPER in submission order.
+    """
+
+    def __init__(
+        self,
+        host=REAPER_HTTP_HOST,
+        port=REAPER_HTTP_PORT,
+        window=DEFAULT_WINDOW,
+        max_batch=DEFAULT_MAX_BATCH,
+        pool_size=2,
+        timeout=2.0
+    ):
+        self.pool = HTTPConnectionPool(host, port, pool_size, timeout)
+        self.window = window
+        self.max_batch = max_batch
+        self.timeout = timeout
+        self._pending = []
+        self._cond = threading.Condition()
+        self._closed = False
+        self._thread = threading.Thread(target=self._flush_loop, daemon=True)
+        self._thread.start()
+        self.stats = {'commands': 0, 'batches': 0, 'deduplicated': 0, 'errors': 0}
+
+    def submit(self, command):
+        """Queue a command; the Future resolves to its parsed response lines"""
+        future = Future()
+        with self._cond:
+            if self._closed:
+                raise ReaperHTTPError("Client is closed")
+            self._pending.append((command.strip().lstrip("/"), future, time.monotonic()))
+            self.stats['commands'] += 1
+            self._cond.notify()
+        return future
+
+    def command(self, *commands):
+        """
+        Run commands (batched with anything else pending) and wait.
+
+        Returns:
+            Parsed lines answering the commands ([] for plain actions)
+        """
+        futures = [self.submit(c) for c in commands]
+        results = []
+        for future in futures:
+            try:
+                results.extend(future.result(timeout=self.timeout * 2 + self.window))
+            except FutureTimeout:
+                raise ReaperHTTPError("REAPER web interface timed out")
+        return results
+
+    def request(self, path):
+        """Unbatched GET on a pooled connection: (status, body)"""
+        return self.pool.get(path)
+
+    def _flush_loop(self):
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if not self._pending:
+                    return
+                # Let more commands join until the oldest has waited `window`
+                # (commands queued behind an in-flight batch go out at once)
+                deadline = self._pending[0][2] + self.window
+                while len(self._pending) < self.max_batch and not self._closed:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                batch = self._pending[:self.max_batch]
+                del self._pending[:self.max_batch]
+            self._send(batch)
+
+    def _send(self, batch):
+        commands = []
+        seen = set()
+        for command, _, _ in batch:
+            if _is_query(command) and command in seen:
+                self.stats['deduplicated'] += 1
+                continue
+            seen.add(command)
+            commands.append(command)
+
+        path = "/_/" + ";".join(urllib.parse.quote(c, safe="/_.:-") for c in commands)
+        try:
+            status, body = self.pool.get(path)
+            if status != 200:
+                raise ReaperHTTPError(f"REAPER web interface returned {status}")
+            items = parse_response(body.decode("utf-8", "replace"))
+        except Exception as e:
+            self.stats['errors'] += 1
+            for _, future, _ in batch:
+                future.set_exception(e)
+            return
+        self.stats['batches'] += 1
+        for command, future, _ in batch:
+            future.set_result(select_results(command, items))
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._thread.join(timeout=1.0)
+        self.pool.close()
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_http_client():
+    """Process-wide client for the configured REAPER web interface"""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = ReaperHTTPClient()
+        return _client
+
+
+def run_action(action_id):
+    """Run one action through the shared client (raises ReaperHTTPError)"""
+    get_http_client().command(f"ACTION/{action_id}")
+
+
+# ============================================================================
+# BENCHMARK
+# ============================================================================
+
+def _stand_in_server():
+    """Local HTTP/1.1 stand-in that answers /_/ commands like REAPER"""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True  # headers and body are separate writes
+
+        def do_GET(self):
+            lines = []
+            for command in urllib.parse.unquote(self.path[3:]).split(";"):
+                if command == "TRANSPORT":
+                    lines.append("TRANSPORT\t1\t12.5\t0\t0:12.500\t7.1.00")
+                elif command.startswith("TRACK"):
+                    lines.append("TRACK\t1\tDrums\t8\t1.0\t0.0\t-1500\t-1500\t1.0\t3\t0\t0\t1\t0")
+            body = ("\n".join(lines) + "\n").encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def _summary(latencies, elapsed):
+    latencies = sorted(latencies)
+    n = len(latencies)
+    return {
+        "commands": n,
+        "commands_per_s": n / elapsed if elapsed > 0 else 0.0,
+        "p50_ms": latencies[n // 2] * 1000,
+        "p99_ms": latencies[min(n - 1, int(n * 0.99))] * 1000,
+    }
+
+
+def benchmark(count=500, threads=8):
+    """
+    Commands/s and latency against a local stand-in: a fresh urllib
+    connection per command, one keep-alive connection, and `threads`
+    concurrent callers through the coalescing client.
+    """
+    import urllib.request
+
+    server = _stand_in_server()
+    host, port = server.server_address
+    results = {}
+    try:
+        latencies = []
+        start_all = time.perf_counter()
+        for _ in range(count):
+            t0 = time.perf_counter()
+            urllib.request.urlopen(f"http://{host}:{port}/_/TRANSPORT", timeout=2).read()
+            latencies.append(time.perf_counter() - t0)
+        results["urllib"] = _summary(latencies, time.perf_counter() - start_all)
+
+        pool = HTTPConnectionPool(host, port, size=1)
+        latencies = []
+        start_all = time.perf_counter()
+        for _ in range(count):
+            t0 = time.perf_counter()
+            pool.get("/_/TRANSPORT")
+            latencies.append(time.perf_counter() - t0)
+        results["keep_alive"] = _summary(latencies, time.perf_counter() - start_all)
+        pool.close()
+
+        client = ReaperHTTPClient(host, port)
+        latencies = []
+        lock = threading.Lock()
+
+        def caller(n):
+            local = []
+            for i in range(n):
+                t0 = time.perf_counter()
+                client.command("TRANSPORT" if i % 2 else "TRACK/1")
+                local.append(time.perf_counter() - t0)
+            with lock:
+                latencies.extend(local)
+
+        workers = [threading.Thread(target=caller, args=(count // threads,)) for _ in range(threads)]
+        start_all = time.perf_counter()
+        for w in workers:
+            w.start()
+        for w in workers:
+            w.join()
+        results["coalesced"] = _summary(latencies, time.perf_counter() - start_all)
+        results["coalesced"]["requests"] = client.stats['batches']
+        client.close()
+    finally:
+        server.shutdown()
+        server.server_close()
+    return results
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="DAWRV REAPER HTTP client")
+    parser.add_argument("commands", nargs="*", help="Commands to send, e.g. TRANSPORT TRACK ACTION/1007")
+    parser.add_argument("--benchmark", action="store_true", help="Compare against one connection per command")
+    parser.add_argument("--count", type=int, default=500, help="Benchmark commands per path")
+    parser.add_argument("--threads", type=int, default=8, help="Concurrent callers for the coalescing client")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        res = benchmark(args.count, args.threads)
+        print(f"{'path':<12} {'commands':>9} {'requests':>9} {'cmds/s':>10} {'p50 ms':>8} {'p99 ms':>8}")
+        for name in ("urllib", "keep_alive", "coalesced"):
+            r = res[name]
+            print(f"{name:<12} {r['commands']:>9} {r.get('requests', r['commands']):>9} "
+                  f"{r['commands_per_s']:>10,.0f} {r['p50_ms']:>8.3f} {r['p99_ms']:>8.3f}")
+        sys.exit(0)
+
+    if not args.commands:
+        parser.print_help()
+        sys.exit(1)
+    try:
+        for item in get_http_client().command(*args.commands):
+            print(item)
+    except ReaperHTTPError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        sys.exit(1)
@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+"""
+REAPER Name Resolver - Find tracks, markers, regions and FX by spoken name
+
+"Mute the vocals" or "go to the chorus" need the REAPER object behind a
+name. That used to mean one dawrv_get_track_info.lua run per query
+(ExtState round-trips), and markers were only reachable by index. This
+module keeps an in-memory index of every name in the project:
+
+- names are normalized (lowercase tokens, number words -> digits, simple
+  plurals, a few studio abbreviations such as vox/gtr/verb)
+- every token also gets a phonetic key, so "base" finds "Bass" and
+  "corus" finds "Chorus"
+- entries are updated one at a time from ReaperStateMirror changes
+  (track/marker/region/FX names), never rebuilt
+
+Queries are a few dict lookups plus a bisect for prefixes: microseconds
+for a typical project.
+
+Usage:
+    from reaper_name_resolver import NameResolver
+
+    names = NameResolver()
+    names.attach(mirror)                    # ReaperStateMirror
+    names.resolve("the vocals")             # [Match(score, kind, key, name), ...]
+    names.best("chorus", kinds=("marker", "region"))
+"""
+import re
+import sys
+import time
+import bisect
+import heapq
+import threading
+from collections import namedtuple
+
+KINDS = ("track", "marker", "region", "fx")
+_KIND_ORDER = {kind: i for i, kind in enumerate(KINDS)}
+
+# Query words that name a kind rather than an object ("the vocals track")
+KIND_WORDS = {
+    "track": "track", "channel": "track",
+    "marker": "marker",
+    "region": "region", "section": "region",
+    "fx": "fx", "effect": "fx", "plugin": "fx",
+}
+
+STOPWORDS = {"the", "a", "an", "my", "on", "to", "of", "at"}
+
+# Command verbs, dropped only from the start of a query: "solo" is also a
+# common section name ("go to the solo")
+COMMAND_WORDS = {"go", "mute", "unmute", "solo", "unsolo", "select"}
+
+NUMBER_WORDS = {
+    "zero": "0", "one": "1", "two": "2", "three": "3", "four": "4", "five": "5",
+    "six": "6", "seven": "7", "eight": "8", "nine": "9", "ten": "10",
+    "eleven": "11", "twelve": "12", "first": "1", "second": "2", "third": "3",
+}
+
+# Common studio abbreviations, applied to names and queries alike
+ALIASES = {
+    "vox": "vocal", "voc": "vocal", "vocals": "vocal", "gtr": "guitar", "gtrs": "guitar",
+    "kik": "kick", "snr": "snare", "bv": "backing", "bvs": "backing", "verb": "reverb",
+    "keys": "key", "perc": "percussion",
+}
+
+# Match weights
+EXACT, PREFIX, PHONETIC = 1.0, 0.8, 0.75
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+_PHONETIC_RULES = (
+    ("sch", "sk"), ("ght", "t"), ("ph", "f"), ("gh", "g"), ("kn", "n"), ("wr", "r"),
+    ("ck", "k"), ("sh", "x"), ("ch", "k"), ("th", "0"), ("qu", "kw"), ("dg", "j"), ("x", "ks"),
+)
+_SOFT_C = re.compile(r"c(?=[eiy])")
+_VOWELS = re.compile(r"[aeiouyhw]")
+
+Match = namedtuple("Match", "score kind key name")
+
+
+def normalize(text):
+    """Normalized tokens of a name or query"""
+    tokens = []
+    for token in _TOKEN.findall(text.lower()):
+        token = NUMBER_WORDS.get(token, token)
+        token = ALIASES.get(token, token)
+        if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+            token = ALIASES.get(token[:-1], token[:-1])
+        tokens.append(token)
+    return tokens
+
+
+def phonetic_key(token):
+    """
+    Rough sound-alike key (consonant skeleton after common spellings are
+    folded), e.g. "chorus"/"corus" -> "krs", "bass"/"base" -> "bs".
+    """
+    if token.isdigit():
+        return token
+    for spelling, sound in _PHONETIC_RULES:
+        token = token.replace(spelling, sound)
+    token = _SOFT_C.sub("s", token).replace("c", "k").replace("q", "k").replace("z", "s")
+    first = "a" if token[0] in "aeiouy" else token[0]
+    key = first + _VOWELS.sub("", token[1:])
+    return "".join(ch for i, ch in enumerate(key) if i == 0 or ch != key[i - 1])
+
+
+class NameResolver:
+    """Incrementally maintained index of REAPER object names"""
+
+    def __init__(self):
+        self._entries = {}      # (kind, key) -> (name, tokens)
+        self._postings = {}     # token -> {(kind, key)}
+        self._phonetic = {}     # phonetic key -> {token}
+        self._vocab = []        # sorted tokens, for prefix matches
+        self._lock = threading.RLock()
+        self._state = None
+        self._token = None
+
+    # ------------------------------------------------------------------
+    # Index maintenance
+    # ------------------------------------------------------------------
+
+    def _add_token(self, token, entry):
+        postings = self._postings.get(token)
+        if postings is None:
+            postings = self._postings[token] = set()
+            bisect.insort(self._vocab, token)
+            self._phonetic.setdefault(phonetic_key(token), set()).add(token)
+        postings.add(entry)
+
+    def _remove_token(self, token, entry):
+        postings = self._postings.get(token)
+        if postings is None:
+            return
+        postings.discard(entry)
+        if not postings:
+            del self._postings[token]
+            del self._vocab[bisect.bisect_left(self._vocab, token)]
+            key = phonetic_key(token)
+            self._phonetic[key].discard(token)
+            if not self._phonetic[key]:
+                del self._phonetic[key]
+
+    def set_name(self, kind, key, name):
+        """Add, rename or (with an empty name) remove one object"""
+        if kind not in KINDS:
+            raise ValueError(f"Unknown kind: {kind}")
+        entry = (kind, key)
+        name = (name or "").strip()
+        with self._lock:
+            old = self._entries.get(entry)
+            if old is not None and old[0] == name:
+                return
+            if old is not None:
+                for token in set(old[1]):
+                    self._remove_token(token, entry)
+                del self._entries[entry]
+            if not name:
+                return
+            tokens = tuple(normalize(name))
+            self._entries[entry] = (name, tokens)
+            for token in set(tokens):
+                self._add_token(token, entry)
+
+    def remove(self, kind, key):
+        self.set_name(kind, key, "")
+
+    def __len__(self):
+        return len(self._entries)
+
+    # ------------------------------------------------------------------
+    # State mirror
+    # ------------------------------------------------------------------
+
+    def _on_change(self, topic, key, value):
+        if topic == "fx":
+            self.set_name("fx", key, value)
+        elif topic in ("track", "marker", "region") and key[1] == "name":
+            self.set_name(topic, key[0], value)
+
+    def attach(self, state):
+        """Index a ReaperStateMirror's names and follow its changes"""
+        self.detach()
+        self._state = state
+        self._token = state.subscribe(self._on_change)
+        snapshot = state.snapshot()
+        for kind, group in (("track", "tracks"), ("marker", "markers"), ("region", "regions")):
+            for number, record in snapshot.get(group, {}).items():
+                self.set_name(kind, int(number), record.get("name"))
+        for number, slots in snapshot.get("fx", {}).items():
+            for slot, name in slots.items():
+                self.set_name("fx", (int(number), int(slot)), name)
+
+    def detach(self):
+        if self._state is not None:
+            self._state.unsubscribe(self._token)
+            self._state = self._token = None
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def _candidates(self, token):
+        """Index tokens matching a query token: {token: weight}"""
+        matches = {}
+        if token in self._postings:
+            matches[token] = EXACT
+        if len(token) >= 3:
+            start = bisect.bisect_left(self._vocab, token)
+            for vocab_token in self._vocab[start:start + 20]:
+                if not vocab_token.startswith(token):
+                    break
+                matches.setdefault(vocab_token, PREFIX)
+        if len(token) >= 3:
+            for vocab_token in self._phonetic.get(phonetic_key(token), ()):
+                matches.setdefault(vocab_token, PHONETIC)
+        return matches
+
+    def resolve(self, query, kinds=None, limit=5):
+        """
+        Rank objects by how well their names match a spoken phrase.
+
+        Args:
+            query: e.g. "the lead vocals", "chorus", "reverb on drums"
+            kinds: Restrict to some of KINDS; kind words in the query
+                   ("the chorus marker") are used as a hint otherwise
+            limit: Maximum results
+
+        Returns:
+            [Match(score, kind, key, name)] best first. key is the track,
+            marker or region number, or (track, slot) for FX; score is 1.0
+            for an exact name.
+        """
+        words = [w for w in normalize(query) if w not in STOPWORDS]
+        while words and words[0] in COMMAND_WORDS and any(w not in KIND_WORDS for w in words[1:]):
+            words.pop(0)
+        hinted = {KIND_WORDS[w] for w in words if w in KIND_WORDS}
+        tokens = [w for w in words if w not in KIND_WORDS] or words
+        if not tokens:
+            return []
+        kinds = set(kinds) if kinds else None
+
+        with self._lock:
+            scores = {}
+            for token in tokens:
+                best = {}
+                for vocab_token, weight in self._candidates(token).items():
+                    for entry in self._postings[vocab_token]:
+                        if weight > best.get(entry, 0.0):
+                            best[entry] = weight
+                for entry, weight in best.items():
+                    total, count = scores.get(entry, (0.0, 0))
+                    scores[entry] = (total + weight, count + 1)
+
+            ranked = []
+            boost = 1.1 if hinted else 1.0
+            for entry, (total, count) in scores.items():
+                kind = entry[0]
+                if kinds is not None and kind not in kinds:
+                    continue
+                # Coverage of the query, then of the name ("Vocals" beats
+                # "Lead Vocals" for "vocals")
+                score = total * (0.75 + 0.25 * min(1.0, count / max(1, len(self._entries[entry][1]))))
+                if kind in hinted:
+                    score *= boost
+                ranked.append((score, -_KIND_ORDER[kind], entry))
+            top = heapq.nlargest(limit, ranked)
+            return [
+                Match(round(min(1.0, score / len(tokens)), 4), entry[0], entry[1], self._entries[entry][0])
+                for score, _, entry in top
+            ]
+
+    def best(self, query, kinds=None, min_score=0.6):
+        """Best match, or None below min_score"""
+        matches = self.resolve(query, kinds, limit=1)
+        if matches and matches[0].score >= min_score:
+            return matches[0]
+        return None
+
+
+_resolver = None
+_resolver_lock = threading.Lock()
+
+
+def get_name_resolver(state=None):
+    """Process-wide resolver; attached to state on first call if given"""
+    global _resolver
+    with _resolver_lock:
+        if _resolver is None:
+            _resolver = NameResolver()
+            if state is not None:
+                _resolver.attach(state)
+        return _resolver
+
+
+# ============================================================================
+# BENCHMARK
+# ============================================================================
+
+def benchmark(queries=20000):
+    """µs per resolve() on a 200-track project with markers, regions and FX"""
+    import random
+    rng = random.Random(3)
+    instruments = ["Kick", "Snare", "Hi Hat", "Overheads", "Room", "Bass DI", "Bass Amp", "Lead Vocals",
+                   "Backing Vocals", "Acoustic Guitar", "Electric Gtr", "Piano", "Synth Pad", "Strings",
+                   "Brass", "Percussion", "Choir", "Organ", "Click", "FX Return"]
+    plugins = ["ReaEQ", "ReaComp", "ReaVerb", "ReaDelay", "Pro-Q 3", "FabFilter Pro-C 2", "Valhalla VintageVerb",
+               "Soundtoys Decapitator", "OTT", "Serum", "Kontakt", "ReaTune"]
+    sections = ["Intro", "Verse", "Pre Chorus", "Chorus", "Bridge", "Breakdown", "Solo", "Outro"]
+    names = NameResolver()
+    start = time.perf_counter()
+    for n in range(1, 201):
+        names.set_name("track", n, f"{rng.choice(instruments)} {n // len(instruments) + 1}")
+        for slot in range(1, 4):
+            names.set_name("fx", (n, slot), rng.choice(plugins))
+    for n in range(1, 61):
+        names.set_name("marker", n, f"{rng.choice(sections)} {n // 8 + 1}")
+    for n in range(1, 41):
+        names.set_name("region", n, rng.choice(sections))
+    build_ms = (time.perf_counter() - start) * 1000
+
+    phrases = ["lead vocals", "the corus", "base amp", "backing vox 2", "valhalla", "snare track",
+               "reverb on drums", "second verse marker", "hi hat", "pre chorus"]
+    start = time.perf_counter()
+    for i in range(queries):
+        names.resolve(phrases[i % len(phrases)])
+    resolve_us = (time.perf_counter() - start) / queries * 1e6
+
+    start = time.perf_counter()
+    for i in range(queries):
+        names.set_name("track", 1 + i % 200, f"{rng.choice(instruments)} {i}")
+    rename_us = (time.perf_counter() - start) / queries * 1e6
+    return {"entries": len(names), "build_ms": build_ms, "resolve_us": resolve_us, "rename_us": rename_us}
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="DAWRV REAPER name resolver")
+    parser.add_argument("query", nargs="*", help="Name to resolve against live OSC feedback")
+    parser.add_argument("--kind", choices=KINDS, action="append", help="Restrict to a kind")
+    parser.add_argument("--listen", type=float, default=2.0, help="Seconds of feedback to collect first")
+    parser.add_argument("--benchmark", action="store_true", help="Measure resolve/update cost")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        res = benchmark()
+        print(f"{res['entries']} names indexed in {res['build_ms']:.1f} ms")
+        print(f"resolve: {res['resolve_us']:.1f} µs/query, rename: {res['rename_us']:.1f} µs")
+        sys.exit(0)
+
+    from reaper_state import ReaperStateMirror
+
+    mirror = ReaperStateMirror()
+    if not mirror.start():
+        sys.exit(1)
+    names = NameResolver()
+    names.attach(mirror)
+    time.sleep(args.listen)
+    mirror.stop()
+    print(f"{len(names)} names indexed from REAPER feedback")
+    for match in names.resolve(" ".join(args.query), args.kind):
+        print(f"{match.score:6.3f}  {match.kind:<7} {match.key!s:<10} {match.name}")
@@ -0,0 +1,386 @@
+#!/usr/bin/env python3
+"""
+REAPER OSC Encoder - Cached OSC messages and bundles
+
+Shared encoder for the REAPER bridges:
+- Argument-less messages for fixed action IDs (/action/{id}) are encoded
+  once and reused
+- Messages with arguments are packed by one precompiled struct per
+  address/argument layout (address and type tag are cached with it)
+- Bundles with timetags put a group of actions in ONE datagram, so a
+  multi-step command arrives together and in order instead of as
+  separate packets with no ordering guarantee
+- decode_packet() parses REAPER's feedback (messages and bundles)
+
+Usage:
+    from reaper_osc import OSCSender, action_bundle
+
+    sender = OSCSender()                       # 127.0.0.1:8000
+    sender.send("/action/1007")
+    sender.send_actions([40297, 40939, 6])     # one bundle
+"""
+import os
+import sys
+import time
+import socket
+import struct
+import threading
+
+REAPER_OSC_HOST = os.environ.get("DAWRV_REAPER_OSC_HOST", "127.0.0.1")
+REAPER_OSC_PORT = int(os.environ.get("DAWRV_REAPER_OSC_PORT", "8000"))
+
+_INT = struct.Struct(">i")
+_FLOAT = struct.Struct(">f")
+_INT64 = struct.Struct(">q")
+_DOUBLE = struct.Struct(">d")
+_TIMETAG = struct.Struct(">II")
+
+BUNDLE_TAG = b"#bundle\x00"
+NTP_EPOCH_OFFSET = 2208988800  # seconds from 1900-01-01 to 1970-01-01
+IMMEDIATELY = (0, 1)           # OSC "execute immediately" timetag
+
+DEFAULT_BUFFER_SIZE = 1536
+
+
+def _pad(data):
+    """OSC string: null-terminated, padded to a multiple of 4"""
+    return data + b"\x00" * (4 - (len(data) % 4))
+
+
+def timetag(when=None):
+    """
+    NTP timetag for a Unix time (None = execute immediately).
+
+    Returns:
+        (seconds, fraction) pair
+    """
+    if when is None:
+        return IMMEDIATELY
+    seconds = int(when)
+    fraction = int((when - seconds) * (1 << 32)) & 0xFFFFFFFF
+    return seconds + NTP_EPOCH_OFFSET, fraction
+
+
+class OSCEncoder:
+    """
+    OSC 1.0 message/bundle encoder.
+
+    Argument-less messages are cached whole. For messages with arguments,
+    each (address, argument layout) compiles to one struct.Struct whose
+    first field is the cached address + type tag, so encoding is a single
+    pack() call. Bundles are assembled with pack_into in a preallocated
+    buffer; immediate bundles of fixed messages are cached too.
+    Not thread-safe (one buffer); use get_encoder() for a per-thread instance.
+    """
+
+    MAX_CACHED_BUNDLES = 256
+
+    def __init__(self, buffer_size=DEFAULT_BUFFER_SIZE):
+        self._buf = bytearray(buffer_size)
+        self._addresses = {}
+        self._layouts = {}
+        self._messages = {}
+        self._bundles = {}
+
+    def _address(self, address):
+        encoded = self._addresses.get(address)
+        if encoded is None:
+            encoded = self._addresses[address] = _pad(address.encode("utf-8"))
+        return encoded
+
+    def _ensure(self, size):
+        if size > len(self._buf):
+            self._buf = bytearray(max(size, len(self._buf) * 2))
+
+    def encode(self, address, args=()):
+        """Encode one OSC message (ints -> i, floats -> f, bytes -> b, else s)"""
+        if not args:
+            message = self._messages.get(address)
+            if message is None:
+                message = self._messages[address] = self._address(address) + b",\x00\x00\x00"
+            return message
+
+        tags = ""
+        fields = []
+        values = []
+        for arg in args:
+            if isinstance(arg, int):
+                tags += "i"
+                fields.append("i")
+                values.append(arg)
+            elif isinstance(arg, float):
+                tags += "f"
+                fields.append("f")
+                values.append(arg)
+            elif isinstance(arg, (bytes, bytearray)):
+                # int32 size + data padded to 4 (struct "Ns" zero-fills)
+                tags += "b"
+                fields.append(f"i{(len(arg) + 3) & ~3}s")
+                values.append(len(arg))
+                values.append(bytes(arg))
+            else:
+                encoded = str(arg).encode("utf-8")
+                tags += "s"
+                fields.append(f"{(len(encoded) + 4) & ~3}s")
+                values.append(encoded)
+
+        key = (address, tags, tuple(fields))
+        layout = self._layouts.get(key)
+        if layout is None:
+            prefix = self._address(address) + _pad(("," + tags).encode("ascii"))
+            layout = self._layouts[key] = (struct.Struct(f">{len(prefix)}s{''.join(fields)}"), prefix)
+        packer, prefix = layout
+        return packer.pack(prefix, *values)
+
+    def bundle(self, elements, when=None):
+        """
+        Encode an OSC bundle.
+
+        Args:
+            elements: Encoded messages/bundles (bytes) or (address, args) tuples
+            when: Unix time for the timetag (None = immediately)
+        """
+        encoded = [
+            element if isinstance(element, (bytes, bytearray))
+            else self.encode(element[0], element[1] if len(element) > 1 else ())
+            for element in elements
+        ]
+        size = 16 + sum(4 + len(element) for element in encoded)
+        self._ensure(size)
+        buf = self._buf
+        buf[0:8] = BUNDLE_TAG
+        _TIMETAG.pack_into(buf, 8, *timetag(when))
+        offset = 16
+        for element in encoded:
+            _INT.pack_into(buf, offset, len(element))
+            offset += 4
+            buf[offset:offset + len(element)] = element
+            offset += len(element)
+        return bytes(buf[:offset])
+
+    def action_bundle(self, action_ids, when=None):
+        """Bundle of /action/{id} messages (immediate bundles are cached)"""
+        if when is not None:
+            return self.bundle([self.encode(f"/action/{a}") for a in action_ids], when)
+        key = tuple(action_ids)
+        packet = self._bundles.get(key)
+        if packet is None:
+            packet = self.bundle([self.encode(f"/action/{a}") for a in key])
+            if len(self._bundles) >= self.MAX_CACHED_BUNDLES:
+                self._bundles.clear()
+            self._bundles[key] = packet
+        return packet
+
+
+_local = threading.local()
+
+
+def get_encoder():
+    """Per-thread encoder (the pack buffer is reused between calls)"""
+    encoder = getattr(_local, "encoder", None)
+    if encoder is None:
+        encoder = _local.encoder = OSCEncoder()
+    return encoder
+
+
+def encode_message(address, args=()):
+    return get_encoder().encode(address, args)
+
+
+def action_message(action_id):
+    """Cached /action/{id} message"""
+    return get_encoder().encode(f"/action/{action_id}")
+
+
+def action_bundle(action_ids, when=None):
+    """One bundle that runs the given actions in order"""
+    return get_encoder().action_bundle(action_ids, when)
+
+
+# ============================================================================
+# DECODING
+# ============================================================================
+
+class OSCDecodeError(ValueError):
+    """Malformed OSC packet"""
+
+
+def _read_string(data, offset):
+    end = data.find(b"\x00", offset)
+    if end < 0:
+        raise OSCDecodeError("Unterminated string")
+    return data[offset:end].decode("utf-8", "replace"), (end + 4) & ~3
+
+
+def decode_message(data):
+    """
+    Decode one OSC message.
+
+    Returns:
+        (address, args) with args as a tuple; T/F/N map to True/False/None
+    """
+    address, offset = _read_string(data, 0)
+    if not address.startswith("/"):
+        raise OSCDecodeError(f"Bad address: {address!r}")
+    if offset >= len(data):
+        return address, ()  # old-style message without a type tag
+    tags, offset = _read_string(data, offset)
+    if not tags.startswith(","):
+        raise OSCDecodeError(f"Bad type tag: {tags!r}")
+    args = []
+    try:
+        for tag in tags[1:]:
+            if tag == "i":
+                args.append(_INT.unpack_from(data, offset)[0])
+                offset += 4
+            elif tag == "f":
+                args.append(_FLOAT.unpack_from(data, offset)[0])
+                offset += 4
+            elif tag == "s":
+                value, offset = _read_string(data, offset)
+                args.append(value)
+            elif tag == "b":
+                size = _INT.unpack_from(data, offset)[0]
+                args.append(bytes(data[offset + 4:offset + 4 + size]))
+                offset += 4 + ((size + 3) & ~3)
+            elif tag == "h":
+                args.append(_INT64.unpack_from(data, offset)[0])
+                offset += 8
+            elif tag == "d":
+                args.append(_DOUBLE.unpack_from(data, offset)[0])
+                offset += 8
+            elif tag in "TFN":
+                args.append({"T": True, "F": False, "N": None}[tag])
+            else:
+                raise OSCDecodeError(f"Unsupported type tag: {tag!r}")
+    except struct.error as e:
+        raise OSCDecodeError(f"Truncated message: {e}")
+    return address, tuple(args)
+
+
+def decode_packet(data):
+    """
+    Decode a datagram (message or bundle, bundles flattened in order).
+
+    Returns:
+        List of (address, args)
+    """
+    if not data.startswith(BUNDLE_TAG):
+        return [decode_message(data)]
+    messages = []
+    offset = 16
+    while offset + 4 <= len(data):
+        size = _INT.unpack_from(data, offset)[0]
+        offset += 4
+        if size < 0 or offset + size > len(data):
+            raise OSCDecodeError("Truncated bundle element")
+        messages.extend(decode_packet(data[offset:offset + size]))
+        offset += size
+    return messages
+
+
+class OSCSender:
+    """Persistent UDP socket to REAPER's OSC port"""
+
+    def __init__(self, host=REAPER_OSC_HOST, port=REAPER_OSC_PORT):
+        self.address = (host, port)
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._lock = threading.Lock()
+
+    def send_packet(self, packet):
+        with self._lock:
+            self._sock.sendto(packet, self.address)
+
+    def send(self, address, args=()):
+        self.send_packet(encode_message(address, args))
+
+    def send_actions(self, action_ids, when=None):
+        """Send several actions as one bundle (a single action as a plain message)"""
+        action_ids = list(action_ids)
+        if len(action_ids) == 1 and when is None:
+            self.send_packet(action_message(action_ids[0]))
+        else:
+            self.send_packet(action_bundle(action_ids, when))
+
+    def close(self):
+        self._sock.close()
+
+
+# ============================================================================
+# MICROBENCHMARK
+# ============================================================================
+
+def _legacy_build(path, args):
+    """Concatenating encoder the bridges used before this module"""
+    message = path.encode('utf-8') + b'\x00' * (4 - (len(path) % 4))
+    if args:
+        type_tag = ',' + ''.join('i' if isinstance(a, int) else 'f' if isinstance(a, float) else 's' for a in args)
+        message += type_tag.encode('utf-8') + b'\x00' * (4 - (len(type_tag) % 4))
+        for arg in args:
+            if isinstance(arg, int):
+                message += struct.pack('>i', arg)
+            elif isinstance(arg, float):
+                message += struct.pack('>f', arg)
+            else:
+                arg_bytes = str(arg).encode('utf-8')
+                message += arg_bytes + b'\x00' * (4 - (len(arg_bytes) % 4))
+    else:
+        message += b',\x00\x00\x00'
+    return message
+
+
+def benchmark(iterations=100000):
+    """
+    Encode cost per message (µs): legacy concatenation vs. this encoder.
+    """
+    cases = {
+        "action (no args)": ("/action/40029", ()),
+        "int+float+str": ("/track/3/volume", (3, 0.716, "db")),
+        "float": ("/tempo/raw", (128.0,)),
+    }
+
+    def timed(fn):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            fn()
+        return (time.perf_counter() - start) / iterations * 1e6
+
+    encoder = get_encoder()
+    results = {}
+    for name, (address, args) in cases.items():
+        assert encoder.encode(address, args) == _legacy_build(address, list(args))
+        results[name] = {
+            "legacy_us": timed(lambda: _legacy_build(address, list(args))),
+            "encoder_us": timed(lambda: encoder.encode(address, args)),
+        }
+
+    actions = [40297, 40939, 6]
+    results["3 actions"] = {
+        "legacy_us": timed(lambda: [_legacy_build(f"/action/{a}", []) for a in actions]),
+        "encoder_us": timed(lambda: action_bundle(actions)),
+    }
+    return results
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="DAWRV OSC encoder")
+    parser.add_argument("--benchmark", action="store_true", help="Measure encode cost per message")
+    parser.add_argument("--iterations", type=int, default=100000, help="Benchmark iterations")
+    parser.add_argument("--actions", nargs="+", type=int, help="Send action IDs to REAPER as one bundle")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        res = benchmark(args.iterations)
+        print(f"{'message':<20} {'legacy µs':>10} {'encoder µs':>11}")
+        for name, r in res.items():
+            print(f"{name:<20} {r['legacy_us']:>10.3f} {r['encoder_us']:>11.3f}")
+        print("(3 actions: three separate messages vs. one bundle)")
+    elif args.actions:
+        sender = OSCSender()
+        sender.send_actions(args.actions)
+        sender.close()
+        print(f"✅ Sent {len(args.actions)} action(s) to {sender.address[0]}:{sender.address[1]}", file=sys.stderr)
+    else:
+        parser.print_help()
@@ -0,0 +1,507 @@
+#!/usr/bin/env python3
+"""
+REAPER State Mirror - Live project state from REAPER's OSC feedback
+
+Queries like "what's the tempo" or "is track 3 muted" used to spawn a Lua
+script through `reaper -nonewinst -run`, which takes seconds. REAPER can
+push OSC feedback to a device port instead; this module listens there and
+keeps an in-memory mirror that is updated one message at a time:
+
+- transport: playing, recording, paused, repeat, position (s), beat
+- tempo (BPM) and time signature
+- tracks: name, volume, volume_db, pan, mute, solo, arm, selected
+- markers and regions: name, number, time (s)
+- FX names per track (/track/{n}/fx/{slot}/name)
+
+Queries are dict lookups (tracks by number or by name) and callers can
+subscribe to changes per topic.
+
+REAPER setup: Preferences > Control/OSC/web > Add > OSC, mode "Configure
+device IP+local port", device port = DAWRV_REAPER_FEEDBACK_PORT (9000).
+Track and marker numbers are the ones REAPER sends, i.e. relative to the
+surface's bank (set "Tracks per bank" high enough to cover the project).
+Time signature is not in REAPER's default pattern file; add /timesig (two
+ints) or /timesig/str ("7/8") to the .ReaperOSC file if you need it; the
+same goes for numbered regions (/region/{n}/name, /region/{n}/time).
+
+Usage:
+    python3 reaper_state.py                     # print changes as they arrive
+    python3 reaper_state.py --capture fb.jsonl  # record raw feedback
+    python3 reaper_state.py --replay fb.jsonl --port 9100   # replay to a port
+"""
+import os
+import sys
+import json
+import time
+import socket
+import itertools
+import threading
+
+from reaper_osc import OSCDecodeError, decode_packet
+
+REAPER_FEEDBACK_HOST = os.environ.get("DAWRV_REAPER_FEEDBACK_HOST", "127.0.0.1")
+REAPER_FEEDBACK_PORT = int(os.environ.get("DAWRV_REAPER_FEEDBACK_PORT", "9000"))
+
+TOPICS = ("transport", "tempo", "time_signature", "track", "marker", "region", "fx")
+
+
+def _flag(args):
+    # REAPER sends toggles as float 1.0/0.0; a bare message means "on"
+    return bool(args[0]) if args else True
+
+
+def _number(args):
+    return float(args[0])
+
+
+def _text(args):
+    return str(args[0]) if args else ""
+
+
+# address -> (transport field, converter)
+_TRANSPORT = {
+    "/play": ("playing", _flag),
+    "/record": ("recording", _flag),
+    "/pause": ("paused", _flag),
+    "/repeat": ("repeat", _flag),
+    "/time": ("position", _number),
+    "/beat/str": ("beat", _text),
+}
+
+# /track/{n}/... suffix -> (track field, converter)
+_TRACK = {
+    "name": ("name", _text),
+    "volume": ("volume", _number),
+    "volume/db": ("volume_db", _number),
+    "pan": ("pan", _number),
+    "mute": ("mute", _flag),
+    "solo": ("solo", _flag),
+    "recarm": ("arm", _flag),
+    "select": ("selected", _flag),
+}
+
+# /marker/{n}/... and /region/{n}/... suffix -> (field, converter)
+_MARKER = {
+    "name": ("name", _text),
+    "number/str": ("number", _text),
+    "time": ("time", _number),
+}
+
+
+def _new_track(number):
+    return {
+        "number": number, "name": "", "volume": None, "volume_db": None, "pan": None,
+        "mute": False, "solo": False, "arm": False, "selected": False,
+    }
+
+
+class ReaperStateMirror:
+    """
+    Incrementally updated copy of REAPER's state, fed by OSC feedback.
+
+    Every update is O(1): the address is split once and looked up in a
+    fixed table. Subscribers are called on the listener thread with
+    (topic, key, value) only when a value actually changes.
+    """
+
+    def __init__(self, host=REAPER_FEEDBACK_HOST, port=REAPER_FEEDBACK_PORT):
+        self.address = (host, port)
+        self.transport = {
+            "playing": False, "recording": False, "paused": False,
+            "repeat": False, "position": 0.0, "beat": None,
+        }
+        self.tempo = None
+        self.time_signature = None
+        self.tracks = {}
+        self.markers = {}
+        self.regions = {}
+        self.fx = {}
+        self._track_names = {}
+        self.version = 0
+        self.updated_at = None
+        self.stats = {'packets': 0, 'messages': 0, 'ignored': 0, 'errors': 0}
+
+        self._lock = threading.RLock()
+        self._subscribers = {}
+        self._tokens = itertools.count(1)
+        self._sock = None
+        self._thread = None
+        self.is_running = False
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def track(self, number):
+        """Track state by REAPER track number (None if never reported)"""
+        with self._lock:
+            track = self.tracks.get(int(number))
+            return dict(track) if track else None
+
+    def track_by_name(self, name):
+        """Track state by name (case-insensitive)"""
+        with self._lock:
+            number = self._track_names.get(name.strip().lower())
+            return dict(self.tracks[number]) if number is not None else None
+
+    def marker(self, number):
+        with self._lock:
+            marker = self.markers.get(int(number))
+            return dict(marker) if marker else None
+
+    def region(self, number):
+        with self._lock:
+            region = self.regions.get(int(number))
+            return dict(region) if region else None
+
+    def track_fx(self, number):
+        """FX names on a track by slot ({} if none reported)"""
+        with self._lock:
+            return dict(self.fx.get(int(number), {}))
+
+    def snapshot(self):
+        """Copy of the whole mirror (JSON-serializable)"""
+        with self._lock:
+            return {
+                "transport": dict(self.transport),
+                "tempo": self.tempo,
+                "time_signature": list(self.time_signature) if self.time_signature else None,
+                "tracks": {str(n): dict(t) for n, t in self.tracks.items()},
+                "markers": {str(n): dict(m) for n, m in self.markers.items()},
+                "regions": {str(n): dict(r) for n, r in self.regions.items()},
+                "fx": {str(n): {str(slot): name for slot, name in fx.items()} for n, fx in self.fx.items()},
+                "version": self.version,
+                "updated_at": self.updated_at,
+            }
+
+    # ------------------------------------------------------------------
+    # Subscriptions
+    # ------------------------------------------------------------------
+
+    def subscribe(self, callback, topic=None):
+        """
+        Call callback(topic, key, value) on every change.
+
+        Args:
+            callback: Called on the listener thread; keep it short
+            topic: One of TOPICS, or None for all changes
+
+        Returns:
+            Token for unsubscribe()
+        """
+        if topic is not None and topic not in TOPICS:
+            raise ValueError(f"Unknown topic: {topic}")
+        token = next(self._tokens)
+        with self._lock:
+            self._subscribers[token] = (topic, callback)
+        return token
+
+    def unsubscribe(self, token):
+        with self._lock:
+            self._subscribers.pop(token, None)
+
+    def _notify(self, changes):
+        with self._lock:
+            subscribers = list(self._subscribers.values())
+        for topic, key, value in changes:
+            for wanted, callback in subscribers:
+                if wanted is None or wanted == topic:
+                    try:
+                        callback(topic, key, value)
+                    except Exception as e:
+                        print(f"⚠️  State subscriber failed: {e}", file=sys.stderr)
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+
+    def _set(self, record, field, value, changes, topic, key):
+        if record.get(field) != value:
+            record[field] = value
+            changes.append((topic, key, value))
+
+    def _apply(self, address, args, changes):
+        entry = _TRANSPORT.get(address)
+        if entry is not None:
+            field, convert = entry
+            self._set(self.transport, field, convert(args), changes, "transport", field)
+            return True
+
+        if address == "/stop":
+            if _flag(args):
+                self._set(self.transport, "playing", False, changes, "transport", "playing")
+                self._set(self.transport, "recording", False, changes, "transport", "recording")
+            return True
+
+        if address == "/tempo/raw":
+            tempo = _number(args)
+            if self.tempo != tempo:
+                self.tempo = tempo
+                changes.append(("tempo", "bpm", tempo))
+            return True
+
+        if address in ("/timesig", "/timesig/str"):
+            if address == "/timesig":
+                signature = (int(args[0]), int(args[1]))
+            else:
+                num, denom = _text(args).split("/", 1)
+                signature = (int(num), int(denom))
+            if self.time_signature != signature:
+                self.time_signature = signature
+                changes.append(("time_signature", "signature", signature))
+            return True
+
+        # /track/{n}/{field...}, /marker/{n}/{field...}, /region/{n}/{field...}
+        parts = address.split("/", 3)
+        if len(parts) != 4 or not parts[2].isdigit():
+            return False
+        number = int(parts[2])
+        if parts[1] == "track" and parts[3].startswith("fx/"):
+            # /track/{n}/fx/{slot}/name
+            fx_parts = parts[3].split("/")
+            if len(fx_parts) != 3 or fx_parts[2] != "name" or not fx_parts[1].isdigit():
+                return False
+            slot = int(fx_parts[1])
+            names = self.fx.setdefault(number, {})
+            name = _text(args)
+            if names.get(slot, "") != name:
+                if name:
+                    names[slot] = name
+                else:
+                    names.pop(slot, None)
+                changes.append(("fx", (number, slot), name))
+            return True
+        if parts[1] == "track":
+            entry = _TRACK.get(parts[3])
+            if entry is None:
+                return False
+            field, convert = entry
+            track = self.tracks.get(number)
+            if track is None:
+                track = self.tracks[number] = _new_track(number)
+            value = convert(args)
+            if field == "name" and track["name"] != value:
+                old = track["name"].strip().lower()
+                if self._track_names.get(old) == number:
+                    del self._track_names[old]
+                if value:
+                    self._track_names[value.strip().lower()] = number
+            self._set(track, field, value, changes, "track", (number, field))
+            return True
+        if parts[1] == "marker":
+            entry = _MARKER.get(parts[3])
+            if entry is None:
+                return False
+            field, convert = entry
+            marker = self.markers.get(number)
+            if marker is None:
+                marker = self.markers[number] = {"name": "", "number": str(number), "time": None}
+            self._set(marker, field, convert(args), changes, "marker", (number, field))
+            return True
+        if parts[1] == "region":
+            entry = _MARKER.get(parts[3])
+            if entry is None:
+                return False
+            field, convert = entry
+            region = self.regions.get(number)
+            if region is None:
+                region = self.regions[number] = {"name": "", "number": str(number), "time": None}
+            self._set(region, field, convert(args), changes, "region", (number, field))
+            return True
+        return False
+
+    def apply(self, address, args=()):
+        """Apply one decoded feedback message; returns True if it was understood"""
+        changes = []
+        with self._lock:
+            try:
+                known = self._apply(address, args, changes)
+            except (ValueError, TypeError, IndexError):
+                self.stats['errors'] += 1
+                return False
+            self.stats['messages'] += 1
+            if not known:
+                self.stats['ignored'] += 1
+            if changes:
+                self.version += 1
+                self.updated_at = time.time()
+        if changes:
+            self._notify(changes)
+        return known
+
+    def feed(self, packet):
+        """Apply one raw feedback datagram (message or bundle)"""
+        try:
+            messages = decode_packet(packet)
+        except OSCDecodeError:
+            with self._lock:
+                self.stats['errors'] += 1
+            return
+        with self._lock:
+            self.stats['packets'] += 1
+        for address, args in messages:
+            self.apply(address, args)
+
+    # ------------------------------------------------------------------
+    # Listener
+    # ------------------------------------------------------------------
+
+    def start(self):
+        """Bind the feedback port and listen on a background thread"""
+        if self.is_running:
+            return True
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        try:
+            sock.bind(self.address)
+        except OSError as e:
+            sock.close()
+            print(f"⚠️  Could not bind OSC feedback port {self.address[1]}: {e}", file=sys.stderr)
+            return False
+        sock.settimeout(0.5)
+        self._sock = sock
+        self.address = sock.getsockname()
+        self.is_running = True
+        self._thread = threading.Thread(target=self._listen, daemon=True)
+        self._thread.start()
+        return True
+
+    def _listen(self):
+        while self.is_running:
+            try:
+                packet = self._sock.recv(65536)
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            if packet and self.is_running:
+                self.feed(packet)
+
+    def wait_for_version(self, version, timeout=1.0):
+        """Block until the mirror has moved past version (for tests/tools)"""
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            if self.version > version:
+                return True
+            time.sleep(0.005)
+        return self.version > version
+
+    def stop(self):
+        if not self.is_running:
+            return
+        self.is_running = False
+        try:
+            # Wake the blocked recv() instead of waiting for its timeout
+            self._sock.sendto(b"", self.address)
+        except OSError:
+            pass
+        if self._thread:
+            self._thread.join(timeout=1.0)
+        self._sock.close()
+
+
+_mirror = None
+_mirror_lock = threading.Lock()
+
+
+def get_state_mirror(start=True):
+    """Process-wide mirror on the configured feedback port"""
+    global _mirror
+    with _mirror_lock:
+        if _mirror is None:
+            _mirror = ReaperStateMirror()
+            if start:
+                _mirror.start()
+        return _mirror
+
+
+# ============================================================================
+# CAPTURE / REPLAY
+# ============================================================================
+
+def capture(path, host=REAPER_FEEDBACK_HOST, port=REAPER_FEEDBACK_PORT, duration=None):
+    """Record raw feedback datagrams as JSONL ({"t": offset_s, "hex": ...})"""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind((host, port))
+    sock.settimeout(0.5)
+    start = time.time()
+    count = 0
+    try:
+        with open(path, "w") as f:
+            while duration is None or time.time() - start < duration:
+                try:
+                    packet = sock.recv(65536)
+                except socket.timeout:
+                    continue
+                f.write(json.dumps({"t": round(time.time() - start, 6), "hex": packet.hex()}) + "\n")
+                count += 1
+    except KeyboardInterrupt:
+        pass
+    finally:
+        sock.close()
+    return count
+
+
+def load_capture(path):
+    """Read a capture file as a list of (offset_s, packet)"""
+    with open(path) as f:
+        return [
+            (entry["t"], bytes.fromhex(entry["hex"]))
+            for entry in (json.loads(line) for line in f if line.strip())
+        ]
+
+
+def replay(packets, host, port, speed=None):
+    """
+    Send captured packets to a port (a stand-in for REAPER).
+
+    Args:
+        packets: (offset_s, packet) pairs from load_capture()
+        speed: Playback speed factor (None = as fast as possible)
+    """
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    start = time.time()
+    try:
+        for offset, packet in packets:
+            if speed:
+                delay = offset / speed - (time.time() - start)
+                if delay > 0:
+                    time.sleep(delay)
+            sock.sendto(packet, (host, port))
+    finally:
+        sock.close()
+    return len(packets)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="DAWRV REAPER state mirror")
+    parser.add_argument("--host", default=REAPER_FEEDBACK_HOST, help="Feedback host")
+    parser.add_argument("--port", type=int, default=REAPER_FEEDBACK_PORT, help="Feedback port")
+    parser.add_argument("--capture", metavar="FILE", help="Record raw feedback to a JSONL file")
+    parser.add_argument("--duration", type=float, help="Capture duration in seconds")
+    parser.add_argument("--replay", metavar="FILE", help="Replay a capture to --host/--port")
+    parser.add_argument("--speed", type=float, help="Replay speed factor (default: as fast as possible)")
+    args = parser.parse_args()
+
+    if args.capture:
+        n = capture(args.capture, args.host, args.port, args.duration)
+        print(f"✅ Captured {n} packet(s) to {args.capture}", file=sys.stderr)
+        sys.exit(0)
+    if args.replay:
+        n = replay(load_capture(args.replay), args.host, args.port, args.speed)
+        print(f"✅ Replayed {n} packet(s) to {args.host}:{args.port}", file=sys.stderr)
+        sys.exit(0)
+
+    mirror = ReaperStateMirror(args.host, args.port)
+    if not mirror.start():
+        sys.exit(1)
+    mirror.subscribe(lambda topic, key, value: print(f"{topic:<15} {key!s:<22} {value!r}"))
+    print(f"👂 Listening for REAPER feedback on {mirror.address[0]}:{mirror.address[1]}", file=sys.stderr)
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        mirror.stop()
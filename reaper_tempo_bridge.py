@@ -7,8 +7,19 @@ import sys
 import os
 import tempfile
 
+from reaper_command_server import try_call
+
 def execute_tempo_command(command, value=None):
     """Execute a tempo command in REAPER"""
+    # Resident Lua command server: one defer cycle instead of a REAPER launch
+    args = [command] if value is None else [command, value]
+    result = try_call("tempo", *args)
+    if result is not None:
+        if command == "get":
+            print(f"Current tempo: {result} BPM", file=sys.stderr)
+            return float(result)
+        return True
+
     try:
         # Path to tempo script
         home_dir = os.path.expanduser("~")
@@ -110,7 +121,19 @@ if __name__ == "__main__":
             print(f"Invalid value: {sys.argv[2]}", file=sys.stderr)
             sys.exit(1)
     
-    result = execute_tempo_command(command, value)
+    # Resident daemon (reaper_bridge_daemon.py) if running, else run here
+    from reaper_bridge_client import forward
+    response = forward("tempo", command=command, value=value)
+    if response is None:
+        result = execute_tempo_command(command, value)
+    elif response.get("ok"):
+        result = response["result"].get("value")
+        if result is None:
+            result = True
+    else:
+        # Not retried here: the daemon may already have changed the tempo
+        print(f"❌ Bridge daemon tempo {command} failed: {response.get('error')}", file=sys.stderr)
+        result = None
     
     if command == "get" and isinstance(result, (int, float)):
         print(result)
@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+REAPER Tempo Map - Local bar/measure to time conversion
+
+"Go to bar 32" used to generate a Lua script whose only job was to call
+TimeMap_GetMeasureInfo and turn the bar into seconds, and REAPER had to
+run it each time. The tempo and time-signature map changes rarely, so
+dawrv_command_server.lua exports it to server/tempo_map.txt whenever the
+project's tempo markers change, and this module:
+
+- loads the map once and reloads it only when that file changes (one stat)
+- converts bars to seconds locally, including tempo changes, linear
+  tempo ramps and time-signature changes (microseconds per lookup)
+- seeks with OSC (/time + play, loop range for "loop 8 to 16") as one
+  bundle, so Lua is only involved when the map itself changes
+
+Map file (tab-separated):
+    base<TAB>bpm<TAB>num<TAB>denom
+    marker<TAB>time<TAB>qn<TAB>measure<TAB>bpm<TAB>num<TAB>denom<TAB>linear
+
+Usage:
+    from reaper_tempo_map import get_tempo_map
+
+    tempo_map = get_tempo_map()
+    if tempo_map:
+        start, end = tempo_map.measure_bounds(32)
+"""
+import os
+import sys
+import math
+import time
+import bisect
+import threading
+
+from reaper_command_server import COMMAND_SERVER_DIR, get_command_client, try_call
+from reaper_osc import get_encoder
+
+TEMPO_MAP_PATH = os.environ.get(
+    "DAWRV_TEMPO_MAP_PATH", os.path.join(COMMAND_SERVER_DIR, "tempo_map.txt")
+)
+
+# REAPER actions used for seeking (same as the Lua bar commands)
+PLAY_ACTION = 1007
+TOGGLE_REPEAT_ACTION = 1068
+
+
+class TempoMapError(ValueError):
+    """Malformed tempo map export"""
+
+
+class TempoMap:
+    """
+    Piecewise tempo / time signature map.
+
+    Tempo segments are indexed by quarter-note position and time
+    signature regions by measure, so a bar lookup is two bisects plus a
+    little arithmetic.
+    """
+
+    def __init__(self, base_bpm=120.0, num=4, denom=4, markers=()):
+        """
+        Args:
+            base_bpm, num, denom: Project tempo and time signature at time 0
+            markers: (time, qn, measure, bpm, num, denom, linear) tuples as
+                     exported by REAPER; num/denom <= 0 means "unchanged"
+        """
+        markers = sorted(markers)
+        self.base_bpm = float(base_bpm)
+        self.markers = markers
+
+        # Tempo segments: start qn, start time, bpm, end qn/time/bpm for ramps
+        self._seg_qn = [0.0]
+        self._segments = [(0.0, 0.0, self.base_bpm, None)]
+        for i, (t, qn, _, bpm, _, _, linear) in enumerate(markers):
+            ramp = None
+            if linear and i + 1 < len(markers):
+                t1, qn1, _, bpm1 = markers[i + 1][:4]
+                if abs(bpm1 - bpm) > 1e-9 and qn1 > qn:
+                    ramp = (qn1, t1, bpm1)
+            if qn <= 0.0:
+                self._segments[0] = (0.0, t, bpm, ramp)
+            else:
+                self._seg_qn.append(qn)
+                self._segments.append((qn, t, bpm, ramp))
+
+        # Time signature regions: start measure, start qn, quarter notes per measure
+        self._region_measure = [0]
+        self._regions = [(0, 0.0, num * 4.0 / denom)]
+        for t, qn, measure, _, ts_num, ts_denom, _ in markers:
+            if ts_num <= 0 or ts_denom <= 0:
+                continue
+            region = (measure, qn, ts_num * 4.0 / ts_denom)
+            if measure <= 0:
+                self._regions[0] = (0, 0.0, region[2])
+            else:
+                self._region_measure.append(measure)
+                self._regions.append(region)
+
+    @classmethod
+    def from_text(cls, text):
+        base = (120.0, 4, 4)
+        markers = []
+        try:
+            for line in text.splitlines():
+                fields = line.split("\t")
+                if fields[0] == "base":
+                    base = (float(fields[1]), int(fields[2]), int(fields[3]))
+                elif fields[0] == "marker":
+                    markers.append((
+                        float(fields[1]), float(fields[2]), int(fields[3]), float(fields[4]),
+                        int(fields[5]), int(fields[6]), fields[7] == "1"
+                    ))
+        except (IndexError, ValueError) as e:
+            raise TempoMapError(f"Bad tempo map line {line!r}: {e}")
+        return cls(*base, markers=markers)
+
+    def qn_to_time(self, qn):
+        """Seconds at a quarter-note position"""
+        start_qn, start_t, bpm, ramp = self._segments[bisect.bisect_right(self._seg_qn, qn) - 1]
+        if ramp is None:
+            return start_t + (qn - start_qn) * 60.0 / bpm
+        # Tempo ramps linearly over quarter notes; the integral of 60/bpm is
+        # logarithmic, scaled so the segment ends exactly at REAPER's time
+        end_qn, end_t, end_bpm = ramp
+        slope = (end_bpm - bpm) / (end_qn - start_qn)
+        log_at = math.log((bpm + slope * (min(qn, end_qn) - start_qn)) / bpm)
+        log_end = math.log(end_bpm / bpm)
+        t = start_t + (end_t - start_t) * log_at / log_end
+        if qn > end_qn:
+            t += (qn - end_qn) * 60.0 / end_bpm
+        return t
+
+    def measure_to_qn(self, bar):
+        """Quarter-note position of the start of a 1-based bar"""
+        index = max(1, int(bar)) - 1
+        measure, qn, per_measure = self._regions[bisect.bisect_right(self._region_measure, index) - 1]
+        return qn + (index - measure) * per_measure
+
+    def measure_to_time(self, bar):
+        """Seconds at the start of a 1-based bar"""
+        return self.qn_to_time(self.measure_to_qn(bar))
+
+    def measure_bounds(self, bar):
+        """(start, end) seconds of a 1-based bar"""
+        return self.measure_to_time(bar), self.measure_to_time(max(1, int(bar)) + 1)
+
+    def bpm_at_qn(self, qn):
+        start_qn, _, bpm, ramp = self._segments[bisect.bisect_right(self._seg_qn, qn) - 1]
+        if ramp is None or qn >= ramp[0]:
+            return ramp[2] if ramp else bpm
+        return bpm + (ramp[2] - bpm) * (qn - start_qn) / (ramp[0] - start_qn)
+
+
+_cache = {"key": None, "map": None}
+_cache_lock = threading.Lock()
+
+
+def get_tempo_map(path=None, refresh=True, require_server=True):
+    """
+    Cached tempo map, reloaded only when the export file changes.
+
+    Args:
+        path: Export file (default TEMPO_MAP_PATH)
+        refresh: If there is no export yet, ask the command server for one
+        require_server: Only trust the export while the command server is
+                        running (it is what keeps the file current)
+
+    Returns:
+        TempoMap, or None if no map is available
+    """
+    path = path or TEMPO_MAP_PATH
+    if require_server and not get_command_client().is_alive():
+        return None
+    try:
+        st = os.stat(path)
+    except OSError:
+        if refresh and try_call("tempomap") is not None:
+            return get_tempo_map(path, refresh=False, require_server=False)
+        return None
+
+    key = (path, st.st_mtime_ns, st.st_size)
+    with _cache_lock:
+        if _cache["key"] == key:
+            return _cache["map"]
+    try:
+        with open(path) as f:
+            tempo_map = TempoMap.from_text(f.read())
+    except (OSError, TempoMapError) as e:
+        print(f"⚠️  Could not load tempo map: {e}", file=sys.stderr)
+        return None
+    with _cache_lock:
+        _cache["key"] = key
+        _cache["map"] = tempo_map
+    return tempo_map
+
+
+def seek_packet(command, tempo_map, measure1, measure2=None):
+    """
+    OSC bundle for a bar command, or None if the command needs REAPER.
+
+    goto: /time; play: /time + play; loop: loop range + repeat toggle +
+    /time + play (same actions the Lua bar script runs).
+    """
+    encoder = get_encoder()
+    if command in ("goto", "play"):
+        start = tempo_map.measure_to_time(measure1 or 1)
+        elements = [("/time", (float(start),))]
+        if command == "play":
+            elements.append((f"/action/{PLAY_ACTION}", ()))
+        return encoder.bundle(elements)
+    if command == "loop":
+        first = int(measure1 or 1)
+        last = int(measure2 or first)
+        if last < first:
+            first, last = last, first
+        start = tempo_map.measure_to_time(first)
+        end = tempo_map.measure_to_time(last + 1)
+        return encoder.bundle([
+            ("/loop/start/time", (float(start),)),
+            ("/loop/end/time", (float(end),)),
+            (f"/action/{TOGGLE_REPEAT_ACTION}", ()),
+            ("/time", (float(start),)),
+            (f"/action/{PLAY_ACTION}", ()),
+        ])
+    return None
+
+
+# ============================================================================
+# MICROBENCHMARK
+# ============================================================================
+
+def benchmark(iterations=100000):
+    """µs per bar-to-time lookup on a map with tempo ramps and meter changes"""
+    markers = [(0.0, 0.0, 0, 120.0, 4, 4, False)]
+    qn, t = 0.0, 0.0
+    for i in range(1, 64):
+        qn += 16.0
+        t += 16.0 * 60.0 / (120.0 + (i - 1) % 8)
+        markers.append((t, qn, i * 4, 120.0 + i % 8, 7 if i % 5 == 0 else 4, 8 if i % 5 == 0 else 4, i % 3 == 0))
+    tempo_map = TempoMap(120.0, 4, 4, markers)
+    bars = [1 + (i * 37) % 250 for i in range(1000)]
+    start = time.perf_counter()
+    for i in range(iterations):
+        tempo_map.measure_to_time(bars[i % 1000])
+    return {"markers": len(markers), "us_per_lookup": (time.perf_counter() - start) / iterations * 1e6}
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="DAWRV tempo map")
+    parser.add_argument("bars", nargs="*", type=int, help="Bars to convert to seconds")
+    parser.add_argument("--path", default=TEMPO_MAP_PATH, help="Tempo map export")
+    parser.add_argument("--benchmark", action="store_true", help="Measure lookup cost")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        res = benchmark()
+        print(f"{res['markers']} markers: {res['us_per_lookup']:.2f} µs per bar lookup")
+        sys.exit(0)
+
+    tempo_map = get_tempo_map(args.path, require_server=False)
+    if tempo_map is None:
+        print(f"❌ No tempo map at {args.path} (is dawrv_command_server.lua running?)", file=sys.stderr)
+        sys.exit(1)
+    for bar in args.bars:
+        start, end = tempo_map.measure_bounds(bar)
+        print(f"bar {bar}: {start:.6f} - {end:.6f} s")
@@ -0,0 +1,879 @@
+#!/usr/bin/env python3
+"""
+DAWRV REAPER Bridge Test Suite
+==============================
+Unit tests for the REAPER-side Python modules. Everything runs against
+local stand-ins (UDP/UNIX sockets), so REAPER does not need to be running.
+"""
+
+import os
+import sys
+import pickle
+import socket
+import struct
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from reaper_bridge import build_osc_message
+from reaper_bridge_client import BridgeClient, encode_frame, read_frame, forward
+from reaper_bridge_daemon import ReaperBridgeDaemon
+from reaper_osc import (
+    OSCEncoder, OSCSender, BUNDLE_TAG, NTP_EPOCH_OFFSET, timetag, decode_packet, _legacy_build
+)
+from reaper_state import ReaperStateMirror, load_capture, replay
+from reaper_command_server import LuaCommandClient, StandInServer, CommandServerError
+from reaper_dispatch import DispatchQueue
+from reaper_name_resolver import NameResolver, phonetic_key
+from reaper_plugin_catalog import PluginCatalog, load_phonetic_corrections
+from reaper_extstate import ExtStateWatcher, SectionReader, convert, diff_values
+from reaper_action_catalog import Action, ActionCatalog, build_catalog, load_actions
+from reaper_tempo_map import TempoMap, get_tempo_map, seek_packet
+from reaper_http import HTTPConnectionPool, ReaperHTTPClient, Track, Transport, parse_response, _stand_in_server
+
+
+class _PlainUnpickler(pickle.Unpickler):
+    """Loads builtin types only, as a process whose __main__ is not the CLI would"""
+
+    def find_class(self, module, name):
+        if module not in ("builtins", "array", "copyreg", "_codecs"):
+            raise pickle.UnpicklingError(f"{module}.{name} in a cache file")
+        return super().find_class(module, name)
+
+
+def _load_plain(path):
+    with open(path, "rb") as f:
+        return _PlainUnpickler(f).load()
+
+
+# A cache pickled by a CLI run, naming a class on that run's __main__
+_MAIN_PICKLE = b"\x80\x04c__main__\nAction\n)\x81."
+
+
+class _OSCStandIn:
+    """UDP socket standing in for REAPER's OSC listener"""
+
+    def __init__(self):
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind(("127.0.0.1", 0))
+        self.sock.settimeout(1.0)
+        self.port = self.sock.getsockname()[1]
+
+    def recv(self):
+        return self.sock.recv(65536)
+
+    def close(self):
+        self.sock.close()
+
+
+class TestBridgeDaemon(unittest.TestCase):
+    """Tests for the resident bridge daemon and its client"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp(prefix="dawrv_bridge_test_")
+        self.socket_path = os.path.join(self.tmp_dir, "bridge.sock")
+        self.osc = _OSCStandIn()
+        self.daemon = ReaperBridgeDaemon(socket_path=self.socket_path, osc_port=self.osc.port)
+        self.assertTrue(self.daemon.start())
+
+    def tearDown(self):
+        self.daemon.stop()
+        self.osc.close()
+        os.rmdir(self.tmp_dir)
+
+    def test_frame_roundtrip(self):
+        """Test length-prefixed frames decode back to the message"""
+        frame = encode_frame({"id": 3, "op": "ping"})
+        data = [frame]
+
+        def read(n):
+            chunk, data[0] = data[0][:n], data[0][n:]
+            return chunk
+
+        self.assertEqual(read_frame(read), {"id": 3, "op": "ping"})
+        self.assertIsNone(read_frame(read))
+
+    def test_pipelined_actions_keep_order(self):
+        """Test pipelined requests are answered by ID and sent in order"""
+        client = BridgeClient(self.socket_path)
+        try:
+            ids = [client.submit("action", action_id=action) for action in (1007, 1016, 40029)]
+            responses = [client.wait(request_id) for request_id in ids]
+        finally:
+            client.close()
+        self.assertEqual([r["id"] for r in responses], ids)
+        self.assertTrue(all(r["ok"] and r["result"]["via"] == "osc" for r in responses))
+        self.assertEqual(
+            [self.osc.recv() for _ in ids],
+            [build_osc_message(f"/action/{a}", []) for a in (1007, 1016, 40029)]
+        )
+
+    def test_actions_op_sends_one_bundle(self):
+        """Test the actions op sends all actions in one bundle datagram"""
+        response = forward("actions", action_ids=[40297, 40939], socket_path=self.socket_path)
+        self.assertTrue(response["ok"])
+        self.assertEqual(response["result"]["via"], "osc-bundle")
+        self.assertTrue(self.osc.recv().startswith(BUNDLE_TAG))
+
+    def test_dispatch_op_sends_transport_immediately(self):
+        """Test the dispatch op queues actions and sends transport at once"""
+        response = forward("dispatch", action_id=1007, socket_path=self.socket_path)
+        self.assertEqual(response["result"]["kind"], "transport")
+        self.assertEqual(decode_packet(self.osc.recv()), [("/action/1007", ())])
+        self.assertFalse(forward("dispatch", param="tempo", delta=5, socket_path=self.socket_path)["ok"])
+
+    def test_state_op_without_mirror(self):
+        """Test the state op fails cleanly when feedback is disabled"""
+        response = forward("state", socket_path=self.socket_path)
+        self.assertFalse(response["ok"])
+
+    def test_errors_are_reported_per_request(self):
+        """Test an unknown op fails without closing the connection"""
+        response = forward("nope", socket_path=self.socket_path)
+        self.assertFalse(response["ok"])
+        self.assertTrue(forward("ping", socket_path=self.socket_path)["ok"])
+
+    def test_forward_without_daemon(self):
+        """Test CLI forwarding reports no daemon so scripts run locally"""
+        self.assertIsNone(forward("ping", socket_path=os.path.join(self.tmp_dir, "missing.sock")))
+
+    def test_forward_timeout_is_an_error(self):
+        """Test a request sent to a daemon that never answers fails instead of running locally"""
+        path = os.path.join(self.tmp_dir, "silent.sock")
+        silent = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        silent.bind(path)
+        silent.listen(1)
+        try:
+            response = forward("action", timeout=0.2, socket_path=path, action_id=40364)
+        finally:
+            silent.close()
+            os.remove(path)
+        self.assertIsNotNone(response)
+        self.assertFalse(response["ok"])
+        self.assertIn("timed out", response["error"])
+
+
+class TestOSCEncoder(unittest.TestCase):
+    """Tests for the cached OSC encoder and bundles"""
+
+    def setUp(self):
+        self.encoder = OSCEncoder()
+
+    def test_messages_match_legacy_encoding(self):
+        """Test cached/compiled encoding is byte-identical to the old builder"""
+        cases = [
+            ("/action/40029", ()),
+            ("/tempo/raw", (128.0,)),
+            ("/track/3/volume", (3, 0.716, "db")),
+            ("/track/12/name", ("Lead Vox",)),
+            ("/abc", ("abcd", -5)),
+        ]
+        for address, args in cases:
+            expected = _legacy_build(address, list(args))
+            self.assertEqual(self.encoder.encode(address, args), expected)
+            # Second call goes through the cached layout
+            self.assertEqual(self.encoder.encode(address, args), expected)
+
+    def test_blob_argument(self):
+        """Test blobs are size-prefixed and padded to 4 bytes"""
+        message = self.encoder.encode("/b", (b"\x01\x02\x03",))
+        self.assertEqual(message, b"/b\x00\x00,b\x00\x00" + struct.pack(">i", 3) + b"\x01\x02\x03\x00")
+
+    def test_bundle_layout(self):
+        """Test bundle header, immediate timetag and element sizes"""
+        packet = self.encoder.action_bundle([40297, 6])
+        first = self.encoder.encode("/action/40297")
+        second = self.encoder.encode("/action/6")
+        self.assertEqual(
+            packet,
+            BUNDLE_TAG + struct.pack(">II", 0, 1)
+            + struct.pack(">i", len(first)) + first
+            + struct.pack(">i", len(second)) + second
+        )
+        self.assertIs(self.encoder.action_bundle([40297, 6]), packet)
+
+    def test_decode_roundtrip(self):
+        """Test decoding messages and flattened bundles"""
+        message = self.encoder.encode("/track/2/name", ("Bass",))
+        bundle = self.encoder.bundle([("/tempo/raw", (120.0,)), ("/play", (1.0,))])
+        self.assertEqual(decode_packet(message), [("/track/2/name", ("Bass",))])
+        self.assertEqual(decode_packet(bundle), [("/tempo/raw", (120.0,)), ("/play", (1.0,))])
+
+    def test_timetag(self):
+        """Test Unix time converts to NTP seconds and fraction"""
+        self.assertEqual(timetag(None), (0, 1))
+        self.assertEqual(timetag(10.5), (10 + NTP_EPOCH_OFFSET, 1 << 31))
+
+    def test_sender_sends_actions_in_one_datagram(self):
+        """Test multi-action commands arrive as a single bundle"""
+        osc = _OSCStandIn()
+        sender = OSCSender(port=osc.port)
+        try:
+            sender.send_actions([40297, 40939, 6])
+            sender.send_actions([1007])
+            self.assertEqual(osc.recv(), self.encoder.action_bundle([40297, 40939, 6]))
+            self.assertEqual(osc.recv(), self.encoder.encode("/action/1007"))
+        finally:
+            sender.close()
+            osc.close()
+
+
+def _captured_feedback(encoder):
+    """Feedback as REAPER sends it on connect and during playback"""
+    return [
+        (0.0, encoder.bundle([
+            ("/tempo/raw", (120.0,)),
+            ("/timesig/str", ("4/4",)),
+            ("/track/1/name", ("Drums",)),
+            ("/track/1/volume", (0.716,)),
+            ("/track/1/mute", (0.0,)),
+            ("/track/2/name", ("Lead Vox",)),
+            ("/track/2/pan", (0.5,)),
+            ("/track/2/recarm", (1.0,)),
+            ("/marker/1/name", ("Chorus",)),
+            ("/marker/1/time", (32.0,)),
+        ])),
+        (0.01, encoder.encode("/play", (1.0,))),
+        (0.02, encoder.encode("/time", (1.5,))),
+        (0.03, encoder.encode("/track/1/mute", (1.0,))),
+        (0.04, encoder.encode("/track/2/name", ("Vocals",))),
+        (0.05, encoder.encode("/tempo/raw", (128.0,))),
+        (0.06, encoder.encode("/unknown/path", (1,))),
+        (0.07, encoder.encode("/stop", (1.0,))),
+    ]
+
+
+class TestStateMirror(unittest.TestCase):
+    """Tests for the OSC feedback state mirror"""
+
+    def setUp(self):
+        self.mirror = ReaperStateMirror("127.0.0.1", 0)
+        self.assertTrue(self.mirror.start())
+        self.packets = _captured_feedback(OSCEncoder())
+
+    def tearDown(self):
+        self.mirror.stop()
+
+    def _replay(self):
+        done = threading.Event()
+        self.mirror.subscribe(
+            lambda topic, key, value: done.set() if key == "playing" and value is False else None,
+            "transport"
+        )
+        replay(self.packets, *self.mirror.address)
+        self.assertTrue(done.wait(1.0))
+
+    def test_replayed_feedback_builds_state(self):
+        """Test a replayed capture over UDP updates the mirror"""
+        self._replay()
+        self.assertEqual(self.mirror.tempo, 128.0)
+        self.assertEqual(self.mirror.time_signature, (4, 4))
+        self.assertFalse(self.mirror.transport["playing"])
+        self.assertAlmostEqual(self.mirror.transport["position"], 1.5)
+        self.assertTrue(self.mirror.track(1)["mute"])
+        self.assertAlmostEqual(self.mirror.track(1)["volume"], 0.716, places=5)
+        self.assertTrue(self.mirror.track(2)["arm"])
+        self.assertEqual(self.mirror.marker(1)["time"], 32.0)
+        self.assertEqual(self.mirror.stats["ignored"], 1)
+
+    def test_track_lookup_by_name_follows_renames(self):
+        """Test the name index tracks renamed tracks"""
+        self._replay()
+        self.assertEqual(self.mirror.track_by_name("vocals")["number"], 2)
+        self.assertIsNone(self.mirror.track_by_name("Lead Vox"))
+
+    def test_subscribers_get_changes_only(self):
+        """Test subscribers are called per topic and only on change"""
+        changes = []
+        self.mirror.subscribe(lambda topic, key, value: changes.append((key, value)), "track")
+        self.mirror.apply("/track/3/solo", (1.0,))
+        self.mirror.apply("/track/3/solo", (1.0,))
+        self.mirror.apply("/tempo/raw", (90.0,))
+        self.assertEqual(changes, [((3, "solo"), True)])
+
+    def test_capture_file_roundtrip(self):
+        """Test capture files load back as (offset, packet) pairs"""
+        import json
+        with tempfile.NamedTemporaryFile("w", suffix=".jsonl", delete=False) as f:
+            for offset, packet in self.packets:
+                f.write(json.dumps({"t": offset, "hex": packet.hex()}) + "\n")
+        try:
+            self.assertEqual(load_capture(f.name), self.packets)
+        finally:
+            os.unlink(f.name)
+
+
+class TestReaperHTTP(unittest.TestCase):
+    """Tests for the pooled, coalescing web interface client"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = _stand_in_server()
+        cls.host, cls.port = cls.server.server_address
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def test_parse_transport_and_track_lines(self):
+        """Test TRANSPORT/TRACK lines parse into objects, unknown lines into tuples"""
+        items = parse_response(
+            "TRANSPORT\t5\t3.25\t1\t0:03.250\t2.3.00\n"
+            "TRACK\t2\tLead Vox\t74\t0.5\t-0.25\t-1500\t-1500\t1.0\t3\t1\t0\t1\t0\n"
+            "NTRACK\t4\n"
+        )
+        transport, track, ntrack = items
+        self.assertIsInstance(transport, Transport)
+        self.assertTrue(transport.playing and transport.recording and transport.repeat)
+        self.assertIsInstance(track, Track)
+        self.assertEqual(track.name, "Lead Vox")
+        self.assertTrue(track.selected and track.muted and track.armed)
+        self.assertFalse(track.soloed)
+        self.assertEqual(ntrack, ("NTRACK", "4"))
+
+    def test_pool_reuses_connections(self):
+        """Test sequential requests share one keep-alive connection"""
+        pool = HTTPConnectionPool(self.host, self.port, size=1)
+        try:
+            for _ in range(5):
+                status, _ = pool.get("/_/TRANSPORT")
+                self.assertEqual(status, 200)
+            self.assertEqual(pool.stats["connects"], 1)
+        finally:
+            pool.close()
+
+    def test_commands_in_window_are_batched(self):
+        """Test commands within the window go out as one request, answered per command"""
+        client = ReaperHTTPClient(self.host, self.port, window=0.05)
+        try:
+            futures = [client.submit(c) for c in ("ACTION/1007", "TRANSPORT", "TRANSPORT", "TRACK/1")]
+            results = [f.result(timeout=2) for f in futures]
+        finally:
+            client.close()
+        self.assertEqual(client.stats["batches"], 1)
+        self.assertEqual(client.stats["deduplicated"], 1)
+        self.assertEqual(results[0], [])
+        self.assertIsInstance(results[1][0], Transport)
+        self.assertEqual(results[1], results[2])
+        self.assertEqual(results[3][0].name, "Drums")
+
+
+class TestCommandServer(unittest.TestCase):
+    """Tests for the Lua command server client against a stand-in server"""
+
+    def setUp(self):
+        self.server_dir = tempfile.mkdtemp(prefix="dawrv_cmdserver_test_")
+        self.server = StandInServer(self.server_dir, tick=0.005, handlers={
+            "ping": lambda: "pong",
+            "tempo": lambda command, value=None: f"{float(value or 120):.2f}",
+            "fail": lambda: 1 / 0,
+            "track": lambda number, param, value: "ok",
+        })
+        self.client = LuaCommandClient(self.server_dir, poll_interval=0.001)
+
+    def tearDown(self):
+        self.client.close()
+        self.server.stop()
+        import shutil
+        shutil.rmtree(self.server_dir, ignore_errors=True)
+
+    def test_call_roundtrip(self):
+        """Test a command is executed and its result returned"""
+        self.server.start()
+        self.assertEqual(self.client.call("tempo", "set", 128), "128.00")
+        self.assertTrue(self.client.is_alive())
+
+    def test_pipelined_commands_run_in_order(self):
+        """Test pipelined submits are acked by ID and executed in submit order"""
+        self.server.start()
+        ids = [self.client.submit("tempo", "set", bpm) for bpm in (100, 110, 120)]
+        self.assertEqual([self.client.wait(i) for i in ids], ["100.00", "110.00", "120.00"])
+        self.assertEqual([args[2] for args in self.server.executed], ["100", "110", "120"])
+
+    def test_batch_shares_one_undo_block(self):
+        """Test a batch runs with a single undo label"""
+        self.server.start()
+        results = self.client.call_batch(
+            [("track", n, "B_MUTE", 1) for n in (1, 2, 3)], undo="DAWRV: mute tracks"
+        )
+        self.assertEqual(results, ["ok", "ok", "ok"])
+        self.assertEqual(self.server.undo_blocks, ["DAWRV: mute tracks"])
+
+    def test_failed_command_raises(self):
+        """Test a command error in the server is raised to the caller"""
+        self.server.start()
+        with self.assertRaises(CommandServerError):
+            self.client.call("fail")
+        self.assertEqual(self.client.call("ping"), "pong")
+
+    def test_timeout_withdraws_unread_batch(self):
+        """Test a batch the server never picked up is removed on timeout"""
+        self.assertFalse(self.client.is_alive())
+        with self.assertRaises(CommandServerError):
+            self.client.call("ping", timeout=0.05)
+        self.assertEqual(os.listdir(os.path.join(self.server_dir, "inbox")), [])
+
+    def _wait_for_acks(self, count):
+        deadline = time.time() + 2
+        while self.client.stats['acks'] < count and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(self.client.stats['acks'], count)
+
+    def test_late_ack_dropped(self):
+        """Test the ack of a command that timed out after REAPER picked it up is not kept"""
+        self.server.handlers["slow"] = lambda: time.sleep(0.2) or "late"
+        self.server.start()
+        with self.assertRaises(CommandServerError):
+            self.client.call("slow", timeout=0.1)
+        self._wait_for_acks(1)
+        self.assertEqual((self.client._results, self.client._abandoned), ({}, set()))
+        self.assertEqual(self.client.call("ping"), "pong")
+
+    def test_failed_batch_keeps_no_results(self):
+        """Test results after the first failure in call_batch are not kept"""
+        self.server.start()
+        with self.assertRaises(CommandServerError):
+            self.client.call_batch([("fail",), ("ping",), ("ping",)])
+        self._wait_for_acks(1)
+        self.assertEqual((self.client._results, self.client._abandoned), ({}, set()))
+
+
+class TestTempoMap(unittest.TestCase):
+    """Tests for the local bar-to-time tempo map"""
+
+    def test_constant_tempo(self):
+        """Test bars at 120 BPM 4/4 are two seconds long"""
+        tempo_map = TempoMap(120.0, 4, 4)
+        self.assertAlmostEqual(tempo_map.measure_to_time(1), 0.0)
+        self.assertAlmostEqual(tempo_map.measure_to_time(33), 64.0)
+        self.assertEqual(tempo_map.measure_bounds(2), (2.0, 4.0))
+
+    def test_tempo_and_meter_changes(self):
+        """Test a tempo change at bar 3 and a 7/8 section from bar 5"""
+        tempo_map = TempoMap(120.0, 4, 4, markers=[
+            (4.0, 8.0, 2, 60.0, 0, 0, False),      # bar 3: 60 BPM
+            (12.0, 16.0, 4, 60.0, 7, 8, False),    # bar 5: 7/8
+        ])
+        self.assertAlmostEqual(tempo_map.measure_to_time(3), 4.0)
+        self.assertAlmostEqual(tempo_map.measure_to_time(4), 8.0)
+        self.assertAlmostEqual(tempo_map.measure_to_time(5), 12.0)
+        self.assertAlmostEqual(tempo_map.measure_to_time(6), 15.5)   # 3.5 QN at 60 BPM
+
+    def test_linear_ramp_hits_marker_times(self):
+        """Test a tempo ramp is monotonic and ends exactly at the next marker"""
+        tempo_map = TempoMap(120.0, 4, 4, markers=[
+            (0.0, 0.0, 0, 120.0, 4, 4, True),
+            (5.5, 8.0, 2, 60.0, 0, 0, False),
+        ])
+        times = [tempo_map.qn_to_time(qn / 2) for qn in range(17)]
+        self.assertEqual(times, sorted(times))
+        self.assertAlmostEqual(tempo_map.measure_to_time(3), 5.5)
+        self.assertAlmostEqual(tempo_map.measure_to_time(4), 9.5)
+        self.assertAlmostEqual(tempo_map.bpm_at_qn(4.0), 90.0)
+
+    def test_export_is_cached_until_it_changes(self):
+        """Test the export file is parsed once and reloaded after a rewrite"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "tempo_map.txt")
+            with open(path, "w") as f:
+                f.write("base\t120.0\t4\t4\nmarker\t4.0\t8.0\t2\t60.0\t0\t0\t0\n")
+            first = get_tempo_map(path, require_server=False)
+            self.assertIs(get_tempo_map(path, require_server=False), first)
+            self.assertAlmostEqual(first.measure_to_time(4), 8.0)
+            with open(path, "w") as f:
+                f.write("base\t60.0\t3\t4\n")
+            os.utime(path, ns=(0, 10 ** 9))
+            second = get_tempo_map(path, require_server=False)
+            self.assertIsNot(second, first)
+            self.assertAlmostEqual(second.measure_to_time(2), 3.0)
+
+    def test_loop_seek_is_one_bundle(self):
+        """Test "loop 8 to 16" becomes loop range, repeat, seek and play in one packet"""
+        packet = seek_packet("loop", TempoMap(120.0, 4, 4), 16, 8)
+        self.assertEqual(decode_packet(packet), [
+            ("/loop/start/time", (14.0,)),
+            ("/loop/end/time", (32.0,)),
+            ("/action/1068", ()),
+            ("/time", (14.0,)),
+            ("/action/1007", ()),
+        ])
+
+
+class TestActionCatalog(unittest.TestCase):
+    """Tests for the searchable action catalog index"""
+
+    ACTIONS = [
+        Action(0, 1007, "", "Transport: Play"),
+        Action(0, 1016, "", "Transport: Stop"),
+        Action(0, 40364, "", "Options: Toggle metronome"),
+        Action(0, 40001, "", "Track: Insert new track"),
+        Action(0, 40157, "", "Markers: Insert marker at current position"),
+        Action(0, 53000, "_SWS_ABOUT", "SWS: About"),
+        Action(32060, 40003, "", "Edit: Select all events"),
+        Action(32060, 40364, "", "Options: Toggle metronome"),
+    ]
+
+    PAIRS = [
+        Action(0, 40509, "", "Item: Fade items in to cursor"),
+        Action(0, 40510, "", "Item: Fade out"),
+        Action(0, 1011, "", "View: Zoom out horizontal"),
+        Action(0, 1012, "", "View: Zoom in horizontal"),
+    ]
+
+    def setUp(self):
+        self.catalog = ActionCatalog(self.ACTIONS)
+
+    def test_search_by_name(self):
+        """Test exact, prefix and misspelled queries find the right action"""
+        for query in ("toggle metronome", "metronom", "togle metronome"):
+            self.assertEqual(self.catalog.best(query).id, 40364, query)
+        self.assertEqual(self.catalog.best("insert new track").id, 40001)
+        self.assertIsNone(self.catalog.best("render stems"))
+
+    def test_direction_words_pick_the_pair(self):
+        """Test in/out pick the matching half of an action pair, in either index order"""
+        for actions in (self.PAIRS, self.PAIRS[::-1]):
+            catalog = ActionCatalog(actions)
+            self.assertEqual(catalog.best("fade in").id, 40509)
+            self.assertEqual(catalog.best("fade out").id, 40510)
+            self.assertEqual(catalog.best("zoom in").id, 1012)
+            self.assertEqual(catalog.best("zoom out").id, 1011)
+
+    def test_section_and_id_lookups(self):
+        """Test section filters and command/named ID lookups"""
+        results = self.catalog.search("select all", section="midi_editor")
+        self.assertEqual([a.id for _, a in results], [40003])
+        self.assertEqual(self.catalog.best("metronome", section=32060).section, 32060)
+        self.assertEqual(self.catalog.by_id(1016).name, "Transport: Stop")
+        self.assertEqual(self.catalog.by_named_id("SWS_ABOUT").id, 53000)
+
+    def test_exports_and_cached_index(self):
+        """Test all export formats load and the saved index is reused until an export changes"""
+        with tempfile.TemporaryDirectory() as tmp:
+            tsv = os.path.join(tmp, "dawrv_action_catalog.tsv")
+            txt = os.path.join(tmp, "dawrv_action_ids.txt")
+            cache = os.path.join(tmp, "index", "action_catalog.idx")
+            with open(tsv, "w") as f:
+                f.write("0\t1007\t\tTransport: Play\n32060\t40003\t\tEdit: Select all events\n")
+            with open(txt, "w") as f:
+                f.write("ID: 1007 | Name: Transport: Play\nID: 40364 | Name: Options: Toggle metronome\n")
+            self.assertEqual(len(load_actions([tsv, txt])), 3)
+
+            first = build_catalog([tsv, txt], cache)
+            self.assertTrue(os.path.exists(cache))
+            second = build_catalog([tsv, txt], cache)
+            self.assertEqual(second.actions, first.actions)
+            self.assertEqual(second.best("metronome").id, 40364)
+
+            with open(txt, "w") as f:
+                f.write("ID: 40001 | Name: Track: Insert new track\n")
+            os.utime(txt, ns=(0, 10 ** 9))
+            third = build_catalog([tsv, txt], cache)
+            self.assertIsNone(third.best("metronome"))
+            self.assertEqual(third.best("new track").id, 40001)
+
+    def test_cached_index_independent_of_main(self):
+        """Test the index holds plain tuples, and a cache that cannot be unpickled is rebuilt"""
+        with tempfile.TemporaryDirectory() as tmp:
+            tsv = os.path.join(tmp, "dawrv_action_catalog.tsv")
+            cache = os.path.join(tmp, "action_catalog.idx")
+            with open(tsv, "w") as f:
+                f.write("0\t1007\t\tTransport: Play\n0\t40364\t\tOptions: Toggle metronome\n")
+            build_catalog([tsv], cache)
+            _load_plain(cache)
+            self.assertIsInstance(build_catalog([tsv], cache).by_id(1007), Action)
+
+            with open(cache, "wb") as f:
+                f.write(_MAIN_PICKLE)
+            self.assertEqual(build_catalog([tsv], cache).best("metronome").id, 40364)
+            _load_plain(cache)
+
+
+class TestDispatchQueue(unittest.TestCase):
+    """Tests for the coalescing dispatch queue against a fake OSC endpoint"""
+
+    def setUp(self):
+        self.osc = _OSCStandIn()
+        self.sender = OSCSender("127.0.0.1", self.osc.port)
+        self.state = ReaperStateMirror()
+        self.state.apply("/tempo/raw", (120.0,))
+        self.queue = DispatchQueue(self.sender.send_packet, state=self.state, window=10.0, max_delay=10.0)
+
+    def tearDown(self):
+        self.queue.close()
+        self.sender.close()
+        self.osc.close()
+
+    def test_nudges_merge_into_one_set(self):
+        """Test five "tempo up" nudges become one absolute /tempo/raw"""
+        for _ in range(5):
+            self.queue.nudge("tempo", 1.0)
+        self.queue.flush()
+        self.assertEqual(decode_packet(self.osc.recv()), [("/tempo/raw", (125.0,))])
+        self.assertEqual(self.queue.stats["saved"], 4)
+
+        # The next nudge builds on what was sent, before feedback arrives
+        self.queue.nudge("tempo", -10.0)
+        self.queue.flush()
+        self.assertEqual(decode_packet(self.osc.recv()), [("/tempo/raw", (115.0,))])
+
+    def test_sets_replace_pending_nudges(self):
+        """Test an absolute set overrides earlier nudges and later ones add to it"""
+        with self.assertRaises(ValueError):
+            self.queue.nudge("volume_db", 1.0, track=2)
+        self.queue.set("volume_db", -6.0, track=2)
+        self.queue.nudge("volume_db", 1.5, track=2)
+        self.queue.flush()
+        self.assertEqual(decode_packet(self.osc.recv()), [("/track/2/volume/db", (-4.5,))])
+
+    def test_toggles_dropped_and_transport_ordered(self):
+        """Test a repeated toggle is dropped and transport flushes pending actions ahead of it"""
+        self.assertEqual(self.queue.action(40364), "toggle")
+        self.assertEqual(self.queue.action(40364), "dropped")
+        self.assertEqual(self.queue.action(40029, kind="plain"), "plain")
+        self.assertEqual(self.queue.action(1007), "transport")
+        self.assertEqual(decode_packet(self.osc.recv()), [
+            ("/action/40364", ()), ("/action/40029", ()), ("/action/1007", ()),
+        ])
+        self.assertEqual(self.queue.stats["saved"], 1)
+        self.assertEqual(self.queue.stats["packets"], 1)
+
+    def test_failed_send_falls_back(self):
+        """Test actions in a packet that could not be sent go to on_failed"""
+        def unreachable(packet):
+            raise OSError("network unreachable")
+        failed = []
+        queue = DispatchQueue(unreachable, state=self.state, window=10.0, max_delay=10.0, on_failed=failed.extend)
+        try:
+            queue.action(40029, kind="plain")
+            queue.nudge("tempo", 1.0)
+            queue.action(1007)
+            self.assertEqual(failed, ["40029", "1007"])
+            self.assertEqual((queue.stats["errors"], queue.stats["fallback"]), (1, 2))
+        finally:
+            queue.close()
+
+    def test_window_flushes_without_transport(self):
+        """Test pending commands are sent once the debounce window closes"""
+        queue = DispatchQueue(self.sender.send_packet, window=0.01, max_delay=0.05)
+        try:
+            queue.action(40029, kind="plain")
+            self.assertEqual(decode_packet(self.osc.recv()), [("/action/40029", ())])
+        finally:
+            queue.close()
+
+
+class TestNameResolver(unittest.TestCase):
+    """Tests for the track/marker/region/FX name index"""
+
+    def setUp(self):
+        self.state = ReaperStateMirror()
+        for address, args in [
+            ("/track/1/name", ("Lead Vocals",)),
+            ("/track/2/name", ("Vocals",)),
+            ("/track/3/name", ("Bass DI",)),
+            ("/track/4/name", ("Backing Vox 2",)),
+            ("/track/3/fx/1/name", ("ReaComp",)),
+            ("/marker/1/name", ("Chorus",)),
+            ("/region/2/name", ("Verse 2",)),
+        ]:
+            self.state.apply(address, args)
+        self.names = NameResolver()
+        self.names.attach(self.state)
+
+    def tearDown(self):
+        self.names.detach()
+
+    def test_ranked_matches(self):
+        """Test exact names rank first and kind words act as hints"""
+        matches = self.names.resolve("the vocals")
+        self.assertEqual([(m.key, m.score) for m in matches[:2]], [(2, 1.0), (1, 0.875)])
+        self.assertEqual(self.names.best("backing vocals two").key, 4)
+        self.assertEqual(self.names.best("second verse").kind, "region")
+        self.assertEqual(self.names.best("reacomp plugin"), (1.0, "fx", (3, 1), "ReaComp"))
+        self.assertIsNone(self.names.best("strings"))
+
+    def test_command_words_only_stripped_from_the_start(self):
+        """Test a section named like a command verb ("Solo") can still be found"""
+        self.state.apply("/marker/3/name", ("Solo",))
+        self.assertEqual(self.names.best("go to the solo").name, "Solo")
+        self.assertEqual(self.names.best("solo").name, "Solo")
+        self.assertEqual(self.names.best("mute the solo").name, "Solo")
+        self.assertEqual(self.names.best("solo the vocals").key, 2)
+        self.assertEqual(self.names.best("select solo marker").name, "Solo")
+
+    def test_phonetic_matches(self):
+        """Test misheard names still resolve through phonetic keys"""
+        self.assertEqual(phonetic_key("chorus"), phonetic_key("corus"))
+        self.assertEqual(self.names.best("corus", kinds=("marker",)).name, "Chorus")
+        self.assertEqual(self.names.best("base").key, 3)
+
+    def test_updates_follow_the_mirror(self):
+        """Test renames and new objects are indexed incrementally"""
+        self.state.apply("/track/2/name", ("Choir",))
+        self.state.apply("/marker/5/name", ("Bridge",))
+        self.assertEqual(self.names.best("vocals").key, 1)
+        self.assertEqual(self.names.best("choir").key, 2)
+        self.assertEqual(self.names.best("bridge").key, 5)
+        self.state.apply("/track/3/fx/1/name", ("",))
+        self.assertIsNone(self.names.best("reacomp"))
+
+
+class TestPluginCatalog(unittest.TestCase):
+    """Tests for the plugin catalog built from REAPER's plugin cache files"""
+
+    FILES = {
+        "reaper-vstplugins_arm64.ini": (
+            "[vstcache]\n"
+            "FabFilter Pro-Q 3.vst3=00A1,{F2B1},Pro-Q 3 (FabFilter)\n"
+            "FabFilter Pro-C 2.vst3=00A2,{F2B2},Pro-C 2 (FabFilter)\n"
+            "reacomp.vst.dylib=00A3,1919247729,ReaComp (Cockos)\n"
+            "Serum.vst3=00A4,{X1},Serum (Xfer Records)!!!VSTi\n"
+            "Waves.vst3=00A5,<SHELL>,\n"
+        ),
+        "reaper-auplugins_arm64.ini": "[auplugins]\nFabFilter: Pro-Q 3=\nNative Instruments: Kontakt 7=<inst>\n",
+        "reaper-clap-macos-aarch64.ini": "[Surge XT.clap]\n_=00B1\norg.surge-synth-team.surge-xt=1|Surge XT (Surge Synth Team)\n",
+        "reaper-jsfx.ini": 'NAME "utility/volume" "JS: Volume Adjustment"\n',
+        "reaper-fxtags.ini": "[category]\nFabFilter Pro-C 2.vst3=Dynamics|Compressor\n",
+    }
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        for name, text in self.FILES.items():
+            with open(os.path.join(self.tmp.name, name), "w") as f:
+                f.write(text)
+        self.cache = os.path.join(self.tmp.name, "DAWRV", "plugin_catalog.idx")
+        corrections = load_phonetic_corrections()
+        self.catalog = PluginCatalog(self.tmp.name, self.cache, corrections)
+        self.assertEqual(self.catalog.refresh(), 5)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_all_formats_parsed(self):
+        """Test VST/VST3/AU/CLAP/JS entries, vendors and instrument flags"""
+        names = sorted(p.add_name for p in self.catalog.plugins.values())
+        self.assertEqual(names, [
+            "AU: FabFilter: Pro-Q 3", "AUi: Native Instruments: Kontakt 7",
+            "CLAPi: Surge XT (Surge Synth Team)", "JS: Volume Adjustment",
+            "VST3: Pro-C 2 (FabFilter)", "VST3: Pro-Q 3 (FabFilter)",
+            "VST3i: Serum (Xfer Records)", "VST: ReaComp (Cockos)",
+        ])
+
+    def test_spoken_names(self):
+        """Test phonetic corrections, squashed names, typos and category words"""
+        self.assertEqual(self.catalog.best("fabric filter pro queue three").add_name, "VST3: Pro-Q 3 (FabFilter)")
+        self.assertEqual(self.catalog.best("proq3").name, "Pro-Q 3")
+        self.assertEqual(self.catalog.best("contact", instrument=True).name, "Kontakt 7")
+        self.assertEqual(self.catalog.best("surg xt").name, "Surge XT")
+        self.assertEqual(self.catalog.best("kontact seven").name, "Kontakt 7")
+        compressors = {p.name for _, p in self.catalog.search("compressor")}
+        self.assertEqual(compressors, {"Pro-C 2", "ReaComp"})
+        both = [p.format for _, p in self.catalog.search("pro q 3", unique=False)[:2]]
+        self.assertEqual(both, ["VST3", "AU"])
+
+    def test_only_changed_files_reparsed(self):
+        """Test refresh re-parses a file only after it changes, and restarts reuse the cache"""
+        self.assertEqual(self.catalog.refresh(), 0)
+        path = os.path.join(self.tmp.name, "reaper-jsfx.ini")
+        with open(path, "a") as f:
+            f.write('NAME "delay/delay" "JS: Delay Machine"\n')
+        os.utime(path, ns=(0, 10 ** 9))
+        self.assertEqual(self.catalog.refresh(), 1)
+        self.assertEqual(self.catalog.best("delay machine").format, "JS")
+        self.assertEqual(len(self.catalog), 9)
+
+        restarted = PluginCatalog(self.tmp.name, self.cache, [])
+        self.assertEqual(restarted.refresh(), 1)   # tags only; cache files come from the index
+        self.assertEqual(len(restarted), 9)
+
+    def test_saved_index_independent_of_main(self):
+        """Test the index holds plain tuples, and a cache that cannot be unpickled is re-parsed"""
+        _load_plain(self.cache)
+        restarted = PluginCatalog(self.tmp.name, self.cache, [])
+        self.assertEqual(restarted.refresh(), 1)
+        self.assertEqual(restarted.best("serum").add_name, "VST3i: Serum (Xfer Records)")
+        with open(self.cache, "wb") as f:
+            f.write(_MAIN_PICKLE)
+        unreadable = PluginCatalog(self.tmp.name, self.cache, [])
+        self.assertEqual(unreadable.refresh(), 5)
+        self.assertEqual(unreadable.best("serum").add_name, "VST3i: Serum (Xfer Records)")
+
+
+
+class TestExtStateWatcher(unittest.TestCase):
+    """Tests for the incremental [RHEA] ExtState reader and watcher"""
+
+    CONTROL = {
+        "control_detected": "true", "control_type": "volume-fader", "track_number": "3",
+        "value": "0.71", "value_formatted": "-2.9 dB",
+    }
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "reaper-extstate.ini")
+        self._write(self.CONTROL)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _write(self, rhea, before="[other_script]\nkey=1\n"):
+        text = before + "[RHEA]\n" + "".join(f"{k}={v}\n" for k, v in rhea.items()) + "[zz]\nx=2\n"
+        tmp = self.path + ".tmp"
+        with open(tmp, "w") as f:
+            f.write(text)
+        os.replace(tmp, self.path)
+
+    def test_section_read_from_cached_offset(self):
+        """Test the section is re-read at its offset and rescanned only when it moves"""
+        reader = SectionReader(self.path)
+        self.assertEqual(reader.read(), self.CONTROL)
+        self.assertEqual(reader.offset, len("[other_script]\nkey=1\n"))
+        self._write(dict(self.CONTROL, value="0.5"))
+        self.assertEqual(reader.read(force=True)["value"], "0.5")
+        self.assertEqual(reader.stats['scans'], 1)
+        self._write(self.CONTROL, before="[other_script]\nkey=1\nmore=22\n")
+        self.assertEqual(reader.read(force=True), self.CONTROL)
+        self.assertEqual(reader.stats['scans'], 2)
+
+    def test_typed_diff_per_kind(self):
+        """Test values are typed and each kind of change is one event"""
+        old = convert(self.CONTROL)
+        self.assertEqual((old["control_detected"], old["track_number"], old["value"]), (True, 3, 0.71))
+        new = convert(dict(self.CONTROL, value="0.710", clicked_x="120", control_clicked="true"))
+        changes = diff_values(old, new)
+        self.assertEqual([c.kind for c in changes], ["click"])
+        self.assertEqual(changes[0].changed, {"clicked_x": 120.0, "control_clicked": True})
+        changes = diff_values(new, convert({"control_detected": "false"}))
+        self.assertEqual(changes[0].changed, {"control_detected": False})
+        self.assertIn("track_number", changes[0].removed)
+
+    def test_burst_of_writes_is_one_event(self):
+        """Test REAPER's ten rewrites per control change publish one event"""
+        watcher = ExtStateWatcher(self.path, debounce=0.05, max_delay=1.0)
+        received = threading.Event()
+        changes = []
+        watcher.subscribe(lambda change: (changes.append(change), received.set()), kind="control")
+        watcher.start()
+        try:
+            new = dict(self.CONTROL, control_type="pan-control", value="0.25")
+            for _ in range(10):
+                self._write(new)
+            self.assertTrue(received.wait(3.0))
+            time.sleep(0.2)
+            self._write(new)
+            time.sleep(0.3)
+        finally:
+            watcher.stop()
+        self.assertEqual(len(changes), 1)
+        self.assertEqual(changes[0].changed, {"control_type": "pan-control", "value": 0.25})
+        self.assertEqual(watcher.get("value"), 0.25)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -126,11 +126,6 @@ print(f'✅ Calibration complete! Energy threshold: {recognizer.energy_threshold
 
 command_file = '/tmp/dawrv_voice_command.txt'
 
-# Deduplication: track last command to prevent writing duplicates
-last_written_command = None
-last_write_time = 0
-write_cooldown = 2.0  # Don't write same command within 2 seconds
-
 while True:
     try:
         with microphone as source:
@@ -144,15 +139,8 @@ while True:
             text = recognizer.recognize_google(audio, language='en-US')
             print(f'✅ Heard: "{text}"', flush=True)
             
-            # Deduplication: check if this is the same command as last time
-            current_time = time.time()
-            normalized_text = text.lower().strip()
-            
-            if (normalized_text == last_written_command and 
-                (current_time - last_write_time) < write_cooldown):
-                print(f'⏸️  Skipping duplicate command (within cooldown): "{text}"', flush=True)
-                continue  # Skip writing this duplicate
-            
+            # Every phrase is a new utterance, so repeats are written too;
+            # repeated toggles are dropped by the bridge daemon's dispatch queue
             # Write to file for DAWRV to read
             try:
                 # Remove existing file first
@@ -164,10 +152,6 @@ while True:
                     f.flush()
                     os.fsync(f.fileno())  # Force write to disk
                 print(f'📝 Command written: "{text}"', flush=True)
-                
-                # Update deduplication tracking
-                last_written_command = normalized_text
-                last_write_time = current_time
             except Exception as e:
                 print(f'⚠️  Failed to write command: {e}', flush=True)
             
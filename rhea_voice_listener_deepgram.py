@@ -6,7 +6,6 @@ Real-time, highly accurate voice recognition for DAWRV commands
 import sys
 import os
 import asyncio
-import time
 
 print('🎤 Starting Deepgram Nova-2...', flush=True)
 
@@ -34,14 +33,7 @@ CHUNK = 1024  # Buffer size
 # Output file for commands
 COMMAND_FILE = '/tmp/dawrv_voice_command.txt'
 
-# Deduplication: track last command to prevent writing duplicates
-last_written_command = None
-last_write_time = 0
-write_cooldown = 1.0  # Don't write same command within 1 second
-
 async def listen_and_transcribe():
-    global last_written_command, last_write_time
-    
     # Initialize PyAudio
     p = pyaudio.PyAudio()
     stream = p.open(format=FORMAT,
@@ -79,8 +71,6 @@ async def listen_and_transcribe():
     
     # Set up event handlers
     def on_message(self, result, **kwargs):
-        global last_written_command, last_write_time
-        
         sentence = result.channel.alternatives[0].transcript
         if sentence:
             # Filter out very short transcripts (likely false triggers)
@@ -97,16 +87,11 @@ async def listen_and_transcribe():
             
             print(f'✅ Heard (Deepgram): "{sentence}"', flush=True)
             
-            # Deduplication logic
-            now = time.time()
-            if sentence.lower() != last_written_command or (now - last_write_time) > write_cooldown:
-                with open(COMMAND_FILE, 'w') as f:
-                    f.write(sentence)
-                last_written_command = sentence.lower()
-                last_write_time = now
-                print(f'📝 Command written to {COMMAND_FILE}', flush=True)
-            else:
-                print('⏩ Duplicate command, skipping write.', flush=True)
+            # Only final results arrive, so a repeat is a new utterance;
+            # repeated toggles are dropped by the bridge daemon's dispatch queue
+            with open(COMMAND_FILE, 'w') as f:
+                f.write(sentence)
+            print(f'📝 Command written to {COMMAND_FILE}', flush=True)
     
     def on_error(self, error, **kwargs):
         print(f'❌ Deepgram error: {error}', file=sys.stderr, flush=True)
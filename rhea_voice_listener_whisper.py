@@ -444,9 +444,6 @@ def is_echo(text):
     return False
 
 # Main loop
-last_command = None
-last_time = 0
-COOLDOWN = 5.0  # Longer cooldown to prevent loops
 POST_SPEECH_DELAY = 4.0  # Wait 1.5s after RHEA speaks
 
 while True:
@@ -496,15 +493,11 @@ while True:
                     print(f'🔇 Rejected echo: "{text}"', flush=True)
                     continue
                 
-                # Deduplicate rapid commands
-                now = time.time()
-                if text != last_command or (now - last_time) > COOLDOWN:
-                    print(f'\n✅ HEARD: "{text}"\n', flush=True)
-                    write_command(text)
-                    last_command = text
-                    last_time = now
-                else:
-                    print(f'🔇 Duplicate ignored: "{text}"', flush=True)
+                # Every recording is a new utterance: repeats are deliberate
+                # ("next track" twice), and a repeated toggle is dropped by
+                # the bridge daemon's dispatch queue
+                print(f'\n✅ HEARD: "{text}"\n', flush=True)
+                write_command(text)
         
         # Small pause between recordings
         time.sleep(0.3)
@@ -0,0 +1,776 @@
+#!/usr/bin/env python3
+"""
+Screen Awareness Core - Hover scheduling shared by the screen trackers
+
+Every screen_awareness_tracker*.py variant polled the mouse every 100 ms
+and, whenever the position changed, cancelled its threading.Timer and
+started a new one - a new OS thread for every mouse move, hundreds a
+minute while the user works. The trackers now share one loop that keeps
+a single hover deadline and checks it on each tick:
+
+- pointer moved           deadline = now + hover_delay
+- deadline passed, still  on_hover(x, y) once, deadline cleared
+
+The loop sleeps until the deadline when it is closer than the next poll,
+so hovers are reported as promptly as the Timer did, without the threads.
+
+Hit-testing used to enumerate every on-screen window through
+CGWindowListCopyWindowInfo on each hover. WindowCache keeps REAPER's
+windows in a WindowIndex, where point-in-window is two bisects, and
+re-enumerates on a TTL, on invalidate(), or when the pointer lands
+outside every known window.
+
+Each hover used to print about six {"event": "info"} lines plus the
+element, every one flushed and JSON-parsed by screen-awareness.js.
+EventWriter drops logs below --log-level and repeats of the previous
+event, batches what is left into at most --max-flushes writes a second,
+and with --compact sends an element as the fields that changed.
+
+Platform probes (mouse position, window list) sit behind ScreenProbe, so
+all of this runs - and is tested and benchmarked - off macOS against a
+ScriptedProbe replaying a pointer trace on a FakeClock.
+
+Usage:
+    from screen_awareness_core import HoverScheduler, MacScreenProbe, WindowCache
+
+    probe = MacScreenProbe()
+    scheduler = HoverScheduler(probe.mouse_position, on_hover, hover_delay=0.5)
+    scheduler.run()                 # until scheduler.stop()
+
+    windows = WindowCache(probe)
+    windows.window_at(x, y)         # Window(owner='REAPER', name=..., ...) or None
+    windows.stats                   # {'hits': 41, 'misses': 2, 'refreshes': 2, ...}
+
+    output = EventWriter(level='info', compact=True)
+    output.element({'type': 'mute-button', ...})    # dropped if unchanged
+"""
+import os
+import sys
+import json
+import bisect
+import time
+from abc import ABC, abstractmethod
+from collections import namedtuple
+
+from screen_awareness_grid import CELL_SIZE
+
+DEFAULT_HOVER_DELAY = 0.5
+DEFAULT_CHECK_INTERVAL = 0.1
+ERROR_BACKOFF = 1.0
+LOG_LEVELS = {'debug': 10, 'info': 20, 'error': 40, 'off': 100}
+DEFAULT_LOG_LEVEL = 'info'
+DEFAULT_MAX_FLUSHES = 10
+DEFAULT_WINDOW_TTL = 10.0
+DEFAULT_MISS_RECHECK = 2.0
+# A control re-reported after the pointer moves at least this far (and out of its grid cell)
+MOVE_THRESHOLD = 5
+
+
+# ============================================================================
+# PROBES
+# ============================================================================
+
+class Window(namedtuple("Window", "owner name x y width height")):
+    """An on-screen window in top-left screen coordinates"""
+    __slots__ = ()
+
+    def contains(self, x, y):
+        return self.x <= x < self.x + self.width and self.y <= y < self.y + self.height
+
+    @property
+    def bounds(self):
+        return {'x': self.x, 'y': self.y, 'width': self.width, 'height': self.height}
+
+
+class ScreenProbe(ABC):
+    """Where the pointer is and which windows are on screen"""
+
+    @abstractmethod
+    def mouse_position(self):
+        """(x, y) in screen coordinates with the origin top-left, or None"""
+
+    @abstractmethod
+    def windows(self):
+        """On-screen Windows, front to back"""
+
+    def element_at(self, x, y):
+        """Accessibility attributes (role, title, value, description) at (x, y), or None"""
+        return None
+
+
+class MacScreenProbe(ScreenProbe):
+    """AppKit/Quartz probe (imported on first use, so this module loads anywhere)"""
+
+    def __init__(self):
+        from AppKit import NSEvent, NSScreen
+        from Quartz import CGWindowListCopyWindowInfo, kCGWindowListOptionOnScreenOnly, kCGNullWindowID
+        self._event = NSEvent
+        self._screen = NSScreen
+        self._window_list = lambda: CGWindowListCopyWindowInfo(
+            kCGWindowListOptionOnScreenOnly, kCGNullWindowID
+        )
+        self._ax = None
+
+    def mouse_position(self):
+        location = self._event.mouseLocation()
+        height = self._screen.mainScreen().frame().size.height
+        return (int(location.x), int(height - location.y))
+
+    def windows(self):
+        result = []
+        for window in self._window_list() or ():
+            bounds = window.get('kCGWindowBounds', {})
+            result.append(Window(
+                window.get('kCGWindowOwnerName', ''),
+                window.get('kCGWindowName', 'Unknown'),
+                bounds.get('X', 0),
+                bounds.get('Y', 0),
+                bounds.get('Width', 0),
+                bounds.get('Height', 0)
+            ))
+        return result
+
+    def element_at(self, x, y):
+        if self._ax is None:
+            try:
+                import ApplicationServices as ax
+            except ImportError:
+                import Quartz as ax
+            self._ax = ax
+        ax = self._ax
+        err, element = ax.AXUIElementCopyElementAtPosition(
+            ax.AXUIElementCreateSystemWide(), float(x), float(y), None
+        )
+        if err != 0 or not element:
+            return None
+        info = {}
+        for key, attribute in (('role', 'AXRole'), ('title', 'AXTitle'),
+                               ('value', 'AXValue'), ('description', 'AXDescription')):
+            err, value = ax.AXUIElementCopyAttributeValue(element, attribute, None)
+            if err == 0 and value:
+                info[key] = str(value)
+        return info or None
+
+
+class FakeClock:
+    """Manual clock: pass it as both clock and sleep to run a loop instantly"""
+
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += max(0.0, seconds)
+
+
+class ScriptedProbe(ScreenProbe):
+    """Replays a pointer trace of (time, x, y) samples against a clock"""
+
+    def __init__(self, trace, windows=(), clock=None):
+        self.trace = sorted(trace)
+        self._times = [sample[0] for sample in self.trace]
+        self._windows = list(windows)
+        self.clock = clock or FakeClock()
+        self.calls = {'mouse_position': 0, 'windows': 0}
+
+    def mouse_position(self):
+        self.calls['mouse_position'] += 1
+        i = bisect.bisect_right(self._times, self.clock())
+        if i == 0:
+            return None
+        _, x, y = self.trace[i - 1]
+        return (x, y)
+
+    def windows(self):
+        self.calls['windows'] += 1
+        return list(self._windows)
+
+
+# ============================================================================
+# HOVER SCHEDULER
+# ============================================================================
+
+class HoverScheduler:
+    """Single-threaded hover detection with one deadline"""
+
+    def __init__(
+        self,
+        position,
+        on_hover,
+        hover_delay=DEFAULT_HOVER_DELAY,
+        check_interval=DEFAULT_CHECK_INTERVAL,
+        clock=time.monotonic,
+        sleep=time.sleep,
+        on_error=None,
+        on_tick=None
+    ):
+        """
+        Args:
+            position: Callable returning the pointer (x, y), or None
+            on_hover: Called with (x, y) once the pointer rests hover_delay
+            hover_delay: Seconds the pointer must stay put
+            check_interval: Seconds between position polls
+            clock: Monotonic clock (FakeClock in tests)
+            sleep: Sleep function matching clock
+            on_error: Called with a message when a tick raises
+            on_tick: Called with the time after every tick (e.g. EventWriter.poll)
+        """
+        self.position = position
+        self.on_hover = on_hover
+        self.hover_delay = hover_delay
+        self.check_interval = check_interval
+        self.clock = clock
+        self.sleep = sleep
+        self.on_error = on_error
+        self.on_tick = on_tick
+        self.running = False
+        self.last_position = None
+        self.deadline = None
+        self.stats = {'ticks': 0, 'moves': 0, 'hovers': 0, 'errors': 0}
+
+    def tick(self, now=None):
+        """
+        Poll the pointer once.
+
+        Returns:
+            The (x, y) reported to on_hover on this tick, else None
+        """
+        now = self.clock() if now is None else now
+        self.stats['ticks'] += 1
+        pos = self.position()
+        if not pos:
+            return None
+        if pos != self.last_position:
+            self.last_position = pos
+            self.deadline = now + self.hover_delay
+            self.stats['moves'] += 1
+            return None
+        if self.deadline is None or now < self.deadline:
+            return None
+        self.deadline = None
+        self.stats['hovers'] += 1
+        self.on_hover(*pos)
+        return pos
+
+    def next_delay(self, now):
+        """Seconds to sleep before the next tick"""
+        if self.deadline is not None and now < self.deadline:
+            return min(self.check_interval, self.deadline - now)
+        return self.check_interval
+
+    def run(self, duration=None):
+        """Tick until stop() is called (or for duration seconds)"""
+        self.running = True
+        end = None if duration is None else self.clock() + duration
+        while self.running:
+            now = self.clock()
+            if end is not None and now >= end:
+                break
+            try:
+                self.tick(now)
+                if self.on_tick:
+                    self.on_tick(now)
+                delay = self.next_delay(now)
+            except Exception as e:
+                self.stats['errors'] += 1
+                if self.on_error:
+                    self.on_error(f"Error in track loop: {e}")
+                delay = ERROR_BACKOFF
+            self.sleep(delay)
+        self.running = False
+
+    def stop(self):
+        self.running = False
+        self.deadline = None
+
+
+# ============================================================================
+# WINDOW GEOMETRY
+# ============================================================================
+
+class WindowIndex:
+    """
+    Point-in-window lookup: the windows' edges cut the screen into x slabs,
+    each slab into y intervals owned by the front-most window covering
+    them, so a lookup is two bisects.
+    """
+
+    def __init__(self, windows):
+        self.windows = [w for w in windows if w.width > 0 and w.height > 0]
+        self._xs = sorted({edge for w in self.windows for edge in (w.x, w.x + w.width)})
+        self._slabs = []
+        for x in self._xs[:-1]:
+            covering = [w for w in self.windows if w.x <= x < w.x + w.width]
+            ys = sorted({edge for w in covering for edge in (w.y, w.y + w.height)})
+            owners = [
+                next((w for w in covering if w.y <= y < w.y + w.height), None)
+                for y in ys[:-1]
+            ]
+            self._slabs.append((ys, owners))
+
+    def __len__(self):
+        return len(self.windows)
+
+    def at(self, x, y):
+        """Front-most window containing (x, y), or None"""
+        i = bisect.bisect_right(self._xs, x) - 1
+        if i < 0 or i >= len(self._slabs):
+            return None
+        ys, owners = self._slabs[i]
+        j = bisect.bisect_right(ys, y) - 1
+        if j < 0 or j >= len(owners):
+            return None
+        return owners[j]
+
+
+class WindowCache:
+    """
+    One application's windows, re-enumerated when older than ttl, after
+    invalidate(), or when a point falls outside all of them and the list
+    is older than recheck - instead of on every hover.
+    """
+
+    def __init__(
+        self,
+        probe,
+        owner="REAPER",
+        ttl=DEFAULT_WINDOW_TTL,
+        recheck=DEFAULT_MISS_RECHECK,
+        clock=time.monotonic
+    ):
+        """
+        Args:
+            probe: ScreenProbe listing on-screen windows
+            owner: Substring of the owning application's name
+            ttl: Seconds the window list is trusted
+            recheck: Seconds a point outside all windows is trusted
+            clock: Monotonic clock (FakeClock in tests)
+        """
+        self.probe = probe
+        self.owner = owner
+        self.ttl = ttl
+        self.recheck = recheck
+        self.clock = clock
+        self.index = WindowIndex(())
+        self._geometry = None
+        self._refreshed_at = None
+        self.stats = {'hits': 0, 'misses': 0, 'refreshes': 0, 'rebuilds': 0, 'errors': 0}
+
+    def invalidate(self):
+        """Window layout changed (or may have): re-enumerate on next use"""
+        self._refreshed_at = None
+
+    def refresh(self):
+        """Re-enumerate now; the index is only rebuilt if geometry changed"""
+        self.stats['refreshes'] += 1
+        self._refreshed_at = self.clock()
+        try:
+            windows = [w for w in self.probe.windows() if self.owner in w.owner]
+        except Exception:
+            self.stats['errors'] += 1
+            return False
+        geometry = tuple(windows)
+        if geometry == self._geometry:
+            return False
+        self._geometry = geometry
+        self.index = WindowIndex(windows)
+        self.stats['rebuilds'] += 1
+        return True
+
+    def _stale(self, now, age):
+        return self._refreshed_at is None or now - self._refreshed_at >= age
+
+    def windows(self):
+        """The owner's windows, front to back"""
+        if self._stale(self.clock(), self.ttl):
+            self.stats['misses'] += 1
+            self.refresh()
+        else:
+            self.stats['hits'] += 1
+        return list(self.index.windows)
+
+    def window_at(self, x, y):
+        """The owner's front-most window under (x, y), or None"""
+        now = self.clock()
+        if not self._stale(now, self.ttl):
+            window = self.index.at(x, y)
+            # Outside every known window: trusted only briefly, since a
+            # window may have opened or moved there
+            if window is not None or not self._stale(now, self.recheck):
+                self.stats['hits'] += 1
+                return window
+        self.stats['misses'] += 1
+        self.refresh()
+        return self.index.at(x, y)
+
+
+# ============================================================================
+# EVENT OUTPUT
+# ============================================================================
+
+def _control(element):
+    """An element without the hover position it was found at"""
+    return {key: value for key, value in element.items() if key != 'position'}
+
+
+def _same_spot(a, b):
+    """True if two hover positions are in one grid cell or under MOVE_THRESHOLD px apart"""
+    if not a or not b:
+        return a == b
+    dx, dy = abs(a['x'] - b['x']), abs(a['y'] - b['y'])
+    if dx < MOVE_THRESHOLD and dy < MOVE_THRESHOLD:
+        return True
+    return a['x'] // CELL_SIZE == b['x'] // CELL_SIZE and a['y'] // CELL_SIZE == b['y'] // CELL_SIZE
+
+
+class EventWriter:
+    """
+    JSON-lines events for screen-awareness.js: logs below the level are
+    dropped, a repeat of the previous event (or of the previous element
+    barely moved on the same control: see _same_spot) is dropped, and events are
+    written in batches of at most max_flushes flushes per second (poll()
+    from the tick loop writes out the rest). In compact mode an element
+    is sent as the fields that changed since the previous one.
+    """
+
+    def __init__(
+        self,
+        stream=None,
+        level=DEFAULT_LOG_LEVEL,
+        max_flushes=DEFAULT_MAX_FLUSHES,
+        compact=False,
+        clock=time.monotonic
+    ):
+        """
+        Args:
+            stream: Where lines go (default: stdout)
+            level: Lowest log level written (see LOG_LEVELS)
+            max_flushes: Most writes per second (0: write every event)
+            compact: Send elements as changes to the previous one
+            clock: Monotonic clock (FakeClock in tests)
+        """
+        self.stream = stream or sys.stdout
+        self.level = LOG_LEVELS[level]
+        self.interval = 1.0 / max_flushes if max_flushes else 0.0
+        self.compact = compact
+        self.clock = clock
+        self._pending = []
+        self._last_event = None
+        self._last_element = None
+        self._flushed_at = None
+        self.stats = {'events': 0, 'dropped': 0, 'writes': 0, 'bytes': 0}
+
+    def enabled(self, level):
+        return LOG_LEVELS[level] >= self.level
+
+    def log(self, level, message):
+        if not self.enabled(level):
+            self.stats['dropped'] += 1
+            return
+        event = {'event': 'error' if level == 'error' else 'info', 'message': message}
+        if level == 'debug':
+            event['level'] = level
+        self._emit(event)
+        if level == 'error':
+            self.flush()
+
+    def debug(self, message):
+        self.log('debug', message)
+
+    def info(self, message):
+        self.log('info', message)
+
+    def error(self, message):
+        self.log('error', message)
+
+    def element(self, element):
+        """Report the element under the pointer (dropped if it is the same control at about the same spot)"""
+        previous = self._last_element
+        if (previous is not None and _control(element) == _control(previous)
+                and _same_spot(element.get('position'), previous.get('position'))):
+            self.stats['dropped'] += 1
+            return
+        self._last_element = dict(element)
+        if self.compact and previous is not None:
+            event = {'event': 'element-changed', 'changed': {
+                key: value for key, value in element.items()
+                if key not in previous or previous[key] != value
+            }}
+            removed = [key for key in previous if key not in element]
+            if removed:
+                event['removed'] = removed
+        else:
+            event = {'event': 'element-detected', 'element': element}
+        self._emit(event)
+
+    def _emit(self, event):
+        if event == self._last_event:
+            self.stats['dropped'] += 1
+            return
+        self._last_event = event
+        self.stats['events'] += 1
+        separators = (',', ':') if self.compact else None
+        self._pending.append(json.dumps(event, separators=separators))
+        self.poll()
+
+    def poll(self, now=None):
+        """Write pending events if the last write is at least 1/max_flushes old"""
+        if not self._pending:
+            return
+        now = self.clock() if now is None else now
+        if self._flushed_at is not None and now - self._flushed_at < self.interval:
+            return
+        self.flush(now)
+
+    def flush(self, now=None):
+        if not self._pending:
+            return
+        data = "\n".join(self._pending) + "\n"
+        self._pending = []
+        self._flushed_at = self.clock() if now is None else now
+        self.stats['writes'] += 1
+        self.stats['bytes'] += len(data.encode("utf-8"))
+        try:
+            self.stream.write(data)
+            self.stream.flush()
+        except (OSError, ValueError):
+            pass    # DAWRV closed the pipe
+
+
+def tracker_arguments(description, argv=None):
+    """Command line shared by the trackers: hover delay (ms) and output options"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("hover_ms", nargs="?", type=float, default=DEFAULT_HOVER_DELAY * 1000,
+                        help="Hover delay in milliseconds")
+    parser.add_argument("--log-level", choices=sorted(LOG_LEVELS, key=LOG_LEVELS.get),
+                        default=os.environ.get("DAWRV_TRACKER_LOG_LEVEL", DEFAULT_LOG_LEVEL))
+    parser.add_argument("--max-flushes", type=float, default=DEFAULT_MAX_FLUSHES,
+                        help="Most stdout writes per second (0: every event)")
+    parser.add_argument("--compact", action="store_true",
+                        help="Send elements as the fields changed since the last one")
+    return parser.parse_args(argv)
+
+
+def event_writer(args):
+    return EventWriter(level=args.log_level, max_flushes=args.max_flushes, compact=args.compact)
+
+
+# ============================================================================
+# BENCHMARK
+# ============================================================================
+
+def synthetic_trace(seconds=600, seed=7, step=0.1):
+    """Pointer trace of a user working: drags between short and long rests"""
+    import random
+
+    rng = random.Random(seed)
+    trace = []
+    t, x, y = 0.0, 400, 300
+    while t < seconds:
+        for _ in range(rng.randint(3, 30)):          # moving
+            x = max(0, min(2559, x + rng.randint(-40, 40)))
+            y = max(0, min(1439, y + rng.randint(-25, 25)))
+            trace.append((round(t, 3), x, y))
+            t += step
+        t += rng.choice((0.2, 0.3, 0.8, 1.5, 3.0))   # resting
+    return trace
+
+
+def benchmark(seconds=600, hover_delay=DEFAULT_HOVER_DELAY):
+    """Timer-per-move (old trackers) vs. one scheduler over the same trace"""
+    import threading
+
+    trace = synthetic_trace(seconds)
+
+    # Old trackers: cancel + new Timer thread on every position change
+    timer, threads = None, 0
+    start = time.perf_counter()
+    last = None
+    for _, x, y in trace:
+        if (x, y) != last:
+            last = (x, y)
+            if timer:
+                timer.cancel()
+            timer = threading.Timer(hover_delay, lambda: None)
+            timer.daemon = True
+            timer.start()
+            threads += 1
+    if timer:
+        timer.cancel()
+    legacy = time.perf_counter() - start
+
+    clock = FakeClock()
+    probe = ScriptedProbe(trace, clock=clock)
+    hovers = []
+    scheduler = HoverScheduler(
+        probe.mouse_position, lambda x, y: hovers.append((x, y)),
+        hover_delay=hover_delay, clock=clock, sleep=clock.sleep
+    )
+    start = time.perf_counter()
+    scheduler.run(duration=seconds + hover_delay + 1)
+    elapsed = time.perf_counter() - start
+    return {
+        'moves': len(trace),
+        'legacy_threads': threads,
+        'legacy_ms': legacy * 1000,
+        'ticks': scheduler.stats['ticks'],
+        'hovers': len(hovers),
+        'scheduler_ms': elapsed * 1000,
+        'us_per_tick': elapsed / max(1, scheduler.stats['ticks']) * 1e6
+    }
+
+
+def synthetic_windows(count=60, reaper=6, seed=11):
+    """A crowded desktop, REAPER's main window maximised, its others floating"""
+    import random
+
+    rng = random.Random(seed)
+    names = ["Mixer", "FX: Track 1", "Media Explorer", "Routing Matrix", "Unknown"]
+    windows = []
+    for i in range(1, count):
+        owner = "REAPER" if i < reaper else f"App{i}"
+        name = names[(i - 1) % len(names)] if i < reaper else f"Window {i}"
+        w, h = rng.randint(200, 1600), rng.randint(150, 1000)
+        windows.append(Window(owner, name, rng.randint(0, 2560 - w), rng.randint(25, 1440 - h), w, h))
+    rng.shuffle(windows)
+    windows.append(Window("REAPER", "REAPER v7.0 - project.rpp", 0, 25, 2560, 1415))
+    return windows
+
+
+def benchmark_windows(seconds=600, ttl=DEFAULT_WINDOW_TTL):
+    """Window enumerations and hit-test cost per hover, scan vs. cache"""
+    trace = synthetic_trace(seconds)
+    desktop = synthetic_windows()
+    clock = FakeClock()
+    probe = ScriptedProbe(trace, windows=desktop, clock=clock)
+    cache = WindowCache(probe, ttl=ttl, clock=clock)
+    hovers = []
+    scheduler = HoverScheduler(
+        probe.mouse_position, lambda x, y: hovers.append((x, y)),
+        clock=clock, sleep=clock.sleep
+    )
+    scheduler.run(duration=seconds + 2)
+
+    def scan(x, y):
+        for w in probe.windows():
+            if "REAPER" in w.owner and w.contains(x, y):
+                return w
+        return None
+
+    probe.calls['windows'] = 0
+    start = time.perf_counter()
+    for _ in range(10):
+        expected = [scan(x, y) for x, y in hovers]
+    scanned = (time.perf_counter() - start) / 10
+    scan_calls = probe.calls['windows'] // 10
+
+    # Hovers replayed at the times they happened, so the TTL is exercised
+    probe.calls['windows'] = 0
+    start = time.perf_counter()
+    found = []
+    for t, (x, y) in zip(_hover_times(trace, hovers), hovers):
+        clock.now = t
+        found.append(cache.window_at(x, y))
+    cached = time.perf_counter() - start
+    assert found == expected
+    return {
+        'hovers': len(hovers),
+        'scan_enumerations': scan_calls,
+        'scan_us': scanned / max(1, len(hovers)) * 1e6,
+        'cache_enumerations': probe.calls['windows'],
+        'cache_us': cached / max(1, len(hovers)) * 1e6,
+        'stats': dict(cache.stats)
+    }
+
+
+def benchmark_output(hovers=500):
+    """stdout writes and bytes per hover: the old per-step prints vs. EventWriter"""
+    import io
+    import random
+    from screen_awareness_grid import CONTROLS, element
+
+    rng = random.Random(5)
+    labels = sorted(CONTROLS)
+    hovered = []
+    for _ in range(hovers):
+        # Hovers mostly come back to the same few controls
+        label = rng.choice(labels[:6]) if rng.random() < 0.7 else rng.choice(labels)
+        hovered.append((rng.randrange(2560), rng.randrange(1440), label))
+
+    class Prints(EventWriter):
+        """The old trackers: every step printed and flushed on its own"""
+
+        def log(self, level, message):
+            self._pending.append(json.dumps({'event': 'info', 'message': message}))
+            self.flush()
+
+        def element(self, element):
+            self._pending.append(json.dumps({'event': 'element-detected', 'element': element}))
+            self.flush()
+
+    def replay(output, clock):
+        for x, y, label in hovered:
+            clock.sleep(DEFAULT_HOVER_DELAY + 0.1)
+            output.poll()
+            found = dict(element(label), window="REAPER v7.0 - project.rpp", position={'x': x, 'y': y})
+            output.debug(f"Hover detected at ({x}, {y})")
+            output.debug("Found 6 REAPER window(s)")
+            output.debug("Detected window: REAPER v7.0 - project.rpp")
+            output.debug(f"Identified: {found['type']} (via position)")
+            output.element(found)
+            output.info(f"Detected: {found['type']}")
+        output.flush()
+        return output.stats
+
+    clock = FakeClock()
+    before = replay(Prints(io.StringIO(), level='debug', clock=clock), clock)
+    after = replay(EventWriter(io.StringIO(), compact=True, clock=clock), clock)
+    return {
+        'hovers': hovers,
+        'prints_writes': before['writes'] / hovers,
+        'prints_bytes': before['bytes'] / hovers,
+        'writer_writes': after['writes'] / hovers,
+        'writer_bytes': after['bytes'] / hovers,
+        'stats': after
+    }
+
+
+def _hover_times(trace, hovers, hover_delay=DEFAULT_HOVER_DELAY):
+    """When each hover fired: hover_delay after the trace reached its position"""
+    times, i = [], 0
+    for x, y in hovers:
+        while trace[i][1:] != (x, y):
+            i += 1
+        times.append(trace[i][0] + hover_delay)
+        i += 1
+    return times
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="DAWRV screen awareness hover scheduler")
+    parser.add_argument("--benchmark", action="store_true", help="Replay a synthetic pointer trace")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        res = benchmark()
+        print(f"trace:     {res['moves']} pointer moves over 10 minutes")
+        print(f"timers:    {res['legacy_threads']} threads started, {res['legacy_ms']:.1f} ms")
+        print(f"scheduler: 0 threads, {res['ticks']} ticks, {res['hovers']} hovers, "
+              f"{res['scheduler_ms']:.1f} ms ({res['us_per_tick']:.2f} µs/tick)")
+        res = benchmark_windows()
+        print(f"scan:      {res['scan_enumerations']} window enumerations for {res['hovers']} hovers, "
+              f"{res['scan_us']:.1f} µs/hover")
+        print(f"cache:     {res['cache_enumerations']} window enumerations, "
+              f"{res['cache_us']:.1f} µs/hover, {res['stats']}")
+        res = benchmark_output()
+        print(f"prints:    {res['prints_writes']:.2f} writes, {res['prints_bytes']:.0f} bytes per hover")
+        print(f"writer:    {res['writer_writes']:.2f} writes, {res['writer_bytes']:.0f} bytes per hover, "
+              f"{res['stats']}")
+    else:
+        parser.print_help()
@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+Screen Awareness Detector - Cheapest-first control detection, cached per cell
+
+Each tracker variant was built around one strategy: position heuristics
+(_smart), an osascript subprocess per hover with a 200 ms timeout
+(_hybrid), or Accessibility API calls (_v2 and the plain tracker).
+CascadingDetector runs strategies cheapest first and stops at the first
+answer whose confidence reaches min_confidence, so the expensive query
+only runs where the hit grid has not learned the control:
+
+    position       hit grid / window title   0.9 learned, 0.5 band guess
+    accessibility  AX API or osascript       0.9 specific control, 0.4 generic
+
+Answers are cached per (window, CELL_SIZE grid cell), without the
+per-hover HOVER_FIELDS (the caller sets the position on every hover). A
+window that moves or resizes drops its cells, and entries expire after ttl. An expensive
+strategy runs at most once per min_interval; a hover inside the interval
+gets the best cheap answer (left uncached) instead of another subprocess.
+
+Usage:
+    from screen_awareness_detector import (
+        CascadingDetector, accessibility_strategy, position_strategy
+    )
+
+    detector = CascadingDetector([
+        position_strategy(HitGridCache()),
+        accessibility_strategy(probe.element_at, min_interval=0.25),
+    ])
+    detector.detect(window, x, y)   # {'type': 'mute-button', ...} or None
+    detector.last_source            # 'position' / 'accessibility' / 'cache'
+"""
+import time
+from collections import namedtuple
+
+from screen_awareness_grid import CELL_SIZE, element, window_kind
+
+LEARNED_CONFIDENCE = 0.9
+SEEDED_CONFIDENCE = 0.5
+SPECIFIC_CONFIDENCE = 0.9
+GENERIC_CONFIDENCE = 0.4
+DEFAULT_MIN_CONFIDENCE = 0.7
+DEFAULT_CELL_TTL = 300.0
+MAX_WINDOWS = 8
+
+# Fields that belong to one hover rather than the control, never cached
+HOVER_FIELDS = ('position', 'value')
+
+# Accessibility answers too vague to stop the cascade on
+GENERIC_TYPES = {'button', 'slider', 'text-field', 'menu', 'group', 'unknown'}
+
+
+class Strategy(namedtuple("Strategy", "name detect min_interval")):
+    """
+    detect(window, x, y) -> (element, confidence) or None.
+    A min_interval above zero marks the strategy expensive (rate-limited).
+    """
+    __slots__ = ()
+
+    def __new__(cls, name, detect, min_interval=0.0):
+        return super().__new__(cls, name, detect, min_interval)
+
+
+def classify_accessibility(info):
+    """Control type for accessibility attributes (AX roles or System Events names)"""
+    role = (info.get('role') or '').lower()
+    title = (info.get('title') or '').lower()
+    desc = (info.get('description') or '').lower()
+
+    if 'slider' in role or 'value indicator' in role:
+        if 'volume' in title or 'fader' in title or 'db' in desc:
+            return 'volume-fader'
+        if 'pan' in title or 'pan' in desc:
+            return 'pan-control'
+        return 'slider'
+    if 'button' in role or 'checkbox' in role:
+        if 'mute' in title or 'mute' in desc:
+            return 'mute-button'
+        if 'solo' in title or 'solo' in desc:
+            return 'solo-button'
+        if 'arm' in title or 'record' in title or 'arm' in desc:
+            return 'arm-button'
+        if 'fx' in title or 'effect' in title:
+            return 'fx-button'
+        return 'button'
+    if 'text' in role:
+        if 'track' in desc or 'track' in title:
+            return 'track-name'
+        return 'text-field'
+    if 'menu' in role:
+        return 'menu'
+    if 'group' in role:
+        return 'group'
+    return role if role else 'unknown'
+
+
+def position_strategy(grids):
+    """Hit grid for the mixer and main windows, window title for the rest"""
+
+    def detect(window, x, y):
+        kind = window_kind(window.name)
+        if kind == 'fx':
+            return {
+                'type': 'plugin-control',
+                'role': 'Plugin Parameter',
+                'title': 'Plugin Control',
+                'description': 'Plugin parameter control',
+                'window': window.name
+            }, SEEDED_CONFIDENCE
+        label, learned = grids.lookup(window, x, y)
+        if label is None:
+            return {
+                'type': 'reaper-control',
+                'role': 'UI Element',
+                'title': 'REAPER Control',
+                'description': f'Control in {window.name}',
+                'window': window.name
+            }, GENERIC_CONFIDENCE
+        return element(label), LEARNED_CONFIDENCE if learned else SEEDED_CONFIDENCE
+
+    return Strategy("position", detect)
+
+
+def accessibility_strategy(query, name="accessibility", min_interval=0.25):
+    """
+    Args:
+        query: Callable (x, y) -> dict of role/title/value/description, or None
+        min_interval: Fewest seconds between two queries
+    """
+
+    def detect(window, x, y):
+        info = query(x, y)
+        if not info:
+            return None
+        info = dict(info)
+        info['type'] = info.get('type') or classify_accessibility(info)
+        specific = info.get('role') and info['type'] not in GENERIC_TYPES \
+            and not info['type'].startswith('ax')
+        return info, SPECIFIC_CONFIDENCE if specific else GENERIC_CONFIDENCE
+
+    return Strategy(name, detect, min_interval)
+
+
+class CascadingDetector:
+    """Runs strategies cheapest first and caches answers per window cell"""
+
+    def __init__(
+        self,
+        strategies,
+        min_confidence=DEFAULT_MIN_CONFIDENCE,
+        cell=CELL_SIZE,
+        ttl=DEFAULT_CELL_TTL,
+        clock=time.monotonic
+    ):
+        """
+        Args:
+            strategies: Strategy list, cheapest first
+            min_confidence: Stop escalating at an answer this confident
+            cell: Cache cell size in pixels
+            ttl: Seconds a cached answer is reused
+            clock: Monotonic clock (FakeClock in tests)
+        """
+        self.strategies = list(strategies)
+        self.min_confidence = min_confidence
+        self.cell = cell
+        self.ttl = ttl
+        self.clock = clock
+        self.last_source = None
+        self._cells = {}            # window -> {(col, row): (element, source, time)}
+        self._geometry = {}         # (owner, name) -> window last seen with that title
+        self._last_run = {}         # expensive strategy -> time of its last query
+        self.stats = {
+            'hits': 0, 'misses': 0, 'invalidations': 0, 'rate_limited': 0, 'errors': 0,
+            'calls': {strategy.name: 0 for strategy in self.strategies}
+        }
+
+    def invalidate(self, window=None):
+        """Forget cached answers for one window (or all of them)"""
+        if window is None:
+            self._cells.clear()
+            self._geometry.clear()
+        else:
+            self._cells.pop(tuple(window), None)
+
+    def _window_cells(self, window):
+        key = tuple(window)
+        title = (window.owner, window.name)
+        previous = self._geometry.get(title)
+        if previous != key:
+            if previous is not None and self._cells.pop(previous, None) is not None:
+                self.stats['invalidations'] += 1
+            self._geometry[title] = key
+        cells = self._cells.get(key)
+        if cells is None:
+            if len(self._cells) >= MAX_WINDOWS:
+                self._cells.pop(next(iter(self._cells)))
+            cells = self._cells[key] = {}
+        return cells
+
+    def detect(self, window, x, y):
+        """The control under screen position (x, y) in window, or None"""
+        now = self.clock()
+        cells = self._window_cells(window)
+        cell = (int(x - window.x) // self.cell, int(y - window.y) // self.cell)
+        cached = cells.get(cell)
+        if cached is not None and now - cached[2] < self.ttl:
+            self.stats['hits'] += 1
+            self.last_source = 'cache'
+            return dict(cached[0]) if cached[0] else None
+        self.stats['misses'] += 1
+
+        best, skipped = None, False
+        for strategy in self.strategies:
+            if strategy.min_interval:
+                last = self._last_run.get(strategy.name)
+                if last is not None and now - last < strategy.min_interval:
+                    self.stats['rate_limited'] += 1
+                    skipped = True
+                    continue
+                self._last_run[strategy.name] = now
+            self.stats['calls'][strategy.name] += 1
+            try:
+                result = strategy.detect(window, x, y)
+            except Exception:
+                self.stats['errors'] += 1
+                result = None
+            if not result or not result[0]:
+                continue
+            if best is None or result[1] > best[1]:
+                best = (result[0], result[1], strategy.name)
+            if result[1] >= self.min_confidence:
+                break
+
+        confident = best is not None and best[1] >= self.min_confidence
+        # A rate-limited answer is only provisional: the next hover here
+        # gets to escalate
+        if confident or not skipped:
+            cached = {k: v for k, v in best[0].items() if k not in HOVER_FIELDS} if best else None
+            cells[cell] = (cached, best[2] if best else None, now)
+        self.last_source = best[2] if best else None
+        return dict(best[0]) if best else None
+
+
+# ============================================================================
+# BENCHMARK
+# ============================================================================
+
+def benchmark(hovers=2000, controls=150, query_ms=150.0):
+    """Expensive queries for repeated hovers: query every hover vs. the cascade"""
+    import random
+    from screen_awareness_core import FakeClock, Window
+    from screen_awareness_grid import HitGrid, main_control
+
+    window = Window("REAPER", "REAPER v7.0 - project.rpp", 0, 25, 2560, 1415)
+    rng = random.Random(2)
+    spots = [(rng.randrange(window.width), rng.randrange(25, 1440)) for _ in range(controls)]
+    # Controls near a learned click are answered by the grid alone
+    learned = [(x, y - 25, main_control(x / 25.6, (y - 25) / 14.15)) for x, y in spots[:controls // 2]]
+    grid = HitGrid.build(window.width, window.height, main_control, learned)
+
+    class Grids:
+        seeds = {'main': main_control}
+
+        def lookup(self, window, x, y):
+            return grid.lookup_learned(x - window.x, y - window.y)
+
+    queries = []
+
+    def query(x, y):
+        queries.append((x, y))
+        return {'role': 'AXButton', 'title': 'Mute'}
+
+    clock = FakeClock()
+    detector = CascadingDetector(
+        [position_strategy(Grids()), accessibility_strategy(query, min_interval=0.25)], clock=clock
+    )
+    start = time.perf_counter()
+    for _ in range(hovers):
+        x, y = rng.choice(spots)
+        clock.sleep(rng.uniform(0.5, 3.0))
+        detector.detect(window, x + rng.randint(-2, 2), y + rng.randint(-2, 2))
+    elapsed = time.perf_counter() - start
+    return {
+        'hovers': hovers,
+        'direct_queries': hovers,
+        'direct_ms': hovers * query_ms,
+        'cascade_queries': len(queries),
+        'cascade_ms': len(queries) * query_ms + elapsed * 1000,
+        'stats': detector.stats
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="DAWRV cascading screen control detector")
+    parser.add_argument("--benchmark", action="store_true", help="Replay repeated hovers over a window")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        res = benchmark()
+        print(f"direct:  {res['direct_queries']} accessibility queries "
+              f"(~{res['direct_ms'] / 1000:.0f} s at 150 ms each)")
+        print(f"cascade: {res['cascade_queries']} accessibility queries "
+              f"(~{res['cascade_ms'] / 1000:.1f} s), {res['stats']}")
+    else:
+        parser.print_help()
@@ -0,0 +1,493 @@
+#!/usr/bin/env python3
+"""
+Screen Awareness Hit Grid - Learned control layouts as lookup grids
+
+The smart tracker classified controls with hard-coded percentage bands on
+every hover (and told arm, mute and solo apart with y_pct % 10). A
+HitGrid instead maps each cell (CELL_SIZE px square) of one window
+geometry to a control in a single array lookup:
+
+- cells start from the percentage bands (SEEDS), so nothing is lost
+  before any learning happened
+- click-learning samples (~/.dawrv/control-training.json, written by
+  control-learning-service.js from clicks reported by
+  dawrv_mouse_tracker_continuous.lua) override cells within
+  LEARN_RADIUS cells of where they were clicked. Clicks are stored
+  relative to the window they landed in, so moving the window keeps them.
+
+Grids are persisted per window kind and size (at most MAX_GRID_FILES on
+disk) and rebuilt lazily: a resized window gets its own grid on the first
+hover over it, and new training samples invalidate the grids built from
+the old ones.
+
+Usage:
+    from screen_awareness_grid import HitGridCache
+
+    grids = HitGridCache()
+    grids.control_at(window, x, y)  # {'type': 'volume-fader', ...} or None
+"""
+import os
+import sys
+import json
+import time
+import pickle
+from collections import Counter
+
+CONTROL_TRAINING_PATH = os.environ.get(
+    "DAWRV_CONTROL_TRAINING",
+    os.path.join(os.path.expanduser("~"), ".dawrv", "control-training.json")
+)
+HIT_GRID_CACHE = os.environ.get(
+    "DAWRV_HIT_GRID_CACHE",
+    os.path.join(os.path.expanduser("~"), ".dawrv", "hit-grids")
+)
+GRID_VERSION = 3
+CELL_SIZE = 8
+LEARN_RADIUS = 3
+MAX_GRIDS = 8
+MAX_GRID_FILES = 16
+
+# label -> element reported to DAWRV
+CONTROLS = {
+    'fx-slot': ('fx-button', 'Button', 'FX Slot', 'Plugin/FX slot'),
+    'fx-insert': ('fx-button', 'Button', 'FX Button', 'FX Insert/Auto button'),
+    'pan': ('pan-control', 'Knob', 'Pan Control', 'Track pan knob'),
+    'fader': ('volume-fader', 'Slider', 'Volume Fader', 'Track volume fader'),
+    'mute-solo': ('button', 'Button', 'Mute/Solo', 'Mute or Solo button'),
+    'meter': ('track-label', 'Text', 'Track Info', 'Track meter or label'),
+    'arm': ('arm-button', 'Button', 'Record Arm', 'Track record arm button'),
+    'mute': ('mute-button', 'Button', 'Mute', 'Track mute button'),
+    'solo': ('solo-button', 'Button', 'Solo', 'Track solo button'),
+    'track-name': ('track-name', 'Text', 'Track Name', 'Track name field'),
+    'track-fx': ('fx-button', 'Button', 'FX', 'Track FX chain'),
+    'timeline': ('timeline', 'Timeline', 'Track Timeline', 'Track timeline and items'),
+}
+
+# control_type reported by the ReaScript tracker -> label
+LEARNED_LABELS = {
+    'volume_fader': 'fader',
+    'volume': 'fader',
+    'pan_control': 'pan',
+    'pan': 'pan',
+    'mute_button': 'mute',
+    'mute': 'mute',
+    'solo_button': 'solo',
+    'solo': 'solo',
+    'record_arm': 'arm',
+    'arm': 'arm',
+    'fx_button': 'track-fx',
+    'fx': 'track-fx',
+    'track_label': 'track-name',
+    'track_area': 'timeline',
+}
+
+# Mixer strip, top to bottom: (y_pct below, label)
+MIXER_BANDS = (
+    (8, 'fx-slot'),         # plugin/FX labels
+    (15, 'fx-insert'),      # FX insert/auto buttons
+    (30, 'pan'),            # pan knobs and routing buttons
+    (85, 'fader'),          # the long vertical faders
+    (93, 'mute-solo'),      # lit mute/solo buttons
+)
+
+
+def mixer_control(x_pct, y_pct):
+    for limit, label in MIXER_BANDS:
+        if y_pct < limit:
+            return label
+    return 'meter'
+
+
+def track_view_control(x_pct, y_pct):
+    if x_pct < 20:
+        # Unlearned guess; click samples replace it per cell
+        if y_pct % 10 < 3:
+            return 'arm'
+        return 'mute' if y_pct % 10 < 6 else 'solo'
+    if x_pct < 40:
+        return 'track-name'
+    if x_pct < 60:
+        return 'track-fx'
+    return 'timeline'
+
+
+def main_control(x_pct, y_pct):
+    # Mixer docked on the left half, track view on the right
+    if x_pct < 50:
+        return mixer_control(x_pct, y_pct)
+    return track_view_control(x_pct, y_pct)
+
+
+# window kind -> band classifier the grid starts from
+SEEDS = {
+    'mixer': mixer_control,
+    'main': main_control,
+}
+
+
+def window_kind(window_name):
+    """'mixer', 'main', 'fx' or 'other' for a REAPER window title"""
+    name = (window_name or '').lower()
+    if 'mixer' in name or 'mix' in name:
+        return 'mixer'
+    if 'reaper' in name or 'unknown' in name:
+        return 'main'
+    if 'fx' in name or 'vst' in name or 'plugin' in name:
+        return 'fx'
+    return 'other'
+
+
+def element(label):
+    """Element dict for a grid label (learned labels outside CONTROLS get a generic one)"""
+    if label is None:
+        return None
+    known = CONTROLS.get(label)
+    if known:
+        control_type, role, title, description = known
+    else:
+        control_type = label.replace('_', '-')
+        role, title = 'UI Element', label.replace('_', ' ').replace('-', ' ').title()
+        description = f'{title} control'
+    return {'type': control_type, 'role': role, 'title': title, 'description': description}
+
+
+def file_stamp(path):
+    try:
+        st = os.stat(path)
+        return (st.st_mtime_ns, st.st_size)
+    except OSError:
+        return None
+
+
+def load_samples(path=CONTROL_TRAINING_PATH):
+    """
+    (rel_x, rel_y, kind, label) of learned clicks, relative to the window
+    clicked in; kind is None when the window title was not recorded.
+    Clicks recorded without their window (screen position only) are skipped.
+    """
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return []
+    samples = []
+    for interaction in data.get("interactions", []) if isinstance(data, dict) else []:
+        features = interaction.get("features") or {}
+        control = interaction.get("controlData") or {}
+        x, y = features.get("window_rel_x"), features.get("window_rel_y")
+        control_type = features.get("reascript_guess") or control.get("control_type")
+        if not isinstance(x, (int, float)) or not isinstance(y, (int, float)) or not control_type:
+            continue
+        if control_type == "unknown":
+            continue
+        title = features.get("window_title")
+        kind = window_kind(title) if title else None
+        samples.append((x, y, kind, LEARNED_LABELS.get(control_type, control_type)))
+    return samples
+
+
+# ============================================================================
+# HIT GRID
+# ============================================================================
+
+class HitGrid:
+    """Control label per CELL_SIZE cell of one window size"""
+
+    def __init__(self, width, height, labels, cells, learned=None, cell=CELL_SIZE, stamp=None):
+        self.width = int(width)
+        self.height = int(height)
+        self.cell = cell
+        self.cols = -(-self.width // cell)
+        self.rows = -(-self.height // cell)
+        self.labels = labels        # index -> label (0 is None: nothing there)
+        self.cells = cells          # bytes, row-major label indexes
+        self.learned = learned or bytes(len(cells))     # 1 where a click was learned
+        self.stamp = stamp
+
+    def lookup(self, rel_x, rel_y):
+        """Label at a position relative to the window's top-left, or None"""
+        if not (0 <= rel_x < self.width and 0 <= rel_y < self.height):
+            return None
+        return self.labels[self.cells[int(rel_y) // self.cell * self.cols + int(rel_x) // self.cell]]
+
+    def lookup_learned(self, rel_x, rel_y):
+        """(label, learned) at a relative position; learned is False for band guesses"""
+        if not (0 <= rel_x < self.width and 0 <= rel_y < self.height):
+            return None, False
+        i = int(rel_y) // self.cell * self.cols + int(rel_x) // self.cell
+        return self.labels[self.cells[i]], bool(self.learned[i])
+
+    @classmethod
+    def build(cls, width, height, seed, samples=(), cell=CELL_SIZE, radius=LEARN_RADIUS, stamp=None):
+        """
+        Args:
+            seed: Classifier (x_pct, y_pct) -> label for unlearned cells
+            samples: (rel_x, rel_y, label) learned clicks inside the window
+        """
+        width, height = int(width), int(height)
+        cols, rows = -(-width // cell), -(-height // cell)
+        labels, index = [None], {None: 0}
+        cells = bytearray(cols * rows)
+        x_pcts = [min(width - 1, c * cell + cell // 2) / width * 100 for c in range(cols)]
+        for r in range(rows):
+            y_pct = min(height - 1, r * cell + cell // 2) / height * 100
+            base = r * cols
+            for c, x_pct in enumerate(x_pcts):
+                label = seed(x_pct, y_pct)
+                i = index.get(label)
+                if i is None:
+                    i = index[label] = len(labels)
+                    labels.append(label)
+                cells[base + c] = i
+
+        # Learned clicks claim the cells around them; the nearest (then the
+        # most clicked) sample wins a cell several of them reach
+        votes = Counter()
+        for x, y, label in samples:
+            if 0 <= x < width and 0 <= y < height:
+                votes[(int(y) // cell, int(x) // cell, label)] += 1
+        claims = {}
+        for (r0, c0, label), count in votes.items():
+            for r in range(max(0, r0 - radius), min(rows, r0 + radius + 1)):
+                for c in range(max(0, c0 - radius), min(cols, c0 + radius + 1)):
+                    rank = (max(abs(r - r0), abs(c - c0)), -count)
+                    held = claims.get((r, c))
+                    if held is None or rank < held[0]:
+                        claims[(r, c)] = (rank, label)
+        learned = bytearray(len(cells))
+        for (r, c), (_, label) in claims.items():
+            i = index.get(label)
+            if i is None:
+                if len(labels) > 255:
+                    continue
+                i = index[label] = len(labels)
+                labels.append(label)
+            cells[r * cols + c] = i
+            learned[r * cols + c] = 1
+        return cls(width, height, labels, bytes(cells), bytes(learned), cell, stamp)
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            pickle.dump(
+                (GRID_VERSION, self.width, self.height, self.cell, self.labels, self.cells,
+                 self.learned, self.stamp),
+                f, protocol=pickle.HIGHEST_PROTOCOL
+            )
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path):
+        """Saved grid, or None if missing or from another version"""
+        try:
+            with open(path, "rb") as f:
+                version, *fields = pickle.load(f)
+        except (OSError, ValueError, TypeError, EOFError, pickle.UnpicklingError):
+            return None
+        if version != GRID_VERSION:
+            return None
+        width, height, cell, labels, cells, learned, stamp = fields
+        return cls(width, height, labels, cells, learned, cell, stamp)
+
+
+class HitGridCache:
+    """Grids for the windows being hovered, built or loaded on first use"""
+
+    def __init__(
+        self,
+        training_path=CONTROL_TRAINING_PATH,
+        cache_dir=HIT_GRID_CACHE,
+        seeds=None,
+        cell=CELL_SIZE,
+        check_interval=5.0,
+        clock=time.monotonic
+    ):
+        """
+        Args:
+            training_path: control-training.json with learned clicks
+            cache_dir: Where grids are persisted (None: memory only)
+            seeds: window kind -> band classifier (default SEEDS)
+            cell: Cell size in pixels
+            check_interval: Seconds between checks for new training samples
+            clock: Monotonic clock
+        """
+        self.training_path = training_path
+        self.cache_dir = cache_dir
+        self.seeds = SEEDS if seeds is None else seeds
+        self.cell = cell
+        self.check_interval = check_interval
+        self.clock = clock
+        self._grids = {}            # (kind, width, height) -> HitGrid
+        self._samples = None
+        self._stamp = file_stamp(training_path)
+        self._checked_at = clock()
+        self.stats = {'lookups': 0, 'builds': 0, 'loads': 0}
+
+    def _check_training(self):
+        now = self.clock()
+        if now - self._checked_at < self.check_interval:
+            return
+        self._checked_at = now
+        stamp = file_stamp(self.training_path)
+        if stamp != self._stamp:
+            self._stamp = stamp
+            self._samples = None
+            self._grids.clear()
+
+    def _path(self, key):
+        kind, width, height = key
+        return os.path.join(self.cache_dir, f"{kind}_{width}x{height}.grid")
+
+    def _prune_files(self):
+        """Delete the least recently used grid files beyond MAX_GRID_FILES"""
+        try:
+            paths = [os.path.join(self.cache_dir, n) for n in os.listdir(self.cache_dir) if n.endswith(".grid")]
+            paths.sort(key=os.path.getmtime, reverse=True)
+            for path in paths[MAX_GRID_FILES:]:
+                os.remove(path)
+        except OSError as e:
+            print(f"⚠️  Could not prune hit grids: {e}", file=sys.stderr)
+
+    def grid(self, kind, window):
+        """The grid for a window of this kind and size (wherever it is on screen)"""
+        key = (kind, int(window.width), int(window.height))
+        grid = self._grids.get(key)
+        if grid is not None:
+            return grid
+        path = self._path(key) if self.cache_dir else None
+        grid = HitGrid.load(path) if path else None
+        if grid is not None and grid.stamp == self._stamp and grid.cell == self.cell:
+            self.stats['loads'] += 1
+            try:
+                os.utime(path)              # recently used: kept by _prune_files
+            except OSError:
+                pass
+        else:
+            if self._samples is None:
+                self._samples = load_samples(self.training_path)
+            _, width, height = key
+            inside = [
+                (x, y, label) for x, y, sample_kind, label in self._samples
+                if sample_kind in (None, kind) and 0 <= x < width and 0 <= y < height
+            ]
+            grid = HitGrid.build(width, height, self.seeds[kind], inside, self.cell, stamp=self._stamp)
+            self.stats['builds'] += 1
+            if path:
+                try:
+                    grid.save(path)
+                    self._prune_files()
+                except OSError as e:
+                    print(f"⚠️  Could not save hit grid: {e}", file=sys.stderr)
+        if len(self._grids) >= MAX_GRIDS:
+            self._grids.pop(next(iter(self._grids)))
+        self._grids[key] = grid
+        return grid
+
+    def lookup(self, window, x, y):
+        """(label, learned) under screen position (x, y); (None, False) outside any grid"""
+        kind = window_kind(window.name)
+        if kind not in self.seeds or window.width <= 0 or window.height <= 0:
+            return None, False
+        self.stats['lookups'] += 1
+        self._check_training()
+        return self.grid(kind, window).lookup_learned(x - window.x, y - window.y)
+
+    def label_at(self, window, x, y):
+        """Grid label under screen position (x, y), or None"""
+        return self.lookup(window, x, y)[0]
+
+    def control_at(self, window, x, y):
+        """Element dict for the control under screen position (x, y), or None"""
+        return element(self.label_at(window, x, y))
+
+
+# ============================================================================
+# BENCHMARK
+# ============================================================================
+
+def synthetic_samples(window, count=400, seed=5):
+    """Window-relative clicks on a track panel whose arm/mute/solo rows repeat every 60 px"""
+    import random
+
+    rng = random.Random(seed)
+    samples = []
+    for _ in range(count):
+        track = rng.randrange(max(1, int(window.height) // 60))
+        button = rng.randrange(3)
+        x = window.width * 0.55 + rng.randint(0, 40)
+        y = track * 60 + 12 + button * 16 + rng.randint(-3, 3)
+        samples.append((x, y, ('arm', 'mute', 'solo')[button]))
+    return samples
+
+
+def benchmark(hovers=100000):
+    """Lookup cost per hover: percentage bands vs. grid, plus build/load cost"""
+    import random
+    import tempfile
+    from screen_awareness_core import Window
+
+    window = Window("REAPER", "REAPER v7.0 - project.rpp", 0, 25, 2560, 1415)
+    rng = random.Random(1)
+    points = [(rng.randrange(window.width), rng.randrange(window.height)) for _ in range(hovers)]
+
+    start = time.perf_counter()
+    for rel_x, rel_y in points:
+        main_control(rel_x / window.width * 100, rel_y / window.height * 100)
+    bands = time.perf_counter() - start
+
+    with tempfile.TemporaryDirectory() as tmp:
+        training = os.path.join(tmp, "control-training.json")
+        with open(training, "w") as f:
+            json.dump({"interactions": [
+                {"features": {"window_rel_x": x, "window_rel_y": y, "window_title": window.name,
+                              "reascript_guess": label}}
+                for x, y, label in synthetic_samples(window)
+            ]}, f)
+        grids = HitGridCache(training, os.path.join(tmp, "grids"))
+        start = time.perf_counter()
+        grid = grids.grid("main", window)
+        build = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for rel_x, rel_y in points:
+            grid.lookup(rel_x, rel_y)
+        lookups = time.perf_counter() - start
+
+        start = time.perf_counter()
+        HitGridCache(training, os.path.join(tmp, "grids")).grid("main", window)
+        load = time.perf_counter() - start
+
+    return {
+        'hovers': hovers,
+        'cells': grid.cols * grid.rows,
+        'bands_us': bands / hovers * 1e6,
+        'grid_us': lookups / hovers * 1e6,
+        'build_ms': build * 1000,
+        'load_ms': load * 1000
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="DAWRV screen awareness hit grids")
+    parser.add_argument("--benchmark", action="store_true", help="Time grid lookups per hover")
+    parser.add_argument("--clear", action="store_true", help="Delete persisted grids")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        res = benchmark()
+        print(f"bands: {res['bands_us']:.2f} µs/hover")
+        print(f"grid:  {res['grid_us']:.2f} µs/hover ({res['cells']} cells, "
+              f"built in {res['build_ms']:.0f} ms, loaded in {res['load_ms']:.1f} ms)")
+    elif args.clear:
+        removed = 0
+        if os.path.isdir(HIT_GRID_CACHE):
+            for name in os.listdir(HIT_GRID_CACHE):
+                if name.endswith(".grid"):
+                    os.remove(os.path.join(HIT_GRID_CACHE, name))
+                    removed += 1
+        print(f"Removed {removed} grid(s)")
+    else:
+        parser.print_help()
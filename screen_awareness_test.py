@@ -0,0 +1,399 @@
+#!/usr/bin/env python3
+"""
+DAWRV Screen Awareness Test Suite
+=================================
+Unit tests for the platform-neutral screen awareness core. Pointer and
+window probes are scripted, so this runs without macOS or REAPER.
+"""
+
+import io
+import os
+import sys
+import json
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from screen_awareness_core import (
+    EventWriter, FakeClock, HoverScheduler, ScriptedProbe, Window, WindowCache, WindowIndex,
+    synthetic_trace, synthetic_windows
+)
+from screen_awareness_grid import (
+    MAX_GRID_FILES, HitGrid, HitGridCache, element, load_samples, main_control, mixer_control
+)
+from screen_awareness_detector import (
+    CascadingDetector, Strategy, accessibility_strategy, classify_accessibility, position_strategy
+)
+
+
+class TestHoverScheduler(unittest.TestCase):
+    """Test single-deadline hover detection against a scripted pointer"""
+
+    def _run(self, trace, seconds, **kwargs):
+        clock = FakeClock()
+        probe = ScriptedProbe(trace, clock=clock)
+        hovers = []
+        scheduler = HoverScheduler(
+            probe.mouse_position,
+            lambda x, y: hovers.append((clock(), x, y)),
+            clock=clock, sleep=clock.sleep, **kwargs
+        )
+        scheduler.run(duration=seconds)
+        return scheduler, hovers
+
+    def test_hover_reported_once_at_deadline(self):
+        """Test a rest is reported once, hover_delay after the last move"""
+        trace = [(0.0, 10, 10), (0.1, 20, 10), (0.2, 30, 10)]
+        scheduler, hovers = self._run(trace, 3.0, hover_delay=0.5)
+        self.assertEqual(len(hovers), 1)
+        at, x, y = hovers[0]
+        self.assertEqual((x, y), (30, 10))
+        self.assertAlmostEqual(at, 0.7, places=6)
+        self.assertIsNone(scheduler.deadline)
+
+    def test_short_rests_and_moves_not_reported(self):
+        """Test rests shorter than hover_delay never fire"""
+        trace = [(t / 10, 100 + t, 100) for t in range(30)]          # moving
+        trace += [(3.0, 500, 500), (3.3, 510, 500), (3.6, 520, 500)]  # 0.3 s rests
+        scheduler, hovers = self._run(trace, 4.0, hover_delay=0.5)
+        self.assertEqual(hovers, [])
+        trace.append((4.0, 600, 600))
+        scheduler, hovers = self._run(trace, 5.0, hover_delay=0.5)
+        self.assertEqual([(x, y) for _, x, y in hovers], [(600, 600)])
+
+    def test_probe_errors_back_off(self):
+        """Test a failing probe is reported and the loop keeps going"""
+        clock = FakeClock()
+        errors = []
+
+        def broken():
+            raise OSError("no display")
+
+        scheduler = HoverScheduler(broken, lambda x, y: None, clock=clock,
+                                   sleep=clock.sleep, on_error=errors.append)
+        scheduler.run(duration=3.0)
+        self.assertEqual(scheduler.stats['errors'], 3)
+        self.assertIn("no display", errors[0])
+
+    def test_trace_replay_starts_no_threads(self):
+        """Test a long trace runs on the calling thread only"""
+        trace = synthetic_trace(120)
+        before = threading.active_count()
+        scheduler, hovers = self._run(trace, 125.0)
+        self.assertEqual(threading.active_count(), before)
+        self.assertGreater(scheduler.stats['moves'], 500)
+        self.assertGreater(len(hovers), 5)
+        self.assertEqual(scheduler.stats['hovers'], len(hovers))
+
+
+class TestWindowCache(unittest.TestCase):
+    """Test the window index and the TTL'd window cache"""
+
+    def setUp(self):
+        self.main = Window("REAPER", "REAPER v7.0", 0, 25, 1920, 1055)
+        self.mixer = Window("REAPER", "Mixer", 200, 600, 800, 400)
+        self.other = Window("Finder", "Downloads", 100, 100, 400, 300)
+        self.clock = FakeClock(100.0)
+        self.probe = ScriptedProbe([], windows=[self.mixer, self.other, self.main], clock=self.clock)
+        self.cache = WindowCache(self.probe, ttl=10.0, recheck=2.0, clock=self.clock)
+
+    def test_index_matches_linear_scan(self):
+        """Test the slab index returns the front-most window a scan finds"""
+        import random
+
+        windows = synthetic_windows(count=40, reaper=40)
+        index = WindowIndex(windows)
+        rng = random.Random(3)
+        for _ in range(2000):
+            x, y = rng.randint(-10, 2600), rng.randint(-10, 1460)
+            expected = next((w for w in windows if w.contains(x, y)), None)
+            self.assertEqual(index.at(x, y), expected)
+
+    def test_front_window_and_owner_filter(self):
+        """Test overlapping REAPER windows resolve front-most; other apps are ignored"""
+        self.assertEqual(self.cache.window_at(300, 700), self.mixer)
+        self.assertEqual(self.cache.window_at(150, 150), self.main)
+        self.assertIsNone(self.cache.window_at(2500, 10))
+        self.assertEqual(self.cache.windows(), [self.mixer, self.main])
+
+    def test_ttl_and_invalidate(self):
+        """Test hovers reuse the window list until the TTL or an invalidate"""
+        for _ in range(5):
+            self.cache.window_at(300, 700)
+            self.clock.sleep(1.0)
+        self.assertEqual(self.probe.calls['windows'], 1)
+        self.assertEqual(self.cache.stats['hits'], 4)
+        self.assertEqual(self.cache.stats['misses'], 1)
+
+        self.clock.sleep(10.0)
+        self.cache.window_at(300, 700)
+        self.assertEqual(self.probe.calls['windows'], 2)
+        self.assertEqual(self.cache.stats['rebuilds'], 1)     # same geometry, index kept
+
+        self.cache.invalidate()
+        self.cache.window_at(300, 700)
+        self.assertEqual(self.probe.calls['windows'], 3)
+
+    def test_points_outside_recheck_for_new_windows(self):
+        """Test a point outside every window triggers a refresh once recheck passes"""
+        self.assertIsNone(self.cache.window_at(2000, 100))
+        self.assertIsNone(self.cache.window_at(2000, 100))
+        self.assertEqual(self.probe.calls['windows'], 1)
+
+        fx = Window("REAPER", "FX: Track 1", 1950, 50, 400, 300)
+        self.probe._windows.insert(0, fx)
+        self.clock.sleep(2.0)
+        self.assertEqual(self.cache.window_at(2000, 100), fx)
+        self.assertEqual(self.cache.stats['rebuilds'], 2)
+
+
+class TestHitGrid(unittest.TestCase):
+    """Test hit grids seeded from the bands and learned from clicks"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.training = os.path.join(self.tmp.name, "control-training.json")
+        self.cache_dir = os.path.join(self.tmp.name, "grids")
+        self.window = Window("REAPER", "REAPER v7.0 - project.rpp", 0, 25, 1600, 1000)
+        self.clock = FakeClock()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _write_training(self, clicks, title="REAPER v7.0 - project.rpp"):
+        """Clicks (rel_x, rel_y, control_type) in a window with this title"""
+        with open(self.training, "w") as f:
+            json.dump({"interactions": [
+                {"features": {"position_x": x + 5000, "position_y": y + 5000, "window_rel_x": x,
+                              "window_rel_y": y, "window_title": title, "reascript_guess": control_type}}
+                for x, y, control_type in clicks
+            ] + [
+                {"features": {"reascript_guess": "mute_button"}},
+                {"features": {"position_x": 900, "position_y": 425, "reascript_guess": "solo_button"}},
+            ]}, f)
+
+    def _grids(self):
+        return HitGridCache(self.training, self.cache_dir, check_interval=1.0, clock=self.clock)
+
+    def test_seeded_grid_matches_bands(self):
+        """Test an unlearned grid answers like the percentage bands at cell centres"""
+        grid = HitGrid.build(800, 600, mixer_control)
+        for rel_y in range(4, 600, 8):
+            self.assertEqual(grid.lookup(100, rel_y), mixer_control(0, rel_y / 600 * 100))
+        self.assertIsNone(grid.lookup(800, 10))
+        self.assertIsNone(grid.lookup(-1, 10))
+
+    def test_learned_clicks_override_nearby_cells(self):
+        """Test a learned click claims cells within the radius only"""
+        grid = HitGrid.build(1600, 1000, main_control, [(900, 400, 'mute'), (900, 420, 'solo')])
+        self.assertEqual(grid.lookup(905, 398), 'mute')
+        self.assertEqual(grid.lookup(905, 424), 'solo')
+        self.assertEqual(grid.lookup(1300, 400), main_control(1300 / 16, 40))
+
+    def test_samples_loaded_from_training_data(self):
+        """Test clicks without a window-relative position are skipped and control types mapped"""
+        self._write_training([(10, 20, "volume_fader"), (30, 40, "width_control")])
+        self.assertEqual(load_samples(self.training), [(10, 20, 'main', 'fader'), (30, 40, 'main', 'width_control')])
+        self._write_training([(10, 20, "volume_fader")], title="")
+        self.assertEqual(load_samples(self.training), [(10, 20, None, 'fader')])
+        self.assertEqual(load_samples(os.path.join(self.tmp.name, "missing.json")), [])
+
+    def test_grids_persisted_per_geometry(self):
+        """Test grids are built once per size, reloaded, and rebuilt on new clicks"""
+        self._write_training([(900, 400, "mute_button")])
+        grids = self._grids()
+        self.assertEqual(grids.control_at(self.window, 900, 425)['type'], 'mute-button')
+        grids.control_at(self.window, 10, 30)
+        self.assertEqual(grids.stats['builds'], 1)
+
+        restarted = self._grids()
+        self.assertEqual(restarted.label_at(self.window, 900, 425), 'mute')
+        self.assertEqual(restarted.stats, {'lookups': 1, 'builds': 0, 'loads': 1})
+
+        resized = self.window._replace(width=1200)
+        restarted.label_at(resized, 10, 30)
+        self.assertEqual(restarted.stats['builds'], 1)
+
+        self._write_training([(900, 400, "solo_button")])
+        os.utime(self.training, ns=(0, 10 ** 9))
+        self.clock.sleep(1.0)
+        self.assertEqual(restarted.label_at(self.window, 900, 425), 'solo')
+        self.assertEqual(restarted.stats['builds'], 2)
+
+    def test_learning_survives_window_moves(self):
+        """Test a moved window reuses its grid and learned clicks, and grid files are capped"""
+        self._write_training([(900, 400, "mute_button")])
+        grids = self._grids()
+        self.assertEqual(grids.label_at(self.window, 900, 425), 'mute')
+        moved = self.window._replace(x=300, y=200)
+        self.assertEqual(grids.label_at(moved, 1200, 600), 'mute')
+        self.assertEqual(grids.stats['builds'], 1)
+
+        for width in range(100, 100 + 2 * MAX_GRID_FILES, 2):
+            grids.label_at(Window("REAPER", "REAPER", 0, 0, width, 50), 10, 10)
+        self.assertEqual(len(os.listdir(self.cache_dir)), MAX_GRID_FILES)
+
+    def test_other_windows_not_gridded(self):
+        """Test FX and unrelated windows are left to the tracker"""
+        grids = self._grids()
+        self.assertIsNone(grids.control_at(Window("REAPER", "FX: Track 1", 0, 0, 400, 300), 10, 10))
+        self.assertEqual(grids.stats['lookups'], 0)
+
+
+class TestCascadingDetector(unittest.TestCase):
+    """Test cheapest-first detection, the cell cache and rate limiting"""
+
+    def setUp(self):
+        self.window = Window("REAPER", "REAPER v7.0 - project.rpp", 0, 25, 1600, 1000)
+        grid = HitGrid.build(1600, 1000, main_control, [(900, 400, 'mute')])
+
+        class Grids:
+            def lookup(self, window, x, y):
+                return grid.lookup_learned(x - window.x, y - window.y)
+
+        self.queries = []
+        self.clock = FakeClock()
+        self.detector = CascadingDetector([
+            position_strategy(Grids()),
+            accessibility_strategy(self._query, min_interval=1.0)
+        ], clock=self.clock)
+
+    def _query(self, x, y):
+        self.queries.append((x, y))
+        return {'role': 'AXSlider', 'title': 'Volume'}
+
+    def test_learned_cell_needs_no_query(self):
+        """Test a learned grid cell answers without the expensive strategy"""
+        self.assertEqual(self.detector.detect(self.window, 900, 425)['type'], 'mute-button')
+        self.assertEqual(self.detector.last_source, 'position')
+        self.assertEqual(self.queries, [])
+
+    def test_unsure_cell_escalates_once(self):
+        """Test a band guess escalates, and the answer is cached for the cell"""
+        self.assertEqual(self.detector.detect(self.window, 1400, 500)['type'], 'volume-fader')
+        self.assertEqual(self.detector.last_source, 'accessibility')
+        self.clock.sleep(5.0)
+        self.assertEqual(self.detector.detect(self.window, 1403, 502)['type'], 'volume-fader')
+        self.assertEqual(self.detector.last_source, 'cache')
+        self.assertEqual(len(self.queries), 1)
+        self.assertEqual(self.detector.stats['hits'], 1)
+
+    def test_cached_cells_keep_no_hover_fields(self):
+        """Test a cache hit returns the control without the first hover's position or value"""
+        detector = CascadingDetector([Strategy("ax", lambda window, x, y: (
+            {'type': 'volume-fader', 'title': 'Volume', 'value': '-3.0 dB', 'position': {'x': x, 'y': y}}, 0.9
+        ))], clock=self.clock)
+        first = detector.detect(self.window, 1400, 500)
+        self.assertEqual(first['value'], '-3.0 dB')
+        self.assertEqual(first['position'], {'x': 1400, 'y': 500})
+        cached = detector.detect(self.window, 1403, 502)
+        self.assertEqual(detector.last_source, 'cache')
+        self.assertEqual(cached, {'type': 'volume-fader', 'title': 'Volume'})
+
+    def test_expensive_queries_rate_limited(self):
+        """Test a sweep inside min_interval gets the cheap answer, uncached"""
+        self.detector.detect(self.window, 1400, 500)
+        self.clock.sleep(0.3)
+        guess = self.detector.detect(self.window, 1400, 700)
+        self.assertEqual(guess['type'], element(main_control(1400 / 16, 67.5))['type'])
+        self.assertEqual(self.detector.stats['rate_limited'], 1)
+        self.clock.sleep(1.0)
+        self.assertEqual(self.detector.detect(self.window, 1400, 700)['type'], 'volume-fader')
+        self.assertEqual(len(self.queries), 2)
+
+    def test_moved_window_drops_cells(self):
+        """Test cached cells are dropped when the window moves or resizes"""
+        self.detector.detect(self.window, 1400, 500)
+        moved = self.window._replace(x=100)
+        self.clock.sleep(2.0)
+        self.detector.detect(moved, 1500, 500)
+        self.assertEqual(len(self.queries), 2)
+        self.assertEqual(self.detector.stats['invalidations'], 1)
+
+    def test_failing_strategy_falls_through(self):
+        """Test a strategy that raises is counted and skipped"""
+        def broken(window, x, y):
+            raise OSError("osascript missing")
+
+        detector = CascadingDetector([Strategy("broken", broken), self.detector.strategies[0]])
+        self.assertEqual(detector.detect(self.window, 900, 425)['type'], 'mute-button')
+        self.assertEqual(detector.stats['errors'], 1)
+
+    def test_classify_accessibility_roles(self):
+        """Test AX roles and System Events role names map to control types"""
+        self.assertEqual(classify_accessibility({'role': 'AXButton', 'title': 'Solo'}), 'solo-button')
+        self.assertEqual(classify_accessibility({'role': 'slider', 'description': 'pan'}), 'pan-control')
+        self.assertEqual(classify_accessibility({'role': 'AXStaticText', 'title': 'Track 3'}), 'track-name')
+        self.assertEqual(classify_accessibility({}), 'unknown')
+
+
+
+class TestEventWriter(unittest.TestCase):
+    """Test log gating, duplicate dropping and batched flushes of tracker events"""
+
+    def _writer(self, **kwargs):
+        stream, clock = io.StringIO(), FakeClock()
+        return EventWriter(stream, clock=clock, **kwargs), stream, clock
+
+    def _events(self, stream):
+        return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+    def test_log_level_gates_messages(self):
+        output, stream, _ = self._writer(level='info', max_flushes=0)
+        output.debug("Found 1 REAPER window(s)")
+        output.info("Tracking started")
+        output.error("Boom")
+        self.assertEqual([e['event'] for e in self._events(stream)], ['info', 'error'])
+        self.assertEqual(output.stats['dropped'], 1)
+
+    def test_unchanged_element_dropped(self):
+        output, stream, _ = self._writer(max_flushes=0)
+        mute = dict(element('mute-button'), position={'x': 40, 'y': 300})
+        output.element(mute)
+        output.element(dict(mute))
+        output.element(dict(mute, position={'x': 44, 'y': 303}))    # under 5 px
+        output.element(dict(mute, position={'x': 46, 'y': 300}))    # same 8 px cell
+        output.element(dict(mute, position={'x': 48, 'y': 300}))    # moved on
+        output.element(dict(element('solo-button'), position={'x': 48, 'y': 300}))
+        self.assertEqual([(e['element']['type'], e['element']['position']['x']) for e in self._events(stream)],
+                         [('mute-button', 40), ('mute-button', 48), ('solo-button', 48)])
+
+    def test_flushes_batched(self):
+        output, stream, clock = self._writer(max_flushes=10)
+        for i in range(5):
+            output.info(f"step {i}")
+        self.assertEqual(len(self._events(stream)), 1)      # first write goes out at once
+        clock.sleep(0.05)
+        output.poll()
+        self.assertEqual(len(self._events(stream)), 1)
+        clock.sleep(0.05)
+        output.poll()
+        self.assertEqual(len(self._events(stream)), 5)
+        self.assertEqual(output.stats['writes'], 2)
+
+    def test_compact_sends_changed_fields(self):
+        output, stream, _ = self._writer(compact=True, max_flushes=0)
+        output.element({'type': 'mute-button', 'title': 'Mute', 'position': {'x': 1, 'y': 2}})
+        output.element({'type': 'mute-button', 'title': 'Mute', 'position': {'x': 5, 'y': 2}})
+        output.element({'type': 'solo-button', 'title': 'Mute', 'position': {'x': 9, 'y': 2}})
+        output.element({'type': 'solo-button', 'position': {'x': 9, 'y': 2}})
+        first, moved, untitled = self._events(stream)
+        self.assertEqual(first['event'], 'element-detected')
+        self.assertEqual(moved, {'event': 'element-changed',
+                                 'changed': {'type': 'solo-button', 'position': {'x': 9, 'y': 2}}})
+        self.assertEqual(untitled, {'event': 'element-changed', 'changed': {}, 'removed': ['title']})
+
+    def test_fewer_writes_than_prints(self):
+        from screen_awareness_core import benchmark_output
+        res = benchmark_output(hovers=100)
+        # At most one write per hover, plus the final flush
+        self.assertLessEqual(res['writer_writes'], 1.01)
+        self.assertLess(res['writer_bytes'], res['prints_bytes'] / 2)
+
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -6,31 +6,37 @@ Hybrid Screen Awareness Tracker for DAWRV
 """
 
 import sys
-import json
-import time
-import threading
 import subprocess
-from AppKit import NSEvent, NSScreen
-from Quartz import CGWindowListCopyWindowInfo, kCGWindowListOptionOnScreenOnly, kCGNullWindowID
+from screen_awareness_core import (
+    EventWriter, HoverScheduler, MacScreenProbe, WindowCache, event_writer, tracker_arguments
+)
+from screen_awareness_detector import (
+    CascadingDetector, accessibility_strategy, classify_accessibility, position_strategy
+)
+from screen_awareness_grid import HitGridCache
 
 class ScreenAwarenessTracker:
-    def __init__(self):
+    def __init__(self, output=None):
         self.running = False
+        self.output = output or EventWriter()
         self.last_element = None
         self.hover_delay = 0.5
         self.check_interval = 0.1
-        self.last_mouse_pos = (0, 0)
-        self.hover_timer = None
+        self.probe = MacScreenProbe()
+        self.window_cache = WindowCache(self.probe)
+        self.scheduler = None
+        # Hit grid first; the osascript subprocess only where the grid is unsure
+        self.detector = CascadingDetector([
+            position_strategy(HitGridCache()),
+            accessibility_strategy(
+                self.get_element_via_applescript, name="applescript", min_interval=1.0
+            )
+        ])
         
     def get_mouse_position(self):
         """Get current mouse cursor position"""
         try:
-            mouse_loc = NSEvent.mouseLocation()
-            screen = NSScreen.mainScreen()
-            screen_frame = screen.frame()
-            x = int(mouse_loc.x)
-            y = int(screen_frame.size.height - mouse_loc.y)
-            return (x, y)
+            return self.probe.mouse_position()
         except Exception as e:
             self.log_error(f"Error getting mouse position: {e}")
             return None
@@ -38,23 +44,7 @@ class ScreenAwarenessTracker:
     def is_reaper_window(self, x, y):
         """Check if position is over REAPER window"""
         try:
-            window_list = CGWindowListCopyWindowInfo(
-                kCGWindowListOptionOnScreenOnly,
-                kCGNullWindowID
-            )
-            
-            for window in window_list:
-                owner_name = window.get('kCGWindowOwnerName', '')
-                if 'REAPER' in owner_name:
-                    bounds = window.get('kCGWindowBounds', {})
-                    wx = bounds.get('X', 0)
-                    wy = bounds.get('Y', 0)
-                    ww = bounds.get('Width', 0)
-                    wh = bounds.get('Height', 0)
-                    
-                    if wx <= x <= wx + ww and wy <= y <= wy + wh:
-                        return True
-            return False
+            return self.window_cache.window_at(x, y) is not None
         except Exception as e:
             return False
     
@@ -103,7 +93,7 @@ class ScreenAwarenessTracker:
             if result.returncode == 0 and result.stdout:
                 output = result.stdout.strip()
                 if output and not output.startswith('error|'):
-                    return self.parse_applescript_output(output, x, y)
+                    return self.parse_applescript_output(output)
             
             return None
             
@@ -112,8 +102,8 @@ class ScreenAwarenessTracker:
         except Exception as e:
             return None
     
-    def parse_applescript_output(self, output, x, y):
-        """Parse AppleScript output into element info"""
+    def parse_applescript_output(self, output):
+        """Parse AppleScript output into element info (on_hover_timeout adds the position)"""
         try:
             parts = output.split('|')
             if len(parts) < 4:
@@ -126,73 +116,29 @@ class ScreenAwarenessTracker:
                 'role': role,
                 'title': title if title else None,
                 'value': value if value else None,
-                'description': desc if desc else None,
-                'position': {'x': x, 'y': y}
+                'description': desc if desc else None
             }
             
             # Identify control type from role
-            element['type'] = self.identify_control_type(element)
+            element['type'] = classify_accessibility(element)
             
             return element
             
         except Exception as e:
             return None
     
-    def identify_control_type(self, element):
-        """Identify what type of control this is"""
-        role = (element.get('role') or '').lower()
-        title = (element.get('title') or '').lower()
-        desc = (element.get('description') or '').lower()
-        
-        # Map AppleScript roles to friendly types
-        if 'slider' in role or 'value indicator' in role:
-            # Determine if it's a fader, pan, or other slider
-            if 'volume' in title or 'fader' in title or 'db' in desc:
-                return 'volume-fader'
-            elif 'pan' in title or 'pan' in desc:
-                return 'pan-control'
-            else:
-                return 'slider'
-        
-        elif 'button' in role or 'checkbox' in role:
-            if 'mute' in title or 'mute' in desc:
-                return 'mute-button'
-            elif 'solo' in title or 'solo' in desc:
-                return 'solo-button'
-            elif 'arm' in title or 'record' in title or 'arm' in desc:
-                return 'arm-button'
-            elif 'fx' in title or 'effect' in title:
-                return 'fx-button'
-            else:
-                return 'button'
-        
-        elif 'text' in role:
-            if 'track' in desc or 'track' in title:
-                return 'track-name'
-            return 'text-field'
-        
-        elif 'menu' in role:
-            return 'menu'
-        
-        elif 'group' in role:
-            return 'group'
-        
-        return role if role else 'unknown'
-    
     def on_hover_timeout(self, x, y):
         """Called when mouse has hovered for specified delay"""
         if not self.running:
             return
         
-        current_pos = self.get_mouse_position()
-        if not current_pos or current_pos != (x, y):
+        window = self.window_cache.window_at(x, y)
+        if window is None:
             return
         
-        if not self.is_reaper_window(x, y):
-            return
-        
-        # Get element via AppleScript
-        element = self.get_element_via_applescript(x, y)
+        element = self.detector.detect(window, x, y)
+        if element:
+            element['position'] = {'x': x, 'y': y}
         
         if element:
             # Create element key for comparison
@@ -207,68 +153,34 @@ class ScreenAwarenessTracker:
                 self.send_element_detected(element)
     
     def send_element_detected(self, element):
-        """Send element detection event to DAWRV"""
-        try:
-            output = {
-                'event': 'element-detected',
-                'element': element
-            }
-            print(json.dumps(output), flush=True)
-        except Exception as e:
-            self.log_error(f"Error sending element: {e}")
+        """Send element detection event to DAWRV (dropped if unchanged)"""
+        self.output.element(element)
     
     def log_error(self, message):
         """Log error message"""
-        try:
-            output = {
-                'event': 'error',
-                'message': message
-            }
-            print(json.dumps(output), flush=True)
-        except:
-            pass
+        self.output.error(message)
     
     def log_info(self, message):
         """Log info message"""
-        try:
-            output = {
-                'event': 'info',
-                'message': message
-            }
-            print(json.dumps(output), flush=True)
-        except:
-            pass
+        self.output.info(message)
     
     def track_loop(self):
         """Main tracking loop"""
         self.log_info("Hybrid screen awareness tracking started (AppleScript detection)")
         
-        while self.running:
-            try:
-                pos = self.get_mouse_position()
-                
-                if pos and pos != self.last_mouse_pos:
-                    if self.hover_timer:
-                        self.hover_timer.cancel()
-                    
-                    self.last_mouse_pos = pos
-                    x, y = pos
-                    
-                    self.hover_timer = threading.Timer(
-                        self.hover_delay,
-                        self.on_hover_timeout,
-                        args=(x, y)
-                    )
-                    self.hover_timer.daemon = True
-                    self.hover_timer.start()
-                
-                time.sleep(self.check_interval)
-                
-            except Exception as e:
-                self.log_error(f"Error in track loop: {e}")
-                time.sleep(1)
+        # One deadline checked on each poll instead of a Timer thread per move
+        self.scheduler = HoverScheduler(
+            self.get_mouse_position,
+            self.on_hover_timeout,
+            hover_delay=self.hover_delay,
+            check_interval=self.check_interval,
+            on_error=self.log_error,
+            on_tick=self.output.poll
+        )
+        self.scheduler.run()
         
         self.log_info("Screen awareness tracking stopped")
+        self.output.flush()
     
     def start(self, hover_delay=0.5):
         """Start tracking"""
@@ -279,17 +191,16 @@ class ScreenAwarenessTracker:
     def stop(self):
         """Stop tracking"""
         self.running = False
-        if self.hover_timer:
-            self.hover_timer.cancel()
+        if self.scheduler:
+            self.scheduler.stop()
+        self.output.flush()
 
 def main():
     """Main entry point"""
-    if len(sys.argv) > 1:
-        hover_delay = float(sys.argv[1]) / 1000.0
-    else:
-        hover_delay = 0.5
+    args = tracker_arguments("DAWRV screen awareness tracker (AppleScript detection)")
+    hover_delay = args.hover_ms / 1000.0  # Convert ms to seconds
     
-    tracker = ScreenAwarenessTracker()
+    tracker = ScreenAwarenessTracker(event_writer(args))
     
     try:
         tracker.start(hover_delay)
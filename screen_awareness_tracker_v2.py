@@ -5,13 +5,13 @@ Full Accessibility API integration using PyObjC correctly
 """
 
 import sys
-import json
-import time
-import threading
 import objc
-from AppKit import NSEvent, NSScreen
-from Quartz import CGWindowListCopyWindowInfo, kCGWindowListOptionOnScreenOnly, kCGNullWindowID
 from Foundation import NSBundle
+from screen_awareness_core import (
+    EventWriter, HoverScheduler, MacScreenProbe, WindowCache, event_writer, tracker_arguments
+)
+from screen_awareness_detector import CascadingDetector, accessibility_strategy, position_strategy
+from screen_awareness_grid import HitGridCache
 
 # Load Accessibility framework
 bundle_path = '/System/Library/Frameworks/ApplicationServices.framework'
@@ -33,23 +33,25 @@ if bundle:
     kAXRoleDescriptionAttribute = "AXRoleDescription"
 
 class ScreenAwarenessTracker:
-    def __init__(self):
+    def __init__(self, output=None):
         self.running = False
+        self.output = output or EventWriter()
         self.last_element = None
         self.hover_delay = 0.5
         self.check_interval = 0.1
-        self.last_mouse_pos = (0, 0)
-        self.hover_timer = None
+        self.probe = MacScreenProbe()
+        self.window_cache = WindowCache(self.probe)
+        self.scheduler = None
+        # Hit grid first; the Accessibility query only where the grid is unsure
+        self.detector = CascadingDetector([
+            position_strategy(HitGridCache()),
+            accessibility_strategy(self.get_element_at_position)
+        ])
         
     def get_mouse_position(self):
         """Get current mouse cursor position"""
         try:
-            mouse_loc = NSEvent.mouseLocation()
-            screen = NSScreen.mainScreen()
-            screen_frame = screen.frame()
-            x = int(mouse_loc.x)
-            y = int(screen_frame.size.height - mouse_loc.y)
-            return (x, y)
+            return self.probe.mouse_position()
         except Exception as e:
             self.log_error(f"Error getting mouse position: {e}")
             return None
@@ -57,23 +59,7 @@ class ScreenAwarenessTracker:
     def is_reaper_window(self, x, y):
         """Check if position is over REAPER window"""
         try:
-            window_list = CGWindowListCopyWindowInfo(
-                kCGWindowListOptionOnScreenOnly,
-                kCGNullWindowID
-            )
-            
-            for window in window_list:
-                owner_name = window.get('kCGWindowOwnerName', '')
-                if 'REAPER' in owner_name:
-                    bounds = window.get('kCGWindowBounds', {})
-                    wx = bounds.get('X', 0)
-                    wy = bounds.get('Y', 0)
-                    ww = bounds.get('Width', 0)
-                    wh = bounds.get('Height', 0)
-                    
-                    if wx <= x <= wx + ww and wy <= y <= wy + wh:
-                        return True
-            return False
+            return self.window_cache.window_at(x, y) is not None
         except Exception as e:
             return False
     
@@ -147,14 +133,13 @@ class ScreenAwarenessTracker:
         if not self.running:
             return
         
-        current_pos = self.get_mouse_position()
-        if not current_pos or current_pos != (x, y):
+        window = self.window_cache.window_at(x, y)
+        if window is None:
             return
         
-        if not self.is_reaper_window(x, y):
-            return
-        
-        element = self.get_element_at_position(x, y)
+        element = self.detector.detect(window, x, y)
+        if element:
+            element['position'] = {'x': x, 'y': y}
         
         if element:
             # Create a simple hash for comparison
@@ -168,68 +153,34 @@ class ScreenAwarenessTracker:
                 self.send_element_detected(element)
     
     def send_element_detected(self, element):
-        """Send element detection event to DAWRV"""
-        try:
-            output = {
-                'event': 'element-detected',
-                'element': element
-            }
-            print(json.dumps(output), flush=True)
-        except Exception as e:
-            self.log_error(f"Error sending element: {e}")
+        """Send element detection event to DAWRV (dropped if unchanged)"""
+        self.output.element(element)
     
     def log_error(self, message):
         """Log error message"""
-        try:
-            output = {
-                'event': 'error',
-                'message': message
-            }
-            print(json.dumps(output), flush=True)
-        except:
-            pass
+        self.output.error(message)
     
     def log_info(self, message):
         """Log info message"""
-        try:
-            output = {
-                'event': 'info',
-                'message': message
-            }
-            print(json.dumps(output), flush=True)
-        except:
-            pass
+        self.output.info(message)
     
     def track_loop(self):
         """Main tracking loop"""
         self.log_info("Screen awareness tracking started (v2 - Full AX API)")
         
-        while self.running:
-            try:
-                pos = self.get_mouse_position()
-                
-                if pos and pos != self.last_mouse_pos:
-                    if self.hover_timer:
-                        self.hover_timer.cancel()
-                    
-                    self.last_mouse_pos = pos
-                    x, y = pos
-                    
-                    self.hover_timer = threading.Timer(
-                        self.hover_delay,
-                        self.on_hover_timeout,
-                        args=(x, y)
-                    )
-                    self.hover_timer.daemon = True
-                    self.hover_timer.start()
-                
-                time.sleep(self.check_interval)
-                
-            except Exception as e:
-                self.log_error(f"Error in track loop: {e}")
-                time.sleep(1)
+        # One deadline checked on each poll instead of a Timer thread per move
+        self.scheduler = HoverScheduler(
+            self.get_mouse_position,
+            self.on_hover_timeout,
+            hover_delay=self.hover_delay,
+            check_interval=self.check_interval,
+            on_error=self.log_error,
+            on_tick=self.output.poll
+        )
+        self.scheduler.run()
         
         self.log_info("Screen awareness tracking stopped")
+        self.output.flush()
     
     def start(self, hover_delay=0.5):
         """Start tracking"""
@@ -240,17 +191,16 @@ class ScreenAwarenessTracker:
     def stop(self):
         """Stop tracking"""
         self.running = False
-        if self.hover_timer:
-            self.hover_timer.cancel()
+        if self.scheduler:
+            self.scheduler.stop()
+        self.output.flush()
 
 def main():
     """Main entry point"""
-    if len(sys.argv) > 1:
-        hover_delay = float(sys.argv[1]) / 1000.0
-    else:
-        hover_delay = 0.5
+    args = tracker_arguments("DAWRV screen awareness tracker (v2 - full AX API)")
+    hover_delay = args.hover_ms / 1000.0  # Convert ms to seconds
     
-    tracker = ScreenAwarenessTracker()
+    tracker = ScreenAwarenessTracker(event_writer(args))
     
     try:
         tracker.start(hover_delay)
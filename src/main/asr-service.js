@@ -9,6 +9,7 @@ const { spawn } = require('child_process');
 const path = require('path');
 const fs = require('fs');
 const EventEmitter = require('events');
+const { setRheaSpeaking } = require('./shm-status');
 
 class ASRService extends EventEmitter {
     constructor() {
@@ -119,6 +120,7 @@ class ASRService extends EventEmitter {
                 fs.unlinkSync(this.speakingSignal);
             }
         } catch (e) {}
+        setRheaSpeaking(false);
         
         this.loadConfig();
         
@@ -347,6 +349,7 @@ class ASRService extends EventEmitter {
         this.isPaused = true;
         try {
             fs.writeFileSync(this.speakingSignal, 'true');
+            setRheaSpeaking(true);
             console.log('⏸️ ASR paused');
         } catch (err) {
             console.error('Error pausing ASR:', err);
@@ -362,6 +365,7 @@ class ASRService extends EventEmitter {
             if (fs.existsSync(this.speakingSignal)) {
                 fs.unlinkSync(this.speakingSignal);
             }
+            setRheaSpeaking(false);
             console.log('▶️ ASR resumed');
         } catch (err) {
             console.error('Error resuming ASR:', err);
@@ -491,7 +495,10 @@ class ASRService extends EventEmitter {
                         mode: data.mode,
                         timestamp: data.timestamp,
                         isFinal: (data.is_final !== undefined) ? !!data.is_final : true,
-                        provider: data.provider || this.config.provider || 'local'
+                        provider: data.provider || this.config.provider || 'local',
+                        intent: data.intent || null,
+                        // Set when the ASR fast lane already sent the action to REAPER
+                        dispatched: data.dispatched || null
                     });
                 }
             }
@@ -129,6 +129,13 @@ class ControlLearningService extends EventEmitter {
             position_x: controlData.position?.x,
             position_y: controlData.position?.y,
             
+            // Position inside the window that was clicked (kept valid when it moves)
+            window_rel_x: controlData.window?.rel_x,
+            window_rel_y: controlData.window?.rel_y,
+            window_width: controlData.window?.width,
+            window_height: controlData.window?.height,
+            window_title: controlData.window?.title,
+            
             // Context features
             context: controlData.context, // tcp, mcp, arrange
             
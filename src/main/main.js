@@ -11,6 +11,8 @@ const ContextManager = require('./context-manager');
 const ReaScriptService = require('./reascript-service');
 const ControlLearningService = require('./control-learning-service');
 const ASRService = require('./asr-service');
+const ReaperBridgeClient = require('./reaper-bridge-client');
+const { setRheaSpeaking } = require('./shm-status');
 const http = require('http');
 
 // ---------------------------------------------------------------------------
@@ -76,8 +78,11 @@ class DAWRVApp {
             this.asrService.on('transcript', (data) => {
                 if (this.mainWindow) {
                     this.mainWindow.webContents.send('asr-transcript', data);
-                    // Also send as voice-command for compatibility
-                    this.mainWindow.webContents.send('voice-command', data.text);
+                    // Also send as voice-command for compatibility, unless the ASR
+                    // fast lane already executed it (feedback only via asr-transcript)
+                    if (!data.dispatched) {
+                        this.mainWindow.webContents.send('voice-command', data.text);
+                    }
                 }
             });
             
@@ -1161,8 +1166,6 @@ class DAWRVApp {
         console.log('👂 Starting file watcher for voice commands');
         console.log('   Watching file:', this.voiceCommandFile);
         let checkCount = 0;
-        let lastProcessedTime = 0;
-        const fileWatcherCooldown = 100; // FAST: 100ms cooldown for rapid commands (play/stop)
         
         this.fileWatcherInterval = setInterval(() => {
             checkCount++;
@@ -1172,17 +1175,14 @@ class DAWRVApp {
             try {
                 if (fs.existsSync(this.voiceCommandFile)) {
                     const command = fs.readFileSync(this.voiceCommandFile, 'utf8').trim();
-                    const now = Date.now();
                     
-                    // Only process if command exists, is different, and enough time has passed
-                    if (command && command !== this.lastCommand && (now - lastProcessedTime) >= fileWatcherCooldown) {
-                        const commandToProcess = command;
-                        this.lastCommand = commandToProcess;
-                        lastProcessedTime = now;
-                        
-                        console.log('📢 Voice command received:', commandToProcess);
+                    // The file is cleared after every read, so anything in it is a new
+                    // utterance - even the same words again ("next track", "next track").
+                    // Repeated toggles are dropped by the bridge daemon's dispatch queue.
+                    if (command) {
+                        console.log('📢 Voice command received:', command);
                         console.log('   Last command was:', this.lastCommand || '(none)');
-                        console.log('   Time since last processed:', now - lastProcessedTime, 'ms');
+                        this.lastCommand = command;
                         
                         // Clear the file IMMEDIATELY and atomically to prevent re-reading
                         try {
@@ -1199,35 +1199,11 @@ class DAWRVApp {
                         
                         // Send command to renderer immediately (no delay needed since file is cleared)
                         if (this.mainWindow) {
-                            console.log('📤 Sending voice command to renderer:', commandToProcess);
-                            this.mainWindow.webContents.send('voice-command', commandToProcess);
+                            console.log('📤 Sending voice command to renderer:', command);
+                            this.mainWindow.webContents.send('voice-command', command);
                         } else {
                             console.log('❌ Main window not available, cannot send command');
                         }
-                    } else if (command && command === this.lastCommand) {
-                        // If same command is still in file, clear it to prevent re-processing
-                        console.log('⏸️  Same command still in file, clearing:', command);
-                        try {
-                            fs.unlinkSync(this.voiceCommandFile);
-                        } catch (e) {
-                            try {
-                                fs.writeFileSync(this.voiceCommandFile, '');
-                            } catch (e2) {
-                                // Ignore
-                            }
-                        }
-                    } else if (command && (now - lastProcessedTime) < fileWatcherCooldown) {
-                        // Command exists but within cooldown - clear it
-                        console.log('⏸️  Command within cooldown, clearing:', command);
-                        try {
-                            fs.unlinkSync(this.voiceCommandFile);
-                        } catch (e) {
-                            try {
-                                fs.writeFileSync(this.voiceCommandFile, '');
-                            } catch (e2) {
-                                // Ignore
-                            }
-                        }
                     }
                 }
             } catch (err) {
@@ -1470,65 +1446,101 @@ class DAWRVApp {
                 this.mainWindow.webContents.send('reaper-action-log', logMessage);
             }
             
-            // ⚡ FAST PATH: Send OSC directly (no Python overhead!)
+            const startTime = Date.now();
+            
+            // Resident bridge daemon first: its dispatch queue drops repeated
+            // toggles (a double recognition) and keeps transport commands ordered
+            const bridge = getReaperBridge(resolvePythonCmd());
+            if (bridge) {
+                const response = await bridge.request('dispatch', { action_id: String(actionId) });
+                if (response.ok) {
+                    const duration = Date.now() - startTime;
+                    console.log(`✅ REAPER action ${actionId} queued via bridge daemon (${response.result.kind}, ${duration}ms)`);
+                    noteDispatchErrors(response.result);
+                    return { success: true, queued: true, method: 'bridge-dispatch', duration };
+                }
+                if (!response.unreachable) {
+                    // The daemon may already have queued it: sending again could toggle twice
+                    console.error(`❌ Bridge daemon dispatch failed for ${actionId}:`, response.error);
+                    return { success: false, error: response.error };
+                }
+                console.warn('⚠️  Bridge daemon unreachable, sending OSC directly');
+            }
+            
+            // Fallback: send OSC directly on the shared socket
             return new Promise((resolve) => {
-                const startTime = Date.now();
-                let resolved = false;
-                
                 try {
-                    const dgram = require('dgram');
                     const osc = require('osc');
+                    const oscBuffer = osc.writePacket({ address: `/action/${actionId}`, args: [] });
                     
-                    // Build OSC message using osc library
-                    const message = {
-                        address: `/action/${actionId}`,
-                        args: []
-                    };
-                    
-                    const oscBuffer = osc.writePacket(message);
-                    
-                    // Send UDP packet
-                    const client = dgram.createSocket('udp4');
-                    client.send(oscBuffer, 8000, '127.0.0.1', (err) => {
-                        client.close();
-                        if (resolved) return; // Already resolved by timeout
-                        resolved = true;
-                        
+                    getReaperOscSocket().send(oscBuffer, REAPER_OSC_PORT, REAPER_OSC_HOST, (err) => {
                         const duration = Date.now() - startTime;
-                        
                         if (err) {
                             console.error(`❌ OSC send failed (${duration}ms):`, err);
-                            // Fall back to Python bridge
-                            this.executePythonBridge(actionId, resolve);
+                            // Last resort: the bridge script, without the daemon
+                            this.executePythonBridge(actionId, resolve, true);
                         } else {
-                            console.log(`✅ OSC sent instantly (${duration}ms): /action/${actionId}`);
+                            // OSC is fire-and-forget, we don't get REAPER confirmation
+                            console.log(`✅ OSC sent (${duration}ms): /action/${actionId}`);
                             resolve({ success: true, method: 'osc-direct', duration });
                         }
                     });
-                    
-                    // Timeout - assume success if no error within 50ms
-                    // (OSC is fire-and-forget, we don't get REAPER confirmation)
-                    setTimeout(() => {
-                        if (resolved) return;
-                        resolved = true;
-                        const duration = Date.now() - startTime;
-                        console.log(`✅ OSC sent (assumed success after ${duration}ms): /action/${actionId}`);
-                        resolve({ success: true, method: 'osc-direct', duration });
-                    }, 50); // 50ms timeout - fast!
-                    
                 } catch (error) {
                     console.error('❌ Direct OSC failed:', error);
-                    if (!resolved) {
-                        resolved = true;
-                        // Fall back to Python bridge
-                        this.executePythonBridge(actionId, resolve);
-                    }
+                    this.executePythonBridge(actionId, resolve, true);
                 }
             });
         });
         
+        // Multi-step commands: all actions in ONE OSC bundle so they arrive
+        // together and in order (separate UDP packets have no ordering guarantee)
+        ipcMain.handle('execute-reaper-actions', async (event, actionIds) => {
+            const ids = (actionIds || []).map((id) => String(id));
+            if (ids.length === 0) {
+                return { success: false, error: 'No action IDs' };
+            }
+            
+            const startTime = Date.now();
+            try {
+                const osc = require('osc');
+                
+                const oscBuffer = osc.writePacket({
+                    timeTag: { raw: [0, 1] }, // execute immediately
+                    packets: ids.map((id) => ({ address: `/action/${id}`, args: [] }))
+                });
+                
+                await new Promise((resolve, reject) => {
+                    getReaperOscSocket().send(oscBuffer, REAPER_OSC_PORT, REAPER_OSC_HOST, (err) => {
+                        err ? reject(err) : resolve();
+                    });
+                });
+                
+                const duration = Date.now() - startTime;
+                console.log(`✅ OSC bundle sent (${duration}ms): ${ids.join(', ')}`);
+                return { success: true, method: 'osc-bundle', duration };
+            } catch (error) {
+                console.error('❌ OSC bundle failed, trying bridge daemon:', error.message || error);
+                const bridge = getReaperBridge(resolvePythonCmd());
+                if (bridge) {
+                    const response = await bridge.request('actions', { action_ids: ids });
+                    if (response.ok) {
+                        return { success: true, method: 'bridge-daemon' };
+                    }
+                    if (!response.unreachable) {
+                        // The bundle may already have been sent: don't run it twice
+                        return { success: false, error: response.error };
+                    }
+                }
+                // Last resort: one action at a time through the Python bridge
+                for (const id of ids) {
+                    await new Promise((resolve) => this.executePythonBridge(id, resolve));
+                }
+                return { success: true, method: 'python-bridge' };
+            }
+        });
+        
         // Python bridge fallback method (extracted for reuse)
-        this.executePythonBridge = (actionId, resolve) => {
+        this.executePythonBridge = (actionId, resolve, skipDaemon = false) => {
                 // Use Python bridge script - handle both development and packaged app
                 let bridgeScript;
                 if (app.isPackaged) {
@@ -1592,6 +1604,27 @@ class DAWRVApp {
                     console.log('   Using Python:', pythonCmd);
                 }
                 
+                // Resident bridge daemon first: no interpreter startup per action.
+                // Its dispatch queue drops repeated toggles and keeps transport ordered.
+                const bridge = skipDaemon ? null : getReaperBridge(pythonCmd);
+                if (bridge) {
+                    bridge.request('dispatch', { action_id: String(actionId) }).then((response) => {
+                        if (response.ok) {
+                            console.log(`✅ REAPER action ${actionId} queued via bridge daemon (${response.result.kind}, ${response.ms}ms)`);
+                            noteDispatchErrors(response.result);
+                            resolve({ success: true, queued: true });
+                        } else if (!response.unreachable) {
+                            // The daemon may already have queued it: don't send it twice
+                            console.error(`❌ Bridge daemon dispatch failed for ${actionId}:`, response.error);
+                            resolve({ success: false, error: response.error });
+                        } else {
+                            console.warn('⚠️  Bridge daemon unreachable, spawning bridge script:', response.error);
+                            this.executePythonBridge(actionId, resolve, true);
+                        }
+                    });
+                    return;
+                }
+                
                 // Use absolute Python path
                 const command = `"${pythonCmd}" "${bridgeScript}" ${actionId}`;
                 console.log('🎯 Using REAPER bridge script with absolute Python path');
@@ -1734,6 +1767,7 @@ class DAWRVApp {
             try {
                 if (isSpeaking) {
                     fs.writeFileSync(signalFile, 'true');
+                    setRheaSpeaking(true);
                     console.log('🔇 Signal: RHEA speaking - mic paused');
                     // Also pause ASR
                     if (this.asrService) {
@@ -1743,6 +1777,7 @@ class DAWRVApp {
                     if (fs.existsSync(signalFile)) {
                         fs.unlinkSync(signalFile);
                     }
+                    setRheaSpeaking(false);
                     console.log('👂 Signal: RHEA done - mic resumed');
                     // Also resume ASR
                     if (this.asrService) {
@@ -1800,6 +1835,7 @@ class DAWRVApp {
                 // Clear signal files
                 const fs = require('fs');
                 try { fs.unlinkSync('/tmp/rhea_speaking'); } catch (e) {}
+                setRheaSpeaking(false);
                 
                 // Start Whisper listener process
                 startWhisperListener();
@@ -1834,6 +1870,7 @@ class DAWRVApp {
                 // Clear signal files
                 const fs = require('fs');
                 try { fs.unlinkSync('/tmp/rhea_speaking'); } catch (e) {}
+                setRheaSpeaking(false);
                 try { fs.unlinkSync('/tmp/dawrv_voice_command.txt'); } catch (e) {}
                 
                 // Start the advanced ASR service (Python ASR engine) instead of the legacy file-watcher loop
@@ -2158,6 +2195,65 @@ class DAWRVApp {
 
 const dawrvApp = new DAWRVApp();
 
+// OSC target for direct sends (same overrides as reaper_osc.py)
+const REAPER_OSC_HOST = process.env.DAWRV_REAPER_OSC_HOST || '127.0.0.1';
+const REAPER_OSC_PORT = parseInt(process.env.DAWRV_REAPER_OSC_PORT || '8000', 10);
+
+// One UDP socket for direct OSC sends, reopened after an error
+let reaperOscSocket = null;
+
+function getReaperOscSocket() {
+    if (reaperOscSocket) return reaperOscSocket;
+    const dgram = require('dgram');
+    const socket = dgram.createSocket('udp4');
+    socket.on('error', (err) => {
+        console.error('❌ OSC socket error:', err.message || err);
+        try { socket.close(); } catch (_) {}
+        if (reaperOscSocket === socket) reaperOscSocket = null;
+    });
+    socket.unref();
+    reaperOscSocket = socket;
+    return socket;
+}
+
+function resolvePythonCmd() {
+    const frameworkPython = '/Library/Frameworks/Python.framework/Versions/3.13/bin/python3';
+    if (fs.existsSync(frameworkPython)) return frameworkPython;
+    try {
+        return execSync('which python3', { encoding: 'utf-8' }).trim() || 'python3';
+    } catch {
+        return 'python3';
+    }
+}
+
+// Resident REAPER bridge (reaper_bridge_daemon.py --stdio), started on first use
+let reaperBridgeClient = null;
+
+// The daemon answers dispatch requests once queued; its running send error
+// count is the only sign that an earlier queued command never reached REAPER
+let lastDispatchErrors = 0;
+
+function noteDispatchErrors(result) {
+    const errors = (result && result.errors) || 0;
+    if (errors > lastDispatchErrors) {
+        console.warn(`⚠️  Bridge daemon failed to send ${errors - lastDispatchErrors} queued REAPER command(s)`);
+    }
+    lastDispatchErrors = errors;
+}
+
+function getReaperBridge(pythonCmd) {
+    if (reaperBridgeClient) return reaperBridgeClient;
+    let daemonScript;
+    if (app.isPackaged) {
+        daemonScript = path.join(process.resourcesPath, 'reaper_bridge_daemon.py');
+    } else {
+        daemonScript = path.resolve(__dirname, '../../reaper_bridge_daemon.py');
+    }
+    if (!fs.existsSync(daemonScript)) return null;
+    reaperBridgeClient = new ReaperBridgeClient(pythonCmd, daemonScript);
+    return reaperBridgeClient;
+}
+
 // Define tempo handler function
 async function handleTempoCommand(event, command, value) {
     console.log('🎵 ========================================');
@@ -2182,8 +2278,22 @@ async function handleTempoCommand(event, command, value) {
         let targetTempo = value;
         
         if (command === 'increase' || command === 'decrease') {
-            // We'd need to get current tempo first, but for now just use the value as delta
-            // TODO: Implement get current tempo via Web API
+            // The bridge daemon's dispatch queue knows the current tempo (OSC
+            // feedback) and merges repeated nudges into one absolute set
+            const bridge = getReaperBridge(resolvePythonCmd());
+            const delta = Number(value) || 1;
+            if (bridge) {
+                const response = await bridge.request('dispatch', {
+                    param: 'tempo',
+                    delta: command === 'increase' ? delta : -delta
+                });
+                if (response.ok) {
+                    console.log(`✅ Tempo ${command} by ${delta} BPM queued via bridge daemon`);
+                    noteDispatchErrors(response.result);
+                    return { success: true, queued: true };
+                }
+                console.warn('⚠️  Bridge daemon tempo nudge failed:', response.error);
+            }
             console.warn('⚠️  Increase/decrease requires current tempo - using absolute value instead');
         }
         
@@ -2436,6 +2546,28 @@ async function handleMeasureCommand(event, command, measure, measureEnd) {
             }
         }
         
+        // Resident bridge daemon (barpos answers with the bar bounds)
+        const bridge = getReaperBridge(pythonCmd);
+        if (bridge) {
+            const response = await bridge.request('bar', {
+                command,
+                measure: (typeof measure !== 'undefined' && measure !== null) ? Number(measure) : null,
+                measure_end: (typeof measureEnd !== 'undefined' && measureEnd !== null) ? Number(measureEnd) : null
+            }, 5000);
+            if (response.ok) {
+                if (command === 'barpos') {
+                    return { success: true, start: response.result.start, end: response.result.end };
+                }
+                return { success: true };
+            }
+            if (!response.unreachable) {
+                // Sent but failed or timed out: running the script too could repeat a toggle
+                console.warn('⚠️  Bridge daemon measure command failed:', response.error);
+                return { success: false, error: response.error };
+            }
+            console.warn('⚠️  Bridge daemon unavailable, spawning script');
+        }
+        
         return await new Promise((resolve) => {
             const args = [measureScript, command];
             if (typeof measure !== 'undefined' && measure !== null) {
@@ -2694,6 +2826,9 @@ app.on('window-all-closed', () => {
 app.on('before-quit', () => {
     dawrvApp.stopVoiceListener();
     dawrvApp.stopFileWatcher();
+    if (reaperBridgeClient) {
+        reaperBridgeClient.stop();
+    }
 });
 
 app.on('activate', () => {
@@ -63,6 +63,8 @@ contextBridge.exposeInMainWorld('api', {
         );
         return result;
     },
+    executeReaperActions: (actionIds) =>
+        ipcRenderer.invoke('execute-reaper-actions', actionIds.map((id) => id.toString())),
     executeTempoCommand: (command, value) => {
         console.log('🔌 [PRELOAD] executeTempoCommand called:', command, value);
         const result = ipcRenderer.invoke('execute-tempo-command', command, value);
@@ -0,0 +1,139 @@
+/**
+ * REAPER Bridge Client
+ *
+ * Keeps one resident reaper_bridge_daemon.py (--stdio) per app session and
+ * sends it length-prefixed JSON requests, instead of spawning a Python
+ * process per REAPER action. Requests are pipelined and matched to
+ * responses by correlation ID.
+ */
+
+const { spawn } = require('child_process');
+const EventEmitter = require('events');
+
+class ReaperBridgeClient extends EventEmitter {
+    constructor(pythonCmd, daemonScript) {
+        super();
+        this.pythonCmd = pythonCmd;
+        this.daemonScript = daemonScript;
+        this.process = null;
+        this.buffer = Buffer.alloc(0);
+        this.nextId = 1;
+        this.pending = new Map(); // id -> { resolve, timer }
+    }
+
+    /**
+     * Spawn the daemon if it is not running
+     */
+    start() {
+        if (this.process) return true;
+
+        try {
+            this.process = spawn(this.pythonCmd, [this.daemonScript, '--stdio'], {
+                stdio: ['pipe', 'pipe', 'pipe'],
+                env: { ...process.env, PYTHONUNBUFFERED: '1' }
+            });
+        } catch (error) {
+            console.error('❌ Could not start REAPER bridge daemon:', error.message);
+            this.process = null;
+            return false;
+        }
+
+        this.answered = false; // a daemon that never answered did not read its requests
+        this.process.stdout.on('data', (chunk) => this.onData(chunk));
+        this.process.stderr.on('data', (data) => {
+            const text = data.toString().trim();
+            if (text) console.log('🌉 Bridge:', text);
+        });
+        const child = this.process;
+        child.on('exit', (code) => {
+            console.log(`🌉 REAPER bridge daemon exited (code ${code})`);
+            this.failPending(child, 'Bridge daemon exited');
+        });
+        child.on('error', (error) => {
+            console.error('❌ REAPER bridge daemon error:', error.message);
+            this.failPending(child, error.message);
+        });
+
+        console.log('🌉 REAPER bridge daemon started');
+        return true;
+    }
+
+    /**
+     * Fail outstanding requests after the daemon died. They count as
+     * unreachable (safe to run another way) only if this daemon never
+     * answered anything, i.e. it died on startup.
+     */
+    failPending(child, error) {
+        if (this.process !== child) return;
+        this.process = null;
+        this.buffer = Buffer.alloc(0);
+        for (const [id, entry] of this.pending) {
+            clearTimeout(entry.timer);
+            entry.resolve({ id, ok: false, error, unreachable: !this.answered });
+        }
+        this.pending.clear();
+    }
+
+    /**
+     * Parse length-prefixed frames from daemon stdout
+     */
+    onData(chunk) {
+        this.buffer = Buffer.concat([this.buffer, chunk]);
+        while (this.buffer.length >= 4) {
+            const size = this.buffer.readUInt32BE(0);
+            if (this.buffer.length < 4 + size) break;
+            const body = this.buffer.subarray(4, 4 + size).toString('utf8');
+            this.buffer = this.buffer.subarray(4 + size);
+
+            let message;
+            try {
+                message = JSON.parse(body);
+            } catch (e) {
+                continue;
+            }
+            this.answered = true;
+            const entry = this.pending.get(message.id);
+            if (entry) {
+                clearTimeout(entry.timer);
+                this.pending.delete(message.id);
+                entry.resolve(message);
+            }
+        }
+    }
+
+    /**
+     * Send a request; resolves with the daemon's response
+     * ({ ok: false } on timeout or if the daemon is unavailable; only an
+     * unavailable daemon sets unreachable, as the request was not run)
+     */
+    request(op, fields = {}, timeoutMs = 2000) {
+        if (!this.start()) {
+            // Nothing was sent: the caller may run the request itself
+            return Promise.resolve({ ok: false, error: 'Bridge daemon unavailable', unreachable: true });
+        }
+
+        const id = this.nextId++;
+        const body = Buffer.from(JSON.stringify({ id, op, ...fields }), 'utf8');
+        const header = Buffer.alloc(4);
+        header.writeUInt32BE(body.length, 0);
+
+        return new Promise((resolve) => {
+            const timer = setTimeout(() => {
+                this.pending.delete(id);
+                resolve({ id, ok: false, error: 'Bridge request timed out' });
+            }, timeoutMs);
+            this.pending.set(id, { resolve, timer });
+            this.process.stdin.write(Buffer.concat([header, body]));
+        });
+    }
+
+    stop() {
+        if (this.process) {
+            this.process.stdin.end();
+            this.process.kill();
+            this.process = null;
+        }
+    }
+}
+
+module.exports = ReaperBridgeClient;
@@ -1,10 +1,14 @@
 /**
  * ReaScript Service
  * 
- * Polls REAPER for last touched control information using ReaScript
+ * Follows the last touched control published by the ReaScript mouse tracker
+ * (dawrv_mouse_tracker_continuous.lua) in REAPER's ExtState. reaper_extstate.py
+ * watches reaper-extstate.ini and sends one JSON line per settled change;
+ * without it the .ini is polled and re-read per key.
  */
 
 const { spawn } = require('child_process');
+const fs = require('fs');
 const path = require('path');
 const EventEmitter = require('events');
 
@@ -18,10 +22,14 @@ class ReaScriptService extends EventEmitter {
         this.lastValue = undefined; // Track last value for value change detection
         this.hasLogged = false; // For debug logging
         this.reaperPath = '/Applications/REAPER.app/Contents/MacOS/REAPER'; // Default macOS path
+        this.pythonCmd = process.env.DAWRV_PYTHON || 'python3';
+        this.watcherProcess = null; // reaper_extstate.py, while it runs
+        this.lastClickTimestamp = null;
     }
     
     /**
-     * Start polling for last touched control
+     * Start following the last touched control: the ExtState watcher if it
+     * can run, polling otherwise
      */
     start() {
         if (this.isPolling) {
@@ -29,8 +37,13 @@ class ReaScriptService extends EventEmitter {
             return;
         }
         
-        console.log('🎛️  Starting ReaScript polling...');
         this.isPolling = true;
+        if (this.startWatcher()) return;
+        this.startPolling();
+    }
+    
+    startPolling() {
+        console.log('🎛️  Starting ReaScript polling...');
         
         // Poll immediately, then at intervals
         this.poll();
@@ -46,12 +59,132 @@ class ReaScriptService extends EventEmitter {
         console.log('🛑 Stopping ReaScript polling');
         this.isPolling = false;
         
+        if (this.watcherProcess) {
+            this.watcherProcess.kill();
+            this.watcherProcess = null;
+        }
+        
         if (this.pollInterval) {
             clearInterval(this.pollInterval);
             this.pollInterval = null;
         }
     }
     
+    /**
+     * Spawn reaper_extstate.py and consume its JSON change lines
+     *
+     * @returns {boolean} false if the script is not there
+     */
+    startWatcher() {
+        const possiblePaths = [
+            process.resourcesPath && path.join(process.resourcesPath, 'reaper_extstate.py'),
+            path.join(__dirname, '..', '..', 'reaper_extstate.py')
+        ].filter(Boolean);
+        const scriptPath = possiblePaths.find((p) => fs.existsSync(p));
+        if (!scriptPath) {
+            console.warn('⚠️  reaper_extstate.py not found, polling ExtState instead');
+            return false;
+        }
+        
+        console.log('🎛️  Starting ExtState watcher:', scriptPath);
+        const watcher = spawn(this.pythonCmd, [scriptPath], { stdio: ['ignore', 'pipe', 'pipe'] });
+        this.watcherProcess = watcher;
+        
+        // One JSON line per change; a chunk can end mid-line
+        let pending = '';
+        watcher.stdout.on('data', (data) => {
+            const lines = (pending + data.toString()).split('\n');
+            pending = lines.pop();
+            for (const line of lines) {
+                if (!line.trim()) continue;
+                try {
+                    this.handleExtStateChange(JSON.parse(line));
+                } catch (error) {
+                    console.error('⚠️  ExtState watcher output error:', error.message);
+                }
+            }
+        });
+        
+        watcher.stderr.on('data', (data) => {
+            const text = data.toString().trim();
+            if (text) console.log('🐍 ExtState watcher:', text);
+        });
+        
+        // Python missing: poll instead
+        watcher.on('error', (error) => {
+            console.error('❌ Failed to spawn ExtState watcher:', error.message);
+            if (this.watcherProcess !== watcher) return;
+            this.watcherProcess = null;
+            if (this.isPolling && !this.pollInterval) this.startPolling();
+        });
+        
+        watcher.on('exit', (code) => {
+            if (this.watcherProcess !== watcher) return;
+            this.watcherProcess = null;
+            if (this.isPolling && !this.pollInterval) {
+                // Unexpected exit - restart
+                console.log(`🔄 ExtState watcher exited (${code}), restarting...`);
+                setTimeout(() => {
+                    if (this.isPolling && !this.watcherProcess && !this.pollInterval) {
+                        this.startWatcher() || this.startPolling();
+                    }
+                }, 1000);
+            }
+        });
+        
+        return true;
+    }
+    
+    /**
+     * A change from reaper_extstate.py: {kind, changed, removed, values},
+     * values already typed (numbers, booleans)
+     */
+    handleExtStateChange(change) {
+        const values = change.values || {};
+        if (change.kind === 'control') {
+            if (values.control_detected !== true) return;
+            this.handleControl({
+                success: true,
+                control_type: values.control_type,
+                context: values.control_context,
+                track_number: values.track_number || 0,
+                track_name: values.track_name,
+                track_guid: values.track_guid,
+                parameter: values.parameter,
+                value: values.value ?? undefined,
+                value_formatted: values.value_formatted,
+                timestamp: values.timestamp
+            });
+        } else if (change.kind === 'click') {
+            // Clearing the flag below is a change too; so is a burst read half-written
+            if (values.control_clicked !== true || values.click_timestamp === this.lastClickTimestamp) return;
+            this.lastClickTimestamp = values.click_timestamp;
+            const clickedWindow = String(values.clicked_window || '').split(',').map(Number);
+            this.handleClick({
+                clicked: true,
+                control_type: values.clicked_type,
+                context: values.clicked_context,
+                track_number: values.clicked_track || 0,
+                track_guid: values.clicked_guid,
+                track_name: `Track ${values.clicked_track}`,
+                timestamp: values.click_timestamp,
+                position: Number.isFinite(values.clicked_x) && Number.isFinite(values.clicked_y)
+                    ? { x: values.clicked_x, y: values.clicked_y }
+                    : undefined,
+                window: clickedWindow.length === 4 && clickedWindow.every(Number.isFinite)
+                    ? {
+                        rel_x: clickedWindow[0],
+                        rel_y: clickedWindow[1],
+                        width: clickedWindow[2],
+                        height: clickedWindow[3],
+                        title: values.clicked_window_title
+                    }
+                    : undefined
+            });
+            this.setExtState('RHEA', 'control_clicked', 'false');
+        }
+    }
+    
     /**
      * Poll REAPER for last touched control (via ExtState from Lua script)
      */
@@ -68,53 +201,13 @@ class ReaScriptService extends EventEmitter {
             }
             
             if (result && result.success) {
-                // Check if control changed OR value changed
-                const controlId = `${result.track_number}-${result.control_type}`;
-                const currentValue = result.value;
-                
-                const controlChanged = controlId !== this.lastControl;
-                
-                // Value changed = same control, but value moved by more than 0.001
-                const valueChanged = !controlChanged && 
-                                    this.lastValue !== undefined && 
-                                    currentValue !== undefined && 
-                                    Math.abs(currentValue - this.lastValue) > 0.001;
-                
-                if (controlChanged || valueChanged) {
-                    // Emit control change event (for both new controls AND value changes)
-                    this.emit('control-touched', result);
-                    
-                    if (controlChanged) {
-                        console.log('🎛️  Control touched:', {
-                            track: result.track_name,
-                            type: result.control_type,
-                            value: result.value_formatted
-                        });
-                        // Reset value tracking when control changes
-                        this.lastValue = currentValue;
-                    } else if (valueChanged) {
-                        console.log('🎚️  Value changed:', {
-                            track: result.track_name,
-                            type: result.control_type,
-                            value: result.value_formatted,
-                            delta: (currentValue - this.lastValue).toFixed(3)
-                        });
-                        this.lastValue = currentValue;
-                    }
-                    
-                    // Update control tracking
-                    this.lastControl = controlId;
-                }
+                this.handleControl(result);
             }
             
             // Check for click events (for learning!)
             const clickResult = await this.readClickExtState();
             if (clickResult && clickResult.clicked) {
-                this.emit('control-clicked', clickResult);
-                console.log('🖱️  Control CLICKED:', {
-                    track: clickResult.track_name,
-                    type: clickResult.control_type
-                });
+                this.handleClick(clickResult);
             }
             
         } catch (error) {
@@ -123,6 +216,57 @@ class ReaScriptService extends EventEmitter {
         }
     }
     
+    /**
+     * Emit control-touched when the control or its value changed
+     */
+    handleControl(result) {
+        // Check if control changed OR value changed
+        const controlId = `${result.track_number}-${result.control_type}`;
+        const currentValue = result.value;
+        
+        const controlChanged = controlId !== this.lastControl;
+        
+        // Value changed = same control, but value moved by more than 0.001
+        const valueChanged = !controlChanged && 
+                            this.lastValue !== undefined && 
+                            currentValue !== undefined && 
+                            Math.abs(currentValue - this.lastValue) > 0.001;
+        
+        if (controlChanged || valueChanged) {
+            // Emit control change event (for both new controls AND value changes)
+            this.emit('control-touched', result);
+            
+            if (controlChanged) {
+                console.log('🎛️  Control touched:', {
+                    track: result.track_name,
+                    type: result.control_type,
+                    value: result.value_formatted
+                });
+                // Reset value tracking when control changes
+                this.lastValue = currentValue;
+            } else if (valueChanged) {
+                console.log('🎚️  Value changed:', {
+                    track: result.track_name,
+                    type: result.control_type,
+                    value: result.value_formatted,
+                    delta: (currentValue - this.lastValue).toFixed(3)
+                });
+                this.lastValue = currentValue;
+            }
+            
+            // Update control tracking
+            this.lastControl = controlId;
+        }
+    }
+    
+    handleClick(clickResult) {
+        this.emit('control-clicked', clickResult);
+        console.log('🖱️  Control CLICKED:', {
+            track: clickResult.track_name,
+            type: clickResult.control_type
+        });
+    }
+    
     /**
      * Read control data from REAPER ExtState
      */
@@ -179,13 +323,32 @@ class ReaScriptService extends EventEmitter {
             const clicked = await this.getExtState('RHEA', 'control_clicked');
             if (clicked !== 'true') return null;
             
+            const clickedX = parseFloat(await this.getExtState('RHEA', 'clicked_x'));
+            const clickedY = parseFloat(await this.getExtState('RHEA', 'clicked_y'));
+            // "rel_x,rel_y,width,height" in the window under the click (empty without js_ReaScriptAPI/SWS)
+            const clickedWindow = (await this.getExtState('RHEA', 'clicked_window') || '').split(',').map(Number);
+            
             const result = {
                 clicked: true,
                 control_type: await this.getExtState('RHEA', 'clicked_type'),
+                context: await this.getExtState('RHEA', 'clicked_context'),
                 track_number: parseInt(await this.getExtState('RHEA', 'clicked_track') || '0'),
                 track_guid: await this.getExtState('RHEA', 'clicked_guid'),
                 track_name: `Track ${await this.getExtState('RHEA', 'clicked_track')}`,
-                timestamp: await this.getExtState('RHEA', 'click_timestamp')
+                timestamp: await this.getExtState('RHEA', 'click_timestamp'),
+                // Screen position of the click (learned into the tracker's hit grids)
+                position: Number.isFinite(clickedX) && Number.isFinite(clickedY)
+                    ? { x: clickedX, y: clickedY }
+                    : undefined,
+                window: clickedWindow.length === 4 && clickedWindow.every(Number.isFinite)
+                    ? {
+                        rel_x: clickedWindow[0],
+                        rel_y: clickedWindow[1],
+                        width: clickedWindow[2],
+                        height: clickedWindow[3],
+                        title: await this.getExtState('RHEA', 'clicked_window_title')
+                    }
+                    : undefined
             };
             
             // Clear the click flag so we don't process it again
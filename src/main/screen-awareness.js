@@ -23,6 +23,8 @@ class ScreenAwarenessSystem extends EventEmitter {
         this.hoverDelay = 500; // ms to wait before announcing
         this.lastAnnouncedElement = null;
         this.trackerProcess = null; // Python tracker process
+        this.trackerLogLevel = process.env.DAWRV_TRACKER_LOG_LEVEL || 'info';
+        this.trackerElement = null; // Last full element, for compact 'element-changed' events
         
         console.log('🖱️  Screen Awareness System initialized');
     }
@@ -191,22 +193,27 @@ class ScreenAwarenessSystem extends EventEmitter {
             
             console.log('🐍 Starting Python tracker:', scriptPath);
             
-            // Spawn Python process
-            this.trackerProcess = spawn('python3', [scriptPath, this.hoverDelay.toString()], {
+            // Spawn Python process (batched, compact events; per-hover steps only at 'debug')
+            this.trackerProcess = spawn('python3', [
+                scriptPath, this.hoverDelay.toString(),
+                '--log-level', this.trackerLogLevel, '--compact'
+            ], {
                 stdio: ['ignore', 'pipe', 'pipe']
             });
+            this.trackerElement = null;
             
-            // Handle stdout (JSON events from Python)
+            // Handle stdout (JSON events from Python); a chunk can end mid-line
+            let pending = '';
             this.trackerProcess.stdout.on('data', (data) => {
-                try {
-                    const lines = data.toString().trim().split('\n');
-                    for (const line of lines) {
-                        if (!line) continue;
-                        const event = JSON.parse(line);
-                        this.handleTrackerEvent(event);
+                const lines = (pending + data.toString()).split('\n');
+                pending = lines.pop();
+                for (const line of lines) {
+                    if (!line.trim()) continue;
+                    try {
+                        this.handleTrackerEvent(JSON.parse(line));
+                    } catch (error) {
+                        console.error('Error parsing tracker output:', error);
                     }
-                } catch (error) {
-                    console.error('Error parsing tracker output:', error);
                 }
             });
             
@@ -246,7 +253,16 @@ class ScreenAwarenessSystem extends EventEmitter {
      */
     handleTrackerEvent(event) {
         if (event.event === 'element-detected') {
+            this.trackerElement = event.element;
             this.handleElementDetected(event.element);
+        } else if (event.event === 'element-changed') {
+            // Compact form: only the fields that differ from the previous element
+            const element = { ...(this.trackerElement || {}), ...event.changed };
+            for (const key of event.removed || []) {
+                delete element[key];
+            }
+            this.trackerElement = element;
+            this.handleElementDetected(element);
         } else if (event.event === 'info') {
             console.log('🐍', event.message);
         } else if (event.event === 'error') {
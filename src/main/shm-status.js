@@ -0,0 +1,85 @@
+/**
+ * Shared Status Block - RHEA speaking gate
+ *
+ * Mirrors /tmp/rhea_speaking into the shared-memory status block read by
+ * the ASR providers (asr/shm_status.py). The Electron main process is the
+ * gate's only writer, so the gate has its own seqlock counter instead of
+ * the flock the Python writers share:
+ *
+ *     496  u32  gate seqlock counter (odd while a write is in progress)
+ *     500  u8   rhea_speaking
+ *     504  u64  timestamp (monotonic ns)
+ *
+ * The layout constants must match asr/shm_status.py.
+ */
+
+const fs = require('fs');
+const os = require('os');
+const path = require('path');
+
+const MAGIC = Buffer.from('DWRV', 'ascii');
+const LAYOUT_VERSION = 3;
+const BLOCK_SIZE = 512;
+const GATE_OFFSET = 496;
+
+let blockFd = null;
+
+function defaultStatusPath() {
+    if (process.env.DAWRV_SHM_STATUS_PATH) return process.env.DAWRV_SHM_STATUS_PATH;
+    if (fs.existsSync('/dev/shm')) return '/dev/shm/dawrv_status';
+    return path.join(os.tmpdir(), 'dawrv_status.shm');
+}
+
+/**
+ * Open (creating and initializing if needed) the status block
+ */
+function openBlock() {
+    if (blockFd !== null) return blockFd;
+    const fd = fs.openSync(defaultStatusPath(), fs.constants.O_RDWR | fs.constants.O_CREAT, 0o666);
+    if (fs.fstatSync(fd).size < BLOCK_SIZE) {
+        fs.ftruncateSync(fd, BLOCK_SIZE);
+    }
+    const header = Buffer.alloc(8);
+    fs.readSync(fd, header, 0, 8, 0);
+    if (!header.subarray(0, 4).equals(MAGIC) || header.readUInt32LE(4) !== LAYOUT_VERSION) {
+        const block = Buffer.alloc(BLOCK_SIZE);
+        MAGIC.copy(block, 0);
+        block.writeUInt32LE(LAYOUT_VERSION, 4);
+        fs.writeSync(fd, block, 0, BLOCK_SIZE, 0);
+    }
+    blockFd = fd;
+    return fd;
+}
+
+/**
+ * Publish RHEA's speaking flag (errors are logged, never thrown: the
+ * /tmp/rhea_speaking file is still the gate the providers check)
+ */
+function setRheaSpeaking(speaking) {
+    try {
+        const fd = openBlock();
+        const counter = Buffer.alloc(4);
+        fs.readSync(fd, counter, 0, 4, GATE_OFFSET);
+        let seq = counter.readUInt32LE(0);
+        seq += seq & 1; // a previous write was interrupted
+
+        const gate = Buffer.alloc(16);
+        gate.writeUInt32LE((seq + 1) >>> 0, 0);
+        fs.writeSync(fd, gate, 0, 4, GATE_OFFSET); // odd: write in progress
+        gate.writeUInt8(speaking ? 1 : 0, 4);
+        gate.writeBigUInt64LE(process.hrtime.bigint(), 8);
+        fs.writeSync(fd, gate, 4, 12, GATE_OFFSET + 4);
+        gate.writeUInt32LE((seq + 2) >>> 0, 0);
+        fs.writeSync(fd, gate, 0, 4, GATE_OFFSET); // even: consistent
+        return true;
+    } catch (error) {
+        console.error('Shared status block error:', error.message);
+        if (blockFd !== null) {
+            try { fs.closeSync(blockFd); } catch (e) {}
+            blockFd = null;
+        }
+        return false;
+    }
+}
+
+module.exports = { setRheaSpeaking, defaultStatusPath };
@@ -3438,6 +3438,21 @@ class RHEAController {
         return commands.length > 1 ? commands : null;
     }
     
+    /**
+     * Execute several REAPER actions in order as one OSC bundle
+     * (one action at a time if the bundle IPC is unavailable)
+     * @param {Array} actionIds - REAPER action IDs, in order
+     */
+    async executeReaperActionSequence(actionIds) {
+        if (window.api?.executeReaperActions) {
+            return await window.api.executeReaperActions(actionIds);
+        }
+        for (const actionId of actionIds) {
+            await window.api.executeReaperAction(actionId);
+        }
+        return { success: true };
+    }
+    
     /**
      * Execute a sequence of commands
      * @param {Array} commands - Array of command strings to execute in order
@@ -5373,9 +5388,7 @@ class RHEAController {
                 // Add multiple tracks
                 try {
                     console.log(`🎚️ Adding ${count} new tracks...`);
-                    for (let i = 0; i < count; i++) {
-                        await window.api.executeReaperAction(40001); // Add track action
-                    }
+                    await this.executeReaperActionSequence(new Array(count).fill(40001)); // Add track action
                     this.speak(`Added ${count} new tracks`);
                     this.updateStatus('ready', `Added ${count} new tracks`);
                     this.logResult(transcript, 'success');
@@ -5411,9 +5424,7 @@ class RHEAController {
                 // Add multiple tracks
                 try {
                     console.log(`🎚️ Adding ${count} new tracks (from number response)...`);
-                    for (let i = 0; i < count; i++) {
-                        await window.api.executeReaperAction(40001); // Add track action
-                    }
+                    await this.executeReaperActionSequence(new Array(count).fill(40001)); // Add track action
                     this.speak(`Added ${count} new tracks`);
                     this.updateStatus('ready', `Added ${count} new tracks`);
                     this.logResult(transcript, 'success');